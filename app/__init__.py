@@ -1,9 +1,25 @@
-"""Package entrypoint."""
+"""Package entrypoint.
 
-from app import api, services
-from app.api.main import build_service_app
-from app.core import config
-from app.main import main
+The API, the services and their machine learning dependencies are imported on
+first use, so the configuration and the command line load fast.
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from app import api, services
+    from app.api.main import build_service_app
+    from app.core import config
+    from app.main import main
+
+_LAZY_ATTRIBUTES = {
+    "api": ("app.api", None),
+    "build_service_app": ("app.api.main", "build_service_app"),
+    "config": ("app.core.config", None),
+    "main": ("app.main", "main"),
+    "services": ("app.services", None),
+}
 
 __all__ = [
     "api",
@@ -12,3 +28,13 @@ __all__ = [
     "main",
     "services",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attribute = _LAZY_ATTRIBUTES[name]
+    module = importlib.import_module(module_name)
+    value = module if attribute is None else getattr(module, attribute)
+    globals()[name] = value
+    return value
@@ -6,10 +6,16 @@ from fastapi import FastAPI, Request, status
 from fastapi.responses import JSONResponse
 
 from app.core.exceptions import (
+    FileTooLargeError,
+    FileUploadError,
     IndexingError,
+    JobNotFoundError,
     QueryExecutionError,
+    QueryTimeoutError,
     RAGException,
     RAGServiceNotInitializedError,
+    SessionNotFoundError,
+    TenantNotFoundError,
 )
 
 logger = getLogger(__name__)
@@ -25,8 +31,16 @@ def rag_exception_handler(request: Request, exc: RAGException) -> JSONResponse:
         status_code = status.HTTP_503_SERVICE_UNAVAILABLE
     if isinstance(exc, QueryExecutionError):
         status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+    if isinstance(exc, QueryTimeoutError):
+        status_code = status.HTTP_504_GATEWAY_TIMEOUT
     if isinstance(exc, IndexingError):
         status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+    if isinstance(exc, TenantNotFoundError | JobNotFoundError | SessionNotFoundError):
+        status_code = status.HTTP_404_NOT_FOUND
+    if isinstance(exc, FileUploadError):
+        status_code = status.HTTP_400_BAD_REQUEST
+    if isinstance(exc, FileTooLargeError):
+        status_code = status.HTTP_413_CONTENT_TOO_LARGE
 
     return JSONResponse(
         status_code=status_code,
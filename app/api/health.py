@@ -1,6 +1,7 @@
 """API health router definition."""
 
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Request, Response, status
+from fastapi.responses import PlainTextResponse
 
 from app.api.v1.schemas import HealthCheckResponseStatus
 
@@ -25,3 +26,52 @@ def get_health() -> HealthCheckResponseStatus:
         HealthCheckResponseStatus: Returns a JSON response with the health status
     """
     return HealthCheckResponseStatus(status="OK")
+
+
+@router.get(
+    "/ready",
+    summary="Perform a Readiness Check",
+    response_description="Return HTTP Status Code 200 (OK) once ready to serve",
+    status_code=status.HTTP_200_OK,
+    response_model=HealthCheckResponseStatus,
+    responses={
+        status.HTTP_503_SERVICE_UNAVAILABLE: {"model": HealthCheckResponseStatus}
+    },
+    include_in_schema=False,
+)
+def get_readiness(request: Request, response: Response) -> HealthCheckResponseStatus:
+    """Perform a Readiness Check.
+
+    The service is ready once the documents are indexed and the models are
+    warmed up, so that the first queries routed to it run at steady state.
+
+    Returns:
+        HealthCheckResponseStatus: Returns a JSON response with the readiness status
+    """
+    rag_service = getattr(request.app.state, "rag_service", None)
+    if rag_service is None or not rag_service.is_ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return HealthCheckResponseStatus(status="NOT READY")
+    return HealthCheckResponseStatus(status="OK")
+
+
+@router.get(
+    "/metrics",
+    summary="Export the service metrics",
+    response_description="Return the metrics in the Prometheus text format",
+    status_code=status.HTTP_200_OK,
+    response_class=PlainTextResponse,
+    include_in_schema=False,
+)
+def get_metrics(request: Request) -> PlainTextResponse:
+    """Export the service metrics.
+
+    The metrics are exported in the Prometheus text exposition format, and are
+    empty until the service is initialized.
+
+    Returns:
+        PlainTextResponse: Returns the metrics as plain text
+    """
+    rag_service = getattr(request.app.state, "rag_service", None)
+    content = rag_service.metrics.render() if rag_service is not None else ""
+    return PlainTextResponse(content, media_type="text/plain; version=0.0.4")
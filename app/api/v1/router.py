@@ -2,7 +2,10 @@
 
 from fastapi import APIRouter
 
-from app.api.v1.routes import rag
+from app.api.v1.routes import admin, chat, documents, rag
 
 router = APIRouter()
 router.include_router(router=rag.router, prefix="/query", tags=["RAG"])
+router.include_router(router=documents.router, prefix="/documents", tags=["Documents"])
+router.include_router(router=chat.router, prefix="/chat", tags=["Chat"])
+router.include_router(router=admin.router, prefix="/admin", tags=["Admin"])
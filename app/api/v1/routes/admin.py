@@ -0,0 +1,28 @@
+"""API v1 admin routes definitions."""
+
+from logging import getLogger
+
+from fastapi import APIRouter, Depends, status
+
+from app.api.dependencies import get_rag_service
+from app.api.v1.schemas import RAGErrorResponse, RAGMemoryResponse
+from app.services.rag_service import RAGService
+
+logger = getLogger(__name__)
+router = APIRouter()
+
+
+@router.get(
+    "/memory",
+    response_model=RAGMemoryResponse | RAGErrorResponse,
+    summary="Report the memory usage",
+    description="Report the resident memory of the worker, the weights of the \
+        loaded models, the estimated index size and the cache sizes.",
+    responses={
+        status.HTTP_200_OK: {"model": RAGMemoryResponse},
+        status.HTTP_500_INTERNAL_SERVER_ERROR: {"model": RAGErrorResponse},
+    },
+)
+def get_memory(rag_service: RAGService = Depends(get_rag_service)):
+    """Endpoint to report the memory used by each component of the service."""
+    return RAGMemoryResponse(**rag_service.memory_usage().as_dict())
@@ -0,0 +1,94 @@
+"""API v1 chat routes definitions."""
+
+from logging import getLogger
+
+from fastapi import APIRouter, Body, Depends, Path, Query, Request, Response, status
+
+from app.api.dependencies import get_rag_service
+from app.api.v1.schemas import (
+    RAGChatRequest,
+    RAGChatResponse,
+    RAGChatSessionResponse,
+    RAGErrorResponse,
+)
+from app.services.metadata import build_metadata_filters
+from app.services.rag_service import RAGService
+from app.services.sessions import SESSION_ID_PATTERN
+from app.services.tenants import TENANT_NAME_PATTERN
+
+logger = getLogger(__name__)
+router = APIRouter()
+
+
+@router.post(
+    "",
+    response_model=RAGChatResponse | RAGErrorResponse,
+    summary="Chat with the RAG system",
+    description="Send a message of a conversation, whose history is kept on the \
+        server. Omit the session id to start a new conversation.",
+    responses={
+        status.HTTP_200_OK: {"model": RAGChatResponse},
+        status.HTTP_404_NOT_FOUND: {"model": RAGErrorResponse},
+        status.HTTP_500_INTERNAL_SERVER_ERROR: {"model": RAGErrorResponse},
+        status.HTTP_504_GATEWAY_TIMEOUT: {"model": RAGErrorResponse},
+    },
+)
+async def chat(
+    http_request: Request,
+    request: RAGChatRequest = Body(...),
+    rag_service: RAGService = Depends(get_rag_service),
+):
+    """Endpoint to send a message of a chat session."""
+    filters = None
+    if request.filters is not None:
+        filters = build_metadata_filters(
+            file_names=request.filters.file_names,
+            page_from=request.filters.page_from,
+            page_to=request.filters.page_to,
+            tags=request.filters.tags,
+        )
+
+    result = await rag_service.chat(
+        message=request.message,
+        session_id=request.session_id,
+        filters=filters,
+        tenant=request.tenant,
+        timeout_s=request.timeout_s,
+        is_disconnected=http_request.is_disconnected,
+    )
+    return RAGChatResponse(**result)
+
+
+@router.get(
+    "/{session_id}",
+    response_model=RAGChatSessionResponse | RAGErrorResponse,
+    summary="Get the history of a chat session",
+    responses={
+        status.HTTP_200_OK: {"model": RAGChatSessionResponse},
+        status.HTTP_404_NOT_FOUND: {"model": RAGErrorResponse},
+    },
+)
+async def get_session(
+    session_id: str = Path(..., pattern=SESSION_ID_PATTERN),
+    tenant: str | None = Query(None, pattern=TENANT_NAME_PATTERN),
+    rag_service: RAGService = Depends(get_rag_service),
+):
+    """Endpoint to read the turns of a chat session."""
+    session = rag_service.get_session(session_id, tenant=tenant)
+    return RAGChatSessionResponse(**session.as_dict())
+
+
+@router.delete(
+    "/{session_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="End a chat session",
+    responses={status.HTTP_404_NOT_FOUND: {"model": RAGErrorResponse}},
+)
+async def delete_session(
+    session_id: str = Path(..., pattern=SESSION_ID_PATTERN),
+    tenant: str | None = Query(None, pattern=TENANT_NAME_PATTERN),
+    rag_service: RAGService = Depends(get_rag_service),
+):
+    """Endpoint to end a chat session, freeing its history and KV cache."""
+    rag_service.delete_session(session_id, tenant=tenant)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,113 @@
+"""API v1 document ingestion routes definitions."""
+
+from logging import getLogger
+
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Body,
+    Depends,
+    Header,
+    Query,
+    Request,
+    status,
+)
+
+from app.api.dependencies import get_rag_service
+from app.api.v1.schemas import (
+    RAGErrorResponse,
+    RAGIngestRequest,
+    RAGIngestResponse,
+    RAGUploadJobResponse,
+)
+from app.core.exceptions import FileUploadError
+from app.services.rag_service import RAGService
+from app.services.tenants import TENANT_NAME_PATTERN
+from app.services.uploads import UPLOAD_FILE_NAME_PATTERN
+
+logger = getLogger(__name__)
+router = APIRouter()
+
+
+@router.post(
+    "/ingest",
+    response_model=RAGIngestResponse | RAGErrorResponse,
+    summary="Index the documents of a tenant",
+    description="Rebuild the collection of a tenant from the documents in its \
+        subdirectory of the documents directory.",
+    responses={
+        status.HTTP_200_OK: {"model": RAGIngestResponse},
+        status.HTTP_404_NOT_FOUND: {"model": RAGErrorResponse},
+        status.HTTP_500_INTERNAL_SERVER_ERROR: {"model": RAGErrorResponse},
+    },
+)
+async def ingest_documents(
+    request: RAGIngestRequest = Body(...),
+    rag_service: RAGService = Depends(get_rag_service),
+):
+    """Endpoint to (re)index the documents of a tenant."""
+    result = await rag_service.ingest(tenant=request.tenant)
+    return RAGIngestResponse(**result)
+
+
+@router.post(
+    "/upload",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=RAGUploadJobResponse | RAGErrorResponse,
+    summary="Upload a PDF document",
+    description="Stream a PDF document, sent as the raw request body, to the \
+        documents of a tenant. The document is indexed in the background, into \
+        the live index; poll the returned job for its status.",
+    responses={
+        status.HTTP_202_ACCEPTED: {"model": RAGUploadJobResponse},
+        status.HTTP_400_BAD_REQUEST: {"model": RAGErrorResponse},
+        status.HTTP_413_CONTENT_TOO_LARGE: {"model": RAGErrorResponse},
+    },
+)
+async def upload_document(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    file_name: str = Query(
+        ...,
+        pattern=UPLOAD_FILE_NAME_PATTERN,
+        description="Name of the document in the documents directory.",
+    ),
+    tenant: str | None = Query(
+        None,
+        pattern=TENANT_NAME_PATTERN,
+        description="Tenant receiving the document, the default collection if omitted.",
+    ),
+    content_type: str | None = Header(None),
+    content_length: int | None = Header(None),
+    rag_service: RAGService = Depends(get_rag_service),
+):
+    """Endpoint to upload a document and index it asynchronously."""
+    if (content_type or "").split(";")[0].strip().lower() != "application/pdf":
+        raise FileUploadError(
+            "Upload the document with 'Content-Type: application/pdf'."
+        )
+    job = await rag_service.upload_document(
+        request.stream(),
+        file_name=file_name,
+        tenant=tenant,
+        content_length=content_length,
+    )
+    background_tasks.add_task(rag_service.index_upload, job.job_id)
+    return RAGUploadJobResponse(**job.as_dict())
+
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=RAGUploadJobResponse | RAGErrorResponse,
+    summary="Get the status of an indexing job",
+    responses={
+        status.HTTP_200_OK: {"model": RAGUploadJobResponse},
+        status.HTTP_404_NOT_FOUND: {"model": RAGErrorResponse},
+    },
+)
+async def get_upload_job(
+    job_id: str,
+    rag_service: RAGService = Depends(get_rag_service),
+):
+    """Endpoint to poll the indexing job of an uploaded document."""
+    return RAGUploadJobResponse(**rag_service.get_upload_job(job_id).as_dict())
@@ -2,7 +2,7 @@
 
 from logging import getLogger
 
-from fastapi import APIRouter, Body, Depends, status
+from fastapi import APIRouter, Body, Depends, Request, status
 
 from app.api.dependencies import get_rag_service
 from app.api.v1.schemas import (
@@ -10,6 +10,7 @@ from app.api.v1.schemas import (
     RAGQueryRequest,
     RAGQueryResponse,
 )
+from app.services.metadata import build_metadata_filters
 from app.services.rag_service import RAGService
 
 logger = getLogger(__name__)
@@ -26,13 +27,29 @@ router = APIRouter()
         status.HTTP_200_OK: {"model": RAGQueryResponse},
         status.HTTP_500_INTERNAL_SERVER_ERROR: {"model": RAGErrorResponse},
         status.HTTP_400_BAD_REQUEST: {"model": RAGErrorResponse},
+        status.HTTP_504_GATEWAY_TIMEOUT: {"model": RAGErrorResponse},
     },
 )
 async def query_rag(
+    http_request: Request,
     request: RAGQueryRequest = Body(...),
     rag_service: RAGService = Depends(get_rag_service),
 ):
     """Endpoint to submit a query to the RAG system."""
+    filters = None
+    if request.filters is not None:
+        filters = build_metadata_filters(
+            file_names=request.filters.file_names,
+            page_from=request.filters.page_from,
+            page_to=request.filters.page_to,
+            tags=request.filters.tags,
+        )
 
-    result = await rag_service.query(prompt=request.prompt)
+    result = await rag_service.query(
+        prompt=request.prompt,
+        filters=filters,
+        tenant=request.tenant,
+        timeout_s=request.timeout_s,
+        is_disconnected=http_request.is_disconnected,
+    )
     return RAGQueryResponse(**result)
@@ -1,8 +1,11 @@
 """API request and response model definitions."""
 
-from typing import Any
+from typing import Any, Literal
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from app.services.sessions import SESSION_ID_PATTERN
+from app.services.tenants import TENANT_NAME_PATTERN
 
 
 class HealthCheckResponseStatus(BaseModel):
@@ -11,6 +14,36 @@ class HealthCheckResponseStatus(BaseModel):
     status: str = "OK"
 
 
+class RAGQueryFilters(BaseModel):
+    """Metadata filters restricting the documents searched by a query."""
+
+    file_names: list[str] | None = Field(
+        None,
+        min_length=1,
+        description="Only search the documents with these file names.",
+    )
+    page_from: int | None = Field(
+        None, ge=1, description="Only search from this page number (inclusive)."
+    )
+    page_to: int | None = Field(
+        None, ge=1, description="Only search up to this page number (inclusive)."
+    )
+    tags: dict[str, str | int | float | bool] | None = Field(
+        None, description="Only search documents with these ingestion tags."
+    )
+
+    @model_validator(mode="after")
+    def check_page_range(self) -> "RAGQueryFilters":
+        """Validates that the page range is not reversed."""
+        if (
+            self.page_from is not None
+            and self.page_to is not None
+            and self.page_from > self.page_to
+        ):
+            raise ValueError("page_from must be lower than or equal to page_to.")
+        return self
+
+
 class RAGQueryRequest(BaseModel):
     """Request model for querying the RAG system."""
 
@@ -19,11 +52,30 @@ class RAGQueryRequest(BaseModel):
         min_length=1,
         description="The question or prompt to send to the RAG system.",
     )
+    filters: RAGQueryFilters | None = Field(
+        None, description="Optional metadata filters to scope the search."
+    )
+    tenant: str | None = Field(
+        None,
+        pattern=TENANT_NAME_PATTERN,
+        description="Tenant whose documents are searched, the default collection if omitted.",
+    )
+    timeout_s: float | None = Field(
+        None,
+        gt=0,
+        description="Deadline of the query in seconds, the configured default if omitted.",
+    )
 
     model_config = ConfigDict(
         json_schema_extra={
             "example": {
                 "prompt": "Give me a list of the data sources used for pre-training the Llama models.",
+                "tenant": "acme",
+                "filters": {
+                    "file_names": ["llama-open-and-efficient-fundation-llms.pdf"],
+                    "page_from": 1,
+                    "page_to": 4,
+                },
             }
         }
     )
@@ -38,6 +90,18 @@ class RAGSourceNode(BaseModel):
     metadata: dict[str, Any] | None = None
 
 
+class RAGCompressionReport(BaseModel):
+    """Model reporting the effect of context compression on a query."""
+
+    original_tokens: int = Field(description="Context tokens before compression.")
+    compressed_tokens: int = Field(description="Context tokens after compression.")
+    tokens_saved: int = Field(description="Context tokens removed from the prompt.")
+    sentences_total: int = Field(description="Sentences scored against the query.")
+    sentences_kept: int = Field(description="Sentences kept in the context.")
+    latency_ms: float = Field(description="Time spent compressing the context.")
+    query_ms: float = Field(description="Total query time, compression included.")
+
+
 class RAGQueryResponse(BaseModel):
     """Response model for the RAG query endpoint."""
 
@@ -45,6 +109,13 @@ class RAGQueryResponse(BaseModel):
     sources: list[RAGSourceNode] = Field(
         description="List of source documents used for the answer"
     )
+    compression: RAGCompressionReport | None = Field(
+        None, description="Context compression report, when enabled."
+    )
+    partial: bool = Field(
+        False,
+        description="Whether the answer was cut short by the deadline or a disconnect.",
+    )
 
     model_config = ConfigDict(
         json_schema_extra={
@@ -60,6 +131,170 @@ class RAGQueryResponse(BaseModel):
     )
 
 
+class RAGChatRequest(BaseModel):
+    """Request model for a message of a chat session."""
+
+    message: str = Field(
+        ..., min_length=1, description="The question or message of the turn."
+    )
+    session_id: str | None = Field(
+        None,
+        pattern=SESSION_ID_PATTERN,
+        description="Session the message belongs to, a new one if omitted.",
+    )
+    filters: RAGQueryFilters | None = Field(
+        None, description="Optional metadata filters to scope the search."
+    )
+    tenant: str | None = Field(
+        None,
+        pattern=TENANT_NAME_PATTERN,
+        description="Tenant whose documents are searched, the default collection if omitted.",
+    )
+    timeout_s: float | None = Field(
+        None,
+        gt=0,
+        description="Deadline of the turn in seconds, the configured default if omitted.",
+    )
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "message": "Which data sources were used for pre-training?",
+                "session_id": "5f0c6a3e9b7d4c1e8a2f6b9d0e3c7a14",
+            }
+        }
+    )
+
+
+class RAGChatResponse(RAGQueryResponse):
+    """Response model for the chat endpoint."""
+
+    session_id: str = Field(description="Session of the conversation.")
+    turn: int = Field(description="Number of the turn in the session, from 1.")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "session_id": "5f0c6a3e9b7d4c1e8a2f6b9d0e3c7a14",
+                "turn": 2,
+                "answer": "CommonCrawl, C4, GitHub, Wikipedia, books and ArXiv.",
+                "sources": [],
+                "partial": False,
+            }
+        }
+    )
+
+
+class RAGChatTurn(BaseModel):
+    """Model representing a turn of a chat session."""
+
+    question: str
+    answer: str
+    partial: bool = False
+
+
+class RAGChatSessionResponse(BaseModel):
+    """Response model for the chat session endpoint."""
+
+    session_id: str = Field(description="Identifier of the session.")
+    tenant: str | None = Field(description="Tenant whose documents are searched.")
+    created_at: float = Field(description="Start time, as a UNIX timestamp.")
+    turns: list[RAGChatTurn] = Field(description="Turns of the conversation.")
+
+
+class RAGIngestRequest(BaseModel):
+    """Request model for (re)indexing the documents of a tenant."""
+
+    tenant: str | None = Field(
+        None,
+        pattern=TENANT_NAME_PATTERN,
+        description="Tenant whose documents are indexed, the default collection if omitted.",
+    )
+
+    model_config = ConfigDict(json_schema_extra={"example": {"tenant": "acme"}})
+
+
+class RAGIngestResponse(BaseModel):
+    """Response model for the ingestion endpoint."""
+
+    tenant: str | None = Field(description="Tenant whose documents were indexed.")
+    collection_name: str = Field(description="Collection holding the documents.")
+    vectors: int = Field(description="Number of vectors in the collection.")
+
+
+class RAGUploadJobResponse(BaseModel):
+    """Response model for the upload and indexing job endpoints."""
+
+    job_id: str = Field(description="Identifier of the indexing job.")
+    file_name: str = Field(description="Name of the uploaded document.")
+    tenant: str | None = Field(description="Tenant whose index receives the document.")
+    size_bytes: int = Field(description="Size of the uploaded document.")
+    status: Literal["pending", "running", "completed", "failed"] = Field(
+        description="Indexing status of the document."
+    )
+    created_at: float = Field(description="Upload time, as a UNIX timestamp.")
+    finished_at: float | None = Field(
+        None, description="Indexing end time, as a UNIX timestamp."
+    )
+    nodes: int = Field(0, description="Nodes appended to the index.")
+    error: str | None = Field(None, description="Indexing error, if it failed.")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "job_id": "5f0c6a3e9b7d4c1e8a2f6b9d0e3c7a14",
+                "file_name": "llama-open-and-efficient-fundation-llms.pdf",
+                "tenant": "acme",
+                "size_bytes": 1048576,
+                "status": "pending",
+                "created_at": 1767225600.0,
+            }
+        }
+    )
+
+
+class RAGProcessMemory(BaseModel):
+    """Model reporting the resident memory of the worker process."""
+
+    rss_bytes: int | None = Field(description="Resident memory, if known.")
+    peak_rss_bytes: int | None = Field(description="Peak resident memory, if known.")
+
+
+class RAGModelMemory(BaseModel):
+    """Model reporting the memory of a loaded model."""
+
+    component: str = Field(description="Component holding the model.")
+    model_name: str = Field(description="Name or path of the model.")
+    weight_bytes: int | None = Field(description="Bytes of its weights, if known.")
+
+
+class RAGVectorStoreMemory(BaseModel):
+    """Model reporting the size of the default collection."""
+
+    backend: str = Field(description="Vector store backend.")
+    vectors: int = Field(description="Vectors in the collection.")
+    index_bytes: int = Field(description="Estimated memory of its index.")
+
+
+class RAGCacheMemory(BaseModel):
+    """Model reporting the size of a cache."""
+
+    cache: str = Field(description="Name of the cache.")
+    entries: int = Field(description="Entries in the cache.")
+    memory_bytes: int = Field(description="Estimated memory of the entries.")
+
+
+class RAGMemoryResponse(BaseModel):
+    """Response model for the memory endpoint."""
+
+    process: RAGProcessMemory
+    models: list[RAGModelMemory]
+    vector_store: RAGVectorStoreMemory | None = Field(
+        description="Default collection, once indexed."
+    )
+    caches: list[RAGCacheMemory]
+
+
 class RAGErrorResponse(BaseModel):
     """Error response model for RAG operations"""
 
@@ -3,11 +3,47 @@
 from app.core.config.api import ApiConfig
 from app.core.config.configuration import Configuration
 from app.core.config.logging import LoggingConfig
-from app.core.config.rag import RagServiceConfig
+from app.core.config.rag import (
+    ChromaServerConfig,
+    ContextCompressionConfig,
+    DeadlinesConfig,
+    DeduplicationConfig,
+    IngestionConfig,
+    LlamaCppConfig,
+    MmapVectorStoreConfig,
+    RagServiceConfig,
+    RelevanceGateConfig,
+    ResourcesConfig,
+    RoutingConfig,
+    SessionsConfig,
+    ShardingConfig,
+    SpeculativeDecodingConfig,
+    SummariesConfig,
+    TenantsConfig,
+    UploadsConfig,
+    WarmupConfig,
+)
 
 __all__ = [
     "ApiConfig",
+    "ChromaServerConfig",
     "Configuration",
+    "ContextCompressionConfig",
+    "DeadlinesConfig",
+    "DeduplicationConfig",
+    "IngestionConfig",
+    "LlamaCppConfig",
     "LoggingConfig",
+    "MmapVectorStoreConfig",
     "RagServiceConfig",
+    "RelevanceGateConfig",
+    "ResourcesConfig",
+    "RoutingConfig",
+    "SessionsConfig",
+    "ShardingConfig",
+    "SpeculativeDecodingConfig",
+    "SummariesConfig",
+    "TenantsConfig",
+    "UploadsConfig",
+    "WarmupConfig",
 ]
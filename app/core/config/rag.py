@@ -1,24 +1,348 @@
 """API configuration class definition."""
 
 from pathlib import Path
+from typing import Literal
 
 from pydantic import BaseModel, Field
 
 
+class ContextCompressionConfig(BaseModel):
+    """Extractive context compression configuration model."""
+
+    enabled: bool = Field(
+        False,
+        description="Compress retrieved nodes to their most relevant sentences",
+    )
+    token_budget: int = Field(
+        512,
+        gt=0,
+        description="Maximum number of context tokens kept across all nodes",
+    )
+    min_sentence_length: int = Field(
+        20,
+        ge=0,
+        description="Sentences shorter than this (in characters) are discarded",
+    )
+
+
+class DeduplicationConfig(BaseModel):
+    """Near-duplicate chunk elimination configuration model."""
+
+    enabled: bool = Field(
+        False,
+        description="Drop near-duplicate chunks before embedding them",
+    )
+    threshold: float = Field(
+        0.85,
+        gt=0.0,
+        le=1.0,
+        description="Jaccard similarity above which two chunks are duplicates",
+    )
+    num_perm: int = Field(128, gt=0, description="Number of MinHash permutations")
+    shingle_size: int = Field(3, gt=0, description="Number of words per shingle")
+    max_signatures: int = Field(
+        100_000,
+        gt=0,
+        description="Signatures of kept chunks held in memory to confirm duplicates",
+    )
+
+
+class ChromaServerConfig(BaseModel):
+    """Chroma server connection configuration model."""
+
+    host: str = Field("localhost", description="Chroma server host")
+    port: int = Field(8001, gt=0, description="Chroma server HTTP port")
+    ssl: bool = Field(False, description="Connect to the server over HTTPS")
+    timeout_secs: float = Field(30.0, gt=0, description="HTTP request timeout")
+    retries: int = Field(
+        3, ge=0, description="Retries of requests failing to reach the server"
+    )
+    retry_backoff_secs: float = Field(
+        0.5, ge=0, description="Initial backoff between retries, doubled each time"
+    )
+    max_connections: int = Field(
+        16, gt=0, description="Maximum pooled connections per worker"
+    )
+    max_keepalive_connections: int = Field(
+        8, ge=0, description="Maximum idle connections kept alive per worker"
+    )
+    keepalive_secs: float = Field(
+        40.0, ge=0, description="Idle time before a pooled connection is closed"
+    )
+
+
+class MmapVectorStoreConfig(BaseModel):
+    """Memory-mapped vector store configuration model."""
+
+    dtype: Literal["float32", "float16", "int8"] = Field(
+        "float32",
+        description="Storage precision of the vectors ('int8' is scalar-quantized)",
+    )
+    search_mode: Literal["exact", "ivf"] = Field(
+        "exact",
+        description="Exhaustive search or inverted file (IVF) search",
+    )
+    nlist: int = Field(256, gt=0, description="Number of IVF lists")
+    nprobe: int = Field(8, gt=0, description="Number of IVF lists probed per query")
+
+
+class ShardingConfig(BaseModel):
+    """Vector store sharding configuration model."""
+
+    num_shards: int = Field(
+        1, gt=0, description="Collections the chunks are hash-partitioned into"
+    )
+    workers: int | None = Field(
+        None, gt=0, description="Workers querying the shards, one per shard if unset"
+    )
+
+
+class TenantsConfig(BaseModel):
+    """Multi-tenant index cache configuration model."""
+
+    max_open_indexes: int = Field(
+        8, gt=0, description="Maximum number of tenant indexes kept open"
+    )
+    max_memory_mb: float | None = Field(
+        None,
+        gt=0,
+        description="Estimated memory budget of the open tenant indexes",
+    )
+
+
+class RelevanceGateConfig(BaseModel):
+    """Relevance gate configuration model."""
+
+    enabled: bool = Field(False, description="Skip generation for irrelevant context")
+    min_score: float = Field(
+        0.4, ge=0, description="Retrieval score at least one node must reach"
+    )
+    answer: str = Field(
+        "The provided context does not contain enough information to answer "
+        "this question.",
+        description="Answer of the queries whose generation is skipped",
+    )
+
+
+class DeadlinesConfig(BaseModel):
+    """Query deadline configuration model."""
+
+    default_timeout_s: float | None = Field(
+        None, gt=0, description="Deadline of queries that set none, none if unset"
+    )
+    max_timeout_s: float = Field(
+        600.0, gt=0, description="Upper bound of the deadline a query can set"
+    )
+    disconnect_poll_interval_s: float = Field(
+        0.5, gt=0, description="Interval between client disconnection checks"
+    )
+
+
+class WarmupConfig(BaseModel):
+    """Startup warm-up configuration model."""
+
+    enabled: bool = Field(
+        True, description="Warm the models up before reporting readiness"
+    )
+    repeats: int = Field(
+        3, ge=2, description="Runs of each warm-up step, the first one is cold"
+    )
+    embedding_batch_sizes: list[int] = Field(
+        default_factory=lambda: [1, 16],
+        description="Batch sizes of the warm-up embedding calls",
+    )
+    prompt_lengths: list[int] = Field(
+        default_factory=lambda: [32, 256],
+        description="Approximate lengths, in words, of the warm-up prompts",
+    )
+    max_new_tokens: int = Field(
+        8, gt=0, description="Tokens generated by each warm-up generation"
+    )
+    torch_compile: bool = Field(
+        False, description="Compile the model forward passes with torch.compile"
+    )
+    torch_compile_mode: Literal["default", "reduce-overhead", "max-autotune"] = Field(
+        "default", description="torch.compile optimization mode"
+    )
+
+
+class UploadsConfig(BaseModel):
+    """Document upload configuration model."""
+
+    max_size_mb: float = Field(50.0, gt=0, description="Maximum size of a document")
+    max_jobs: int = Field(
+        1000, gt=0, description="Indexing jobs whose status is kept, newest first"
+    )
+
+
+class IngestionConfig(BaseModel):
+    """Document ingestion configuration model."""
+
+    batch_size: int = Field(
+        256, gt=0, description="Chunks embedded and written to the store at a time"
+    )
+
+
+class LlamaCppConfig(BaseModel):
+    """llama.cpp LLM backend configuration model."""
+
+    model_path: Path | None = Field(None, description="Path to the GGUF model file")
+    n_ctx: int | None = Field(
+        None, gt=0, description="Context size in tokens, 'context_window' if unset"
+    )
+    n_threads: int | None = Field(
+        None, gt=0, description="Decoding threads, the worker thread budget if unset"
+    )
+    n_threads_batch: int | None = Field(
+        None, gt=0, description="Prompt processing threads, 'n_threads' if unset"
+    )
+    n_batch: int = Field(512, gt=0, description="Prompt tokens processed per batch")
+    n_gpu_layers: int = Field(0, ge=-1, description="Layers offloaded to the GPU")
+
+
+class SpeculativeDecodingConfig(BaseModel):
+    """Assisted (speculative) decoding configuration model."""
+
+    draft_model_name: str | None = Field(
+        None,
+        description="Small model of the LLM family proposing tokens, disabled if unset",
+    )
+    num_assistant_tokens: int = Field(
+        5, gt=0, description="Tokens proposed by the draft model per step"
+    )
+    num_assistant_tokens_schedule: Literal["constant", "heuristic"] = Field(
+        "heuristic",
+        description="Adapt the proposed tokens to the acceptance ('heuristic')",
+    )
+
+
+class RoutingConfig(BaseModel):
+    """Small and large LLM query routing configuration model."""
+
+    enabled: bool = Field(False, description="Answer easy queries with a small LLM")
+    small_llm_model_name: str = Field(
+        "TinyLlama/TinyLlama-1.1B-Chat-v1.0",
+        description="Small LLM answering easy queries with the huggingface backend",
+    )
+    small_llama_cpp_model_path: Path | None = Field(
+        None, description="GGUF file of the small LLM for the llama_cpp backend"
+    )
+    max_query_words: int = Field(
+        24, gt=0, description="Longer queries are routed to the large LLM"
+    )
+    max_context_words: int = Field(
+        1200, gt=0, description="Longer retrieved contexts are routed to the large LLM"
+    )
+    hard_keywords: list[str] = Field(
+        default_factory=lambda: [
+            "compare",
+            "contrast",
+            "difference",
+            "explain",
+            "summarize",
+            "why",
+        ],
+        description="Queries with any of these words are routed to the large LLM",
+    )
+
+
+class SummariesConfig(BaseModel):
+    """Precomputed document summaries configuration model."""
+
+    enabled: bool = Field(
+        False, description="Summarize every document at ingestion for overviews"
+    )
+    section_words: int = Field(
+        1500, gt=0, description="Words of a document summarized by each generation"
+    )
+    rollup_fan_in: int = Field(
+        8, gt=1, description="Summaries combined by each roll-up generation"
+    )
+    overview_keywords: list[str] = Field(
+        default_factory=lambda: [
+            "main contributions",
+            "main points",
+            "overview",
+            "summarise",
+            "summarize",
+            "summary",
+            "tl;dr",
+        ],
+        description="Queries with any of these words are answered from summaries",
+    )
+
+
+class SessionsConfig(BaseModel):
+    """Chat session configuration model."""
+
+    max_sessions: int = Field(
+        256, gt=0, description="Sessions kept, least recently used evicted first"
+    )
+    ttl_s: float = Field(
+        1800.0, gt=0, description="Idle seconds after which a session expires"
+    )
+    max_memory_mb: float = Field(
+        1024.0, gt=0, description="Memory of the histories and KV caches of sessions"
+    )
+    max_turns: int = Field(
+        8, gt=0, description="Latest turns of a session kept in the prompt"
+    )
+    kv_cache: bool = Field(
+        True, description="Reuse the KV cache of the conversation, if the LLM allows"
+    )
+
+
+class ResourcesConfig(BaseModel):
+    """CPU thread budget configuration model."""
+
+    cpu_budget: int | None = Field(
+        None, gt=0, description="Cores shared by all the workers, all cores if unset"
+    )
+    workers: int | None = Field(
+        None,
+        gt=0,
+        description="Server worker processes, the WORKERS environment variable if unset",
+    )
+    intra_op_threads: int | None = Field(
+        None, gt=0, description="torch threads per operation, the worker share if unset"
+    )
+    inter_op_threads: int = Field(
+        1, gt=0, description="torch threads running independent operations"
+    )
+    tokenizers_parallelism: bool = Field(
+        False, description="Let the Hugging Face tokenizers use their own threads"
+    )
+    max_in_flight: int | None = Field(
+        None, gt=0, description="Queries processed at a time per worker, all if unset"
+    )
+
+
 class RagServiceConfig(BaseModel):
     """RAG Config configuration model."""
 
     pdf_directory: str = Field(
         "./data",
-        description="Directory for PDF files",
+        description="Directory for PDF files, with one subdirectory per tenant",
     )
     vector_store_path: Path = Field(
         Path("./vector_store"),
         description="Path for ChromaDB persistence",
     )
+    vector_store_backend: Literal["chroma", "mmap"] = Field(
+        "chroma",
+        description="Vector store backend ('chroma', 'mmap')",
+    )
+    chroma_mode: Literal["persistent", "http"] = Field(
+        "persistent",
+        description="Embedded persistent ChromaDB or a standalone Chroma server",
+    )
+    chroma_server: ChromaServerConfig = Field(
+        default_factory=ChromaServerConfig,
+        description="Chroma server connection options, used in 'http' mode.",
+    )
     collection_name: str = Field(
         "rag_documents",
-        description="ChromaDB collection name",
+        description="ChromaDB collection name, prefix of the tenant collections",
     )
     embed_model_name: str = Field(
         "sentence-transformers/all-MiniLM-L6-v2",
@@ -28,12 +352,36 @@ class RagServiceConfig(BaseModel):
         "NousResearch/Llama-2-7b-chat-hf",
         description="LLM model name",
     )
+    llm_backend: Literal["huggingface", "llama_cpp"] = Field(
+        "huggingface",
+        description="LLM backend ('huggingface', 'llama_cpp')",
+    )
+    llama_cpp: LlamaCppConfig = Field(
+        default_factory=LlamaCppConfig,
+        description="llama.cpp backend options, used with the 'llama_cpp' backend.",
+    )
+    model_artifacts_dir: Path | None = Field(
+        None,
+        description="Pre-baked model artifacts directory, loaded offline if set",
+    )
     temperature: float = Field(0.1, ge=0.0, le=1.0, description="LLM temperature")
     max_new_tokens: int = Field(512, gt=0, description="LLM max new tokens")
     context_window: int = Field(4096, gt=0, description="LLM context window size")
     device_map: str | None = Field(
         "auto", description="Device map for HugginfFace models ('auto', 'cpu', 'cuda')"
     )
+    llm_precision: Literal["default", "float32", "bfloat16", "int8"] = Field(
+        "default",
+        description="LLM weight precision ('int8' is dynamic quantization on CPU)",
+    )
+    speculative_decoding: SpeculativeDecodingConfig = Field(
+        default_factory=SpeculativeDecodingConfig,
+        description="Assisted decoding options of the 'huggingface' backend.",
+    )
+    document_tags: dict[str, dict[str, str | int | float | bool]] = Field(
+        default_factory=dict,
+        description="Custom metadata tags captured at ingestion, by file name",
+    )
     template_dir: Path = Field(
         Path("app/templates"),
         description="Directory for prompt templates.",
@@ -42,3 +390,59 @@ class RagServiceConfig(BaseModel):
         "qa_template.jinja2",
         description="Filename for the prompt template.",
     )
+    compression: ContextCompressionConfig = Field(
+        default_factory=ContextCompressionConfig,
+        description="Extractive context compression options.",
+    )
+    deduplication: DeduplicationConfig = Field(
+        default_factory=DeduplicationConfig,
+        description="Ingestion-time near-duplicate elimination options.",
+    )
+    mmap_store: MmapVectorStoreConfig = Field(
+        default_factory=MmapVectorStoreConfig,
+        description="Memory-mapped vector store options.",
+    )
+    tenants: TenantsConfig = Field(
+        default_factory=TenantsConfig,
+        description="Multi-tenant index cache options.",
+    )
+    warmup: WarmupConfig = Field(
+        default_factory=WarmupConfig,
+        description="Startup warm-up options.",
+    )
+    uploads: UploadsConfig = Field(
+        default_factory=UploadsConfig,
+        description="Document upload options.",
+    )
+    ingestion: IngestionConfig = Field(
+        default_factory=IngestionConfig,
+        description="Streaming document ingestion options.",
+    )
+    deadlines: DeadlinesConfig = Field(
+        default_factory=DeadlinesConfig,
+        description="Query deadline and cancellation options.",
+    )
+    relevance_gate: RelevanceGateConfig = Field(
+        default_factory=RelevanceGateConfig,
+        description="Options of the relevance check run before generation.",
+    )
+    sharding: ShardingConfig = Field(
+        default_factory=ShardingConfig,
+        description="Hash-partitioning of the collection into shards.",
+    )
+    routing: RoutingConfig = Field(
+        default_factory=RoutingConfig,
+        description="Routing of the queries between a small and a large LLM.",
+    )
+    summaries: SummariesConfig = Field(
+        default_factory=SummariesConfig,
+        description="Document summaries answering overview queries.",
+    )
+    resources: ResourcesConfig = Field(
+        default_factory=ResourcesConfig,
+        description="CPU threads and concurrency of each worker.",
+    )
+    sessions: SessionsConfig = Field(
+        default_factory=SessionsConfig,
+        description="Chat sessions keeping the history of conversations.",
+    )
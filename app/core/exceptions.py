@@ -21,13 +21,43 @@ class QueryExecutionError(RAGException):
     pass
 
 
+class QueryTimeoutError(RAGException):
+    """Raised when a query exceeds its deadline or its client goes away."""
+
+    pass
+
+
 class IndexingError(RAGException):
     """Raised when an error occurs during document indexing."""
 
     pass
 
 
+class TenantNotFoundError(RAGException):
+    """Raised when a tenant has no documents to search."""
+
+    pass
+
+
 class FileUploadError(RAGException):
     """Raise when an error occurs during file upload."""
 
     pass
+
+
+class FileTooLargeError(FileUploadError):
+    """Raised when an uploaded file exceeds the maximum size."""
+
+    pass
+
+
+class JobNotFoundError(RAGException):
+    """Raised when an indexing job does not exist or has expired."""
+
+    pass
+
+
+class SessionNotFoundError(RAGException):
+    """Raised when a chat session does not exist or has expired."""
+
+    pass
@@ -1,20 +1,181 @@
 """Main module entrypoint definition."""
 
+import argparse
+from collections.abc import Sequence
 from logging import getLogger
+from pathlib import Path
 
 from app.core.config.configuration import Configuration
+from app.core.config.rag import RagServiceConfig
 from app.utils.logging import configure_logging
 
 logger = getLogger(__name__)
 
 
-def main():
+def build_parser() -> argparse.ArgumentParser:
+    """Builds the command line parser."""
+    parser = argparse.ArgumentParser(prog="app", description="RAG FastAPI service.")
+    parser.add_argument(
+        "--config", default="config-local.yaml", help="Configuration YAML file."
+    )
+    commands = parser.add_subparsers(dest="command")
+
+    bake = commands.add_parser(
+        "bake-models",
+        help="Write the configured models as a self-contained artifact.",
+    )
+    bake.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Artifact directory, 'rag_service.model_artifacts_dir' by default.",
+    )
+    bake.add_argument(
+        "--dtype",
+        choices=["float32", "float16", "bfloat16"],
+        default=None,
+        help="Convert the weights to this precision, kept as published by default.",
+    )
+
+    export = commands.add_parser(
+        "export-snapshot",
+        help="Write a collection with its embeddings to a portable snapshot file.",
+    )
+    export.add_argument("--output", type=Path, required=True, help="Snapshot file.")
+    import_ = commands.add_parser(
+        "import-snapshot",
+        help="Load a snapshot file into an empty collection without re-embedding.",
+    )
+    import_.add_argument("--input", type=Path, required=True, help="Snapshot file.")
+    for snapshot_command in (export, import_):
+        snapshot_command.add_argument(
+            "--collection",
+            default=None,
+            help="Collection name, 'rag_service.collection_name' by default.",
+        )
+        snapshot_command.add_argument(
+            "--batch-size",
+            type=int,
+            default=4096,
+            help="Nodes read from or written to the vector store at a time.",
+        )
+
+    autotune = commands.add_parser(
+        "autotune",
+        help="Sweep thread counts and in-flight limits, writing the best to the config.",
+    )
+    autotune.add_argument(
+        "--threads",
+        type=int,
+        nargs="+",
+        default=None,
+        help="torch threads per worker to try, powers of two up to the cores by default.",
+    )
+    autotune.add_argument(
+        "--in-flight",
+        type=int,
+        nargs="+",
+        default=[1, 2, 4, 8],
+        help="Queries processed at a time per worker to try.",
+    )
+    autotune.add_argument(
+        "--requests",
+        type=int,
+        default=32,
+        help="Stub requests run by every worker per trial.",
+    )
+    autotune.add_argument(
+        "--dim", type=int, default=512, help="Hidden size of the stub model."
+    )
+    autotune.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Report the best settings without writing them to the config.",
+    )
+    return parser
+
+
+def run_autotune_command(
+    args: argparse.Namespace, config_file: Path, config: RagServiceConfig
+):
+    """Tunes the thread budget of the workers, writing it to the config file."""
+    from app.services.resources import (
+        autotune,
+        available_cpus,
+        best_trial,
+        default_thread_counts,
+        worker_count,
+        write_resources,
+    )
+
+    resources = config.resources
+    thread_counts = args.threads or default_thread_counts(
+        resources.cpu_budget or available_cpus(), worker_count(resources)
+    )
+    results = autotune(
+        resources, thread_counts, args.in_flight, requests=args.requests, dim=args.dim
+    )
+    best = best_trial(results)
+    logger.info(
+        f"Best settings: {best.intra_op_threads} threads, {best.max_in_flight} in "
+        f"flight ({best.throughput:.1f} requests/s, p50 {best.p50_ms:.1f} ms)."
+    )
+    if not args.dry_run:
+        write_resources(
+            config_file,
+            {
+                "intra_op_threads": best.intra_op_threads,
+                "max_in_flight": best.max_in_flight,
+            },
+        )
+        logger.info(f"Wrote the settings to {config_file}.")
+
+
+def run_snapshot_command(args: argparse.Namespace, config: RagServiceConfig):
+    """Exports or imports a snapshot of the configured collection."""
+    from app.services.rag_service import create_vector_store_component
+    from app.services.snapshots import export_snapshot, import_snapshot
+
+    if args.collection:
+        config = config.model_copy(update={"collection_name": args.collection})
+    component = create_vector_store_component(config)
+    component.load()
+    try:
+        if args.command == "export-snapshot":
+            export_snapshot(config, component, args.output, args.batch_size)
+        else:
+            import_snapshot(config, component, args.input, args.batch_size)
+    finally:
+        component.shutdown()
+
+
+def main(argv: Sequence[str] | None = None):
     """Main entrypoint."""
-    config = Configuration.from_yaml("config-local.yaml")
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    config = Configuration.from_yaml(args.config)
     configure_logging(logging_config=config.logging)
     logger.info(
         "Service name: %s. Version: %s",
         config.app_name,
         config.version,
     )
+
+    if args.command == "bake-models":
+        from app.services.artifacts import bake_model_artifacts
+
+        output = args.output or config.rag_service.model_artifacts_dir
+        if output is None:
+            parser.error("--output is required without 'model_artifacts_dir'.")
+        bake_model_artifacts(config.rag_service, output_dir=output, dtype=args.dtype)
+        return
+
+    if args.command == "autotune":
+        run_autotune_command(args, Path(args.config), config.rag_service)
+        return
+
+    if args.command in ("export-snapshot", "import-snapshot"):
+        run_snapshot_command(args, config.rag_service)
+        return
+
     logger.info(config)
@@ -1,7 +1,19 @@
 """RAG service package entrypoint."""
 
-from app.services.rag_service import RAGService
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from app.services.rag_service import RAGService
 
 __all__ = [
     "RAGService",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    # The service pulls in llama-index, imported once it is used.
+    if name == "RAGService":
+        from app.services.rag_service import RAGService
+
+        return RAGService
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,145 @@
+"""Pre-baked model artifact function definitions."""
+
+import json
+import time
+from logging import getLogger
+from pathlib import Path
+from typing import Any, Literal
+
+from app.core.config.rag import RagServiceConfig
+
+logger = getLogger(__name__)
+
+MANIFEST_FILE = "manifest.json"
+LLM_ARTIFACT = "llm"
+EMBEDDING_ARTIFACT = "embedding"
+DRAFT_ARTIFACT = "draft"
+SMALL_LLM_ARTIFACT = "small_llm"
+
+ArtifactDtype = Literal["float32", "float16", "bfloat16"]
+
+
+def bake_model_artifacts(
+    config: RagServiceConfig,
+    output_dir: Path,
+    dtype: ArtifactDtype | None = None,
+) -> dict[str, Any]:
+    """Resolves the configured models and writes them as a self-contained artifact.
+
+    The LLM, its tokenizer, the embedding model, the draft model and the small
+    routing LLM, if any, are saved in safetensors format, optionally converted
+    to another floating point precision. The manifest is written last, so an
+    interrupted bake is never loaded.
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+    from transformers import AutoModelForCausalLM, AutoTokenizer
+
+    torch_dtype = getattr(torch, dtype) if dtype else "auto"
+    output_dir.mkdir(parents=True, exist_ok=True)
+    (output_dir / MANIFEST_FILE).unlink(missing_ok=True)
+    start = time.perf_counter()
+
+    logger.info(f"Baking LLM model: {config.llm_model_name}")
+    llm_dir = output_dir / LLM_ARTIFACT
+    model = AutoModelForCausalLM.from_pretrained(
+        config.llm_model_name, torch_dtype=torch_dtype, low_cpu_mem_usage=True
+    )
+    model.save_pretrained(llm_dir, safe_serialization=True)
+    AutoTokenizer.from_pretrained(config.llm_model_name).save_pretrained(llm_dir)
+    del model
+
+    draft_model_name = config.speculative_decoding.draft_model_name
+    if draft_model_name:
+        logger.info(f"Baking draft model: {draft_model_name}")
+        model = AutoModelForCausalLM.from_pretrained(
+            draft_model_name, torch_dtype=torch_dtype, low_cpu_mem_usage=True
+        )
+        model.save_pretrained(output_dir / DRAFT_ARTIFACT, safe_serialization=True)
+        del model
+
+    small_llm_model_name = None
+    if config.routing.enabled and config.llm_backend == "huggingface":
+        small_llm_model_name = config.routing.small_llm_model_name
+        logger.info(f"Baking small LLM model: {small_llm_model_name}")
+        small_llm_dir = output_dir / SMALL_LLM_ARTIFACT
+        model = AutoModelForCausalLM.from_pretrained(
+            small_llm_model_name, torch_dtype=torch_dtype, low_cpu_mem_usage=True
+        )
+        model.save_pretrained(small_llm_dir, safe_serialization=True)
+        AutoTokenizer.from_pretrained(small_llm_model_name).save_pretrained(
+            small_llm_dir
+        )
+        del model
+
+    logger.info(f"Baking embedding model: {config.embed_model_name}")
+    embedding_dir = output_dir / EMBEDDING_ARTIFACT
+    embedding = SentenceTransformer(config.embed_model_name, device="cpu")
+    if dtype:
+        embedding = embedding.to(torch_dtype)
+    embedding.save(str(embedding_dir), safe_serialization=True)
+    del embedding
+
+    manifest = {
+        "llm_model_name": config.llm_model_name,
+        "embed_model_name": config.embed_model_name,
+        "draft_model_name": draft_model_name,
+        "small_llm_model_name": small_llm_model_name,
+        "dtype": dtype or "auto",
+        "files": {
+            str(path.relative_to(output_dir)): path.stat().st_size
+            for path in sorted(output_dir.rglob("*"))
+            if path.is_file()
+        },
+    }
+    (output_dir / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2))
+    logger.info(
+        f"Model artifacts written to {output_dir} in "
+        f"{time.perf_counter() - start:.1f} s "
+        f"({sum(manifest['files'].values()) / 1024**2:.1f} MB)."
+    )
+    return manifest
+
+
+def artifact_path(config: RagServiceConfig, artifact: str) -> Path:
+    """Returns the directory of a model in the configured artifacts.
+
+    Raises if the artifacts are missing, incomplete or were baked for other
+    models than the configured ones.
+    """
+    if config.model_artifacts_dir is None:
+        raise ValueError("No model artifacts directory is configured.")
+    manifest_path = config.model_artifacts_dir / MANIFEST_FILE
+    if not manifest_path.is_file():
+        raise FileNotFoundError(
+            f"Model artifacts not found at {config.model_artifacts_dir}. "
+            "Bake them first with: app bake-models"
+        )
+
+    manifest = json.loads(manifest_path.read_text())
+    baked = (manifest["llm_model_name"], manifest["embed_model_name"])
+    if baked != (config.llm_model_name, config.embed_model_name):
+        raise ValueError(
+            f"Model artifacts at {config.model_artifacts_dir} were baked for "
+            f"{baked}, not for the configured models."
+        )
+    optional_models = {
+        DRAFT_ARTIFACT: (
+            "draft_model_name",
+            "draft model",
+            config.speculative_decoding.draft_model_name,
+        ),
+        SMALL_LLM_ARTIFACT: (
+            "small_llm_model_name",
+            "small LLM model",
+            config.routing.small_llm_model_name,
+        ),
+    }
+    if artifact in optional_models:
+        key, description, model_name = optional_models[artifact]
+        if manifest.get(key) != model_name:
+            raise ValueError(
+                f"Model artifacts at {config.model_artifacts_dir} do not contain "
+                f"the {description} {model_name}. Bake them again."
+            )
+    return config.model_artifacts_dir / artifact
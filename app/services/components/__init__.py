@@ -1,11 +1,27 @@
 """Service components package entrypoint."""
 
+from app.services.components.base import (
+    LLMComponent,
+    PrefixCache,
+    PrefixCachingLLMComponent,
+    VectorStoreComponent,
+)
 from app.services.components.embedding import HuggingFaceEmbeddingComponent
+from app.services.components.llama_cpp import LlamaCppLLMComponent
 from app.services.components.llm import HuggingFaceLLMComponent
+from app.services.components.mmap_vector_store import MmapVectorStoreComponent
+from app.services.components.sharded_vector_store import ShardedVectorStoreComponent
 from app.services.components.vector_store import ChromaVectorStoreComponent
 
 __all__ = [
     "ChromaVectorStoreComponent",
     "HuggingFaceEmbeddingComponent",
     "HuggingFaceLLMComponent",
+    "LLMComponent",
+    "LlamaCppLLMComponent",
+    "MmapVectorStoreComponent",
+    "PrefixCache",
+    "PrefixCachingLLMComponent",
+    "ShardedVectorStoreComponent",
+    "VectorStoreComponent",
 ]
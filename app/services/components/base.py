@@ -0,0 +1,91 @@
+"""Service component interface definitions."""
+
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Any, Protocol, runtime_checkable
+
+from llama_index.core.llms import LLM
+from llama_index.core.schema import BaseNode
+from llama_index.core.vector_stores.types import BasePydanticVectorStore
+
+
+class LLMComponent(Protocol):
+    """Interface shared by the LLM components."""
+
+    def load(self) -> None:
+        """Loads the LLM model into memory."""
+        ...
+
+    def get_model(self) -> LLM:
+        """Returns the loaded LLM model."""
+        ...
+
+    def shutdown(self) -> None:
+        """Releases the model from memory."""
+        ...
+
+
+@dataclass
+class PrefixCache:
+    """KV cache of a token sequence, reusable by the prompts extending it."""
+
+    token_ids: list[int]
+    state: Any
+    memory_bytes: int
+    # Prompt tokens of the last completion read from and added to the cache.
+    reused_tokens: int = 0
+    prefilled_tokens: int = 0
+
+
+@runtime_checkable
+class PrefixCachingLLMComponent(LLMComponent, Protocol):
+    """Interface of the LLM components able to reuse a KV cache across prompts."""
+
+    def complete_with_cache(
+        self, prompt: str, cache: PrefixCache | None
+    ) -> tuple[str, PrefixCache]:
+        """Completes a prompt, formatted as the completions of the LLM are.
+
+        Only the tokens after the longest prefix shared with the cached sequence
+        are prefilled. Returns the completion and the cache of the whole
+        sequence, completion included.
+        """
+        ...
+
+
+def shared_prefix_length(first: list[int], second: list[int]) -> int:
+    """Returns the number of leading tokens two sequences have in common."""
+    length = 0
+    for a, b in zip(first, second, strict=False):
+        if a != b:
+            break
+        length += 1
+    return length
+
+
+class VectorStoreComponent(Protocol):
+    """Interface shared by the vector store components."""
+
+    def load(self) -> None:
+        """Opens the vector store."""
+        ...
+
+    def get_store(self) -> BasePydanticVectorStore:
+        """Returns the initialized vector store."""
+        ...
+
+    def count(self) -> int:
+        """Returns the number of vectors in the collection."""
+        ...
+
+    def iter_nodes(self, batch_size: int) -> Iterator[list[BaseNode]]:
+        """Yields the nodes of the collection with their embeddings, in batches."""
+        ...
+
+    def clear_collections(self) -> None:
+        """Deletes all the vectors of the collection."""
+        ...
+
+    def shutdown(self) -> None:
+        """Shuts down the vector store component."""
+        ...
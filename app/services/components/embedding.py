@@ -3,9 +3,9 @@
 from logging import getLogger
 
 from llama_index.core.embeddings import BaseEmbedding
-from llama_index.embeddings.huggingface import HuggingFaceEmbedding
 
 from app.core.config.rag import RagServiceConfig
+from app.services.artifacts import EMBEDDING_ARTIFACT, artifact_path
 
 logger = getLogger(__name__)
 
@@ -20,8 +20,31 @@ class HuggingFaceEmbeddingComponent:
 
     def load(self) -> None:
         """Loads the embedding model into memory."""
+        from llama_index.embeddings.huggingface import HuggingFaceEmbedding
+        from llama_index.embeddings.huggingface.utils import (
+            get_query_instruct_for_model_name,
+            get_text_instruct_for_model_name,
+        )
+
         logger.info(f"Loading embedding model: {self._config.embed_model_name}")
-        self._model = HuggingFaceEmbedding(model_name=self._config.embed_model_name)
+        if self._config.model_artifacts_dir is None:
+            self._model = HuggingFaceEmbedding(model_name=self._config.embed_model_name)
+        else:
+            # Safetensors weights are memory-mapped, never downloaded. Query and
+            # text instructions depend on the original model name.
+            model_path = str(artifact_path(self._config, EMBEDDING_ARTIFACT))
+            logger.info(f"Loading embedding model offline from artifact: {model_path}")
+            self._model = HuggingFaceEmbedding(
+                model_name=model_path,
+                query_instruction=get_query_instruct_for_model_name(
+                    self._config.embed_model_name
+                ),
+                text_instruction=get_text_instruct_for_model_name(
+                    self._config.embed_model_name
+                ),
+                local_files_only=True,
+                model_kwargs={"torch_dtype": "auto"},
+            )
         logger.info("Embedding model loaded sucessfully.")
 
     def get_model(self) -> BaseEmbedding:
@@ -0,0 +1,118 @@
+"""llama.cpp LLM class definition."""
+
+from logging import getLogger
+
+from llama_index.core.llms import LLM
+
+from app.core.config.rag import RagServiceConfig
+from app.services.components.base import PrefixCache, shared_prefix_length
+from app.services.deadlines import deadline_reached
+from app.services.resources import thread_budget
+
+logger = getLogger(__name__)
+
+
+class LlamaCppLLMComponent:
+    """Manages a quantized GGUF model decoded with llama.cpp."""
+
+    def __init__(self, config: RagServiceConfig):
+        """Initializes the component with configuration."""
+        self._config = config
+        self._model: LLM | None = None
+
+    def load(self) -> None:
+        """Loads the GGUF model, memory-mapping its weights."""
+        try:
+            from llama_cpp import StoppingCriteriaList
+            from llama_index.llms.llama_cpp import LlamaCPP
+        except ImportError as e:
+            raise ImportError(
+                "The 'llama_cpp' LLM backend requires the optional llama-cpp "
+                "dependencies. Install them with: uv sync --extra llama-cpp"
+            ) from e
+
+        llama_config = self._config.llama_cpp
+        if llama_config.model_path is None:
+            raise ValueError("The 'llama_cpp' LLM backend requires a model_path.")
+        logger.info(f"Loading GGUF model: {llama_config.model_path}")
+        model_kwargs = {
+            "n_batch": llama_config.n_batch,
+            "n_gpu_layers": llama_config.n_gpu_layers,
+            "use_mmap": True,
+            "n_threads": llama_config.n_threads
+            or thread_budget(self._config.resources).intra_op_threads,
+        }
+        if llama_config.n_threads_batch is not None:
+            model_kwargs["n_threads_batch"] = llama_config.n_threads_batch
+
+        self._model = LlamaCPP(
+            model_path=str(llama_config.model_path),
+            temperature=self._config.temperature,
+            max_new_tokens=self._config.max_new_tokens,
+            context_window=llama_config.n_ctx or self._config.context_window,
+            model_kwargs=model_kwargs,
+            # Stop decoding once the running request reaches its deadline.
+            generate_kwargs={
+                "stopping_criteria": StoppingCriteriaList(
+                    [lambda input_ids, logits: deadline_reached()]  # noqa: ARG005
+                )
+            },
+            verbose=False,
+        )
+        logger.info("GGUF model loaded successfully.")
+
+    def complete_with_cache(
+        self, prompt: str, cache: PrefixCache | None
+    ) -> tuple[str, PrefixCache]:
+        """Completes a prompt, reusing the KV cache of a previous completion.
+
+        The prompt is formatted and tokenized as ``complete`` does. The
+        llama.cpp state saved with the cache, its KV cache included, is restored
+        first, and llama.cpp only evaluates the tokens after the longest prefix
+        it shares with the prompt tokens.
+        """
+        llm = self.get_model()
+        llama = llm._model
+        token_ids = llama.tokenize(
+            llm.completion_to_prompt(prompt).encode(), add_bos=True, special=True
+        )
+        reused_tokens = 0
+        if cache is not None:
+            llama.load_state(cache.state)
+            # At least one prompt token is evaluated to generate.
+            reused_tokens = min(
+                shared_prefix_length(cache.token_ids, token_ids),
+                cache.state.n_tokens,
+                len(token_ids) - 1,
+            )
+        completion_ids: list[int] = []
+        for token in llama.generate(
+            token_ids,
+            temp=self._config.temperature,
+            stopping_criteria=llm.generate_kwargs.get("stopping_criteria"),
+        ):
+            if token == llama.token_eos():
+                break
+            completion_ids.append(token)
+            if len(completion_ids) >= self._config.max_new_tokens:
+                break
+        state = llama.save_state()
+        completion = llama.detokenize(completion_ids).decode(errors="ignore")
+        return completion, PrefixCache(
+            token_ids=token_ids + completion_ids,
+            state=state,
+            memory_bytes=state.llama_state_size,
+            reused_tokens=reused_tokens,
+            prefilled_tokens=len(token_ids) - reused_tokens,
+        )
+
+    def get_model(self) -> LLM:
+        """Returns the loaded LLM model."""
+        if not self._model:
+            raise ValueError("LLM model has not been loaded. Call load() first.")
+        return self._model
+
+    def shutdown(self) -> None:
+        """Releases the model from memory."""
+        logger.info("Shutting down llama.cpp LLM component.")
+        self._model = None
@@ -1,16 +1,97 @@
 """HuggingFace LLM class definition."""
 
+import functools
 from logging import getLogger
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from llama_index.core.llms import LLM
-from llama_index.llms.huggingface import HuggingFaceLLM
 
 from app.core.config.rag import RagServiceConfig
+from app.services.artifacts import DRAFT_ARTIFACT, LLM_ARTIFACT, artifact_path
+from app.services.components.base import PrefixCache, shared_prefix_length
+from app.services.deadlines import deadline_reached
+from app.services.memory import module_bytes
+from app.services.speculative import DecodingStats, SpeculativeDecodingMonitor
+
+if TYPE_CHECKING:
+    import torch
+    from llama_index.llms.huggingface import HuggingFaceLLM
 
 logger = getLogger(__name__)
 
 
+class DeadlineStoppingCriteria:
+    """Stops generation once the running request reaches its deadline.
+
+    The answer generated so far is kept, so the request gets a partial answer.
+    Follows the ``transformers.StoppingCriteria`` interface without subclassing
+    it, so that torch is only imported once a model is loaded.
+    """
+
+    def __call__(
+        self,
+        input_ids: "torch.LongTensor",
+        scores: "torch.FloatTensor",  # noqa: ARG002
+        **kwargs: Any,  # noqa: ARG002
+    ) -> "torch.BoolTensor":
+        import torch
+
+        return torch.full(
+            (input_ids.shape[0],),
+            deadline_reached(),
+            dtype=torch.bool,
+            device=input_ids.device,
+        )
+
+
+def _stop_at_deadline(generate: Any) -> Any:
+    """Wraps a ``generate`` method to stop it at the deadline of the request.
+
+    ``HuggingFaceLLM`` passes its own stopping criteria to every call, so the
+    deadline criteria are added to them rather than to the generate kwargs.
+    """
+
+    @functools.wraps(generate)
+    def generate_until_deadline(
+        *args: Any, stopping_criteria: Any = None, **kwargs: Any
+    ) -> Any:
+        from transformers import StoppingCriteriaList
+
+        stopping_criteria = StoppingCriteriaList(
+            [*(stopping_criteria or []), DeadlineStoppingCriteria()]
+        )
+        return generate(*args, stopping_criteria=stopping_criteria, **kwargs)
+
+    return generate_until_deadline
+
+
+def _format_completion(llm: "HuggingFaceLLM", prompt: str) -> str:
+    """Formats a prompt as ``HuggingFaceLLM.complete`` does."""
+    if llm.query_wrapper_prompt:
+        prompt = llm.query_wrapper_prompt.format(query_str=prompt)
+    if llm.completion_to_prompt:
+        return llm.completion_to_prompt(prompt)
+    if llm.system_prompt:
+        return f"{llm.system_prompt} {prompt}"
+    return prompt
+
+
+def _kv_cache_bytes(state: Any) -> int:
+    """Returns the memory held by the keys and values of a ``DynamicCache``."""
+    layers = getattr(state, "layers", None)
+    if layers is None:
+        # Before transformers 4.56, the cache holds one list per tensor kind.
+        tensors = [*state.key_cache, *state.value_cache]
+    else:
+        tensors = [
+            tensor
+            for layer in layers
+            for tensor in (layer.keys, layer.values)
+            if tensor is not None
+        ]
+    return sum(tensor.nbytes for tensor in tensors)
+
+
 class HuggingFaceLLMComponent:
     """Manages the HuggingFace Language Model."""
 
@@ -18,9 +99,13 @@ class HuggingFaceLLMComponent:
         """Initizalizes the component with configuration."""
         self._config = config
         self._model: LLM | None = None
+        self._draft_monitor: SpeculativeDecodingMonitor | None = None
 
     def load(self) -> None:
         """Loads the LLM model into memory."""
+        import torch
+        from llama_index.llms.huggingface import HuggingFaceLLM
+
         logger.info(f"Loading LLM model: {self._config.llm_model_name}")
         llm_kwargs: dict[str, Any] = {
             "model_name": self._config.llm_model_name,
@@ -33,10 +118,150 @@ class HuggingFaceLLMComponent:
             },
             "device_map": self._config.device_map,
         }
+        if self._config.model_artifacts_dir is not None:
+            # Safetensors weights are memory-mapped, never downloaded.
+            model_path = str(artifact_path(self._config, LLM_ARTIFACT))
+            logger.info(f"Loading LLM model offline from artifact: {model_path}")
+            llm_kwargs |= {
+                "model_name": model_path,
+                "tokenizer_name": model_path,
+                "model_kwargs": {"local_files_only": True, "torch_dtype": "auto"},
+                "tokenizer_kwargs": {"local_files_only": True},
+            }
+
+        precision = self._config.llm_precision
+        if precision != "default":
+            # Dynamic int8 quantization applies to float32 weights on CPU.
+            dtype = "bfloat16" if precision == "bfloat16" else "float32"
+            logger.info(f"Loading LLM model with {precision} precision.")
+            llm_kwargs["model_kwargs"] = llm_kwargs.get("model_kwargs", {}) | {
+                "torch_dtype": getattr(torch, dtype)
+            }
+            if precision == "int8":
+                llm_kwargs["device_map"] = "cpu"
 
         self._model = HuggingFaceLLM(**llm_kwargs)
+        model = self._model._model
+        model.generate = _stop_at_deadline(model.generate)
+        if precision == "int8":
+            self._quantize_int8(model)
+        if self._config.speculative_decoding.draft_model_name:
+            self._load_draft_model(self._model)
         logger.info("LLM model loaded sucessfully.")
 
+    def _load_draft_model(self, llm: "HuggingFaceLLM") -> None:
+        """Loads the draft model and enables assisted decoding.
+
+        The draft model proposes a few tokens per step and the main model
+        verifies them in a single forward pass, keeping the tokens it agrees
+        with. It must share the tokenizer of the main model.
+        """
+        from transformers import AutoModelForCausalLM
+
+        speculative_config = self._config.speculative_decoding
+        model_name = speculative_config.draft_model_name
+        model_kwargs: dict[str, Any] = {}
+        if self._config.model_artifacts_dir is not None:
+            model_name = str(artifact_path(self._config, DRAFT_ARTIFACT))
+            model_kwargs["local_files_only"] = True
+        logger.info(f"Loading draft model: {model_name}")
+
+        # The draft model runs with the precision and on the device of the LLM.
+        model = llm._model
+        draft_model = AutoModelForCausalLM.from_pretrained(
+            model_name, torch_dtype=model.dtype, **model_kwargs
+        ).to(model.device)
+        draft_model.eval()
+        if self._config.llm_precision == "int8":
+            self._quantize_int8(draft_model)
+
+        llm.generate_kwargs |= {
+            "assistant_model": draft_model,
+            "num_assistant_tokens": speculative_config.num_assistant_tokens,
+            "num_assistant_tokens_schedule": (
+                speculative_config.num_assistant_tokens_schedule
+            ),
+        }
+        self._draft_monitor = SpeculativeDecodingMonitor(model, draft_model)
+
+    @staticmethod
+    def _quantize_int8(module: "torch.nn.Module") -> None:
+        """Quantizes the linear layers of the model to int8, in place.
+
+        Weights are quantized ahead of time and activations on the fly, so the
+        matrix multiplications run on int8 CPU kernels with a 4x smaller
+        weight footprint.
+        """
+        import torch
+        from torch.ao.quantization import quantize_dynamic
+
+        size_before = module_bytes(module)
+        quantize_dynamic(module, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+        logger.info(
+            f"Quantized linear layers to int8: weights went from "
+            f"{size_before / 1024**2:.0f} MB to {module_bytes(module) / 1024**2:.0f} MB."
+        )
+
+    def complete_with_cache(
+        self, prompt: str, cache: PrefixCache | None
+    ) -> tuple[str, PrefixCache]:
+        """Completes a prompt, reusing the KV cache of a previous completion.
+
+        The prompt is formatted and tokenized as ``complete`` does. The cache is
+        cropped to the longest prefix it shares with the prompt tokens, so only
+        the tokens after it are prefilled. The cache is updated in place by the
+        generation and must be dropped if it fails. Assisted decoding is not
+        used for these completions.
+        """
+        import torch
+        from transformers import DynamicCache
+
+        llm = self.get_model()
+        tokenizer, model = llm._tokenizer, llm._model
+        token_ids = tokenizer(_format_completion(llm, prompt))["input_ids"]
+        state, reused_tokens = DynamicCache(), 0
+        if cache is not None:
+            # The last token of a completion is not in the cache yet, and at
+            # least one prompt token must be prefilled to generate.
+            cached_tokens = cache.state.get_seq_length()
+            reused_tokens = min(
+                shared_prefix_length(cache.token_ids, token_ids),
+                cached_tokens,
+                len(token_ids) - 1,
+            )
+            if reused_tokens > 0:
+                state = cache.state
+                if reused_tokens < cached_tokens:
+                    state.crop(reused_tokens - cached_tokens)
+        input_ids = torch.tensor([token_ids], device=model.device)
+        generate_kwargs = {
+            key: value
+            for key, value in llm.generate_kwargs.items()
+            if not key.startswith(("assistant_", "num_assistant_"))
+        }
+        output = model.generate(
+            input_ids=input_ids,
+            attention_mask=torch.ones_like(input_ids),
+            past_key_values=state,
+            max_new_tokens=llm.max_new_tokens,
+            return_dict_in_generate=True,
+            **generate_kwargs,
+        )
+        completion_ids = output.sequences[0, input_ids.shape[1] :].tolist()
+        state = output.past_key_values
+        return tokenizer.decode(completion_ids, skip_special_tokens=True), PrefixCache(
+            token_ids=token_ids + completion_ids,
+            state=state,
+            memory_bytes=_kv_cache_bytes(state),
+            reused_tokens=reused_tokens,
+            prefilled_tokens=len(token_ids) - reused_tokens,
+        )
+
+    @property
+    def decoding_stats(self) -> DecodingStats | None:
+        """Returns the assisted decoding statistics, if a draft model is used."""
+        return self._draft_monitor.stats if self._draft_monitor else None
+
     def get_model(self) -> LLM:
         """Returns the loaded LLM model."""
         if not self._model:
@@ -46,4 +271,13 @@ class HuggingFaceLLMComponent:
     def shutdown(self) -> None:
         """Releases the model from memory."""
         logger.info("Shutting down LLM model component.")
+        if self._draft_monitor is not None:
+            stats = self._draft_monitor.stats
+            logger.info(
+                f"Assisted decoding over {stats.generations} generations: "
+                f"{stats.tokens_per_second:.1f} tokens/s, "
+                f"{stats.acceptance_rate:.0%} of the draft tokens accepted."
+            )
+            self._draft_monitor.remove()
+            self._draft_monitor = None
         self._model = None
@@ -0,0 +1,479 @@
+"""Memory-mapped vector store class definition."""
+
+import fcntl
+import json
+from collections.abc import Iterator
+from contextlib import contextmanager
+from logging import getLogger
+from pathlib import Path
+from typing import Any, Literal
+
+import numpy as np
+from llama_index.core.bridge.pydantic import PrivateAttr
+from llama_index.core.schema import BaseNode
+from llama_index.core.vector_stores.types import (
+    BasePydanticVectorStore,
+    VectorStoreQuery,
+    VectorStoreQueryResult,
+)
+from llama_index.core.vector_stores.utils import (
+    build_metadata_filter_fn,
+    metadata_dict_to_node,
+    node_to_metadata_dict,
+)
+
+from app.core.config.rag import RagServiceConfig
+
+logger = getLogger(__name__)
+
+VectorDType = Literal["float32", "float16", "int8"]
+SearchMode = Literal["exact", "ivf"]
+
+_MANIFEST = "manifest.json"
+_VECTORS = "vectors.bin"
+_SCALES = "scales.bin"
+_RECORDS = "records.jsonl"
+_OFFSETS = "offsets.bin"
+_TOMBSTONES = "tombstones.bin"
+_CENTROIDS = "ivf_centroids.npy"
+_IVF_ROWS = "ivf_rows.npy"
+_IVF_OFFSETS = "ivf_offsets.npy"
+_LOCK = ".lock"
+
+# Minimum number of training points per IVF list, as recommended by FAISS.
+_MIN_POINTS_PER_LIST = 39
+
+
+def _spherical_kmeans(
+    data: np.ndarray, k: int, iterations: int = 10, seed: int = 42
+) -> np.ndarray:
+    """Clusters unit vectors by cosine similarity and returns the centroids."""
+    rng = np.random.default_rng(seed)
+    centroids = data[rng.choice(len(data), size=k, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = np.argmax(data @ centroids.T, axis=1)
+        for cluster in range(k):
+            members = data[assignments == cluster]
+            if len(members):
+                centroids[cluster] = members.sum(axis=0)
+        centroids /= np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)
+    return centroids
+
+
+class MmapVectorStore(BasePydanticVectorStore):
+    """Read-mostly vector store backed by memory-mapped NumPy files.
+
+    Vectors are L2-normalized and appended to a raw binary file, optionally
+    stored as float16 or int8 with a per-vector scale, and searched by cosine
+    similarity either exhaustively or through an inverted file (IVF) index.
+    Node text and metadata live in a JSON lines sidecar addressed by byte
+    offsets, so a query only decodes the records it returns.
+
+    Files are opened read-only through the page cache, which lets every worker
+    process on a host share a single physical copy of the embeddings. Writers
+    serialize through a file lock and readers pick up their changes when the
+    manifest is replaced.
+    """
+
+    stores_text: bool = True
+    flat_metadata: bool = False
+
+    path: str
+    dtype: VectorDType = "float32"
+    search_mode: SearchMode = "exact"
+    nlist: int = 256
+    nprobe: int = 8
+    block_size: int = 65536
+
+    _manifest: dict[str, Any] = PrivateAttr(default_factory=dict)
+    _manifest_stamp: tuple[int, int] = PrivateAttr(default=(-1, -1))
+    _vectors: np.ndarray | None = PrivateAttr(default=None)
+    _scales: np.ndarray | None = PrivateAttr(default=None)
+    _offsets: np.ndarray | None = PrivateAttr(default=None)
+    _tombstones: np.ndarray | None = PrivateAttr(default=None)
+    _records: np.ndarray | None = PrivateAttr(default=None)
+    _ivf: tuple[np.ndarray, np.ndarray, np.ndarray] | None = PrivateAttr(default=None)
+
+    def __init__(self, path: str | Path, **kwargs: Any) -> None:
+        super().__init__(path=str(path), **kwargs)
+        Path(self.path).mkdir(parents=True, exist_ok=True)
+        self._refresh()
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "MmapVectorStore"
+
+    @property
+    def client(self) -> Any:
+        """Returns the directory holding the store files."""
+        return self.path
+
+    def _file(self, name: str) -> Path:
+        return Path(self.path) / name
+
+    @contextmanager
+    def _lock(self) -> Iterator[None]:
+        """Serializes writers across processes."""
+        with self._file(_LOCK).open("a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _write_manifest(self, manifest: dict[str, Any]) -> None:
+        tmp_path = self._file(f"{_MANIFEST}.tmp")
+        tmp_path.write_text(json.dumps(manifest))
+        tmp_path.replace(self._file(_MANIFEST))
+
+    def _map(self, name: str, dtype: Any, shape: tuple[int, ...]) -> np.ndarray:
+        return np.memmap(self._file(name), dtype=dtype, mode="r", shape=shape)
+
+    def _refresh(self, force: bool = False) -> None:
+        """Re-maps the store files if another writer replaced the manifest."""
+        manifest_path = self._file(_MANIFEST)
+        if not manifest_path.exists():
+            self._write_manifest(
+                {"dim": 0, "dtype": self.dtype, "count": 0, "ivf_rows": 0}
+            )
+        # The manifest is replaced on every write, so a new inode or mtime
+        # means another process changed the store.
+        stat = manifest_path.stat()
+        stamp = (stat.st_ino, stat.st_mtime_ns)
+        if stamp == self._manifest_stamp and not force:
+            return
+
+        manifest = json.loads(manifest_path.read_text())
+        if manifest["dtype"] != self.dtype:
+            raise ValueError(
+                f"Store at {self.path} holds {manifest['dtype']} vectors, "
+                f"but {self.dtype} was requested."
+            )
+        self._manifest = manifest
+        self._manifest_stamp = stamp
+        count, dim = manifest["count"], manifest["dim"]
+        if count == 0:
+            self._vectors = self._scales = self._offsets = None
+            self._tombstones = self._records = self._ivf = None
+            return
+
+        self._vectors = self._map(_VECTORS, self.dtype, (count, dim))
+        self._scales = (
+            self._map(_SCALES, np.float32, (count,)) if self.dtype == "int8" else None
+        )
+        self._offsets = self._map(_OFFSETS, np.int64, (count + 1,))
+        self._tombstones = self._map(_TOMBSTONES, np.bool_, (count,))
+        self._records = np.memmap(self._file(_RECORDS), dtype=np.uint8, mode="r")
+        self._ivf = None
+        if manifest["ivf_rows"]:
+            self._ivf = (
+                np.load(self._file(_CENTROIDS), mmap_mode="r"),
+                np.load(self._file(_IVF_ROWS), mmap_mode="r"),
+                np.load(self._file(_IVF_OFFSETS)),
+            )
+
+    def count(self) -> int:
+        """Returns the number of live vectors in the store."""
+        self._refresh()
+        if self._tombstones is None:
+            return 0
+        return int(len(self._tombstones) - np.count_nonzero(self._tombstones))
+
+    def _encode(self, vectors: np.ndarray) -> tuple[np.ndarray, np.ndarray | None]:
+        if self.dtype == "int8":
+            scales = np.maximum(np.abs(vectors).max(axis=1), 1e-12) / 127.0
+            quantized = np.round(vectors / scales[:, None]).astype(np.int8)
+            return quantized, scales.astype(np.float32)
+        return vectors.astype(self.dtype), None
+
+    def _decode(self, start: int, end: int) -> np.ndarray:
+        assert self._vectors is not None
+        block = np.asarray(self._vectors[start:end], dtype=np.float32)
+        if self._scales is not None:
+            block *= self._scales[start:end, None]
+        return block
+
+    def _record(self, row: int) -> dict[str, Any]:
+        assert self._records is not None and self._offsets is not None
+        start, end = self._offsets[row], self._offsets[row + 1]
+        return json.loads(self._records[start:end].tobytes())
+
+    def add(self, nodes: list[BaseNode], **add_kwargs: Any) -> list[str]:  # noqa: ARG002
+        """Appends nodes with their embeddings to the store."""
+        if not nodes:
+            return []
+
+        vectors = np.asarray([node.get_embedding() for node in nodes], dtype=np.float32)
+        vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        encoded, scales = self._encode(vectors)
+        records = [
+            json.dumps(
+                {
+                    "id": node.node_id,
+                    "ref_doc_id": node.ref_doc_id,
+                    "metadata": node_to_metadata_dict(
+                        node, remove_text=False, flat_metadata=self.flat_metadata
+                    ),
+                },
+                ensure_ascii=False,
+            ).encode()
+            + b"\n"
+            for node in nodes
+        ]
+
+        with self._lock():
+            self._refresh(force=True)
+            manifest = dict(self._manifest)
+            if manifest["count"] and manifest["dim"] != vectors.shape[1]:
+                raise ValueError(
+                    f"Embedding dimension {vectors.shape[1]} does not match the "
+                    f"store dimension {manifest['dim']}."
+                )
+            # A writer that crashed after appending, but before replacing the
+            # manifest, leaves extra bytes behind. Appends start from the sizes
+            # the manifest implies, so those bytes are overwritten.
+            count, dim = manifest["count"], manifest["dim"]
+            itemsize = np.dtype(self.dtype).itemsize
+            records_size = int(self._offsets[-1]) if self._offsets is not None else 0
+            ends = records_size + np.cumsum([len(record) for record in records])
+            if count == 0:
+                offsets = np.concatenate([[records_size], ends]).astype(np.int64)
+            else:
+                offsets = ends.astype(np.int64)
+
+            self._append(_VECTORS, count * dim * itemsize, encoded.tobytes())
+            if scales is not None:
+                self._append(_SCALES, count * 4, scales.tobytes())
+            self._append(_RECORDS, records_size, b"".join(records))
+            self._append(_OFFSETS, (count + 1) * 8 if count else 0, offsets.tobytes())
+            self._append(
+                _TOMBSTONES, count, np.zeros(len(nodes), dtype=np.bool_).tobytes()
+            )
+
+            manifest["dim"] = int(vectors.shape[1])
+            manifest["count"] += len(nodes)
+            self._write_manifest(manifest)
+            self._refresh(force=True)
+            if self._needs_ivf_training():
+                self._train_ivf()
+
+        return [node.node_id for node in nodes]
+
+    def _append(self, name: str, size: int, data: bytes) -> None:
+        """Truncates a store file to its committed size and appends data to it."""
+        with self._file(name).open("ab") as f:
+            f.truncate(size)
+            f.write(data)
+
+    def _needs_ivf_training(self) -> bool:
+        if self.search_mode != "ivf":
+            return False
+        count, trained = self._manifest["count"], self._manifest["ivf_rows"]
+        return count - trained >= max(self.nlist * _MIN_POINTS_PER_LIST, trained)
+
+    def _train_ivf(self) -> None:
+        """Clusters all vectors and rebuilds the inverted lists."""
+        count = self._manifest["count"]
+        logger.info(f"Training IVF index with {self.nlist} lists on {count} vectors.")
+        rng = np.random.default_rng(42)
+        sample_size = min(count, self.nlist * 256)
+        sample_rows = np.sort(rng.choice(count, size=sample_size, replace=False))
+        assert self._vectors is not None
+        sample = np.asarray(self._vectors[sample_rows], dtype=np.float32)
+        if self._scales is not None:
+            sample *= self._scales[sample_rows, None]
+        centroids = _spherical_kmeans(sample, self.nlist)
+
+        assignments = np.empty(count, dtype=np.int32)
+        for start in range(0, count, self.block_size):
+            end = min(start + self.block_size, count)
+            assignments[start:end] = np.argmax(
+                self._decode(start, end) @ centroids.T, axis=1
+            )
+        rows = np.argsort(assignments, kind="stable").astype(np.int64)
+        list_offsets = np.concatenate(
+            [[0], np.cumsum(np.bincount(assignments, minlength=self.nlist))]
+        ).astype(np.int64)
+
+        np.save(self._file(_CENTROIDS), centroids.astype(np.float32))
+        np.save(self._file(_IVF_ROWS), rows)
+        np.save(self._file(_IVF_OFFSETS), list_offsets)
+        manifest = dict(self._manifest)
+        manifest["ivf_rows"] = count
+        self._write_manifest(manifest)
+        self._refresh(force=True)
+
+    def _candidate_rows(self, query_vector: np.ndarray) -> np.ndarray | None:
+        """Returns the rows to scan for an IVF query, or None to scan everything."""
+        if self.search_mode != "ivf" or self._ivf is None:
+            return None
+        centroids, rows, list_offsets = self._ivf
+        probes = np.argsort(-(centroids @ query_vector))[: self.nprobe]
+        trained = self._manifest["ivf_rows"]
+        candidates = [rows[list_offsets[p] : list_offsets[p + 1]] for p in probes]
+        candidates.append(np.arange(trained, self._manifest["count"]))
+        return np.sort(np.concatenate(candidates))
+
+    def _scores(self, query_vector: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Returns the candidate rows and their cosine similarity to the query."""
+        assert self._vectors is not None and self._tombstones is not None
+        candidates = self._candidate_rows(query_vector)
+        if candidates is None:
+            count = self._manifest["count"]
+            scores = np.empty(count, dtype=np.float32)
+            for start in range(0, count, self.block_size):
+                end = min(start + self.block_size, count)
+                scores[start:end] = self._decode(start, end) @ query_vector
+            rows = np.arange(count)
+        else:
+            rows = candidates
+            block = np.asarray(self._vectors[rows], dtype=np.float32)
+            if self._scales is not None:
+                block *= self._scales[rows, None]
+            scores = block @ query_vector
+        scores[np.asarray(self._tombstones[rows])] = -np.inf
+        return rows, scores
+
+    def query(self, query: VectorStoreQuery, **kwargs: Any) -> VectorStoreQueryResult:  # noqa: ARG002
+        """Returns the top k nodes most similar to the query embedding."""
+        if query.query_embedding is None:
+            raise ValueError("MmapVectorStore requires a query embedding.")
+        self._refresh()
+        if self._vectors is None:
+            return VectorStoreQueryResult(nodes=[], similarities=[], ids=[])
+
+        query_vector = np.asarray(query.query_embedding, dtype=np.float32)
+        query_vector /= max(float(np.linalg.norm(query_vector)), 1e-12)
+        rows, scores = self._scores(query_vector)
+        top_k = query.similarity_top_k
+
+        if query.filters is None:
+            k = min(top_k, len(scores))
+            top = np.argpartition(-scores, k - 1)[:k] if k else np.array([], int)
+            order = top[np.argsort(-scores[top])]
+            selected = [(int(rows[i]), float(scores[i])) for i in order]
+            records = {row: self._record(row) for row, _ in selected}
+        else:
+            # Walk the candidates best-first and only decode the records needed
+            # to fill the top k with rows that satisfy the filters.
+            records = {}
+            matches = build_metadata_filter_fn(
+                lambda row: records[int(row)]["metadata"], query.filters
+            )
+            selected = []
+            for i in np.argsort(-scores):
+                if len(selected) == top_k or scores[i] == -np.inf:
+                    break
+                row = int(rows[i])
+                records[row] = self._record(row)
+                if matches(str(row)):
+                    selected.append((row, float(scores[i])))
+
+        selected = [(row, score) for row, score in selected if score != -np.inf]
+        return VectorStoreQueryResult(
+            nodes=[
+                metadata_dict_to_node(records[row]["metadata"]) for row, _ in selected
+            ],
+            similarities=[score for _, score in selected],
+            ids=[records[row]["id"] for row, _ in selected],
+        )
+
+    def iter_nodes(self, batch_size: int) -> Iterator[list[BaseNode]]:
+        """Yields the live nodes with their decoded embeddings, in batches."""
+        self._refresh()
+        count = self._manifest["count"]
+        for start in range(0, count, batch_size):
+            end = min(start + batch_size, count)
+            assert self._tombstones is not None
+            vectors = self._decode(start, end)
+            nodes = []
+            for row in np.flatnonzero(~np.asarray(self._tombstones[start:end])):
+                node = metadata_dict_to_node(self._record(start + int(row))["metadata"])
+                node.embedding = vectors[row].tolist()
+                nodes.append(node)
+            if nodes:
+                yield nodes
+
+    def delete(self, ref_doc_id: str, **delete_kwargs: Any) -> None:  # noqa: ARG002
+        """Marks the nodes of a document as deleted."""
+        with self._lock():
+            self._refresh(force=True)
+            count = self._manifest["count"]
+            if not count:
+                return
+            rows = [
+                row
+                for row in range(count)
+                if self._record(row)["ref_doc_id"] == ref_doc_id
+            ]
+            if not rows:
+                return
+            tombstones = np.memmap(
+                self._file(_TOMBSTONES), dtype=np.bool_, mode="r+", shape=(count,)
+            )
+            tombstones[rows] = True
+            tombstones.flush()
+            del tombstones
+            manifest = dict(self._manifest)
+            manifest["deleted"] = manifest.get("deleted", 0) + len(rows)
+            self._write_manifest(manifest)
+            self._refresh(force=True)
+
+    def clear(self) -> None:
+        """Removes every vector and record from the store."""
+        with self._lock():
+            for file in Path(self.path).iterdir():
+                if file.name != _LOCK:
+                    file.unlink()
+            self._refresh(force=True)
+
+
+class MmapVectorStoreComponent:
+    """Manages the memory-mapped Vector Store."""
+
+    def __init__(self, config: RagServiceConfig):
+        """Initizalizes the component with configuration."""
+        self._config = config
+        self._store: MmapVectorStore | None = None
+
+    def load(self) -> None:
+        """Opens the memory-mapped vector store."""
+        store_path = self._config.vector_store_path / self._config.collection_name
+        mmap_config = self._config.mmap_store
+        logger.info(
+            f"Initializing memory-mapped vector store at path: {store_path} "
+            f"with dtype: {mmap_config.dtype} and search: {mmap_config.search_mode}"
+        )
+        self._store = MmapVectorStore(
+            path=store_path,
+            dtype=mmap_config.dtype,
+            search_mode=mmap_config.search_mode,
+            nlist=mmap_config.nlist,
+            nprobe=mmap_config.nprobe,
+        )
+        logger.info("Memory-mapped vector store initialized successfully.")
+
+    def get_store(self) -> MmapVectorStore:
+        """Returns the initialized vector store."""
+        if not self._store:
+            raise ValueError("Vector Store has not been loaded. Call load() first.")
+        return self._store
+
+    def count(self) -> int:
+        """Returns the number of vectors in the collection."""
+        return self.get_store().count()
+
+    def iter_nodes(self, batch_size: int) -> Iterator[list[BaseNode]]:
+        """Yields the nodes of the collection with their embeddings, in batches."""
+        return self.get_store().iter_nodes(batch_size)
+
+    def clear_collections(self) -> None:
+        """Deletes all the vectors of the collection."""
+        store = self.get_store()
+        logger.info(f"Clearing vector store collection: {self._config.collection_name}")
+        store.clear()
+
+    def shutdown(self) -> None:
+        """Shuts down the vector store component."""
+        logger.info("Shutting down vector store component.")
+        self._store = None
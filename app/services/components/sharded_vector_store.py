@@ -0,0 +1,318 @@
+"""Sharded vector store class definition."""
+
+import hashlib
+import heapq
+import multiprocessing
+import threading
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+from itertools import chain
+from logging import getLogger
+from typing import Any
+
+from llama_index.core.bridge.pydantic import PrivateAttr
+from llama_index.core.schema import BaseNode
+from llama_index.core.vector_stores.types import (
+    BasePydanticVectorStore,
+    VectorStoreQuery,
+    VectorStoreQueryResult,
+)
+
+from app.core.config.rag import RagServiceConfig, ShardingConfig
+from app.services.components.base import VectorStoreComponent
+
+logger = getLogger(__name__)
+
+ShardSearch = Callable[[VectorStoreQuery], list[VectorStoreQueryResult]]
+
+# Shard stores opened by a worker process, by location and collection name,
+# with the token of the collection they were opened for. The least recently
+# used are closed beyond the maximum, as tenants come and go.
+_worker_stores: OrderedDict[tuple[str, str], tuple[str, VectorStoreComponent]] = (
+    OrderedDict()
+)
+_MAX_WORKER_STORES = 64
+
+
+def shard_of(node_id: str, num_shards: int) -> int:
+    """Returns the shard of a node, stable across processes and restarts."""
+    digest = hashlib.blake2b(node_id.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % num_shards
+
+
+def shard_config(config: RagServiceConfig, shard: int) -> RagServiceConfig:
+    """Returns the configuration of the collection holding a shard."""
+    return config.model_copy(
+        update={
+            "collection_name": f"{config.collection_name}-shard-{shard}",
+            "sharding": ShardingConfig(),
+        }
+    )
+
+
+def merge_results(
+    results: Sequence[VectorStoreQueryResult], top_k: int
+) -> VectorStoreQueryResult:
+    """Merges the top k nodes of every shard into the global top k.
+
+    Every shard scores with the same metric of the same backend, so the
+    similarities are comparable as they are. Rescaling them per shard would rank
+    the best node of a shard without relevant nodes like the best node overall.
+    """
+    candidates = [
+        (similarity, node, node_id)
+        for result in results
+        for node, similarity, node_id in zip(
+            result.nodes or [], result.similarities or [], result.ids or [], strict=True
+        )
+    ]
+    top = heapq.nlargest(top_k, candidates, key=lambda candidate: candidate[0])
+    return VectorStoreQueryResult(
+        nodes=[node for _, node, _ in top],
+        similarities=[similarity for similarity, _, _ in top],
+        ids=[node_id for _, _, node_id in top],
+    )
+
+
+class ShardedVectorStore(BasePydanticVectorStore):
+    """Vector store hash-partitioning the nodes across several shard stores.
+
+    Nodes are written to the shard of their id. Queries are scattered to every
+    shard, each returning its own top k, and the results are gathered into the
+    global top k.
+    """
+
+    stores_text: bool = True
+    flat_metadata: bool = False
+
+    _shards: list[BasePydanticVectorStore] = PrivateAttr(default_factory=list)
+    _search: ShardSearch = PrivateAttr()
+
+    def __init__(
+        self, shards: list[BasePydanticVectorStore], search: ShardSearch, **kwargs: Any
+    ) -> None:
+        super().__init__(**kwargs)
+        self._shards = shards
+        self._search = search
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "ShardedVectorStore"
+
+    @property
+    def client(self) -> Any:
+        """Returns the clients of the shard stores."""
+        return [shard.client for shard in self._shards]
+
+    def add(self, nodes: list[BaseNode], **add_kwargs: Any) -> list[str]:
+        """Writes every node to the shard of its id."""
+        partitions: dict[int, list[BaseNode]] = {}
+        for node in nodes:
+            partitions.setdefault(shard_of(node.node_id, len(self._shards)), []).append(
+                node
+            )
+        for shard, shard_nodes in partitions.items():
+            self._shards[shard].add(shard_nodes, **add_kwargs)
+        return [node.node_id for node in nodes]
+
+    def delete(self, ref_doc_id: str, **delete_kwargs: Any) -> None:
+        """Deletes the nodes of a document from every shard."""
+        for shard in self._shards:
+            shard.delete(ref_doc_id, **delete_kwargs)
+
+    def query(self, query: VectorStoreQuery, **kwargs: Any) -> VectorStoreQueryResult:  # noqa: ARG002
+        """Returns the top k nodes of all the shards."""
+        return merge_results(self._search(query), query.similarity_top_k)
+
+
+def _start_worker() -> None:
+    """Returns once a worker process has started and imported this module."""
+
+
+def _query_shard(
+    component_cls: type[VectorStoreComponent],
+    config: RagServiceConfig,
+    token: str,
+    query: VectorStoreQuery,
+) -> VectorStoreQueryResult:
+    """Queries a shard from a worker process, opening it on first use.
+
+    The store is reopened when the collection was recreated since it was
+    opened, which changes its token.
+    """
+    if config.vector_store_backend != "mmap" and config.chroma_mode == "http":
+        location = f"{config.chroma_server.host}:{config.chroma_server.port}"
+    else:
+        location = str(config.vector_store_path)
+    key = (location, config.collection_name)
+    cached = _worker_stores.pop(key, None)
+    if cached is not None and cached[0] != token:
+        cached[1].shutdown()
+        cached = None
+    if cached is None:
+        component = component_cls(config)
+        component.load()
+        cached = (token, component)
+    _worker_stores[key] = cached
+    while len(_worker_stores) > _MAX_WORKER_STORES:
+        _, (_, evicted) = _worker_stores.popitem(last=False)
+        evicted.shutdown()
+    return cached[1].get_store().query(query)
+
+
+class WorkerPool:
+    """Process pool shared by the sharded stores of a process.
+
+    The pool is started by its first user, with processes spawned from scratch
+    so that they do not inherit the models and threads of the service, and shut
+    down when its last user releases it.
+    """
+
+    def __init__(self):
+        """Initializes the pool without processes."""
+        self._lock = threading.Lock()
+        self._executor: ProcessPoolExecutor | None = None
+        self._users = 0
+
+    def acquire(self, workers: int) -> ProcessPoolExecutor:
+        """Returns the pool, starting its worker processes if needed."""
+        with self._lock:
+            if self._executor is None:
+                logger.info(f"Starting {workers} shard worker processes.")
+                self._executor = ProcessPoolExecutor(
+                    max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+                )
+                # Processes start on demand, start them before the first query.
+                wait_futures(
+                    [self._executor.submit(_start_worker) for _ in range(workers)]
+                )
+            self._users += 1
+            return self._executor
+
+    def release(self) -> None:
+        """Releases the pool, shutting it down without users left."""
+        with self._lock:
+            self._users -= 1
+            if self._users == 0 and self._executor is not None:
+                logger.info("Shutting down shard worker processes.")
+                self._executor.shutdown(cancel_futures=True)
+                self._executor = None
+
+
+_worker_pool = WorkerPool()
+
+
+class ShardedVectorStoreComponent:
+    """Manages a vector store sharded across several collections."""
+
+    def __init__(
+        self,
+        config: RagServiceConfig,
+        shard_component_cls: type[VectorStoreComponent],
+    ):
+        """Initizalizes the component with configuration."""
+        self._config = config
+        self._shard_component_cls = shard_component_cls
+        self._shard_configs = [
+            shard_config(config, shard) for shard in range(config.sharding.num_shards)
+        ]
+        self._shards: list[VectorStoreComponent] = []
+        self._executor: Executor | None = None
+        self._store: ShardedVectorStore | None = None
+        self._token = uuid.uuid4().hex
+
+    @property
+    def _uses_processes(self) -> bool:
+        """Whether the shards can be queried from other processes.
+
+        An embedded Chroma collection keeps its index in the memory of the
+        process writing to it, so other processes would search stale data.
+        """
+        return (
+            self._config.vector_store_backend == "mmap"
+            or self._config.chroma_mode == "http"
+        )
+
+    def load(self) -> None:
+        """Opens every shard and starts the workers querying them."""
+        num_shards = len(self._shard_configs)
+        workers = self._config.sharding.workers or num_shards
+        logger.info(
+            f"Initializing {num_shards} shards of collection: "
+            f"{self._config.collection_name}"
+        )
+        self._shards = [self._shard_component_cls(c) for c in self._shard_configs]
+        for shard in self._shards:
+            shard.load()
+        if self._uses_processes:
+            self._executor = _worker_pool.acquire(workers)
+        else:
+            self._executor = ThreadPoolExecutor(workers, thread_name_prefix="shard")
+        self._store = self._build_store()
+        logger.info("Sharded vector store initialized successfully.")
+
+    def _build_store(self) -> ShardedVectorStore:
+        return ShardedVectorStore(
+            shards=[shard.get_store() for shard in self._shards], search=self._search
+        )
+
+    def _search(self, query: VectorStoreQuery) -> list[VectorStoreQueryResult]:
+        """Queries every shard in parallel."""
+        if self._executor is None:
+            raise ValueError("Vector Store has not been loaded. Call load() first.")
+        if self._uses_processes:
+            futures = [
+                self._executor.submit(
+                    _query_shard, self._shard_component_cls, config, self._token, query
+                )
+                for config in self._shard_configs
+            ]
+        else:
+            futures = [
+                self._executor.submit(shard.get_store().query, query)
+                for shard in self._shards
+            ]
+        return [future.result() for future in futures]
+
+    def get_store(self) -> ShardedVectorStore:
+        """Returns the initialized vector store."""
+        if not self._store:
+            raise ValueError("Vector Store has not been loaded. Call load() first.")
+        return self._store
+
+    def count(self) -> int:
+        """Returns the number of vectors in all the shards."""
+        self.get_store()
+        return sum(shard.count() for shard in self._shards)
+
+    def iter_nodes(self, batch_size: int) -> Iterator[list[BaseNode]]:
+        """Yields the nodes of every shard with their embeddings, in batches."""
+        self.get_store()
+        return chain.from_iterable(
+            shard.iter_nodes(batch_size) for shard in self._shards
+        )
+
+    def clear_collections(self) -> None:
+        """Deletes all the vectors of every shard."""
+        self.get_store()
+        for shard in self._shards:
+            shard.clear_collections()
+        # Shards may be recreated, the workers reopen them on their next query.
+        self._token = uuid.uuid4().hex
+        self._store = self._build_store()
+
+    def shutdown(self) -> None:
+        """Shuts down the shards and releases the workers."""
+        logger.info("Shutting down sharded vector store component.")
+        if self._executor is not None:
+            if self._uses_processes:
+                _worker_pool.release()
+            else:
+                self._executor.shutdown(cancel_futures=True)
+        for shard in self._shards:
+            shard.shutdown()
+        self._executor = self._store = None
+        self._shards = []
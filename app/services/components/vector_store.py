@@ -1,17 +1,59 @@
 """ChromaDB class definition."""
 
+import time
+from collections.abc import Iterator
 from logging import getLogger
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
-from llama_index.vector_stores.chroma import ChromaVectorStore
+import httpx
+import numpy as np
+from llama_index.core.schema import BaseNode
+from llama_index.core.vector_stores.utils import metadata_dict_to_node
 
-import chromadb
 from app.core.config.rag import RagServiceConfig
-from chromadb.api import ClientAPI
-from chromadb.config import Settings
+
+if TYPE_CHECKING:
+    from chromadb.api import ClientAPI
+    from chromadb.config import Settings
+    from llama_index.vector_stores.chroma import ChromaVectorStore
 
 logger = getLogger(__name__)
 
+# Errors raised before the request was sent, safe to retry.
+_TRANSIENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout)
+
+# A connection dropped by the server may have been closed after the request was
+# processed, so protocol errors are only retried for idempotent methods.
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+class RetryingTransport(httpx.HTTPTransport):
+    """HTTP transport retrying requests that failed to reach the server."""
+
+    def __init__(self, retries: int, backoff_secs: float, **kwargs: Any):
+        super().__init__(**kwargs)
+        self._retries = retries
+        self._backoff_secs = backoff_secs
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        retried_errors = (
+            (*_TRANSIENT_ERRORS, httpx.RemoteProtocolError)
+            if request.method in _IDEMPOTENT_METHODS
+            else _TRANSIENT_ERRORS
+        )
+        for attempt in range(self._retries):
+            try:
+                return super().handle_request(request)
+            except retried_errors as e:
+                delay = self._backoff_secs * 2**attempt
+                logger.warning(
+                    f"Chroma request {request.method} {request.url.path} failed "
+                    f"({e!r}), retrying in {delay:.1f}s."
+                )
+                time.sleep(delay)
+        return super().handle_request(request)
+
 
 class ChromaVectorStoreComponent:
     """Manages the ChromaDB Vector Store."""
@@ -24,15 +66,26 @@ class ChromaVectorStoreComponent:
 
     def load(self) -> None:
         """Loads the ChromaDB client and gets the vector store."""
+        import chromadb
+        from llama_index.vector_stores.chroma import ChromaVectorStore
+
+        location = (
+            f"server: {self._config.chroma_server.host}:{self._config.chroma_server.port}"
+            if self._config.chroma_mode == "http"
+            else f"path: {self._config.vector_store_path}"
+        )
         logger.info(
-            f"Initializing ChromaDB at path: {self._config.vector_store_path} "
+            f"Initializing ChromaDB at {location} "
             f"with collection: {self._config.collection_name}"
         )
-        Path.mkdir(self._config.vector_store_path, exist_ok=True, parents=True)
-        self._client = chromadb.PersistentClient(
-            path=str(self._config.vector_store_path),
-            settings=Settings(anonymized_telemetry=False),
-        )
+        if self._config.chroma_mode == "http":
+            self._client = self._connect_http()
+        else:
+            Path.mkdir(self._config.vector_store_path, exist_ok=True, parents=True)
+            self._client = chromadb.PersistentClient(
+                path=str(self._config.vector_store_path),
+                settings=self._persistent_settings(),
+            )
         chroma_collection = self._client.get_or_create_collection(
             self._config.collection_name,
             metadata={
@@ -43,14 +96,115 @@ class ChromaVectorStoreComponent:
         self._store = ChromaVectorStore(chroma_collection=chroma_collection)
         logger.info("ChromaDB vector store initialized successfully.")
 
-    def get_store(self) -> ChromaVectorStore:
+    def _persistent_settings(self) -> "Settings":
+        """Returns the embedded client settings.
+
+        With a tenant memory budget, Chroma unloads the least recently used
+        collection segments itself to stay within it.
+        """
+        from chromadb.config import Settings
+
+        max_memory_mb = self._config.tenants.max_memory_mb
+        if max_memory_mb is None:
+            return Settings(anonymized_telemetry=False)
+        return Settings(
+            anonymized_telemetry=False,
+            chroma_segment_cache_policy="LRU",
+            chroma_memory_limit_bytes=int(max_memory_mb * 1024**2),
+        )
+
+    def _connect_http(self) -> "ClientAPI":
+        """Connects to a standalone Chroma server through a pooled HTTP client.
+
+        All the requests of the worker share one ``httpx`` connection pool,
+        bounded by the configured limits. Requests time out and are retried with
+        exponential backoff when they cannot reach the server.
+        """
+        import chromadb
+        from chromadb.config import Settings
+
+        server = self._config.chroma_server
+        settings = Settings(
+            anonymized_telemetry=False,
+            chroma_http_max_connections=server.max_connections,
+            chroma_http_max_keepalive_connections=server.max_keepalive_connections,
+            chroma_http_keepalive_secs=server.keepalive_secs,
+        )
+        for attempt in range(server.retries + 1):
+            try:
+                client = chromadb.HttpClient(
+                    host=server.host,
+                    port=server.port,
+                    ssl=server.ssl,
+                    settings=settings,
+                )
+                break
+            except ValueError:
+                if attempt == server.retries:
+                    raise
+                delay = server.retry_backoff_secs * 2**attempt
+                logger.warning(
+                    f"Chroma server not reachable, retrying in {delay:.1f}s."
+                )
+                time.sleep(delay)
+
+        # The HTTP client creates its session without timeouts nor retries,
+        # replace it with one sharing the same pool limits, TLS verification,
+        # authentication and headers. A custom transport ignores the TLS
+        # settings of the client, so they are passed to the transport. These
+        # attributes are private, chromadb is pinned to the minor release they
+        # were checked against.
+        http_api = client._server  # type: ignore[attr-defined]
+        session = http_api._session
+        ssl_verify = http_api._settings.chroma_server_ssl_verify
+        http_api._session = httpx.Client(
+            timeout=server.timeout_secs,
+            headers=session.headers,
+            cookies=session.cookies,
+            auth=session.auth,
+            transport=RetryingTransport(
+                retries=server.retries,
+                backoff_secs=server.retry_backoff_secs,
+                limits=http_api.http_limits,
+                verify=True if ssl_verify is None else ssl_verify,
+            ),
+        )
+        session.close()
+        return client
+
+    def get_store(self) -> "ChromaVectorStore":
         """Returns the initialized vector store."""
         if not self._store:
             raise ValueError("Vector Store has not been loaded. Call load() first.")
         return self._store
 
+    def count(self) -> int:
+        """Returns the number of vectors in the collection."""
+        return self.get_store().client.count()
+
+    def iter_nodes(self, batch_size: int) -> Iterator[list[BaseNode]]:
+        """Yields the nodes of the collection with their embeddings, in batches."""
+        collection = self.get_store().client
+        for offset in range(0, collection.count(), batch_size):
+            batch = collection.get(
+                include=["embeddings", "documents", "metadatas"],
+                limit=batch_size,
+                offset=offset,
+            )
+            embeddings = np.asarray(batch["embeddings"], dtype=np.float32)
+            nodes = []
+            for embedding, text, metadata in zip(
+                embeddings, batch["documents"], batch["metadatas"], strict=True
+            ):
+                node = metadata_dict_to_node(metadata, text=text)
+                node.embedding = embedding.tolist()
+                nodes.append(node)
+            yield nodes
+
     def clear_collections(self) -> None:
         """Deletes and recreates the collection, clearing all data."""
+        from llama_index.vector_stores.chroma import ChromaVectorStore
+
         if not self._client:
             raise ValueError("ChromaDB client is not initialized.")
 
@@ -0,0 +1,162 @@
+"""Extractive context compression class definition."""
+
+import re
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from logging import getLogger
+from typing import Any
+
+import numpy as np
+from llama_index.core.bridge.pydantic import Field, PrivateAttr
+from llama_index.core.embeddings import BaseEmbedding
+from llama_index.core.postprocessor.types import BaseNodePostprocessor
+from llama_index.core.schema import NodeWithScore, QueryBundle, TextNode
+from llama_index.core.utils import get_tokenizer
+
+logger = getLogger(__name__)
+
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+|\n{2,}")
+
+
+def split_sentences(text: str, min_length: int = 0) -> list[str]:
+    """Splits a text into sentences, dropping the ones shorter than min_length."""
+    sentences = (s.strip() for s in _SENTENCE_BOUNDARY.split(text))
+    return [s for s in sentences if s and len(s) >= min_length]
+
+
+@dataclass
+class CompressionReport:
+    """Token and latency figures of a single compression run."""
+
+    original_tokens: int = 0
+    compressed_tokens: int = 0
+    sentences_total: int = 0
+    sentences_kept: int = 0
+    latency_ms: float = 0.0
+
+    @property
+    def tokens_saved(self) -> int:
+        """Number of context tokens removed from the prompt."""
+        return self.original_tokens - self.compressed_tokens
+
+    def as_dict(self) -> dict[str, Any]:
+        """Returns the report as a serializable dictionary."""
+        return {
+            "original_tokens": self.original_tokens,
+            "compressed_tokens": self.compressed_tokens,
+            "tokens_saved": self.tokens_saved,
+            "sentences_total": self.sentences_total,
+            "sentences_kept": self.sentences_kept,
+            "latency_ms": round(self.latency_ms, 2),
+        }
+
+
+class SentenceCompressor(BaseNodePostprocessor):
+    """Keeps only the sentences of the retrieved nodes most similar to the query.
+
+    All sentences are embedded in a single batch with the service embedding model
+    and ranked by cosine similarity against the query embedding. Sentences are
+    kept greedily by score until the token budget is exhausted, and each node is
+    rebuilt with its surviving sentences in their original order.
+    """
+
+    embed_model: BaseEmbedding = Field(description="Model used to embed sentences.")
+    token_budget: int = Field(description="Maximum number of tokens kept.")
+    min_sentence_length: int = Field(
+        default=0, description="Minimum sentence length in characters."
+    )
+    tokenizer: Callable[[str], list] = Field(
+        default_factory=get_tokenizer,
+        description="Tokenizer used to measure the token budget.",
+        exclude=True,
+    )
+    _report: CompressionReport | None = PrivateAttr(default=None)
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "SentenceCompressor"
+
+    @property
+    def report(self) -> CompressionReport | None:
+        """Returns the report of the last compression run."""
+        return self._report
+
+    def _postprocess_nodes(
+        self,
+        nodes: list[NodeWithScore],
+        query_bundle: QueryBundle | None = None,
+    ) -> list[NodeWithScore]:
+        """Compresses the text of the retrieved nodes."""
+        if query_bundle is None or not nodes:
+            return nodes
+
+        start = time.perf_counter()
+        sentences: list[tuple[int, str]] = [
+            (node_idx, sentence)
+            for node_idx, node in enumerate(nodes)
+            if isinstance(node.node, TextNode)
+            for sentence in split_sentences(
+                node.node.get_content(), self.min_sentence_length
+            )
+        ]
+        original_tokens = sum(
+            len(self.tokenizer(node.node.get_content())) for node in nodes
+        )
+        if not sentences:
+            return nodes
+
+        query_embedding = (
+            query_bundle.embedding
+            or self.embed_model.get_query_embedding(query_bundle.query_str)
+        )
+        sentence_embeddings = np.asarray(
+            self.embed_model.get_text_embedding_batch([s for _, s in sentences]),
+            dtype=np.float32,
+        )
+        query_vector = np.asarray(query_embedding, dtype=np.float32)
+        norms = np.linalg.norm(sentence_embeddings, axis=1) * np.linalg.norm(
+            query_vector
+        )
+        scores = sentence_embeddings @ query_vector / np.maximum(norms, 1e-12)
+
+        token_counts = [len(self.tokenizer(sentence)) for _, sentence in sentences]
+        kept: set[int] = set()
+        used_tokens = 0
+        for idx in np.argsort(-scores):
+            if used_tokens + token_counts[idx] > self.token_budget:
+                continue
+            kept.add(int(idx))
+            used_tokens += token_counts[idx]
+
+        compressed: list[NodeWithScore] = []
+        for node_idx, node in enumerate(nodes):
+            if not isinstance(node.node, TextNode):
+                compressed.append(node)
+                continue
+            node_sentences = [
+                sentence
+                for idx, (owner, sentence) in enumerate(sentences)
+                if owner == node_idx and idx in kept
+            ]
+            if not node_sentences:
+                continue
+            new_node = node.node.model_copy()
+            new_node.set_content(" ".join(node_sentences))
+            compressed.append(NodeWithScore(node=new_node, score=node.score))
+
+        self._report = CompressionReport(
+            original_tokens=original_tokens,
+            compressed_tokens=used_tokens,
+            sentences_total=len(sentences),
+            sentences_kept=len(kept),
+            latency_ms=(time.perf_counter() - start) * 1000,
+        )
+        logger.debug(
+            "Compressed %d node(s) into %d: %d/%d sentences kept.",
+            len(nodes),
+            len(compressed),
+            len(kept),
+            len(sentences),
+        )
+        return compressed
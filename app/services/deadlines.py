@@ -0,0 +1,105 @@
+"""Request deadline and cancellation definitions."""
+
+import asyncio
+import threading
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from logging import getLogger
+
+from app.core.exceptions import QueryTimeoutError
+
+logger = getLogger(__name__)
+
+_current_deadline: ContextVar["Deadline | None"] = ContextVar(
+    "current_deadline", default=None
+)
+
+
+class Deadline:
+    """Time limit of a request, which can also be cancelled before it passes.
+
+    The deadline is checked from the worker thread running the request, so
+    cancelling it from the event loop stops the work at its next check.
+    """
+
+    def __init__(self, timeout_s: float | None):
+        """Starts the deadline, which never passes without a timeout."""
+        self.timeout_s = timeout_s
+        self._expires_at = None if timeout_s is None else time.monotonic() + timeout_s
+        self._cancelled = threading.Event()
+        # Set once a generation loop stops at the deadline, so answers that
+        # completed right before it are not reported as partial.
+        self.stopped_generation = False
+
+    def cancel(self) -> None:
+        """Cancels the request, as if the deadline had passed."""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the request was cancelled."""
+        return self._cancelled.is_set()
+
+    @property
+    def expired(self) -> bool:
+        """Whether the deadline passed."""
+        return self._expires_at is not None and time.monotonic() >= self._expires_at
+
+    @property
+    def reached(self) -> bool:
+        """Whether the request should stop, because it expired or was cancelled."""
+        return self.cancelled or self.expired
+
+    def remaining(self) -> float | None:
+        """Returns the seconds left before the deadline, None without a timeout."""
+        if self._expires_at is None:
+            return None
+        return max(self._expires_at - time.monotonic(), 0.0)
+
+    def check(self, stage: str) -> None:
+        """Raises if the request should stop, naming the stage it was in."""
+        if self.cancelled:
+            raise QueryTimeoutError(f"The query was cancelled during {stage}.")
+        if self.expired:
+            raise QueryTimeoutError(
+                f"The query exceeded its {self.timeout_s:g} s deadline during {stage}."
+            )
+
+
+@contextmanager
+def deadline_scope(deadline: Deadline) -> Iterator[Deadline]:
+    """Makes a deadline the one of the running request, within its context."""
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+def deadline_reached() -> bool:
+    """Whether the running request should stop, False outside of a request.
+
+    Generation loops poll it after every token and stop once it returns True,
+    which marks the answer of the request as partial.
+    """
+    deadline = _current_deadline.get()
+    if deadline is None or not deadline.reached:
+        return False
+    deadline.stopped_generation = True
+    return True
+
+
+async def cancel_on_disconnect(
+    is_disconnected: Callable[[], Awaitable[bool]],
+    deadline: Deadline,
+    interval_s: float,
+) -> None:
+    """Cancels a deadline as soon as the client of the request goes away."""
+    while not deadline.reached:
+        if await is_disconnected():
+            logger.info("Client disconnected, cancelling its query.")
+            deadline.cancel()
+            return
+        await asyncio.sleep(interval_s)
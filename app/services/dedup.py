@@ -0,0 +1,194 @@
+"""Near-duplicate chunk filter class definition."""
+
+import hashlib
+import re
+from collections import Counter, OrderedDict, defaultdict
+from collections.abc import Sequence
+from dataclasses import dataclass
+from logging import getLogger
+from typing import Any
+
+import numpy as np
+from llama_index.core.bridge.pydantic import Field, PrivateAttr
+from llama_index.core.schema import BaseNode, TransformComponent
+
+logger = getLogger(__name__)
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = (1 << 32) - 1
+_TOKEN = re.compile(r"\w+")
+
+
+def _stable_hash(value: str) -> int:
+    """Returns a 32-bit hash that is stable across processes."""
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=4).digest())
+
+
+def _band_hash(band: np.ndarray) -> int:
+    """Returns a 64-bit hash of the rows of a signature band."""
+    return int.from_bytes(hashlib.blake2b(band.tobytes(), digest_size=8).digest())
+
+
+def lsh_bands(num_perm: int, threshold: float) -> tuple[int, int]:
+    """Returns the (bands, rows) split of num_perm closest to the Jaccard threshold.
+
+    A pair of signatures becomes a candidate when all rows of at least one band
+    match, which happens with probability 1 - (1 - s^r)^b for similarity s. The
+    S-curve of that probability is centered around (1 / b) ^ (1 / r).
+    """
+    candidates = [
+        (b, num_perm // b) for b in range(1, num_perm + 1) if num_perm % b == 0
+    ]
+    return min(candidates, key=lambda br: abs((1 / br[0]) ** (1 / br[1]) - threshold))
+
+
+@dataclass
+class DeduplicationStats:
+    """Counters of a single deduplication run."""
+
+    input_nodes: int = 0
+    dropped_nodes: int = 0
+    dropped_text_bytes: int = 0
+
+    @property
+    def kept_nodes(self) -> int:
+        """Number of nodes that survived deduplication."""
+        return self.input_nodes - self.dropped_nodes
+
+    @property
+    def dropped_ratio(self) -> float:
+        """Fraction of the input nodes dropped as near duplicates."""
+        return self.dropped_nodes / self.input_nodes if self.input_nodes else 0.0
+
+    def estimated_bytes_saved(self, embedding_dim: int) -> int:
+        """Estimates the index storage saved: node text plus float32 vectors."""
+        return self.dropped_text_bytes + self.dropped_nodes * embedding_dim * 4
+
+
+class NearDuplicateFilter(TransformComponent):
+    """Drops nodes whose text is a near duplicate of an earlier node.
+
+    Every node text is reduced to a MinHash signature over word shingles and
+    candidate duplicates are found with locality sensitive hashing, so the cost
+    is linear in the number of nodes. Candidates are confirmed by comparing the
+    estimated Jaccard similarity of their signatures against the threshold, and
+    the first occurrence of every duplicate group is kept.
+
+    In incremental mode the LSH buckets and the counters carry over between
+    calls, so a stream of node batches is deduplicated as a whole. Buckets only
+    hold a hash per band of every kept node, and the signatures of the latest
+    kept nodes are bounded. Candidates whose signature was evicted are
+    confirmed by the share of bands they match instead, an estimate of their
+    similarity.
+    """
+
+    threshold: float = Field(
+        default=0.85, description="Jaccard similarity above which nodes collapse."
+    )
+    num_perm: int = Field(default=128, description="Number of MinHash permutations.")
+    shingle_size: int = Field(default=3, description="Number of words per shingle.")
+    seed: int = Field(default=42, description="Seed of the MinHash permutations.")
+    incremental: bool = Field(
+        default=False, description="Remember the kept nodes across calls."
+    )
+    max_signatures: int = Field(
+        default=100_000, description="Signatures of kept nodes held in memory."
+    )
+    _stats: DeduplicationStats = PrivateAttr(default_factory=DeduplicationStats)
+    _buckets: list[dict[int, list[int]]] | None = PrivateAttr(default=None)
+    _signatures: OrderedDict[int, np.ndarray] = PrivateAttr(default_factory=OrderedDict)
+    _kept_count: int = PrivateAttr(default=0)
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "NearDuplicateFilter"
+
+    @property
+    def stats(self) -> DeduplicationStats:
+        """Returns the counters of the last run, or of all runs if incremental."""
+        return self._stats
+
+    def _permutations(self) -> tuple[np.ndarray, np.ndarray]:
+        rng = np.random.default_rng(self.seed)
+        a = rng.integers(1, _MAX_HASH, size=self.num_perm, dtype=np.uint64)
+        b = rng.integers(0, _MAX_HASH, size=self.num_perm, dtype=np.uint64)
+        return a, b
+
+    def _shingles(self, text: str) -> set[str]:
+        tokens = _TOKEN.findall(text.lower())
+        if len(tokens) <= self.shingle_size:
+            return {" ".join(tokens)}
+        return {
+            " ".join(tokens[i : i + self.shingle_size])
+            for i in range(len(tokens) - self.shingle_size + 1)
+        }
+
+    def signature(self, text: str) -> np.ndarray:
+        """Computes the MinHash signature of a text."""
+        a, b = self._permutations()
+        return self._signature(text, a, b)
+
+    def _signature(self, text: str, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        hashes = np.fromiter(
+            (_stable_hash(shingle) for shingle in self._shingles(text)),
+            dtype=np.uint64,
+        )
+        permuted = (np.outer(hashes, a) % _MERSENNE_PRIME + b) % _MERSENNE_PRIME
+        return permuted.min(axis=0)
+
+    def __call__(self, nodes: Sequence[BaseNode], **kwargs: Any) -> list[BaseNode]:  # noqa: ARG002
+        """Returns the nodes without their near duplicates."""
+        a, b = self._permutations()
+        bands, rows = lsh_bands(self.num_perm, self.threshold)
+        if not self.incremental or self._buckets is None:
+            self._buckets = [defaultdict(list) for _ in range(bands)]
+            self._signatures = OrderedDict()
+            self._kept_count = 0
+            self._stats = DeduplicationStats()
+        buckets, signatures = self._buckets, self._signatures
+        kept: list[BaseNode] = []
+        stats = self._stats
+        stats.input_nodes += len(nodes)
+
+        for node in nodes:
+            text = node.get_content()
+            signature = self._signature(text, a, b)
+            keys = [
+                _band_hash(signature[band * rows : (band + 1) * rows])
+                for band in range(bands)
+            ]
+            band_matches = Counter(
+                kept_id
+                for band, key in enumerate(keys)
+                for kept_id in buckets[band].get(key, [])
+            )
+            if any(
+                (
+                    np.mean(signatures[kept_id] == signature)
+                    if kept_id in signatures
+                    else (matches / bands) ** (1 / rows)
+                )
+                >= self.threshold
+                for kept_id, matches in band_matches.items()
+            ):
+                stats.dropped_nodes += 1
+                stats.dropped_text_bytes += len(text.encode())
+                continue
+
+            kept_id = self._kept_count
+            self._kept_count += 1
+            for band, key in enumerate(keys):
+                buckets[band][key].append(kept_id)
+            signatures[kept_id] = signature
+            if len(signatures) > self.max_signatures:
+                signatures.popitem(last=False)
+            kept.append(node)
+
+        if not self.incremental:
+            self._buckets, self._signatures = None, OrderedDict()
+        logger.debug(
+            "Near-duplicate filter dropped %d of %d node(s).",
+            stats.dropped_nodes,
+            stats.input_nodes,
+        )
+        return kept
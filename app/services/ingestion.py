@@ -0,0 +1,118 @@
+"""Streaming document ingestion function definitions."""
+
+import importlib.util
+import time
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass
+from logging import getLogger
+from pathlib import Path
+
+from llama_index.core import SimpleDirectoryReader, VectorStoreIndex
+from llama_index.core.ingestion import run_transformations
+from llama_index.core.readers.file.base import default_file_metadata_func
+from llama_index.core.schema import BaseNode, Document, TransformComponent
+
+from app.services.metadata import MetadataValue, annotate_documents
+
+logger = getLogger(__name__)
+
+# File metadata kept out of the embedded and LLM texts, as SimpleDirectoryReader does.
+_EXCLUDED_FILE_METADATA = (
+    "file_name",
+    "file_type",
+    "file_size",
+    "creation_date",
+    "last_modified_date",
+    "last_accessed_date",
+)
+
+
+@dataclass
+class IngestionStats:
+    """Counters of a streaming ingestion run."""
+
+    documents: int = 0
+    nodes: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+
+
+def list_documents(input_dir: str) -> list[Path]:
+    """Returns the document files of a directory, without reading them."""
+    return [Path(path) for path in SimpleDirectoryReader(input_dir).input_files]
+
+
+def _iter_pdf_pages(path: Path) -> Iterator[Document]:
+    """Yields the pages of a PDF file, parsed one at a time."""
+    import pypdf
+
+    file_metadata = default_file_metadata_func(str(path))
+    with path.open("rb") as f:
+        reader = pypdf.PdfReader(f)
+        labels = reader.page_labels
+        for number, page in enumerate(reader.pages):
+            document = Document(
+                text=page.extract_text(),
+                metadata={"page_label": labels[number], "file_name": path.name}
+                | file_metadata,
+            )
+            # The reader caches every object it parses, content streams included.
+            reader.resolved_objects.clear()
+            document.excluded_embed_metadata_keys.extend(_EXCLUDED_FILE_METADATA)
+            document.excluded_llm_metadata_keys.extend(_EXCLUDED_FILE_METADATA)
+            yield document
+
+
+def iter_documents(input_files: Iterable[Path]) -> Iterator[Document]:
+    """Yields the documents of the input files, one PDF page at a time.
+
+    PDF files are parsed page by page, other files one file at a time. The
+    documents have the text and metadata SimpleDirectoryReader gives them.
+    """
+    read_pdf_pages = importlib.util.find_spec("pypdf") is not None
+    for path in input_files:
+        if read_pdf_pages and path.suffix.lower() == ".pdf":
+            yield from _iter_pdf_pages(path)
+        else:
+            for documents in SimpleDirectoryReader(input_files=[path]).iter_data():
+                yield from documents
+
+
+def _insert_batch(
+    index: VectorStoreIndex, nodes: list[BaseNode], stats: IngestionStats
+) -> None:
+    """Embeds a batch of nodes and writes it to the vector store of the index."""
+    index.insert_nodes(nodes)
+    stats.nodes += len(nodes)
+    stats.batches += 1
+    logger.debug(f"Indexed batch {stats.batches} ({stats.nodes} nodes so far).")
+
+
+def insert_documents(
+    index: VectorStoreIndex,
+    documents: Iterable[Document],
+    transformations: Sequence[TransformComponent],
+    batch_size: int,
+    document_tags: Mapping[str, Mapping[str, MetadataValue]] | None = None,
+) -> IngestionStats:
+    """Chunks, embeds and writes a stream of documents to an index in batches.
+
+    Documents are consumed one at a time. Every ``batch_size`` nodes are
+    embedded and written to the vector store before more documents are read,
+    so memory is bounded by the batch size rather than by the corpus size.
+    """
+    stats = IngestionStats()
+    pages: dict[str, int] = {}
+    pending: list[BaseNode] = []
+    start = time.perf_counter()
+    for document in documents:
+        annotate_documents([document], document_tags, pages=pages)
+        pending.extend(run_transformations([document], transformations))
+        stats.documents += 1
+        while len(pending) >= batch_size:
+            _insert_batch(index, pending[:batch_size], stats)
+            del pending[:batch_size]
+    if pending:
+        _insert_batch(index, pending, stats)
+    stats.seconds = time.perf_counter() - start
+    return stats
@@ -0,0 +1,135 @@
+"""Memory accounting function definitions."""
+
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from app.services.tenants import estimate_index_bytes
+
+# Neighbours of a vector on the base layer of a Chroma HNSW graph are twice its
+# M parameter, 16 by default, stored as 4-byte ids.
+HNSW_M = 16
+
+
+@dataclass
+class ProcessMemory:
+    """Resident memory of the process, now and at its peak, if known."""
+
+    rss_bytes: int | None
+    peak_rss_bytes: int | None
+
+
+def _status_kb(value: str | None) -> int | None:
+    """Parses a '<n> kB' field of /proc/self/status as bytes."""
+    if value is None:
+        return None
+    return int(value.split()[0]) * 1024
+
+
+def process_memory() -> ProcessMemory:
+    """Returns the resident memory of this process.
+
+    Read from /proc on Linux. Elsewhere only the peak is known, from
+    getrusage, which reports it in kilobytes on Linux and bytes on macOS.
+    """
+    status = Path("/proc/self/status")
+    if status.is_file():
+        fields = dict(
+            line.split(":", 1)
+            for line in status.read_text().splitlines()
+            if ":" in line
+        )
+        return ProcessMemory(
+            rss_bytes=_status_kb(fields.get("VmRSS")),
+            peak_rss_bytes=_status_kb(fields.get("VmHWM")),
+        )
+    try:
+        import resource
+    except ImportError:
+        return ProcessMemory(rss_bytes=None, peak_rss_bytes=None)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return ProcessMemory(
+        rss_bytes=None, peak_rss_bytes=peak if sys.platform == "darwin" else peak * 1024
+    )
+
+
+def module_bytes(module: Any) -> int:
+    """Returns the bytes of the tensors in the state dict of a torch module.
+
+    The state dict holds the weights packed by dynamic quantization, as tuples
+    of tensors, next to the parameters and persistent buffers. Tied weights
+    are counted once.
+    """
+    tensors = {}
+    pending = list(module.state_dict(keep_vars=True).values())
+    while pending:
+        value = pending.pop()
+        if isinstance(value, tuple | list):
+            pending.extend(value)
+        elif hasattr(value, "element_size"):
+            tensors[id(value)] = value
+    return sum(tensor.numel() * tensor.element_size() for tensor in tensors.values())
+
+
+def model_weight_bytes(model: Any) -> int | None:
+    """Returns the bytes of the weights of a loaded LLM or embedding model.
+
+    HuggingFace models count their torch parameters. llama.cpp models count
+    their GGUF file, which is memory-mapped. Returns None for other models.
+    """
+    # Not imported here: a model can only be a torch module once torch is loaded.
+    torch = sys.modules.get("torch")
+    inner = getattr(model, "_model", None)
+    if torch is not None and isinstance(inner, torch.nn.Module):
+        return module_bytes(inner)
+    model_path = getattr(model, "model_path", None)
+    if isinstance(model_path, str) and Path(model_path).is_file():
+        return Path(model_path).stat().st_size
+    return None
+
+
+def estimate_hnsw_bytes(num_vectors: int, embedding_dim: int, m: int = HNSW_M) -> int:
+    """Estimates the memory held by an HNSW index: its vectors and base links."""
+    return estimate_index_bytes(num_vectors, embedding_dim) + num_vectors * 2 * m * 4
+
+
+@dataclass
+class ModelMemory:
+    """Memory of the weights of a loaded model."""
+
+    component: str
+    model_name: str
+    weight_bytes: int | None
+
+
+@dataclass
+class VectorStoreMemory:
+    """Size of the default collection and the estimated memory of its index."""
+
+    backend: str
+    vectors: int
+    index_bytes: int
+
+
+@dataclass
+class CacheMemory:
+    """Entries of a cache and their estimated memory."""
+
+    cache: str
+    entries: int
+    memory_bytes: int
+
+
+@dataclass
+class MemoryReport:
+    """Memory used by the process and by each component of the service."""
+
+    process: ProcessMemory
+    models: list[ModelMemory]
+    vector_store: VectorStoreMemory | None
+    caches: list[CacheMemory]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Returns the report as a serializable dictionary."""
+        return asdict(self)
@@ -0,0 +1,90 @@
+"""Document metadata capture and query filter definitions."""
+
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+
+from llama_index.core.schema import Document
+from llama_index.core.vector_stores.types import (
+    FilterCondition,
+    FilterOperator,
+    MetadataFilter,
+    MetadataFilters,
+)
+
+MetadataValue = str | int | float | bool
+
+FILE_NAME_KEY = "file_name"
+PAGE_NUMBER_KEY = "page_number"
+
+
+def annotate_documents(
+    documents: Sequence[Document],
+    document_tags: Mapping[str, Mapping[str, MetadataValue]] | None = None,
+    pages: dict[str, int] | None = None,
+) -> None:
+    """Adds filterable metadata to the documents of a reader.
+
+    Each document receives a 1-based numeric ``page_number``, counted per source
+    file in reading order, since PDF page labels are strings that cannot be
+    compared as ranges. The custom tags configured for its file name are merged
+    into the metadata as well. None of the added keys is embedded or shown to the
+    LLM, so they do not alter the indexed content.
+
+    Pass the same ``pages`` counters to annotate consecutive batches of a
+    document stream, so pages keep being counted across batches.
+    """
+    pages = {} if pages is None else pages
+    for document in documents:
+        source = document.metadata.get(
+            "file_path", document.metadata.get(FILE_NAME_KEY)
+        )
+        file_name = document.metadata.get(FILE_NAME_KEY) or Path(str(source)).name
+        pages[str(source)] = pages.get(str(source), 0) + 1
+
+        added: dict[str, MetadataValue] = {PAGE_NUMBER_KEY: pages[str(source)]}
+        added.update((document_tags or {}).get(file_name, {}))
+        document.metadata.update(added)
+        for key in added:
+            if key not in document.excluded_embed_metadata_keys:
+                document.excluded_embed_metadata_keys.append(key)
+            if key not in document.excluded_llm_metadata_keys:
+                document.excluded_llm_metadata_keys.append(key)
+
+
+def build_metadata_filters(
+    file_names: Sequence[str] | None = None,
+    page_from: int | None = None,
+    page_to: int | None = None,
+    tags: Mapping[str, MetadataValue] | None = None,
+) -> MetadataFilters | None:
+    """Builds the metadata filters of a scoped query.
+
+    All the given conditions must hold. The filters are passed down to the
+    vector store retriever, which translates them into native clauses (e.g.
+    Chroma ``where``) so that filtering happens inside the store.
+    """
+    filters: list[MetadataFilter | MetadataFilters] = []
+    if file_names:
+        filters.append(
+            MetadataFilter(
+                key=FILE_NAME_KEY, value=list(file_names), operator=FilterOperator.IN
+            )
+        )
+    if page_from is not None:
+        filters.append(
+            MetadataFilter(
+                key=PAGE_NUMBER_KEY, value=page_from, operator=FilterOperator.GTE
+            )
+        )
+    if page_to is not None:
+        filters.append(
+            MetadataFilter(
+                key=PAGE_NUMBER_KEY, value=page_to, operator=FilterOperator.LTE
+            )
+        )
+    for key, value in (tags or {}).items():
+        filters.append(MetadataFilter(key=key, value=value, operator=FilterOperator.EQ))
+
+    if not filters:
+        return None
+    return MetadataFilters(filters=filters, condition=FilterCondition.AND)
@@ -0,0 +1,218 @@
+"""Service metric definitions, exported in the Prometheus text format."""
+
+import bisect
+import math
+import threading
+from collections.abc import Callable, Iterator, Sequence
+from typing import ClassVar, TypeVar
+
+# Label values of a sample, in the order of the metric label names.
+LabelValues = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    """Escapes a label value or help text for the text exposition format."""
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _format_value(value: float) -> str:
+    """Formats a sample value for the text exposition format."""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class Metric:
+    """Base class of the metrics, a family of samples sharing label names."""
+
+    type_name: ClassVar[str]
+
+    def __init__(self, name: str, description: str, label_names: Sequence[str] = ()):
+        """Initializes a metric without samples."""
+        self.name = name
+        self.description = description
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> LabelValues:
+        """Returns the label values of a sample, checking the label names."""
+        if set(labels) != set(self.label_names):
+            raise ValueError(
+                f"Metric '{self.name}' expects the labels {list(self.label_names)}, "
+                f"got {sorted(labels)}."
+            )
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def samples(self) -> Iterator[tuple[str, dict[str, str], float]]:
+        """Yields the name suffix, labels and value of every sample."""
+        raise NotImplementedError
+
+    def render(self) -> list[str]:
+        """Returns the lines of the metric in the text exposition format."""
+        lines = [
+            f"# HELP {self.name} {_escape(self.description)}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        for suffix, labels, value in self.samples():
+            series = f"{self.name}{suffix}"
+            if labels:
+                label_str = ",".join(
+                    f'{key}="{_escape(label)}"' for key, label in labels.items()
+                )
+                series += f"{{{label_str}}}"
+            lines.append(f"{series} {_format_value(value)}")
+        return lines
+
+
+class Counter(Metric):
+    """Count that only goes up, such as a number of requests."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, description: str, label_names: Sequence[str] = ()):
+        """Initializes a counter without samples."""
+        super().__init__(name, description, label_names)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Increments the counter of some label values."""
+        if amount < 0:
+            raise ValueError("Counters can only be incremented.")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        """Returns the counter of some label values."""
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterator[tuple[str, dict[str, str], float]]:
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            yield "", dict(zip(self.label_names, key, strict=True)), value
+
+
+class Gauge(Metric):
+    """Value that goes up and down, such as a memory size."""
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, description: str, label_names: Sequence[str] = ()):
+        """Initializes a gauge without samples."""
+        super().__init__(name, description, label_names)
+        self._values: dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        """Sets the gauge of some label values."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def value(self, **labels: str) -> float:
+        """Returns the gauge of some label values."""
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterator[tuple[str, dict[str, str], float]]:
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            yield "", dict(zip(self.label_names, key, strict=True)), value
+
+
+class Histogram(Metric):
+    """Distribution of observed values, counted in cumulative buckets."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        buckets: Sequence[float],
+        label_names: Sequence[str] = (),
+    ):
+        """Initializes a histogram with the upper bounds of its buckets."""
+        super().__init__(name, description, label_names)
+        self.buckets = tuple(sorted(buckets))
+        self._counts: dict[LabelValues, list[int]] = {}
+        self._sums: dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Records a value in the bucket it falls into."""
+        key = self._key(labels)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * (len(self.buckets) + 1))
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    def count(self, **labels: str) -> int:
+        """Returns the number of observed values of some label values."""
+        return sum(self._counts.get(self._key(labels), []))
+
+    def samples(self) -> Iterator[tuple[str, dict[str, str], float]]:
+        with self._lock:
+            entries = sorted(
+                (key, list(counts), self._sums[key])
+                for key, counts in self._counts.items()
+            )
+        for key, counts, total in entries:
+            labels = dict(zip(self.label_names, key, strict=True))
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts, strict=True):
+                cumulative += count
+                le = "+Inf" if math.isinf(bound) else _format_value(bound)
+                yield "_bucket", labels | {"le": le}, cumulative
+            yield "_sum", labels, total
+            yield "_count", labels, cumulative
+
+
+MetricT = TypeVar("MetricT", bound=Metric)
+
+
+class MetricsRegistry:
+    """Registry of the metrics of a service."""
+
+    def __init__(self):
+        """Initializes an empty registry."""
+        self._metrics: dict[str, Metric] = {}
+        self._collectors: list[Callable[[], object]] = []
+
+    def _register(self, metric: MetricT) -> MetricT:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric '{metric.name}' is already registered.")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(
+        self, name: str, description: str, label_names: Sequence[str] = ()
+    ) -> Counter:
+        """Registers a new counter."""
+        return self._register(Counter(name, description, label_names))
+
+    def gauge(
+        self, name: str, description: str, label_names: Sequence[str] = ()
+    ) -> Gauge:
+        """Registers a new gauge."""
+        return self._register(Gauge(name, description, label_names))
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        buckets: Sequence[float],
+        label_names: Sequence[str] = (),
+    ) -> Histogram:
+        """Registers a new histogram."""
+        return self._register(Histogram(name, description, buckets, label_names))
+
+    def add_collector(self, collector: Callable[[], object]) -> None:
+        """Registers a function updating some gauges, called on every render."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Returns every metric in the Prometheus text exposition format."""
+        for collector in self._collectors:
+            collector()
+        lines = [line for metric in self._metrics.values() for line in metric.render()]
+        return "\n".join(lines) + "\n" if lines else ""
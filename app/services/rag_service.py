@@ -1,43 +1,172 @@
 """RAG Service class definition."""
 
+import asyncio
+import re
+import threading
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from contextlib import contextmanager
 from logging import getLogger
 from pathlib import Path
-from typing import Any
+from typing import Any, TypeVar
 
-from llama_index.core import (
-    SimpleDirectoryReader,
-    StorageContext,
-    VectorStoreIndex,
-)
+from llama_index.core import Settings, StorageContext, VectorStoreIndex
+from llama_index.core.base.response.schema import RESPONSE_TYPE, Response
+from llama_index.core.postprocessor.types import BaseNodePostprocessor
 from llama_index.core.prompts import RichPromptTemplate
+from llama_index.core.query_engine import RetrieverQueryEngine
+from llama_index.core.retrievers import BaseRetriever
+from llama_index.core.schema import NodeWithScore, QueryBundle, TransformComponent
+from llama_index.core.utils import get_tokenizer
+from llama_index.core.vector_stores.types import MetadataFilters
 
 from app.core.config.rag import RagServiceConfig
-from app.core.exceptions import IndexingError, QueryExecutionError
+from app.core.exceptions import (
+    FileTooLargeError,
+    FileUploadError,
+    IndexingError,
+    JobNotFoundError,
+    QueryExecutionError,
+    QueryTimeoutError,
+    SessionNotFoundError,
+    TenantNotFoundError,
+)
 from app.services.components import (
     ChromaVectorStoreComponent,
     HuggingFaceEmbeddingComponent,
     HuggingFaceLLMComponent,
+    LlamaCppLLMComponent,
+    LLMComponent,
+    MmapVectorStoreComponent,
+    PrefixCachingLLMComponent,
+    ShardedVectorStoreComponent,
+    VectorStoreComponent,
+)
+from app.services.compression import SentenceCompressor
+from app.services.deadlines import Deadline, cancel_on_disconnect, deadline_scope
+from app.services.dedup import NearDuplicateFilter
+from app.services.ingestion import (
+    IngestionStats,
+    insert_documents,
+    iter_documents,
+    list_documents,
+)
+from app.services.memory import (
+    CacheMemory,
+    MemoryReport,
+    ModelMemory,
+    VectorStoreMemory,
+    estimate_hnsw_bytes,
+    model_weight_bytes,
+    process_memory,
+)
+from app.services.metadata import FILE_NAME_KEY
+from app.services.metrics import MetricsRegistry
+from app.services.relevance import RelevanceGate
+from app.services.resources import apply_thread_budget, thread_budget
+from app.services.routing import (
+    QueryRouter,
+    Route,
+    keyword_pattern,
+    small_llm_config,
+)
+from app.services.sessions import ChatSession, ChatTurn, SessionStore, turn_prompt
+from app.services.summaries import SummaryStore, filtered_file_names, summaries_path
+from app.services.tenants import (
+    TENANT_NAME_PATTERN,
+    TenantIndex,
+    TenantIndexCache,
+    estimate_index_bytes,
 )
+from app.services.uploads import (
+    UPLOAD_FILE_NAME_PATTERN,
+    UploadJob,
+    UploadJobs,
+    save_upload,
+    staging_path,
+)
+from app.services.warmup import WarmupTiming, compile_model, warm_up
 
 logger = getLogger(__name__)
 
+T = TypeVar("T")
+
+LLM_COMPONENTS: dict[str, type[LLMComponent]] = {
+    "huggingface": HuggingFaceLLMComponent,
+    "llama_cpp": LlamaCppLLMComponent,
+}
+VECTOR_STORE_COMPONENTS: dict[str, type[VectorStoreComponent]] = {
+    "chroma": ChromaVectorStoreComponent,
+    "mmap": MmapVectorStoreComponent,
+}
+
+
+def create_vector_store_component(config: RagServiceConfig) -> VectorStoreComponent:
+    """Creates the vector store component of a collection, sharded if configured."""
+    component_cls = VECTOR_STORE_COMPONENTS[config.vector_store_backend]
+    if config.sharding.num_shards > 1:
+        return ShardedVectorStoreComponent(config, component_cls)
+    return component_cls(config)
+
 
 class RAGService:
     """Service class for handling Retrieval Augmented Generation (RAG) operations."""
 
     def __init__(
         self,
-        llm_component: HuggingFaceLLMComponent,
+        llm_component: LLMComponent,
         embedding_component: HuggingFaceEmbeddingComponent,
-        vector_store_component: ChromaVectorStoreComponent,
+        vector_store_component: VectorStoreComponent,
         config: RagServiceConfig,
+        small_llm_component: LLMComponent | None = None,
     ):
-        """Initializes the RAGService."""
+        """Initializes the RAGService.
+
+        With query routing enabled, easy queries are answered by the small LLM
+        component and the others by the LLM component.
+        """
+        if config.routing.enabled and small_llm_component is None:
+            raise ValueError("Query routing requires a small LLM component.")
         self._llm_component = llm_component
+        self._llm_components: dict[Route, LLMComponent] = {"large": llm_component}
+        if config.routing.enabled and small_llm_component is not None:
+            self._llm_components["small"] = small_llm_component
         self._embedding_component = embedding_component
         self._vector_store_component = vector_store_component
         self._config = config
         self._index: VectorStoreIndex | None = None
+        max_memory_mb = config.tenants.max_memory_mb
+        self._tenant_indexes = TenantIndexCache(
+            max_open=config.tenants.max_open_indexes,
+            max_memory_bytes=(
+                int(max_memory_mb * 1024**2) if max_memory_mb is not None else None
+            ),
+        )
+        self._embedding_dim: int | None = None
+        self._ingest_lock = threading.Lock()
+        # One generation at a time per LLM, easy queries do not wait for hard ones.
+        self._generation_locks = {
+            route: threading.Lock() for route in self._llm_components
+        }
+        # Queries past the in-flight limit wait, so they do not oversubscribe the CPU.
+        max_in_flight = config.resources.max_in_flight
+        self._in_flight = (
+            threading.BoundedSemaphore(max_in_flight) if max_in_flight else None
+        )
+        self.metrics = MetricsRegistry()
+        self._relevance_gate = RelevanceGate(config.relevance_gate, self.metrics)
+        self._router = QueryRouter(config.routing, self.metrics)
+        self._overview_pattern = keyword_pattern(config.summaries.overview_keywords)
+        self._summary_stores: dict[str, SummaryStore] = {}
+        self._upload_jobs = UploadJobs(max_jobs=config.uploads.max_jobs)
+        self._sessions = SessionStore(config.sessions, self.metrics)
+        self._chat_tokens = self.metrics.counter(
+            "rag_chat_prompt_tokens_total",
+            "Prompt tokens of the chat turns, reused from the KV cache or prefilled.",
+            label_names=("kind",),
+        )
+        self._register_memory_metrics()
+        self._warmed_up = False
 
         self._prompt_template: RichPromptTemplate | None = None
 
@@ -64,42 +193,139 @@ class RAGService:
 
     def _load_and_index_documents(self, force_reindex: bool = False):
         """Load and index documents in the vector store."""
-        vector_store = self._vector_store_component.get_store()
-        collection_empty = vector_store.client.count() == 0
+        self._index = self._build_index(
+            self._vector_store_component, self._config.pdf_directory, force_reindex
+        )
+        self._refresh_summaries(self._config)
+
+    def _build_index(
+        self,
+        vector_store_component: VectorStoreComponent,
+        pdf_directory: str,
+        force_reindex: bool = False,
+    ) -> VectorStoreIndex:
+        """Load the index of a vector store, indexing the documents if needed."""
+        vector_store = vector_store_component.get_store()
+        collection_empty = vector_store_component.count() == 0
         if not force_reindex and not collection_empty:
             logger.info("Existing collection found. Loading index from vector store.")
-            self._index = VectorStoreIndex.from_vector_store(
+            return VectorStoreIndex.from_vector_store(
                 vector_store=vector_store,
                 embed_model=self._embedding_component.get_model(),
             )
-            return
 
         if force_reindex:
-            self._vector_store_component.clear_collections()
+            vector_store_component.clear_collections()
+            # Clearing may recreate the underlying collection.
+            vector_store = vector_store_component.get_store()
 
-        reader = SimpleDirectoryReader(input_dir=self._config.pdf_directory)
-        documents = reader.load_data()
-        if not documents:
+        storage_context = StorageContext.from_defaults(vector_store=vector_store)
+        index = VectorStoreIndex(
+            nodes=[],
+            storage_context=storage_context,
+            embed_model=self._embedding_component.get_model(),
+        )
+        # Uploads are staged as hidden files, which the reader skips.
+        input_files = (
+            list_documents(pdf_directory) if _has_documents(pdf_directory) else []
+        )
+        if not input_files:
             logger.warning(
-                "No PDF documents found in %s. Index will be empty.",
-                self._config.pdf_directory,
+                "No PDF documents found in %s. Index will be empty.", pdf_directory
             )
-            # Create an empty index to avoid errors on query.
-            storage_context = StorageContext.from_defaults(vector_store=vector_store)
-            self._index = VectorStoreIndex.from_documents(
-                documents=[], storage_context=storage_context
+            # Return the empty index to avoid errors on query.
+            return index
+
+        logger.info(f"Indexing {len(input_files)} file(s)...")
+        transformations, dedup_filter = self._transformations()
+        stats = insert_documents(
+            index,
+            iter_documents(input_files),
+            transformations,
+            batch_size=self._config.ingestion.batch_size,
+            document_tags=self._config.document_tags,
+        )
+        logger.info(
+            f"Indexing complete: {stats.documents} document(s) split into "
+            f"{stats.nodes} node(s), written in {stats.batches} batch(es) in "
+            f"{stats.seconds:.1f} s."
+        )
+        if dedup_filter is not None:
+            self._log_deduplication(dedup_filter, stats)
+        return index
+
+    def _summary_store(self, config: RagServiceConfig) -> SummaryStore:
+        """Returns the document summaries of a collection."""
+        store = self._summary_stores.get(config.collection_name)
+        if store is None:
+            store = self._summary_stores[config.collection_name] = SummaryStore(
+                summaries_path(config)
             )
+        return store
+
+    def _complete(self, prompt: str) -> str:
+        """Generates the completion of a prompt, waiting for the LLM."""
+        with self._generation_locks["large"]:
+            return self._llm_component.get_model().complete(prompt).text.strip()
+
+    def _refresh_summaries(self, config: RagServiceConfig) -> None:
+        """Summarizes the new and changed documents of a collection, if enabled."""
+        if not config.summaries.enabled:
             return
+        pdf_directory = config.pdf_directory
+        input_files = (
+            list_documents(pdf_directory) if _has_documents(pdf_directory) else []
+        )
+        start = time.perf_counter()
+        summarized = self._summary_store(config).refresh(
+            input_files,
+            read=lambda path: iter_documents([path]),
+            complete=self._complete,
+            config=config.summaries,
+        )
+        if summarized:
+            logger.info(
+                f"Summarized {summarized} document(s) of collection "
+                f"'{config.collection_name}' in {time.perf_counter() - start:.1f} s."
+            )
 
-        logger.info(f"Indexing {len(documents)} documents(s)...")
-        storage_context = StorageContext.from_defaults(vector_store=vector_store)
-        self._index = VectorStoreIndex.from_documents(
-            documents,
-            storage_context=storage_context,
-            embed_model=self._embedding_component.get_model(),
-            show_progress=True,
+    def _transformations(
+        self,
+    ) -> tuple[list[TransformComponent], NearDuplicateFilter | None]:
+        """Returns the chunking transformations and the deduplication filter.
+
+        The filter is incremental, so chunks are compared across ingestion batches.
+        """
+        transformations: list[TransformComponent] = [Settings.node_parser]
+        if not self._config.deduplication.enabled:
+            return transformations, None
+        dedup_config = self._config.deduplication
+        dedup_filter = NearDuplicateFilter(
+            threshold=dedup_config.threshold,
+            num_perm=dedup_config.num_perm,
+            shingle_size=dedup_config.shingle_size,
+            max_signatures=dedup_config.max_signatures,
+            incremental=True,
+        )
+        transformations.append(dedup_filter)
+        return transformations, dedup_filter
+
+    def _log_deduplication(
+        self, dedup_filter: NearDuplicateFilter, stats: IngestionStats
+    ) -> None:
+        """Logs the chunks dropped by deduplication and the cost they saved."""
+        # Extrapolate the per-chunk indexing cost to the chunks that were dropped.
+        seconds_per_node = stats.seconds / stats.nodes if stats.nodes else 0.0
+        dedup_stats = dedup_filter.stats
+        logger.info(
+            "Deduplication dropped %d of %d chunk(s) (%.1f%%), saving ~%.2f MB of "
+            "index storage and ~%.1f s of indexing time.",
+            dedup_stats.dropped_nodes,
+            dedup_stats.input_nodes,
+            dedup_stats.dropped_ratio * 100,
+            dedup_stats.estimated_bytes_saved(self._get_embedding_dim()) / 1e6,
+            dedup_stats.dropped_nodes * seconds_per_node,
         )
-        logger.info("Indexing complete.")
 
     def get_or_create_index(self, force_reindex: bool = False):
         """Get or create a new index."""
@@ -108,59 +334,823 @@ class RAGService:
         if self._index is None:
             raise IndexingError("Failed to initialize or load the document index.")
 
-    async def query(self, prompt: str) -> dict[str, Any]:
-        """Asynchronously queries the indexed documents."""
+    @property
+    def is_ready(self) -> bool:
+        """Whether the index is loaded and the models are warmed up."""
+        return self._index is not None and (
+            self._warmed_up or not self._config.warmup.enabled
+        )
+
+    def warm_up(self) -> list[WarmupTiming]:
+        """Warm the models and the vector store up, optionally compiling the models.
+
+        Both LLMs are warmed up when queries are routed. Logs the latency of the
+        first and the steady state calls of every step.
+        """
         if self._index is None:
+            raise IndexingError("Index must be loaded before warming up.")
+        warmup_config = self._config.warmup
+        llms = {
+            route: component.get_model()
+            for route, component in self._llm_components.items()
+        }
+        embed_model = self._embedding_component.get_model()
+        if warmup_config.torch_compile:
+            for llm in llms.values():
+                compile_model(llm, mode=warmup_config.torch_compile_mode)
+            compile_model(embed_model, mode=warmup_config.torch_compile_mode)
+
+        logger.info("Warming up models and vector store...")
+        start = time.perf_counter()
+        timings = warm_up(
+            llms=llms,
+            embed_model=embed_model,
+            retriever=self._index.as_retriever(),
+            embedding_batch_sizes=warmup_config.embedding_batch_sizes,
+            prompt_lengths=warmup_config.prompt_lengths,
+            max_new_tokens=warmup_config.max_new_tokens,
+            repeats=warmup_config.repeats,
+        )
+        self._warmed_up = True
+        logger.info(f"Warm-up complete in {time.perf_counter() - start:.1f} s.")
+        return timings
+
+    def memory_usage(self) -> MemoryReport:
+        """Returns the memory used by the process, the models, index and caches.
+
+        Model sizes are the bytes of their loaded weights, and the index size is
+        estimated from the number of vectors of the default collection.
+        """
+        components: list[tuple[str, Any]] = [
+            (f"llm_{route}", component)
+            for route, component in self._llm_components.items()
+        ]
+        components.append(("embedding", self._embedding_component))
+        models = []
+        for name, component in components:
+            try:
+                model = component.get_model()
+            except ValueError:
+                continue  # Not loaded, or shut down.
+            models.append(
+                ModelMemory(
+                    component=name,
+                    model_name=str(
+                        getattr(model, "model_name", None)
+                        or getattr(model, "model_path", "")
+                    ),
+                    weight_bytes=model_weight_bytes(model),
+                )
+            )
+
+        vector_store = None
+        if self._index is not None:
+            vectors = self._vector_store_component.count()
+            estimate = (
+                estimate_hnsw_bytes
+                if self._config.vector_store_backend == "chroma"
+                else estimate_index_bytes
+            )
+            vector_store = VectorStoreMemory(
+                backend=self._config.vector_store_backend,
+                vectors=vectors,
+                index_bytes=estimate(vectors, self._get_embedding_dim()),
+            )
+
+        return MemoryReport(
+            process=process_memory(),
+            models=models,
+            vector_store=vector_store,
+            caches=[
+                CacheMemory(
+                    cache="tenant_indexes",
+                    entries=len(self._tenant_indexes),
+                    memory_bytes=self._tenant_indexes.memory_bytes,
+                ),
+                CacheMemory(
+                    cache="chat_sessions",
+                    entries=len(self._sessions),
+                    memory_bytes=self._sessions.memory_bytes,
+                ),
+            ],
+        )
+
+    def _register_memory_metrics(self) -> None:
+        """Registers the memory gauges, refreshed whenever the metrics are read."""
+        process_gauge = self.metrics.gauge(
+            "rag_process_memory_bytes",
+            "Resident memory of the worker process, now and at its peak.",
+            label_names=("kind",),
+        )
+        model_gauge = self.metrics.gauge(
+            "rag_model_weight_bytes",
+            "Bytes of the weights of the loaded models.",
+            label_names=("component",),
+        )
+        vectors_gauge = self.metrics.gauge(
+            "rag_vector_store_vectors", "Vectors in the default collection."
+        )
+        index_gauge = self.metrics.gauge(
+            "rag_vector_store_index_bytes",
+            "Estimated memory of the index of the default collection.",
+        )
+        cache_gauge = self.metrics.gauge(
+            "rag_cache_memory_bytes",
+            "Estimated memory held by the caches.",
+            label_names=("cache",),
+        )
+        entries_gauge = self.metrics.gauge(
+            "rag_cache_entries", "Entries of the caches.", label_names=("cache",)
+        )
+
+        def collect() -> None:
+            try:
+                report = self.memory_usage()
+            except Exception as e:
+                logger.warning(f"Memory accounting failed: {e}")
+                return
+            if report.process.rss_bytes is not None:
+                process_gauge.set(report.process.rss_bytes, kind="rss")
+            if report.process.peak_rss_bytes is not None:
+                process_gauge.set(report.process.peak_rss_bytes, kind="peak_rss")
+            for model in report.models:
+                if model.weight_bytes is not None:
+                    model_gauge.set(model.weight_bytes, component=model.component)
+            if report.vector_store is not None:
+                vectors_gauge.set(report.vector_store.vectors)
+                index_gauge.set(report.vector_store.index_bytes)
+            for cache in report.caches:
+                cache_gauge.set(cache.memory_bytes, cache=cache.cache)
+                entries_gauge.set(cache.entries, cache=cache.cache)
+
+        self.metrics.add_collector(collect)
+
+    def _tenant_config(self, tenant: str) -> RagServiceConfig:
+        """Returns the configuration of the collection and documents of a tenant."""
+        if not re.fullmatch(TENANT_NAME_PATTERN, tenant):
+            raise ValueError(f"Invalid tenant name: '{tenant}'.")
+        return self._config.model_copy(
+            update={
+                "collection_name": f"{self._config.collection_name}-{tenant}",
+                "pdf_directory": str(Path(self._config.pdf_directory) / tenant),
+            }
+        )
+
+    def _get_embedding_dim(self) -> int:
+        """Returns the dimension of the shared embedding model."""
+        if self._embedding_dim is None:
+            embed_model = self._embedding_component.get_model()
+            self._embedding_dim = len(embed_model.get_text_embedding("dimension"))
+        return self._embedding_dim
+
+    def get_tenant_index(
+        self, tenant: str, force_reindex: bool = False
+    ) -> VectorStoreIndex:
+        """Get the index of a tenant, opening it on first use.
+
+        Tenant indexes live in their own collection, indexed from their own
+        subdirectory of the documents directory, which must exist. They share
+        the embedding model and the LLM of the service, and are kept in a
+        bounded LRU of open indexes.
+        """
+        if not force_reindex and (entry := self._tenant_indexes.get(tenant)):
+            return entry.index
+
+        config = self._tenant_config(tenant)
+        # Unknown tenants are rejected before their collection is created.
+        if not Path(config.pdf_directory).is_dir():
+            raise TenantNotFoundError(f"No documents found for tenant '{tenant}'.")
+        self._tenant_indexes.discard(tenant)
+        component = create_vector_store_component(config)
+        component.load()
+        try:
+            index = self._build_index(component, config.pdf_directory, force_reindex)
+            self._refresh_summaries(config)
+        except Exception:
+            component.shutdown()
+            raise
+
+        memory_bytes = estimate_index_bytes(
+            component.count(), self._get_embedding_dim()
+        )
+        logger.info(
+            f"Opened index of tenant '{tenant}' (~{memory_bytes / 1024**2:.1f} MB)."
+        )
+        self._tenant_indexes.put(
+            TenantIndex(
+                tenant=tenant,
+                index=index,
+                vector_store_component=component,
+                memory_bytes=memory_bytes,
+            )
+        )
+        return index
+
+    async def _open_index(self, tenant: str | None) -> VectorStoreIndex | None:
+        """Returns the index of a tenant, or the default one, for a request.
+
+        Opening a tenant index may embed its whole documents directory, so it
+        runs in a worker thread, under the ingestion lock: concurrent requests
+        wait for a single build, and reindexes do not close it meanwhile.
+        """
+        if tenant is None:
+            return self._index
+        if entry := self._tenant_indexes.get(tenant):
+            return entry.index
+
+        def open_index() -> VectorStoreIndex:
+            with self._ingest_lock:
+                return self.get_tenant_index(tenant)
+
+        return await asyncio.to_thread(open_index)
+
+    def _ingest(self, tenant: str | None) -> dict[str, Any]:
+        """Reindex the documents of a tenant, or the default collection."""
+        with self._ingest_lock:
+            if tenant is None:
+                self.get_or_create_index(force_reindex=True)
+                vector_store_component = self._vector_store_component
+                collection_name = self._config.collection_name
+            else:
+                self.get_tenant_index(tenant, force_reindex=True)
+                entry = self._tenant_indexes.get(tenant)
+                if entry is None:
+                    raise IndexingError(f"Index of tenant '{tenant}' was evicted.")
+                vector_store_component = entry.vector_store_component
+                collection_name = self._tenant_config(tenant).collection_name
+            return {
+                "tenant": tenant,
+                "collection_name": collection_name,
+                "vectors": vector_store_component.count(),
+            }
+
+    async def ingest(self, tenant: str | None = None) -> dict[str, Any]:
+        """Asynchronously reindexes the documents of a tenant.
+
+        Indexing runs in a worker thread so queries keep being served meanwhile.
+        """
+        logger.info(f"Ingesting documents of tenant: {tenant or '<default>'}")
+        return await asyncio.to_thread(self._ingest, tenant)
+
+    async def upload_document(
+        self,
+        chunks: AsyncIterator[bytes],
+        file_name: str,
+        tenant: str | None = None,
+        content_length: int | None = None,
+    ) -> UploadJob:
+        """Streams an uploaded PDF to the documents directory of a tenant.
+
+        The body is written to disk chunk by chunk. Returns a pending job, run by
+        ``index_upload``, that appends the document to the live index.
+        """
+        if not re.fullmatch(UPLOAD_FILE_NAME_PATTERN, file_name):
+            raise FileUploadError(f"Invalid file name: '{file_name}'.")
+        max_bytes = int(self._config.uploads.max_size_mb * 1024**2)
+        if content_length is not None and content_length > max_bytes:
+            raise FileTooLargeError(
+                f"The uploaded file exceeds {max_bytes / 1024**2:.1f} MB."
+            )
+        config = self._config if tenant is None else self._tenant_config(tenant)
+        path = Path(config.pdf_directory) / file_name
+        if path.exists():
+            raise FileUploadError(
+                f"Document '{file_name}' already exists. Replace it and reindex."
+            )
+
+        job = UploadJob(file_name=file_name, tenant=tenant, path=path)
+        self._upload_jobs.add(job)
+        try:
+            job.size_bytes = await save_upload(
+                chunks, staging_path(path, job.job_id), max_bytes=max_bytes
+            )
+        except BaseException:
+            self._upload_jobs.discard(job.job_id)
+            raise
+        logger.info(
+            f"Uploaded '{file_name}' ({job.size_bytes / 1024**2:.1f} MB) for tenant "
+            f"{tenant or '<default>'}, indexing job {job.job_id}."
+        )
+        return job
+
+    def index_upload(self, job_id: str) -> None:
+        """Parses, embeds and appends an uploaded document to its live index.
+
+        The existing collection is not rebuilt. The document is moved next to the
+        other documents once indexed, so later reindexes include it.
+        """
+        job = self.get_upload_job(job_id)
+        staged_path = staging_path(job.path, job.job_id)
+        job.status = "running"
+        start = time.perf_counter()
+        try:
+            with self._ingest_lock:
+                if job.tenant is None:
+                    index = self._index
+                else:
+                    index = self.get_tenant_index(job.tenant)
+                if index is None:
+                    raise IndexingError("Index is not available.")
+
+                documents = (
+                    document.model_copy(
+                        update={
+                            "metadata": document.metadata
+                            | {FILE_NAME_KEY: job.file_name, "file_path": str(job.path)}
+                        }
+                    )
+                    for document in iter_documents([staged_path])
+                )
+                transformations, _ = self._transformations()
+                stats = insert_documents(
+                    index,
+                    documents,
+                    transformations,
+                    batch_size=self._config.ingestion.batch_size,
+                    document_tags=self._config.document_tags,
+                )
+                staged_path.rename(job.path)
+
+                if job.tenant is not None and (
+                    entry := self._tenant_indexes.get(job.tenant)
+                ):
+                    entry.memory_bytes = estimate_index_bytes(
+                        entry.vector_store_component.count(), self._get_embedding_dim()
+                    )
+        except Exception as e:
+            logger.error(f"Indexing job {job.job_id} failed: {e}", exc_info=True)
+            staged_path.unlink(missing_ok=True)
+            job.status, job.error = "failed", str(e)
+        else:
+            job.status, job.nodes = "completed", stats.nodes
+            logger.info(
+                f"Indexed '{job.file_name}' into {stats.nodes} node(s) in "
+                f"{time.perf_counter() - start:.1f} s."
+            )
+            try:
+                self._refresh_summaries(
+                    self._config
+                    if job.tenant is None
+                    else self._tenant_config(job.tenant)
+                )
+            except Exception as e:
+                # The document is searchable, its summary is retried on reindex.
+                logger.error(f"Summarizing '{job.file_name}' failed: {e}")
+        finally:
+            job.finished_at = time.time()
+
+    def get_upload_job(self, job_id: str) -> UploadJob:
+        """Returns an upload indexing job."""
+        job = self._upload_jobs.get(job_id)
+        if job is None:
+            raise JobNotFoundError(f"Indexing job '{job_id}' not found.")
+        return job
+
+    async def query(
+        self,
+        prompt: str,
+        filters: MetadataFilters | None = None,
+        tenant: str | None = None,
+        timeout_s: float | None = None,
+        is_disconnected: Callable[[], Awaitable[bool]] | None = None,
+    ) -> dict[str, Any]:
+        """Asynchronously queries the indexed documents.
+
+        Optional metadata filters are pushed down to the vector store, so only
+        the matching documents are searched. Queries without a tenant search the
+        default collection.
+
+        The query runs in a worker thread under a deadline, the configured default
+        one unless a timeout is given. Generation stops when the deadline passes
+        or the client disconnects, and the answer generated so far is returned
+        as partial. Queries that time out before generating raise an error.
+        """
+        index = await self._open_index(tenant)
+        if index is None:
             raise QueryExecutionError(
                 "Index is not available. Please ensure documens are indexed."
             )
         if self._prompt_template is None:
             raise QueryExecutionError("Prompt template is not loaded.")
 
+        deadline = self._start_deadline(timeout_s)
         llm_prompt = self._prompt_template.format(query_str=prompt)
+        summary_nodes = self._overview_nodes(prompt, filters, tenant)
+
+        node_postprocessors: list[BaseNodePostprocessor] = []
+        compressor: SentenceCompressor | None = None
+        if self._config.compression.enabled:
+            compressor = SentenceCompressor(
+                embed_model=self._embedding_component.get_model(),
+                token_budget=self._config.compression.token_budget,
+                min_sentence_length=self._config.compression.min_sentence_length,
+            )
+            node_postprocessors.append(compressor)
 
         logger.info(f"Executing async query: '{prompt}'")
-        query_engine = self._index.as_query_engine(
-            llm=self._llm_component.get_model(),
-            response_mode="tree_summarize",
-            text_qa_template=llm_prompt,
-        )
+        query_engines = {
+            route: index.as_query_engine(
+                llm=component.get_model(),
+                response_mode="tree_summarize",
+                text_qa_template=llm_prompt,
+                filters=filters,
+            )
+            for route, component in self._llm_components.items()
+        }
+        start = time.perf_counter()
         try:
-            response = await query_engine.aquery(prompt)
+            response = await self._execute_query(
+                query_engines,
+                prompt,
+                deadline,
+                is_disconnected,
+                node_postprocessors,
+                summary_nodes,
+            )
+        except QueryTimeoutError as e:
+            logger.warning(f"Query stopped: {e.detail}")
+            raise
         except Exception as e:
             logger.error(f"Error during query engine execution: {e}", exc_info=True)
             raise QueryExecutionError(f"Failed to execute query: {e}") from e
+        query_ms = (time.perf_counter() - start) * 1000
+
+        partial = deadline.stopped_generation
+        if partial and not str(response).strip():
+            deadline.check("generation")
+        if partial:
+            logger.warning(
+                f"Query stopped after {query_ms:.0f} ms, returning a partial answer."
+            )
 
-        source_nodes_data = [
-            {
-                "text": node.get_content()[:500] + "...",
-                "score": float(node.get_score() if node.get_score() else 0.0),
-                "node_id": node.node_id,
-                "metadata": node.metadata,
-            }
-            for node in response.source_nodes
-        ]
         logger.info(f"Generated answer: {response!s}")
-        return {"answer": str(response), "sources": source_nodes_data}
+        result: dict[str, Any] = {
+            "answer": str(response),
+            "sources": _sources_data(response.source_nodes),
+            "partial": partial,
+        }
+
+        if compressor is not None and compressor.report is not None:
+            report = compressor.report
+            logger.info(
+                "Context compression: %d -> %d tokens (%d saved), "
+                "compression took %.1f ms of a %.1f ms query.",
+                report.original_tokens,
+                report.compressed_tokens,
+                report.tokens_saved,
+                report.latency_ms,
+                query_ms,
+            )
+            result["compression"] = report.as_dict() | {"query_ms": round(query_ms, 2)}
+        return result
+
+    def _overview_nodes(
+        self, prompt: str, filters: MetadataFilters | None, tenant: str | None
+    ) -> list[NodeWithScore] | None:
+        """Returns the document summaries answering an overview query.
+
+        Returns None for other queries, queries with filters other than file
+        names and documents without summaries, which are answered by retrieval.
+        """
+        if not self._config.summaries.enabled or not self._overview_pattern.search(
+            prompt
+        ):
+            return None
+        file_names = filtered_file_names(filters)
+        if file_names is None:
+            return None
+        config = self._config if tenant is None else self._tenant_config(tenant)
+        nodes = self._summary_store(config).nodes(file_names)
+        if not nodes:
+            return None
+        logger.info(f"Answering overview query from {len(nodes)} document summaries.")
+        return nodes
+
+    def _start_deadline(self, timeout_s: float | None) -> Deadline:
+        """Starts the deadline of a query, the configured default if unset."""
+        deadlines_config = self._config.deadlines
+        if timeout_s is None:
+            timeout_s = deadlines_config.default_timeout_s
+        if timeout_s is not None:
+            timeout_s = min(timeout_s, deadlines_config.max_timeout_s)
+        return Deadline(timeout_s)
+
+    async def _execute_query(
+        self,
+        query_engines: dict[Route, RetrieverQueryEngine],
+        prompt: str,
+        deadline: Deadline,
+        is_disconnected: Callable[[], Awaitable[bool]] | None,
+        node_postprocessors: list[BaseNodePostprocessor],
+        summary_nodes: list[NodeWithScore] | None = None,
+    ) -> RESPONSE_TYPE:
+        """Runs a query in a worker thread, cancelling it if the client leaves."""
+        return await self._run_in_worker(
+            lambda: self._run_query(
+                query_engines, prompt, deadline, node_postprocessors, summary_nodes
+            ),
+            deadline,
+            is_disconnected,
+        )
+
+    async def _run_in_worker(
+        self,
+        func: Callable[[], T],
+        deadline: Deadline,
+        is_disconnected: Callable[[], Awaitable[bool]] | None,
+    ) -> T:
+        """Runs a function in a worker thread, cancelling it if the client leaves."""
+        watcher = None
+        if is_disconnected is not None:
+            watcher = asyncio.create_task(
+                cancel_on_disconnect(
+                    is_disconnected,
+                    deadline,
+                    self._config.deadlines.disconnect_poll_interval_s,
+                )
+            )
+        try:
+            return await asyncio.to_thread(func)
+        except asyncio.CancelledError:
+            # The worker thread cannot be interrupted, only told to stop.
+            deadline.cancel()
+            raise
+        finally:
+            if watcher is not None:
+                watcher.cancel()
+
+    def _run_query(
+        self,
+        query_engines: dict[Route, RetrieverQueryEngine],
+        prompt: str,
+        deadline: Deadline,
+        node_postprocessors: list[BaseNodePostprocessor],
+        summary_nodes: list[NodeWithScore] | None = None,
+    ) -> RESPONSE_TYPE:
+        """Retrieves the context of a query and generates its answer.
+
+        Runs in a worker thread, once a query slot is free. The deadline is
+        checked between the two steps, while waiting for a slot or the LLM, and
+        after every generated token. Generation is skipped if the retrieval
+        scores do not pass the relevance gate, before the node postprocessors
+        run, and otherwise runs on the LLM the query is routed to. Overview
+        queries are answered from the given document summaries, without
+        retrieval.
+        """
+        with (
+            deadline_scope(deadline),
+            _hold(self._in_flight, deadline, "the wait for a query slot"),
+        ):
+            query_bundle = QueryBundle(prompt)
+            if summary_nodes is not None:
+                nodes = summary_nodes
+            else:
+                nodes = query_engines["large"].retriever.retrieve(query_bundle)
+                deadline.check("retrieval")
+                if not self._relevance_gate.passes(nodes):
+                    return Response(
+                        response=self._relevance_gate.answer, source_nodes=[]
+                    )
+                for postprocessor in node_postprocessors:
+                    nodes = postprocessor.postprocess_nodes(
+                        nodes, query_bundle=query_bundle
+                    )
+            route = self._router.route(prompt, nodes)
+            with _hold(self._generation_locks[route], deadline, "the wait for the LLM"):
+                start = time.perf_counter()
+                response = query_engines[route].synthesize(query_bundle, nodes)
+                self._router.observe(route, time.perf_counter() - start)
+                return response
+
+    async def chat(
+        self,
+        message: str,
+        session_id: str | None = None,
+        filters: MetadataFilters | None = None,
+        tenant: str | None = None,
+        timeout_s: float | None = None,
+        is_disconnected: Callable[[], Awaitable[bool]] | None = None,
+    ) -> dict[str, Any]:
+        """Answers a message of a chat session, starting one if no id is given.
+
+        The history of the session is kept on the server, so follow-up messages
+        only send the new question. Every turn retrieves context for the message
+        and the previous question, and only adds the nodes the conversation does
+        not hold yet. Sessions belong to a tenant, or to the default collection.
+
+        With the KV cache enabled and an LLM backend supporting it, the attention
+        state of the conversation is kept between turns, so only the new tokens
+        are prefilled. Deadlines and disconnects behave as in queries.
+        """
+        index = await self._open_index(tenant)
+        if index is None:
+            raise QueryExecutionError(
+                "Index is not available. Please ensure documens are indexed."
+            )
+        if session_id is None:
+            session = self._sessions.create(tenant)
+        else:
+            session = self._get_session(session_id, tenant)
+
+        deadline = self._start_deadline(timeout_s)
+        retriever = index.as_retriever(filters=filters)
+        logger.info(f"Executing chat turn of session {session.session_id}.")
+        try:
+            turn, nodes = await self._run_in_worker(
+                lambda: self._run_chat_turn(session, retriever, message, deadline),
+                deadline,
+                is_disconnected,
+            )
+        except QueryTimeoutError as e:
+            logger.warning(f"Chat turn stopped: {e.detail}")
+            raise
+        except Exception as e:
+            logger.error(f"Error during chat turn execution: {e}", exc_info=True)
+            raise QueryExecutionError(f"Failed to execute chat turn: {e}") from e
+        self._sessions.update(session)
+        if turn.partial:
+            logger.warning("Chat turn stopped, returning a partial answer.")
+        return {
+            "session_id": session.session_id,
+            "answer": turn.answer,
+            "sources": _sources_data(nodes),
+            "partial": turn.partial,
+            "turn": len(session.turns),
+        }
+
+    def get_session(self, session_id: str, tenant: str | None = None) -> ChatSession:
+        """Returns a live chat session of a tenant, or of the default collection."""
+        return self._get_session(session_id, tenant)
+
+    def delete_session(self, session_id: str, tenant: str | None = None) -> None:
+        """Ends a chat session of a tenant, or of the default collection."""
+        if not self._sessions.delete(session_id, tenant):
+            raise SessionNotFoundError(f"Chat session '{session_id}' not found.")
+
+    def _get_session(self, session_id: str, tenant: str | None) -> ChatSession:
+        session = self._sessions.get(session_id, tenant)
+        if session is None:
+            raise SessionNotFoundError(f"Chat session '{session_id}' not found.")
+        return session
+
+    def _run_chat_turn(
+        self,
+        session: ChatSession,
+        retriever: BaseRetriever,
+        message: str,
+        deadline: Deadline,
+    ) -> tuple[ChatTurn, list[NodeWithScore]]:
+        """Retrieves the context of a chat message and generates its answer.
+
+        Runs in a worker thread, once a query slot and the session are free.
+        Turns of a session run one at a time, in the order they arrive.
+        """
+        with (
+            deadline_scope(deadline),
+            _hold(self._in_flight, deadline, "the wait for a query slot"),
+            _hold(session.lock, deadline, "the wait for the chat session"),
+        ):
+            previous = session.prompt_turns[-1].question if session.prompt_turns else ""
+            nodes = retriever.retrieve(f"{previous} {message}".strip())
+            deadline.check("retrieval")
+            prompt = self._fit_chat_turn(session, message, nodes)
+            with _hold(
+                self._generation_locks["large"], deadline, "the wait for the LLM"
+            ):
+                answer = self._complete_chat_turn(session, prompt)
+            if deadline.stopped_generation and not answer.strip():
+                # Nothing to keep, the next turn starts from the previous one.
+                session.cache = None
+                deadline.check("generation")
+            turn = ChatTurn(
+                question=message,
+                answer=answer.strip(),
+                prompt=prompt,
+                node_ids=[
+                    node.node_id
+                    for node in nodes
+                    if node.node_id not in session.context_node_ids
+                ],
+                partial=deadline.stopped_generation,
+            )
+            session.turns.append(turn)
+            return turn, nodes
+
+    def _fit_chat_turn(
+        self, session: ChatSession, message: str, nodes: list[NodeWithScore]
+    ) -> str:
+        """Returns the text of a chat turn, dropping old turns to make room.
+
+        The prompt keeps at most the configured number of turns, and leaves
+        room in the context window for the answer.
+        """
+        max_turns = self._config.sessions.max_turns
+        while len(session.prompt_turns) >= max_turns:
+            session.drop_oldest_turn()
+        tokenizer = get_tokenizer()
+        budget = self._config.context_window - self._config.max_new_tokens
+        while True:
+            seen = session.context_node_ids
+            prompt = turn_prompt(
+                message, [node for node in nodes if node.node_id not in seen]
+            )
+            if not session.prompt_turns or (
+                len(tokenizer(session.transcript() + prompt)) <= budget
+            ):
+                return prompt
+            session.drop_oldest_turn()
+
+    def _complete_chat_turn(self, session: ChatSession, prompt: str) -> str:
+        """Generates the answer of a chat turn, reusing the KV cache if possible."""
+        component = self._llm_component
+        if not self._config.sessions.kv_cache or not isinstance(
+            component, PrefixCachingLLMComponent
+        ):
+            return component.get_model().complete(session.transcript() + prompt).text
+        try:
+            answer, cache = component.complete_with_cache(
+                session.transcript() + prompt, session.cache
+            )
+        except Exception:
+            # The cache may hold part of the failed turn.
+            session.cache = None
+            raise
+        session.cache = cache
+        self._chat_tokens.inc(cache.reused_tokens, kind="reused")
+        self._chat_tokens.inc(cache.prefilled_tokens, kind="prefilled")
+        logger.info(
+            f"Chat turn reused {cache.reused_tokens} cached tokens and prefilled "
+            f"{cache.prefilled_tokens}."
+        )
+        return answer
 
     async def shutdown(self) -> None:
         """Shutdown service and components."""
         logger.info("RAG service shutdown complete.")
-        self._llm_component.shutdown()
+        for llm_component in self._llm_components.values():
+            llm_component.shutdown()
         self._embedding_component.shutdown()
         self._vector_store_component.shutdown()
+        self._tenant_indexes.clear()
+        self._sessions.clear()
         self._index = None
+        self._warmed_up = False
+
+
+@contextmanager
+def _hold(
+    lock: "threading.Lock | threading.Semaphore | None", deadline: Deadline, stage: str
+) -> Iterator[None]:
+    """Holds a lock, if any, waiting in short steps so queued queries can time out."""
+    if lock is None:
+        yield
+        return
+    while not lock.acquire(timeout=0.1):
+        deadline.check(stage)
+    try:
+        deadline.check(stage)
+        yield
+    finally:
+        lock.release()
+
+
+def _sources_data(nodes: list[NodeWithScore]) -> list[dict[str, Any]]:
+    """Returns the retrieved nodes of an answer as its sources."""
+    return [
+        {
+            "text": node.get_content()[:500] + "...",
+            "score": float(node.get_score() if node.get_score() else 0.0),
+            "node_id": node.node_id,
+            "metadata": node.metadata,
+        }
+        for node in nodes
+    ]
+
+
+def _has_documents(directory: str) -> bool:
+    """Whether a directory holds documents, ignoring hidden files."""
+    path = Path(directory)
+    return path.is_dir() and any(
+        child.is_file() and not child.name.startswith(".") for child in path.iterdir()
+    )
 
 
 async def initialize_rag_service(config: RagServiceConfig) -> RAGService:
     """Creates and initializes all components and the RAG service."""
     logger.info("Initializing RAG service and its components...")
+    apply_thread_budget(thread_budget(config.resources))
     # Initialize components
-    llm_component = HuggingFaceLLMComponent(config)
+    llm_component = LLM_COMPONENTS[config.llm_backend](config)
     llm_component.load()
+    small_llm_component = None
+    if config.routing.enabled:
+        small_llm_component = LLM_COMPONENTS[config.llm_backend](
+            small_llm_config(config)
+        )
+        small_llm_component.load()
     embedding_component = HuggingFaceEmbeddingComponent(config)
     embedding_component.load()
-    vector_store_component = ChromaVectorStoreComponent(config)
+    vector_store_component = create_vector_store_component(config)
     vector_store_component.load()
     # Intialize service
     rag_service = RAGService(
@@ -168,7 +1158,10 @@ async def initialize_rag_service(config: RagServiceConfig) -> RAGService:
         embedding_component=embedding_component,
         vector_store_component=vector_store_component,
         config=config,
+        small_llm_component=small_llm_component,
     )
     rag_service.get_or_create_index()
+    if config.warmup.enabled:
+        rag_service.warm_up()
     logger.info("RAGService instance initialized successfully.")
     return rag_service
@@ -0,0 +1,62 @@
+"""Relevance gate class definition."""
+
+from collections.abc import Sequence
+from logging import getLogger
+
+from llama_index.core.schema import NodeWithScore
+
+from app.core.config.rag import RelevanceGateConfig
+from app.services.metrics import MetricsRegistry
+
+logger = getLogger(__name__)
+
+# Upper bounds of the top score histogram, fine enough to pick a threshold.
+SCORE_BUCKETS = tuple(round(0.05 * i, 2) for i in range(1, 21))
+
+
+def top_score(nodes: Sequence[NodeWithScore]) -> float:
+    """Returns the best score of the retrieved nodes, 0 without nodes."""
+    return max((node.score or 0.0 for node in nodes), default=0.0)
+
+
+class RelevanceGate:
+    """Skips generation for queries whose retrieved context is not relevant.
+
+    Generation is skipped when no retrieved node scores at least the threshold.
+    The best score of every query is recorded, even while the gate is disabled,
+    so the threshold can be tuned from the share of queries below each bucket.
+    """
+
+    def __init__(self, config: RelevanceGateConfig, metrics: MetricsRegistry):
+        """Initializes the gate and registers its metrics."""
+        self._config = config
+        self._top_scores = metrics.histogram(
+            "rag_retrieval_top_score",
+            "Best retrieval score of each query.",
+            buckets=SCORE_BUCKETS,
+        )
+        self._decisions = metrics.counter(
+            "rag_relevance_gate_total",
+            "Queries checked by the relevance gate, by outcome.",
+            label_names=("outcome",),
+        )
+
+    @property
+    def answer(self) -> str:
+        """Returns the answer of the queries that do not pass the gate."""
+        return self._config.answer
+
+    def passes(self, nodes: Sequence[NodeWithScore]) -> bool:
+        """Whether the retrieved nodes are relevant enough to generate an answer."""
+        score = top_score(nodes)
+        self._top_scores.observe(score)
+        if not self._config.enabled:
+            return True
+        passed = score >= self._config.min_score
+        self._decisions.inc(outcome="passed" if passed else "rejected")
+        if not passed:
+            logger.info(
+                f"Best retrieval score {score:.3f} is below "
+                f"{self._config.min_score:.3f}, skipping generation."
+            )
+        return passed
@@ -0,0 +1,278 @@
+"""CPU thread budget and concurrency autotuning function definitions."""
+
+import functools
+import multiprocessing
+import os
+import statistics
+import time
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from logging import getLogger
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from app.core.config.rag import ResourcesConfig
+
+logger = getLogger(__name__)
+
+# Worker processes of the server, as set by run.sh.
+WORKERS_ENV = "WORKERS"
+# Thread pools of the native libraries loaded after the budget is applied.
+THREAD_ENVS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS")
+
+
+@dataclass(frozen=True)
+class ThreadBudget:
+    """Threads and concurrency of a worker process."""
+
+    intra_op_threads: int
+    inter_op_threads: int
+    tokenizers_parallelism: bool
+    max_in_flight: int | None
+
+
+def available_cpus() -> int:
+    """Returns the cores this process may run on."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def worker_count(config: ResourcesConfig) -> int:
+    """Returns the server worker processes sharing the CPU budget."""
+    if config.workers is not None:
+        return config.workers
+    return max(int(os.environ.get(WORKERS_ENV, "1")), 1)
+
+
+def thread_budget(config: ResourcesConfig) -> ThreadBudget:
+    """Returns the threads of a worker, its share of the CPU budget if unset."""
+    cpus = config.cpu_budget or available_cpus()
+    return ThreadBudget(
+        intra_op_threads=config.intra_op_threads
+        or max(cpus // worker_count(config), 1),
+        inter_op_threads=config.inter_op_threads,
+        tokenizers_parallelism=config.tokenizers_parallelism,
+        max_in_flight=config.max_in_flight,
+    )
+
+
+def apply_thread_budget(budget: ThreadBudget) -> None:
+    """Sizes the thread pools of torch and the tokenizers in this process.
+
+    The environment variables cover the native libraries loaded afterwards.
+    torch only sets its inter-op threads before running parallel work, they are
+    kept with a warning otherwise.
+    """
+    import torch
+
+    for name in THREAD_ENVS:
+        os.environ[name] = str(budget.intra_op_threads)
+    os.environ["TOKENIZERS_PARALLELISM"] = str(budget.tokenizers_parallelism).lower()
+    torch.set_num_threads(budget.intra_op_threads)
+    if torch.get_num_interop_threads() != budget.inter_op_threads:
+        try:
+            torch.set_num_interop_threads(budget.inter_op_threads)
+        except RuntimeError:
+            logger.warning(
+                "torch inter-op threads are already in use, keeping "
+                f"{torch.get_num_interop_threads()}."
+            )
+    logger.info(
+        f"Thread budget: {budget.intra_op_threads} intra-op and "
+        f"{torch.get_num_interop_threads()} inter-op torch threads, tokenizers "
+        f"parallelism {'on' if budget.tokenizers_parallelism else 'off'}, "
+        f"{budget.max_in_flight or 'unlimited'} queries in flight."
+    )
+
+
+@functools.cache
+def _stub_weights(dim: int, layers: int) -> list[Any]:
+    import torch
+
+    generator = torch.Generator().manual_seed(0)
+    return [
+        torch.randn(dim, dim, generator=generator) / dim**0.5 for _ in range(layers)
+    ]
+
+
+def stub_workload(dim: int, layers: int, tokens: int = 16) -> None:
+    """Runs the forward pass of a stub model, a stack of dense layers.
+
+    Stands for the embedding and generation passes of a request, exercising the
+    same torch thread pools without loading the models.
+    """
+    import torch
+
+    x = torch.ones(tokens, dim)
+    with torch.inference_mode():
+        for weight in _stub_weights(dim, layers):
+            x = torch.tanh(x @ weight)
+
+
+def _start_trial_worker(inter_op_threads: int) -> None:
+    import torch
+
+    torch.set_num_interop_threads(inter_op_threads)
+
+
+def _run_trial(
+    intra_op_threads: int, max_in_flight: int, requests: int, dim: int, layers: int
+) -> list[float]:
+    """Runs the requests of a worker, some at a time, returning their latencies."""
+    import torch
+
+    torch.set_num_threads(intra_op_threads)
+
+    def timed() -> float:
+        start = time.perf_counter()
+        stub_workload(dim, layers)
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        return list(executor.map(lambda _: timed(), range(requests)))
+
+
+@dataclass
+class TrialResult:
+    """Throughput and latency of the workers with some threads and concurrency."""
+
+    intra_op_threads: int
+    max_in_flight: int
+    throughput: float
+    p50_ms: float
+
+
+def default_thread_counts(cpus: int, workers: int) -> list[int]:
+    """Returns the powers of two up to the cores, with the share of a worker."""
+    counts = {max(cpus // workers, 1)}
+    count = 1
+    while count <= cpus:
+        counts.add(count)
+        count *= 2
+    return sorted(counts)
+
+
+def autotune(
+    config: ResourcesConfig,
+    thread_counts: Sequence[int],
+    in_flight_limits: Sequence[int],
+    requests: int = 32,
+    dim: int = 512,
+    layers: int = 8,
+) -> list[TrialResult]:
+    """Measures the stub workload for every thread count and in-flight limit.
+
+    Every server worker is a process of the sweep, so that they compete for the
+    cores as they would when serving. The processes are started once and reused
+    by all the trials.
+    """
+    workers = worker_count(config)
+    results = []
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_start_trial_worker,
+        initargs=(config.inter_op_threads,),
+    ) as executor:
+
+        def run(threads: int, in_flight: int, requests: int) -> list[float]:
+            futures = [
+                executor.submit(_run_trial, threads, in_flight, requests, dim, layers)
+                for _ in range(workers)
+            ]
+            return [latency for f in futures for latency in f.result()]
+
+        # Starts the processes and allocates the weights before measuring.
+        run(1, 1, 1)
+        for threads in thread_counts:
+            for in_flight in in_flight_limits:
+                start = time.perf_counter()
+                latencies = run(threads, in_flight, requests)
+                elapsed = time.perf_counter() - start
+                result = TrialResult(
+                    intra_op_threads=threads,
+                    max_in_flight=in_flight,
+                    throughput=len(latencies) / elapsed,
+                    p50_ms=statistics.median(latencies) * 1000,
+                )
+                logger.info(
+                    f"{workers} workers x {threads} threads, {in_flight} in flight: "
+                    f"{result.throughput:.1f} requests/s, p50 {result.p50_ms:.1f} ms."
+                )
+                results.append(result)
+    return results
+
+
+def best_trial(results: Sequence[TrialResult], tolerance: float = 0.05) -> TrialResult:
+    """Returns the trial using the fewest threads within a tolerance of the best.
+
+    Trials whose throughput is within the tolerance of the highest one are
+    equivalent, measurement noise aside, and fewer threads leave cores free.
+    """
+    highest = max(result.throughput for result in results)
+    return min(
+        (r for r in results if r.throughput >= highest * (1 - tolerance)),
+        key=lambda r: (r.intra_op_threads, r.max_in_flight),
+    )
+
+
+def _indent(line: str) -> int:
+    return len(line) - len(line.lstrip(" "))
+
+
+def _find_block(
+    lines: list[str], key: str, indent: int, start: int, end: int
+) -> tuple[int, int] | None:
+    """Returns the line range of a mapping key and its nested lines."""
+    for i in range(start, end):
+        if _indent(lines[i]) == indent and lines[i].strip().startswith(f"{key}:"):
+            j = i + 1
+            while j < end and (
+                not lines[j].strip()
+                or lines[j].lstrip().startswith("#")
+                or _indent(lines[j]) > indent
+            ):
+                j += 1
+            # Comments and blank lines at the end belong to the next key.
+            while j > i + 1 and (
+                not lines[j - 1].strip()
+                or (
+                    lines[j - 1].lstrip().startswith("#")
+                    and _indent(lines[j - 1]) <= indent
+                )
+            ):
+                j -= 1
+            return i, j
+    return None
+
+
+def write_resources(config_file: Path, values: dict[str, Any]) -> None:
+    """Writes settings into the 'rag_service.resources' section of a YAML file.
+
+    Only the lines of the given settings are replaced or added, the rest of the
+    file, comments included, is kept as is.
+    """
+    lines = config_file.read_text().splitlines(keepends=True)
+    service = _find_block(lines, "rag_service", 0, 0, len(lines))
+    if service is None:
+        raise ValueError(f"{config_file} has no 'rag_service' section.")
+    resources = _find_block(lines, "resources", 2, service[0] + 1, service[1])
+    if resources is None:
+        lines[service[1] : service[1]] = ["  resources:\n"]
+        resources = (service[1], service[1] + 1)
+    start, end = resources
+    for key, value in values.items():
+        line = "    " + yaml.safe_dump({key: value}, default_flow_style=False)
+        block = _find_block(lines, key, 4, start + 1, end)
+        if block is None:
+            lines.insert(end, line)
+            end += 1
+        else:
+            lines[block[0] : block[1]] = [line]
+            end -= block[1] - block[0] - 1
+    config_file.write_text("".join(lines))
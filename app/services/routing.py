@@ -0,0 +1,112 @@
+"""Query router class definition."""
+
+import re
+from collections.abc import Sequence
+from logging import getLogger
+from typing import Literal
+
+from llama_index.core.schema import MetadataMode, NodeWithScore
+
+from app.core.config.rag import RagServiceConfig, RoutingConfig
+from app.services.artifacts import SMALL_LLM_ARTIFACT, artifact_path
+from app.services.metrics import MetricsRegistry
+
+logger = getLogger(__name__)
+
+Route = Literal["small", "large"]
+
+# Upper bounds of the generation latency histogram, in seconds.
+LATENCY_BUCKETS = (0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 40.0, 80.0, 160.0)
+
+
+def keyword_pattern(keywords: Sequence[str]) -> re.Pattern[str]:
+    """Returns a pattern matching any of the keywords as whole words, in any case."""
+    if not keywords:
+        return re.compile(r"(?!)")
+    return re.compile(
+        r"\b(?:" + "|".join(map(re.escape, keywords)) + r")\b", re.IGNORECASE
+    )
+
+
+def small_llm_config(config: RagServiceConfig) -> RagServiceConfig:
+    """Returns the configuration of the small LLM component.
+
+    The small LLM shares the backend and the generation options of the LLM.
+    With model artifacts, the huggingface backend loads it from its baked
+    directory, so it is never downloaded either.
+    """
+    routing = config.routing
+    if config.llm_backend == "llama_cpp" and routing.small_llama_cpp_model_path is None:
+        raise ValueError(
+            "Routing with the 'llama_cpp' backend requires a small_llama_cpp_model_path."
+        )
+    llm_model_name = routing.small_llm_model_name
+    if config.model_artifacts_dir is not None and config.llm_backend == "huggingface":
+        llm_model_name = str(artifact_path(config, SMALL_LLM_ARTIFACT))
+    return config.model_copy(
+        update={
+            "llm_model_name": llm_model_name,
+            "model_artifacts_dir": None,
+            "speculative_decoding": config.speculative_decoding.model_copy(
+                update={"draft_model_name": None}
+            ),
+            "llama_cpp": config.llama_cpp.model_copy(
+                update={"model_path": routing.small_llama_cpp_model_path}
+            ),
+        }
+    )
+
+
+class QueryRouter:
+    """Routes queries between a small and a large LLM.
+
+    Queries go to the small LLM unless they look hard: long, asking several
+    questions, using words that call for synthesis, or retrieving a long context.
+    Decisions are counted by route and reason, and the generation latency of
+    each route is recorded, so the thresholds can be tuned.
+    """
+
+    def __init__(self, config: RoutingConfig, metrics: MetricsRegistry):
+        """Initializes the router and registers its metrics."""
+        self._config = config
+        self._keywords = keyword_pattern(config.hard_keywords)
+        self._decisions = metrics.counter(
+            "rag_llm_route_total",
+            "Queries routed to each LLM, by route and reason.",
+            label_names=("route", "reason"),
+        )
+        self._latency = metrics.histogram(
+            "rag_llm_generation_seconds",
+            "Generation latency of each LLM route.",
+            buckets=LATENCY_BUCKETS,
+            label_names=("route",),
+        )
+
+    def _decide(self, prompt: str, nodes: Sequence[NodeWithScore]) -> tuple[Route, str]:
+        if not self._config.enabled:
+            return "large", "disabled"
+        if len(prompt.split()) > self._config.max_query_words:
+            return "large", "query_length"
+        if prompt.count("?") > 1:
+            return "large", "questions"
+        if self._keywords.search(prompt):
+            return "large", "keyword"
+        context_words = sum(
+            len(node.node.get_content(metadata_mode=MetadataMode.NONE).split())
+            for node in nodes
+        )
+        if context_words > self._config.max_context_words:
+            return "large", "context_length"
+        return "small", "easy"
+
+    def route(self, prompt: str, nodes: Sequence[NodeWithScore]) -> Route:
+        """Returns the LLM that should answer a query with its retrieved nodes."""
+        route, reason = self._decide(prompt, nodes)
+        self._decisions.inc(route=route, reason=reason)
+        if self._config.enabled:
+            logger.info(f"Routing query to the {route} LLM ({reason}).")
+        return route
+
+    def observe(self, route: Route, seconds: float) -> None:
+        """Records the generation latency of a route."""
+        self._latency.observe(seconds, route=route)
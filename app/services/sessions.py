@@ -0,0 +1,218 @@
+"""Chat session class and function definitions."""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from logging import getLogger
+from typing import Any
+
+from llama_index.core.schema import MetadataMode, NodeWithScore
+
+from app.core.config.rag import SessionsConfig
+from app.services.components.base import PrefixCache
+from app.services.metrics import MetricsRegistry
+
+logger = getLogger(__name__)
+
+SESSION_ID_PATTERN = r"^[0-9a-f]{32}$"
+
+CHAT_PREAMBLE = (
+    "You are a professional and objective assistant having a conversation with a "
+    "user. Answer their questions based exclusively on the context provided in "
+    "the conversation. If the context does not contain the information to "
+    "answer a question, say so. Do not make up information.\n"
+)
+
+
+def turn_prompt(question: str, nodes: Sequence[NodeWithScore]) -> str:
+    """Returns the text a turn appends to the conversation.
+
+    Only the retrieved nodes that are not in the conversation yet are added as
+    context, before the question.
+    """
+    prompt = ""
+    if nodes:
+        context = "\n\n".join(
+            node.node.get_content(metadata_mode=MetadataMode.LLM) for node in nodes
+        )
+        prompt += (
+            f"\nContext:\n---------------------\n{context}\n---------------------\n"
+        )
+    return prompt + f"\nUser: {question}\nAssistant:"
+
+
+@dataclass
+class ChatTurn:
+    """Question and answer of a turn, with the text it added to the conversation."""
+
+    question: str
+    answer: str
+    prompt: str
+    node_ids: list[str]
+    partial: bool = False
+
+
+@dataclass
+class ChatSession:
+    """Conversation of a client, with the KV cache of its prompt, if any.
+
+    The prompt of the conversation only grows, turn after turn, so the next
+    turn reuses the cached tokens it shares with the previous one. Turns
+    dropped from the prompt stay in the history, but invalidate the cache.
+    """
+
+    tenant: str | None
+    session_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    created_at: float = field(default_factory=time.time)
+    last_used: float = field(default_factory=time.monotonic)
+    turns: list[ChatTurn] = field(default_factory=list)
+    first_turn: int = 0
+    cache: PrefixCache | None = None
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def prompt_turns(self) -> list[ChatTurn]:
+        """Returns the turns in the prompt of the conversation."""
+        return self.turns[self.first_turn :]
+
+    @property
+    def context_node_ids(self) -> set[str]:
+        """Returns the nodes in the prompt of the conversation."""
+        return {node_id for turn in self.prompt_turns for node_id in turn.node_ids}
+
+    @property
+    def memory_bytes(self) -> int:
+        """Returns the estimated memory held by the history and the KV cache."""
+        text_bytes = sum(
+            len(turn.question) + len(turn.answer) + len(turn.prompt)
+            for turn in self.turns
+        )
+        return text_bytes + (self.cache.memory_bytes if self.cache else 0)
+
+    def transcript(self) -> str:
+        """Returns the prompt of the conversation, up to its last answer."""
+        return CHAT_PREAMBLE + "".join(
+            f"{turn.prompt} {turn.answer}" for turn in self.prompt_turns
+        )
+
+    def drop_oldest_turn(self) -> None:
+        """Removes the oldest turn from the prompt, invalidating the cache."""
+        self.first_turn += 1
+        self.cache = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Returns the session history as a serializable dictionary."""
+        return {
+            "session_id": self.session_id,
+            "tenant": self.tenant,
+            "created_at": self.created_at,
+            "turns": [
+                {
+                    "question": turn.question,
+                    "answer": turn.answer,
+                    "partial": turn.partial,
+                }
+                for turn in self.turns
+            ],
+        }
+
+
+class SessionStore:
+    """Bounded store of the chat sessions.
+
+    Sessions expire once idle for longer than the TTL. Beyond the maximum
+    number of sessions or their memory budget, the least recently used ones
+    are evicted. The session in use is never evicted.
+    """
+
+    def __init__(self, config: SessionsConfig, metrics: MetricsRegistry):
+        """Initializes an empty store and registers its metrics."""
+        self._config = config
+        self._max_memory_bytes = int(config.max_memory_mb * 1024**2)
+        self._sessions: OrderedDict[str, ChatSession] = OrderedDict()
+        self._lock = threading.Lock()
+        self._evictions = metrics.counter(
+            "rag_chat_sessions_evicted_total",
+            "Chat sessions evicted, by reason.",
+            label_names=("reason",),
+        )
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    @property
+    def memory_bytes(self) -> int:
+        """Returns the estimated memory held by the sessions."""
+        return sum(session.memory_bytes for session in self._sessions.values())
+
+    def create(self, tenant: str | None) -> ChatSession:
+        """Starts a session, evicting others to stay within the limits."""
+        session = ChatSession(tenant=tenant)
+        with self._lock:
+            self._sessions[session.session_id] = session
+            self._evict()
+        return session
+
+    def get(self, session_id: str, tenant: str | None) -> ChatSession | None:
+        """Returns a live session of a tenant, marking it as recently used."""
+        with self._lock:
+            self._expire()
+            session = self._sessions.get(session_id)
+            if session is None or session.tenant != tenant:
+                return None
+            session.last_used = time.monotonic()
+            self._sessions.move_to_end(session_id)
+            return session
+
+    def update(self, session: ChatSession) -> None:
+        """Accounts for the memory of a session after a turn."""
+        with self._lock:
+            session.last_used = time.monotonic()
+            if session.session_id in self._sessions:
+                self._sessions.move_to_end(session.session_id)
+            self._evict()
+
+    def delete(self, session_id: str, tenant: str | None) -> bool:
+        """Ends a session of a tenant, returning whether it existed."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None or session.tenant != tenant:
+                return False
+            del self._sessions[session_id]
+            return True
+
+    def clear(self) -> None:
+        """Ends all the sessions."""
+        with self._lock:
+            self._sessions.clear()
+
+    def _expire(self) -> None:
+        deadline = time.monotonic() - self._config.ttl_s
+        # Sessions are ordered by last use, the expired ones come first.
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if session.last_used > deadline:
+                break
+            self._remove(session, "ttl")
+
+    def _evict(self) -> None:
+        self._expire()
+        while len(self._sessions) > 1:
+            if len(self._sessions) > self._config.max_sessions:
+                reason = "lru"
+            elif self.memory_bytes > self._max_memory_bytes:
+                reason = "memory"
+            else:
+                break
+            self._remove(next(iter(self._sessions.values())), reason)
+
+    def _remove(self, session: ChatSession, reason: str) -> None:
+        del self._sessions[session.session_id]
+        self._evictions.inc(reason=reason)
+        logger.info(
+            f"Evicting chat session {session.session_id} ({reason}, "
+            f"~{session.memory_bytes / 1024**2:.1f} MB)."
+        )
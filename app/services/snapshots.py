@@ -0,0 +1,198 @@
+"""Portable index snapshot function definitions."""
+
+import json
+import shutil
+import tempfile
+import time
+import zipfile
+from itertools import islice
+from logging import getLogger
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from llama_index.core.schema import BaseNode, MetadataMode
+from llama_index.core.vector_stores.utils import (
+    metadata_dict_to_node,
+    node_to_metadata_dict,
+)
+
+from app.core.config.rag import RagServiceConfig
+from app.services.components.base import VectorStoreComponent
+
+logger = getLogger(__name__)
+
+SNAPSHOT_FORMAT_VERSION = 1
+# Chroma rejects larger inserts than about 5k embeddings at a time.
+DEFAULT_BATCH_SIZE = 4096
+
+_MANIFEST = "manifest.json"
+_EMBEDDINGS = "embeddings.f32"
+_RECORDS = "records.jsonl"
+_EMBEDDING_DTYPE = np.dtype("<f4")
+
+
+def index_params(config: RagServiceConfig) -> dict[str, Any]:
+    """Returns the parameters of the configured vector store index."""
+    if config.vector_store_backend == "mmap":
+        return {"backend": "mmap", **config.mmap_store.model_dump()}
+    return {"backend": "chroma", "hnsw:space": "l2"}
+
+
+def _member(name: str, compress_type: int) -> zipfile.ZipInfo:
+    """Returns the archive entry of a snapshot file."""
+    info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+    info.compress_type = compress_type
+    return info
+
+
+def _record(node: BaseNode) -> bytes:
+    """Serializes the text and metadata of a node as a JSON line."""
+    return (
+        json.dumps(
+            {
+                "text": node.get_content(metadata_mode=MetadataMode.NONE),
+                "metadata": node_to_metadata_dict(
+                    node, remove_text=True, flat_metadata=False
+                ),
+            },
+            ensure_ascii=False,
+        ).encode()
+        + b"\n"
+    )
+
+
+def export_snapshot(
+    config: RagServiceConfig,
+    vector_store_component: VectorStoreComponent,
+    output: Path,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> dict[str, Any]:
+    """Writes every node of a collection with its embedding to a snapshot file.
+
+    The snapshot is a zip archive holding the embeddings as one raw float32
+    column, the node text and metadata as compressed JSON lines in the same
+    order, and a manifest with the embedding model and index parameters. It is
+    written to a temporary file first, so an interrupted export leaves no
+    snapshot behind.
+    """
+    start = time.perf_counter()
+    count = dim = 0
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output.with_name(f"{output.name}.tmp")
+    with (
+        tempfile.TemporaryFile(dir=output.parent) as embeddings_file,
+        zipfile.ZipFile(tmp_path, "w", allowZip64=True) as archive,
+    ):
+        with archive.open(_member(_RECORDS, zipfile.ZIP_DEFLATED), "w") as records:
+            for nodes in vector_store_component.iter_nodes(batch_size):
+                embeddings = np.asarray(
+                    [node.get_embedding() for node in nodes], dtype=_EMBEDDING_DTYPE
+                )
+                dim = embeddings.shape[1]
+                embeddings_file.write(embeddings.tobytes())
+                records.writelines(_record(node) for node in nodes)
+                count += len(nodes)
+
+        embeddings_file.seek(0)
+        with archive.open(
+            _member(_EMBEDDINGS, zipfile.ZIP_STORED), "w", force_zip64=True
+        ) as embeddings:
+            shutil.copyfileobj(embeddings_file, embeddings)
+
+        manifest = {
+            "format_version": SNAPSHOT_FORMAT_VERSION,
+            "embed_model_name": config.embed_model_name,
+            "collection_name": config.collection_name,
+            "index_params": index_params(config),
+            "count": count,
+            "dim": dim,
+        }
+        archive.writestr(_MANIFEST, json.dumps(manifest, indent=2))
+    tmp_path.replace(output)
+
+    logger.info(
+        f"Exported {count} nodes of collection '{config.collection_name}' to "
+        f"{output} in {time.perf_counter() - start:.1f} s "
+        f"({output.stat().st_size / 1024**2:.1f} MB)."
+    )
+    return manifest
+
+
+def read_manifest(archive: zipfile.ZipFile, config: RagServiceConfig) -> dict[str, Any]:
+    """Returns the manifest of a snapshot, checking it fits the configuration.
+
+    Raises if the file is not a snapshot of a supported format version, or if
+    its embeddings were computed by another model than the configured one.
+    """
+    if _MANIFEST not in archive.namelist():
+        raise ValueError(f"{archive.filename} is not an index snapshot.")
+    manifest = json.loads(archive.read(_MANIFEST))
+    if manifest["format_version"] != SNAPSHOT_FORMAT_VERSION:
+        raise ValueError(
+            f"Snapshot format version {manifest['format_version']} is not "
+            f"supported, expected {SNAPSHOT_FORMAT_VERSION}."
+        )
+    if manifest["embed_model_name"] != config.embed_model_name:
+        raise ValueError(
+            f"Snapshot {archive.filename} was exported with the embedding model "
+            f"{manifest['embed_model_name']}, not with the configured "
+            f"{config.embed_model_name}. Reindex the documents instead."
+        )
+    if manifest["index_params"] != index_params(config):
+        logger.warning(
+            f"Snapshot index parameters {manifest['index_params']} differ from the "
+            f"configured {index_params(config)}, the index is rebuilt on import."
+        )
+    return manifest
+
+
+def import_snapshot(
+    config: RagServiceConfig,
+    vector_store_component: VectorStoreComponent,
+    snapshot: Path,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> dict[str, Any]:
+    """Loads the nodes of a snapshot file into an empty collection.
+
+    Nodes are streamed from the snapshot and written to the vector store in
+    batches, with their exported embeddings, so nothing is re-embedded.
+    """
+    start = time.perf_counter()
+    with zipfile.ZipFile(snapshot) as archive:
+        manifest = read_manifest(archive, config)
+        if vector_store_component.count():
+            raise ValueError(
+                f"Collection '{config.collection_name}' is not empty. "
+                "Clear it before importing a snapshot."
+            )
+
+        store = vector_store_component.get_store()
+        row_bytes = manifest["dim"] * _EMBEDDING_DTYPE.itemsize
+        imported = 0
+        with archive.open(_RECORDS) as records, archive.open(_EMBEDDINGS) as embeddings:
+            while lines := list(islice(records, batch_size)):
+                vectors = np.frombuffer(
+                    embeddings.read(len(lines) * row_bytes), dtype=_EMBEDDING_DTYPE
+                ).reshape(len(lines), manifest["dim"])
+                nodes = []
+                for line, vector in zip(lines, vectors, strict=True):
+                    record = json.loads(line)
+                    node = metadata_dict_to_node(
+                        record["metadata"], text=record["text"]
+                    )
+                    node.embedding = vector.tolist()
+                    nodes.append(node)
+                store.add(nodes)
+                imported += len(nodes)
+
+    if imported != manifest["count"]:
+        raise ValueError(
+            f"Snapshot {snapshot} holds {imported} nodes, "
+            f"but its manifest declares {manifest['count']}."
+        )
+    logger.info(
+        f"Imported {imported} nodes into collection '{config.collection_name}' "
+        f"from {snapshot} in {time.perf_counter() - start:.1f} s."
+    )
+    return manifest
@@ -0,0 +1,114 @@
+"""Speculative decoding statistics class definitions."""
+
+import threading
+import time
+from dataclasses import dataclass
+from logging import getLogger
+from typing import Any
+
+logger = getLogger(__name__)
+
+
+@dataclass
+class DecodingStats:
+    """Tokens proposed by a draft model, accepted by the main model and timing."""
+
+    generations: int = 0
+    new_tokens: int = 0
+    draft_tokens: int = 0
+    accepted_tokens: int = 0
+    seconds: float = 0.0
+
+    @property
+    def acceptance_rate(self) -> float:
+        """Share of the draft tokens accepted by the main model."""
+        return self.accepted_tokens / self.draft_tokens if self.draft_tokens else 0.0
+
+    @property
+    def tokens_per_second(self) -> float:
+        """Generated tokens per second, prompt processing included."""
+        return self.new_tokens / self.seconds if self.seconds else 0.0
+
+    def add(self, other: "DecodingStats") -> None:
+        """Accumulates the statistics of another generation."""
+        self.generations += other.generations
+        self.new_tokens += other.new_tokens
+        self.draft_tokens += other.draft_tokens
+        self.accepted_tokens += other.accepted_tokens
+        self.seconds += other.seconds
+
+
+class SpeculativeDecodingMonitor:
+    """Measures the acceptance rate and the throughput of assisted generations.
+
+    Every forward pass of the draft model proposes one token, and every forward
+    pass of the main model verifies the proposed tokens and adds one of its own,
+    so the accepted tokens are the generated tokens minus the main model forward
+    passes. Passes are counted per thread, so concurrent generations do not mix.
+    """
+
+    def __init__(self, model: Any, draft_model: Any):
+        """Hooks into the forward passes and the generate method of the models."""
+        self.stats = DecodingStats()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._hooks = [
+            model.register_forward_hook(self._count("main_passes")),
+            draft_model.register_forward_hook(self._count("draft_passes")),
+        ]
+        self._model = model
+        self._generate = model.generate
+        self._wrapped_generate = "generate" in vars(model)
+        model.generate = self._timed_generate
+
+    def _count(self, counter: str) -> Any:
+        """Returns a forward hook incrementing a counter of the current thread."""
+
+        def hook(*_: Any) -> None:
+            if getattr(self._local, "active", False):
+                setattr(self._local, counter, getattr(self._local, counter) + 1)
+
+        return hook
+
+    def _timed_generate(self, *args: Any, **kwargs: Any) -> Any:
+        """Runs a generation, recording its statistics if it is assisted."""
+        if kwargs.get("assistant_model") is None:
+            return self._generate(*args, **kwargs)
+        input_ids = kwargs.get("input_ids", args[0] if args else None)
+        self._local.main_passes = 0
+        self._local.draft_passes = 0
+        self._local.active = True
+        start = time.perf_counter()
+        try:
+            output = self._generate(*args, **kwargs)
+        finally:
+            self._local.active = False
+        sequences = getattr(output, "sequences", output)
+        new_tokens = sequences.shape[-1] - (
+            input_ids.shape[-1] if input_ids is not None else 0
+        )
+        generation = DecodingStats(
+            generations=1,
+            new_tokens=new_tokens,
+            draft_tokens=self._local.draft_passes,
+            accepted_tokens=max(new_tokens - self._local.main_passes, 0),
+            seconds=time.perf_counter() - start,
+        )
+        with self._lock:
+            self.stats.add(generation)
+        logger.info(
+            f"Assisted generation: {generation.new_tokens} tokens at "
+            f"{generation.tokens_per_second:.1f} tokens/s, "
+            f"{generation.accepted_tokens}/{generation.draft_tokens} draft tokens "
+            f"accepted ({generation.acceptance_rate:.0%})."
+        )
+        return output
+
+    def remove(self) -> None:
+        """Removes the hooks from the models."""
+        for hook in self._hooks:
+            hook.remove()
+        if self._wrapped_generate:
+            self._model.generate = self._generate
+        else:
+            del self._model.generate
@@ -0,0 +1,203 @@
+"""Precomputed document summary class and function definitions."""
+
+import hashlib
+import json
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import asdict, dataclass
+from logging import getLogger
+from pathlib import Path
+
+from llama_index.core.prompts import PromptTemplate
+from llama_index.core.schema import Document, NodeWithScore, TextNode
+from llama_index.core.vector_stores.types import FilterOperator, MetadataFilters
+
+from app.core.config.rag import RagServiceConfig, SummariesConfig
+from app.services.metadata import FILE_NAME_KEY
+
+logger = getLogger(__name__)
+
+SUMMARIES_DIR = "summaries"
+
+SECTION_PROMPT = PromptTemplate(
+    "Summarize the following excerpt of the document '{file_name}' in a few "
+    "sentences. Keep its key facts, figures and conclusions.\n\n"
+    "Excerpt:\n---------------------\n{text}\n---------------------\n\nSummary:"
+)
+ROLLUP_PROMPT = PromptTemplate(
+    "The following are summaries of consecutive parts of the document "
+    "'{file_name}'. Combine them into a single summary of the document, keeping "
+    "its purpose, key facts and conclusions.\n\n"
+    "Summaries:\n---------------------\n{text}\n---------------------\n\nSummary:"
+)
+
+# Generates the completion of a prompt.
+Complete = Callable[[str], str]
+
+
+@dataclass
+class DocumentSummary:
+    """Hierarchical summary of a document file."""
+
+    file_name: str
+    sha256: str
+    sections: list[str]
+    summary: str
+
+
+def summaries_path(config: RagServiceConfig) -> Path:
+    """Returns the file holding the document summaries of a collection."""
+    return config.vector_store_path / SUMMARIES_DIR / f"{config.collection_name}.json"
+
+
+def file_sha256(path: Path) -> str:
+    """Returns the SHA-256 digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        while chunk := f.read(1024**2):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _iter_sections(documents: Iterable[Document], section_words: int) -> Iterator[str]:
+    """Yields the text of consecutive sections of at most some words."""
+    words: list[str] = []
+    for document in documents:
+        words.extend(document.text.split())
+        while len(words) >= section_words:
+            yield " ".join(words[:section_words])
+            del words[:section_words]
+    if words:
+        yield " ".join(words)
+
+
+def summarize_document(
+    file_name: str,
+    documents: Iterable[Document],
+    complete: Complete,
+    config: SummariesConfig,
+) -> tuple[list[str], str]:
+    """Returns the section summaries and the summary of a document.
+
+    Sections of the document are summarized one at a time, then their summaries
+    are rolled up in groups until a single summary is left.
+    """
+    sections = [
+        complete(SECTION_PROMPT.format(file_name=file_name, text=text))
+        for text in _iter_sections(documents, config.section_words)
+    ]
+    level = sections
+    while len(level) > 1:
+        level = [
+            complete(
+                ROLLUP_PROMPT.format(
+                    file_name=file_name,
+                    text="\n\n".join(level[i : i + config.rollup_fan_in]),
+                )
+            )
+            for i in range(0, len(level), config.rollup_fan_in)
+        ]
+    return sections, level[0] if level else ""
+
+
+def filtered_file_names(filters: MetadataFilters | None) -> list[str] | None:
+    """Returns the file names a query is scoped to, all of them if unset.
+
+    Returns None when the query has filters that summaries cannot honour, such
+    as page ranges or tags.
+    """
+    if filters is None:
+        return []
+    if len(filters.filters) != 1:
+        return None
+    file_filter = filters.filters[0]
+    if (
+        getattr(file_filter, "key", None) != FILE_NAME_KEY
+        or file_filter.operator != FilterOperator.IN
+    ):
+        return None
+    return list(file_filter.value)
+
+
+class SummaryStore:
+    """Document summaries of a collection, persisted as a JSON file.
+
+    Summaries are keyed by file name, with the digest of the file they were
+    generated from, so only new and changed files are summarized again.
+    """
+
+    def __init__(self, path: Path):
+        """Initializes the store, loading the summaries of an existing file."""
+        self._path = path
+        self._lock = threading.Lock()
+        self._summaries: dict[str, DocumentSummary] = {}
+        if path.is_file():
+            self._summaries = {
+                entry["file_name"]: DocumentSummary(**entry)
+                for entry in json.loads(path.read_text())
+            }
+
+    def _save(self) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._path.with_name(f"{self._path.name}.tmp")
+        tmp_path.write_text(
+            json.dumps([asdict(s) for s in self._summaries.values()], indent=2)
+        )
+        tmp_path.replace(self._path)
+
+    def nodes(self, file_names: Iterable[str] = ()) -> list[NodeWithScore]:
+        """Returns the summaries of some documents, or of all, as nodes."""
+        names = set(file_names)
+        return [
+            NodeWithScore(
+                node=TextNode(
+                    text=summary.summary,
+                    metadata={FILE_NAME_KEY: summary.file_name, "summary": True},
+                ),
+                score=1.0,
+            )
+            # Copied first, a refresh may be adding summaries meanwhile.
+            for summary in list(self._summaries.values())
+            if summary.summary and (not names or summary.file_name in names)
+        ]
+
+    def refresh(
+        self,
+        input_files: Iterable[Path],
+        read: Callable[[Path], Iterable[Document]],
+        complete: Complete,
+        config: SummariesConfig,
+    ) -> int:
+        """Summarizes the new and changed files and forgets the removed ones.
+
+        Returns the number of summarized files. The store is saved after every
+        file, so an interrupted refresh keeps the summaries generated so far.
+        """
+        with self._lock:
+            input_files = list(input_files)
+            names = {path.name for path in input_files}
+            removed = set(self._summaries) - names
+            for name in removed:
+                del self._summaries[name]
+
+            summarized = 0
+            for path in input_files:
+                sha256 = file_sha256(path)
+                existing = self._summaries.get(path.name)
+                if existing is not None and existing.sha256 == sha256:
+                    continue
+                logger.info(f"Summarizing document: {path.name}")
+                sections, summary = summarize_document(
+                    path.name, read(path), complete, config
+                )
+                self._summaries[path.name] = DocumentSummary(
+                    file_name=path.name,
+                    sha256=sha256,
+                    sections=sections,
+                    summary=summary,
+                )
+                self._save()
+                summarized += 1
+            if removed and not summarized:
+                self._save()
+            return summarized
@@ -0,0 +1,100 @@
+"""Tenant index cache class definition."""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from logging import getLogger
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from llama_index.core import VectorStoreIndex
+
+    from app.services.components.base import VectorStoreComponent
+
+logger = getLogger(__name__)
+
+# Tenant names become part of collection names and document directories.
+TENANT_NAME_PATTERN = r"^[A-Za-z0-9][A-Za-z0-9_-]{0,62}$"
+
+
+def estimate_index_bytes(num_vectors: int, embedding_dim: int) -> int:
+    """Estimates the memory held by an index: its float32 vectors."""
+    return num_vectors * embedding_dim * 4
+
+
+@dataclass
+class TenantIndex:
+    """Open index of a tenant and the vector store backing it."""
+
+    tenant: str
+    index: "VectorStoreIndex"
+    vector_store_component: "VectorStoreComponent"
+    memory_bytes: int = 0
+
+
+class TenantIndexCache:
+    """Bounded LRU cache of the open tenant indexes.
+
+    Indexes are evicted, least recently used first, when the number of open
+    indexes or their estimated memory exceed the limits. The most recently added
+    index is never evicted, even if it alone exceeds the memory budget. Evicted
+    indexes shut down their vector store to release its resources.
+    """
+
+    def __init__(self, max_open: int, max_memory_bytes: int | None = None):
+        """Initializes an empty cache."""
+        self._max_open = max_open
+        self._max_memory_bytes = max_memory_bytes
+        self._entries: OrderedDict[str, TenantIndex] = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, tenant: str) -> bool:
+        return tenant in self._entries
+
+    @property
+    def memory_bytes(self) -> int:
+        """Returns the estimated memory held by the open indexes."""
+        return sum(entry.memory_bytes for entry in self._entries.values())
+
+    def get(self, tenant: str) -> TenantIndex | None:
+        """Returns the open index of a tenant, marking it as recently used."""
+        with self._lock:
+            entry = self._entries.get(tenant)
+            if entry is not None:
+                self._entries.move_to_end(tenant)
+            return entry
+
+    def put(self, entry: TenantIndex) -> None:
+        """Adds the index of a tenant, evicting the least recently used ones."""
+        with self._lock:
+            self.discard(entry.tenant)
+            self._entries[entry.tenant] = entry
+            while len(self._entries) > 1 and (
+                len(self._entries) > self._max_open
+                or (
+                    self._max_memory_bytes is not None
+                    and self.memory_bytes > self._max_memory_bytes
+                )
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                logger.info(
+                    f"Evicting index of tenant '{evicted.tenant}' "
+                    f"(~{evicted.memory_bytes / 1024**2:.1f} MB)."
+                )
+                evicted.vector_store_component.shutdown()
+
+    def discard(self, tenant: str) -> None:
+        """Closes the index of a tenant, if open."""
+        with self._lock:
+            entry = self._entries.pop(tenant, None)
+            if entry is not None:
+                entry.vector_store_component.shutdown()
+
+    def clear(self) -> None:
+        """Closes all the open indexes."""
+        with self._lock:
+            for tenant in list(self._entries):
+                self.discard(tenant)
@@ -0,0 +1,137 @@
+"""Document upload and indexing job definitions."""
+
+import asyncio
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from logging import getLogger
+from pathlib import Path
+from typing import Any, Literal
+
+from app.core.exceptions import FileTooLargeError, FileUploadError
+
+logger = getLogger(__name__)
+
+# Uploaded file names become document names in the documents directory.
+UPLOAD_FILE_NAME_PATTERN = r"^[A-Za-z0-9][A-Za-z0-9 _.()-]{0,250}\.pdf$"
+PDF_MAGIC = b"%PDF-"
+
+JobStatus = Literal["pending", "running", "completed", "failed"]
+
+
+def staging_path(path: Path, job_id: str) -> Path:
+    """Returns the hidden path an upload is written to until it is indexed.
+
+    Readers skip hidden files, so a reindex never picks up a document twice.
+    """
+    return path.with_name(f".{job_id}-{path.name}")
+
+
+async def save_upload(chunks: AsyncIterator[bytes], path: Path, max_bytes: int) -> int:
+    """Streams an uploaded PDF to disk, chunk by chunk, and returns its size.
+
+    The body is never held in memory as a whole. Uploads that are not PDF files
+    or exceed the maximum size are rejected and their partial file removed.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    size, head = 0, b""
+    try:
+        with path.open("xb") as f:
+            async for chunk in chunks:
+                if len(head) < len(PDF_MAGIC):
+                    head += chunk[: len(PDF_MAGIC) - len(head)]
+                    if not PDF_MAGIC.startswith(head):
+                        raise FileUploadError(
+                            "The uploaded file is not a PDF document."
+                        )
+                size += len(chunk)
+                if size > max_bytes:
+                    raise FileTooLargeError(
+                        f"The uploaded file exceeds {max_bytes / 1024**2:.1f} MB."
+                    )
+                await asyncio.to_thread(f.write, chunk)
+        if head != PDF_MAGIC:
+            raise FileUploadError("The uploaded file is not a PDF document.")
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+    return size
+
+
+@dataclass
+class UploadJob:
+    """Background indexing job of an uploaded document."""
+
+    file_name: str
+    tenant: str | None
+    path: Path
+    size_bytes: int = 0
+    job_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: JobStatus = "pending"
+    created_at: float = field(default_factory=time.time)
+    finished_at: float | None = None
+    nodes: int = 0
+    error: str | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Returns the job status as a dictionary."""
+        return {
+            "job_id": self.job_id,
+            "file_name": self.file_name,
+            "tenant": self.tenant,
+            "size_bytes": self.size_bytes,
+            "status": self.status,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "nodes": self.nodes,
+            "error": self.error,
+        }
+
+
+class UploadJobs:
+    """Bounded registry of the upload indexing jobs.
+
+    The oldest finished jobs are forgotten when the registry is full. Jobs that
+    are still pending or running are always kept.
+    """
+
+    def __init__(self, max_jobs: int):
+        """Initializes an empty registry."""
+        self._max_jobs = max_jobs
+        self._jobs: OrderedDict[str, UploadJob] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def add(self, job: UploadJob) -> None:
+        """Registers a new job, forgetting the oldest finished ones.
+
+        Raises if another job is already uploading or indexing the same document.
+        """
+        with self._lock:
+            if any(
+                entry.path == job.path and entry.status in ("pending", "running")
+                for entry in self._jobs.values()
+            ):
+                raise FileUploadError(f"'{job.file_name}' is already being uploaded.")
+            self._jobs[job.job_id] = job
+            finished = [
+                job_id
+                for job_id, entry in self._jobs.items()
+                if entry.status in ("completed", "failed")
+            ]
+            for job_id in finished[: max(len(self._jobs) - self._max_jobs, 0)]:
+                del self._jobs[job_id]
+
+    def get(self, job_id: str) -> UploadJob | None:
+        """Returns a job by id."""
+        return self._jobs.get(job_id)
+
+    def discard(self, job_id: str) -> None:
+        """Forgets a job, if registered."""
+        with self._lock:
+            self._jobs.pop(job_id, None)
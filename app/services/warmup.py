@@ -0,0 +1,135 @@
+"""Model warm-up function definitions."""
+
+import statistics
+import time
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass
+from logging import getLogger
+from typing import Any
+
+from llama_index.core.base.base_retriever import BaseRetriever
+from llama_index.core.embeddings import BaseEmbedding
+from llama_index.core.llms import LLM
+
+logger = getLogger(__name__)
+
+_FILLER = (
+    "Retrieval augmented generation grounds the answers of a language model in "
+    "passages retrieved from an indexed collection of documents."
+)
+
+
+def filler_text(num_words: int) -> str:
+    """Returns a text of roughly num_words words."""
+    words = _FILLER.split(" ")
+    return " ".join(words[i % len(words)] for i in range(num_words))
+
+
+@dataclass
+class WarmupTiming:
+    """Latency of the first (cold) and the following (steady) runs of a step."""
+
+    step: str
+    first_ms: float
+    steady_ms: float
+
+    @property
+    def speedup(self) -> float:
+        """Ratio between the cold and the steady-state latency."""
+        return self.first_ms / self.steady_ms if self.steady_ms else 0.0
+
+
+def time_step(step: str, fn: Callable[[], Any], repeats: int) -> WarmupTiming:
+    """Runs a warm-up step repeatedly, timing the first and the median later run."""
+    latencies = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - start) * 1000)
+    timing = WarmupTiming(
+        step=step,
+        first_ms=latencies[0],
+        steady_ms=statistics.median(latencies[1:]) if repeats > 1 else latencies[0],
+    )
+    logger.info(
+        f"Warm-up {step}: first call {timing.first_ms:.1f} ms, "
+        f"steady state {timing.steady_ms:.1f} ms ({timing.speedup:.1f}x)."
+    )
+    return timing
+
+
+def compile_model(model: Any, mode: str = "default") -> bool:
+    """Compiles the forward pass of the torch module wrapped by a model.
+
+    Compilation is lazy, the kernels are generated by the first calls of the
+    warm-up. Returns whether the model wraps a torch module that was compiled.
+    """
+    import torch
+
+    module = getattr(model, "_model", None)
+    if not isinstance(module, torch.nn.Module):
+        logger.warning(f"{type(model).__name__} does not wrap a torch module.")
+        return False
+    device = next(module.parameters(), torch.empty(0)).device
+    logger.info(f"Compiling {type(module).__name__} on {device} (mode: {mode}).")
+    module.forward = torch.compile(module.forward, mode=mode, dynamic=True)
+    return True
+
+
+def _with_max_new_tokens(llm: LLM, max_new_tokens: int) -> LLM:
+    """Returns a copy of the LLM, sharing its weights, that generates fewer tokens."""
+    update: dict[str, Any] = {"max_new_tokens": max_new_tokens}
+    # Some backends, such as llama.cpp, copy the limit into their generate kwargs.
+    generate_kwargs = getattr(llm, "generate_kwargs", None)
+    if isinstance(generate_kwargs, dict) and "max_tokens" in generate_kwargs:
+        update["generate_kwargs"] = generate_kwargs | {"max_tokens": max_new_tokens}
+    return llm.model_copy(update=update)
+
+
+def warm_up(
+    llms: Mapping[str, LLM],
+    embed_model: BaseEmbedding,
+    retriever: BaseRetriever,
+    embedding_batch_sizes: Sequence[int],
+    prompt_lengths: Sequence[int],
+    max_new_tokens: int,
+    repeats: int,
+) -> list[WarmupTiming]:
+    """Runs representative embedding batches, generations and vector searches.
+
+    The first calls page the weights in, grow the allocator pools and select the
+    kernels for each input shape, so that the first user queries run at steady
+    state latency. Every LLM, by name, runs the generations.
+    """
+    timings = [
+        time_step(
+            f"embedding batch={batch_size}",
+            lambda batch_size=batch_size: embed_model.get_text_embedding_batch(
+                [filler_text(64)] * batch_size
+            ),
+            repeats,
+        )
+        for batch_size in embedding_batch_sizes
+    ]
+    timings.append(
+        time_step(
+            "vector search",
+            lambda: retriever.retrieve(filler_text(12)),
+            repeats,
+        )
+    )
+
+    # Generate a few tokens only, the prompt length drives the prefill shapes.
+    for name, llm in llms.items():
+        short_llm = _with_max_new_tokens(llm, max_new_tokens)
+        timings.extend(
+            time_step(
+                f"generation llm={name} prompt={num_words} words",
+                lambda short_llm=short_llm, num_words=num_words: short_llm.complete(
+                    filler_text(num_words)
+                ),
+                repeats,
+            )
+            for num_words in prompt_lengths
+        )
+    return timings
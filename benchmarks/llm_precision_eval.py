@@ -0,0 +1,170 @@
+"""LLM precision evaluation.
+
+Compares the LLM loaded at the precisions of ``rag_service.llm_precision``
+against the float32 baseline on a fixed question set. For every precision it
+reports:
+
+* answer overlap with the float32 answers (token F1 and exact match),
+* generated tokens per second,
+* peak resident memory of the process and model load time.
+
+Every precision is loaded in a fresh process, so peak memory is not polluted
+by the other runs. Decoding is greedy, so answer differences come from the
+precision only.
+
+Usage:
+    uv run python benchmarks/llm_precision_eval.py --precisions float32 bfloat16 int8
+"""
+
+import argparse
+import multiprocessing
+import re
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+QUESTIONS = [
+    "What is a large language model?",
+    "Explain in two sentences what retrieval augmented generation is.",
+    "Which data sources are commonly used to pre-train language models?",
+    "What is the difference between pre-training and fine-tuning?",
+    "Why do transformers need positional information?",
+    "What does a tokenizer do?",
+    "Name three ways to reduce the memory footprint of a neural network.",
+    "What is the capital of France?",
+]
+
+BASELINE = "float32"
+
+
+def token_f1(prediction: str, reference: str) -> float:
+    """Returns the word-level F1 overlap between two answers."""
+    predicted = re.findall(r"\w+", prediction.lower())
+    expected = re.findall(r"\w+", reference.lower())
+    if not predicted or not expected:
+        return float(predicted == expected)
+    common = sum((Counter(predicted) & Counter(expected)).values())
+    if common == 0:
+        return 0.0
+    precision, recall = common / len(predicted), common / len(expected)
+    return 2 * precision * recall / (precision + recall)
+
+
+def _peak_rss_mb() -> float:
+    """Reads the peak resident memory of the current process."""
+    for line in Path("/proc/self/status").read_text().splitlines():
+        if line.startswith("VmHWM:"):
+            return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def run_precision(
+    config_path: str,
+    llm_model_name: str | None,
+    precision: str,
+    max_new_tokens: int,
+    results: Any,
+) -> None:
+    """Answers the questions from a fresh process at the given precision."""
+    from app.core.config.configuration import Configuration
+    from app.services.components.llm import HuggingFaceLLMComponent
+
+    rag_config = Configuration.from_yaml(config_path).rag_service
+    update: dict[str, Any] = {
+        "llm_precision": precision,
+        "max_new_tokens": max_new_tokens,
+        "device_map": "cpu",
+    }
+    if llm_model_name:
+        update |= {"llm_model_name": llm_model_name, "model_artifacts_dir": None}
+    component = HuggingFaceLLMComponent(rag_config.model_copy(update=update))
+
+    start = time.perf_counter()
+    component.load()
+    load_seconds = time.perf_counter() - start
+    llm = component.get_model()
+    llm.generate_kwargs = {"do_sample": False}
+    tokenizer = llm._tokenizer  # type: ignore[attr-defined]
+
+    answers, generated_tokens, generation_seconds = [], 0, 0.0
+    for question in QUESTIONS:
+        start = time.perf_counter()
+        answer = llm.complete(question).text
+        generation_seconds += time.perf_counter() - start
+        generated_tokens += len(tokenizer(answer, add_special_tokens=False).input_ids)
+        answers.append(answer)
+
+    results.put(
+        {
+            "answers": answers,
+            "tokens_per_second": generated_tokens / generation_seconds,
+            "peak_rss_mb": _peak_rss_mb(),
+            "load_seconds": load_seconds,
+        }
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--config", default="config-local.yaml")
+    parser.add_argument(
+        "--llm-model", default=None, help="Override 'rag_service.llm_model_name'."
+    )
+    parser.add_argument("--max-new-tokens", type=int, default=64)
+    parser.add_argument(
+        "--precisions",
+        nargs="+",
+        choices=["float32", "bfloat16", "int8"],
+        default=["float32", "bfloat16", "int8"],
+    )
+    args = parser.parse_args()
+    precisions = [BASELINE, *(p for p in args.precisions if p != BASELINE)]
+
+    context = multiprocessing.get_context("spawn")
+    runs = {}
+    for precision in precisions:
+        results = context.Queue()
+        process = context.Process(
+            target=run_precision,
+            args=(
+                args.config,
+                args.llm_model,
+                precision,
+                args.max_new_tokens,
+                results,
+            ),
+        )
+        process.start()
+        runs[precision] = results.get()
+        process.join()
+
+    baseline = runs[BASELINE]["answers"]
+    header = (
+        "precision",
+        "answer F1",
+        "exact match",
+        "tokens/s",
+        "peak RSS MB",
+        "load s",
+    )
+    print(f"{len(QUESTIONS)} questions, {args.max_new_tokens} max new tokens")
+    print("| " + " | ".join(header) + " |")
+    print("|" + "---|" * len(header))
+    for precision, run in runs.items():
+        pairs = list(zip(run["answers"], baseline, strict=True))
+        f1 = sum(token_f1(answer, reference) for answer, reference in pairs)
+        exact = sum(answer.strip() == reference.strip() for answer, reference in pairs)
+        row = (
+            precision,
+            f"{f1 / len(pairs):.3f}",
+            f"{exact / len(pairs):.2f}",
+            f"{run['tokens_per_second']:.1f}",
+            f"{run['peak_rss_mb']:.0f}",
+            f"{run['load_seconds']:.1f}",
+        )
+        print("| " + " | ".join(row) + " |")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Sharded vector search benchmark.
+
+Splits synthetic clustered embeddings into a growing number of memory-mapped
+shards, queried in parallel by worker processes, and reports for every shard
+count:
+
+* recall@k against an exact float32 search, which stays at 1.0 with exact
+  search since every shard returns its own top k,
+* query latency percentiles, including the scatter to the workers and the
+  gather of their results,
+* the time to write the dataset into the shards.
+
+The first row queries the unsharded store within the process, as a baseline
+for the overhead of the workers.
+
+Usage:
+    uv run python benchmarks/sharding_benchmark.py --num-vectors 500000
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from llama_index.core.schema import TextNode
+from llama_index.core.vector_stores.types import VectorStoreQuery
+
+from app.core.config.rag import (
+    MmapVectorStoreConfig,
+    RagServiceConfig,
+    ShardingConfig,
+)
+from app.services.rag_service import create_vector_store_component
+
+
+def make_dataset(
+    num_vectors: int, num_queries: int, dim: int, seed: int = 0
+) -> tuple[np.ndarray, np.ndarray]:
+    """Creates clustered unit vectors and queries close to them."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(max(num_vectors // 500, 1), dim))
+    data = centers[rng.integers(len(centers), size=num_vectors)]
+    data += rng.normal(scale=0.5, size=data.shape)
+    queries = data[rng.choice(num_vectors, size=num_queries, replace=False)]
+    queries = queries + rng.normal(scale=0.1, size=queries.shape)
+    data /= np.linalg.norm(data, axis=1, keepdims=True)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    return data.astype(np.float32), queries.astype(np.float32)
+
+
+def run(
+    num_shards: int,
+    workers: int | None,
+    path: Path,
+    data: np.ndarray,
+    queries: np.ndarray,
+    args: argparse.Namespace,
+) -> tuple[float, list[float], list[list[int]]]:
+    """Builds and queries a store, returning build seconds, latencies and ids."""
+    config = RagServiceConfig(
+        vector_store_path=path,
+        vector_store_backend="mmap",
+        mmap_store=MmapVectorStoreConfig(dtype=args.dtype),
+        sharding=ShardingConfig(num_shards=num_shards, workers=workers),
+    )
+    component = create_vector_store_component(config)
+    component.load()
+    try:
+        store = component.get_store()
+        start = time.perf_counter()
+        batch_size = 5000
+        for offset in range(0, len(data), batch_size):
+            store.add(
+                [
+                    TextNode(text=f"chunk {i}", id_=str(i), embedding=data[i].tolist())
+                    for i in range(offset, min(offset + batch_size, len(data)))
+                ]
+            )
+        build_seconds = time.perf_counter() - start
+
+        latencies, ids = [], []
+        for query in queries:
+            start = time.perf_counter()
+            result = store.query(
+                VectorStoreQuery(
+                    query_embedding=query.tolist(), similarity_top_k=args.top_k
+                )
+            )
+            latencies.append((time.perf_counter() - start) * 1000)
+            ids.append([int(node_id) for node_id in result.ids or []])
+    finally:
+        component.shutdown()
+    return build_seconds, latencies, ids
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--num-vectors", type=int, default=200_000)
+    parser.add_argument("--num-queries", type=int, default=200)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument(
+        "--dtype", choices=["float32", "float16", "int8"], default="float32"
+    )
+    parser.add_argument("--shards", type=int, nargs="+", default=[2, 4, 8])
+    parser.add_argument(
+        "--workers", type=int, default=None, help="One worker per shard by default."
+    )
+    args = parser.parse_args()
+
+    data, queries = make_dataset(args.num_vectors, args.num_queries, args.dim)
+    exact = np.argsort(-(queries @ data.T), axis=1)[:, : args.top_k]
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for num_shards in [1, *args.shards]:
+            path = Path(tmp_dir) / f"shards-{num_shards}"
+            build_seconds, latencies, ids = run(
+                num_shards, args.workers, path, data, queries, args
+            )
+            recall = np.mean(
+                [
+                    len(set(found) & set(expected)) / args.top_k
+                    for found, expected in zip(ids, exact, strict=True)
+                ]
+            )
+            latencies = sorted(latencies)
+            rows.append(
+                (
+                    str(num_shards) if num_shards > 1 else "1 (in process)",
+                    f"{recall:.3f}",
+                    f"{statistics.median(latencies):.2f}",
+                    f"{latencies[int(len(latencies) * 0.95) - 1]:.2f}",
+                    f"{build_seconds:.1f}",
+                )
+            )
+
+    header = ("shards", f"recall@{args.top_k}", "p50 ms", "p95 ms", "build s")
+    print(f"{args.num_vectors} vectors x {args.dim} dims, {args.num_queries} queries")
+    print("| " + " | ".join(header) + " |")
+    print("|" + "---|" * len(header))
+    for row in rows:
+        print("| " + " | ".join(row) + " |")
+
+
+if __name__ == "__main__":
+    main()
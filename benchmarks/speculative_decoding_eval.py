@@ -0,0 +1,137 @@
+"""Speculative decoding evaluation.
+
+Answers a fixed question set with the LLM alone, then with each draft model
+of ``rag_service.speculative_decoding``, and reports for every run:
+
+* generated tokens per second and the speedup over the LLM alone,
+* the share of draft tokens accepted by the LLM,
+* the share of answers identical to the ones of the LLM alone.
+
+A draft model pays off when its speedup is above 1, which needs a high
+acceptance rate and a draft model much cheaper than the LLM. Decoding is
+greedy, so assisted answers should match the plain ones. Every run is loaded
+in a fresh process.
+
+Usage:
+    uv run python benchmarks/speculative_decoding_eval.py \
+        --draft-models HuggingFaceTB/SmolLM2-135M-Instruct
+"""
+
+import argparse
+import multiprocessing
+import time
+from typing import Any
+
+from llm_precision_eval import QUESTIONS
+
+
+def run_generation(
+    config_path: str,
+    draft_model_name: str | None,
+    num_assistant_tokens: int,
+    max_new_tokens: int,
+    results: Any,
+) -> None:
+    """Answers the questions from a fresh process, with an optional draft model."""
+    from app.core.config.configuration import Configuration
+    from app.services.components.llm import HuggingFaceLLMComponent
+
+    rag_config = Configuration.from_yaml(config_path).rag_service
+    speculative_config = rag_config.speculative_decoding.model_copy(
+        update={
+            "draft_model_name": draft_model_name,
+            "num_assistant_tokens": num_assistant_tokens,
+        }
+    )
+    component = HuggingFaceLLMComponent(
+        rag_config.model_copy(
+            update={
+                "max_new_tokens": max_new_tokens,
+                "speculative_decoding": speculative_config,
+            }
+        )
+    )
+    component.load()
+    llm = component.get_model()
+    llm.generate_kwargs |= {"do_sample": False}
+    tokenizer = llm._tokenizer  # type: ignore[attr-defined]
+
+    # The first generation pages the weights in, it is left out of the timings.
+    llm.complete(QUESTIONS[0])
+    stats_before = component.decoding_stats
+    draft_tokens = stats_before.draft_tokens if stats_before else 0
+    accepted_tokens = stats_before.accepted_tokens if stats_before else 0
+
+    answers, generated_tokens, generation_seconds = [], 0, 0.0
+    for question in QUESTIONS:
+        start = time.perf_counter()
+        answer = llm.complete(question).text
+        generation_seconds += time.perf_counter() - start
+        generated_tokens += len(tokenizer(answer, add_special_tokens=False).input_ids)
+        answers.append(answer)
+
+    stats = component.decoding_stats
+    acceptance_rate = None
+    if stats and stats.draft_tokens > draft_tokens:
+        acceptance_rate = (stats.accepted_tokens - accepted_tokens) / (
+            stats.draft_tokens - draft_tokens
+        )
+    results.put(
+        {
+            "answers": answers,
+            "tokens_per_second": generated_tokens / generation_seconds,
+            "acceptance_rate": acceptance_rate,
+        }
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--config", default="config-local.yaml")
+    parser.add_argument("--draft-models", nargs="+", required=True)
+    parser.add_argument("--num-assistant-tokens", type=int, default=5)
+    parser.add_argument("--max-new-tokens", type=int, default=64)
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    runs = {}
+    for draft_model_name in [None, *args.draft_models]:
+        results = context.Queue()
+        process = context.Process(
+            target=run_generation,
+            args=(
+                args.config,
+                draft_model_name,
+                args.num_assistant_tokens,
+                args.max_new_tokens,
+                results,
+            ),
+        )
+        process.start()
+        runs[draft_model_name or "none"] = results.get()
+        process.join()
+
+    baseline = runs["none"]
+    header = ("draft model", "tokens/s", "speedup", "acceptance", "same answers")
+    print(
+        f"{len(QUESTIONS)} questions, {args.max_new_tokens} max new tokens, "
+        f"{args.num_assistant_tokens} assistant tokens"
+    )
+    print("| " + " | ".join(header) + " |")
+    print("|" + "---|" * len(header))
+    for draft_model_name, run in runs.items():
+        pairs = zip(run["answers"], baseline["answers"], strict=True)
+        same = sum(answer.strip() == reference.strip() for answer, reference in pairs)
+        acceptance = run["acceptance_rate"]
+        row = (
+            draft_model_name,
+            f"{run['tokens_per_second']:.1f}",
+            f"{run['tokens_per_second'] / baseline['tokens_per_second']:.2f}x",
+            "-" if acceptance is None else f"{acceptance:.0%}",
+            f"{same / len(QUESTIONS):.2f}",
+        )
+        print("| " + " | ".join(row) + " |")
+
+
+if __name__ == "__main__":
+    main()
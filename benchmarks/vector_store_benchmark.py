@@ -0,0 +1,210 @@
+"""Vector store backend benchmark.
+
+Compares the Chroma vector store against the memory-mapped store, in its
+different storage precisions and search modes, on synthetic clustered
+embeddings. For every backend it reports:
+
+* recall@k against an exact float32 search,
+* query latency percentiles,
+* resident memory added by opening and querying the store, split into private
+  (anonymous) memory and file-backed pages shared through the page cache.
+
+Every backend is queried from a fresh process that imports the same modules,
+and memory is measured against that import baseline, so the figures are not
+polluted by the data generation, the libraries or the other backends.
+
+Usage:
+    uv run python benchmarks/vector_store_benchmark.py --num-vectors 100000
+"""
+
+import argparse
+import multiprocessing
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from llama_index.core.schema import TextNode
+from llama_index.core.vector_stores.types import VectorStoreQuery
+
+BACKENDS = {
+    "chroma": {},
+    "mmap-float32": {"dtype": "float32", "search_mode": "exact"},
+    "mmap-float16": {"dtype": "float16", "search_mode": "exact"},
+    "mmap-int8": {"dtype": "int8", "search_mode": "exact"},
+    "mmap-int8-ivf": {"dtype": "int8", "search_mode": "ivf"},
+}
+
+
+def make_dataset(
+    num_vectors: int, num_queries: int, dim: int, seed: int = 0
+) -> tuple[np.ndarray, np.ndarray]:
+    """Creates clustered unit vectors and queries close to them."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(max(num_vectors // 500, 1), dim))
+    data = centers[rng.integers(len(centers), size=num_vectors)]
+    data += rng.normal(scale=0.5, size=data.shape)
+    queries = data[rng.choice(num_vectors, size=num_queries, replace=False)]
+    queries = queries + rng.normal(scale=0.1, size=queries.shape)
+    data /= np.linalg.norm(data, axis=1, keepdims=True)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    return data.astype(np.float32), queries.astype(np.float32)
+
+
+def open_store(backend: str, path: Path, nlist: int, nprobe: int) -> Any:
+    """Opens the vector store of a backend."""
+    if backend == "chroma":
+        import chromadb
+        from chromadb.config import Settings
+        from llama_index.vector_stores.chroma import ChromaVectorStore
+
+        client = chromadb.PersistentClient(
+            path=str(path), settings=Settings(anonymized_telemetry=False)
+        )
+        collection = client.get_or_create_collection(
+            "benchmark", metadata={"hnsw:space": "l2"}
+        )
+        return ChromaVectorStore(chroma_collection=collection)
+
+    from app.services.components.mmap_vector_store import MmapVectorStore
+
+    return MmapVectorStore(path=path, nlist=nlist, nprobe=nprobe, **BACKENDS[backend])
+
+
+def build(backend: str, path: Path, data: np.ndarray, nlist: int, nprobe: int) -> float:
+    """Inserts the dataset into a backend and returns the elapsed seconds."""
+    store = open_store(backend, path, nlist, nprobe)
+    start = time.perf_counter()
+    batch_size = 5000
+    for offset in range(0, len(data), batch_size):
+        store.add(
+            [
+                TextNode(text=f"chunk {i}", id_=str(i), embedding=data[i].tolist())
+                for i in range(offset, min(offset + batch_size, len(data)))
+            ]
+        )
+    return time.perf_counter() - start
+
+
+def _memory_kb() -> dict[str, int]:
+    """Reads the resident memory breakdown of the current process."""
+    fields = {}
+    for line in Path("/proc/self/status").read_text().splitlines():
+        key, _, value = line.partition(":")
+        if key in {"VmRSS", "RssAnon", "RssFile", "VmHWM"}:
+            fields[key] = int(value.split()[0])
+    return fields
+
+
+def run_queries(
+    backend: str,
+    path: Path,
+    queries: np.ndarray,
+    top_k: int,
+    nlist: int,
+    nprobe: int,
+    results: Any,
+) -> None:
+    """Queries a backend from a fresh process and reports ids, latency and RSS."""
+    import chromadb  # noqa: F401
+    from llama_index.vector_stores.chroma import ChromaVectorStore  # noqa: F401
+
+    from app.services.components.mmap_vector_store import MmapVectorStore  # noqa: F401
+
+    baseline = _memory_kb()
+    store = open_store(backend, path, nlist, nprobe)
+    latencies, ids = [], []
+    for query in queries:
+        start = time.perf_counter()
+        result = store.query(
+            VectorStoreQuery(query_embedding=query.tolist(), similarity_top_k=top_k)
+        )
+        latencies.append((time.perf_counter() - start) * 1000)
+        ids.append([int(node_id) for node_id in result.ids or []])
+    memory = _memory_kb()
+    delta = {key: memory[key] - baseline[key] for key in ("RssAnon", "RssFile")}
+    delta["VmHWM"] = memory["VmHWM"]
+    results.put({"latencies": latencies, "ids": ids, "memory": delta})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--num-vectors", type=int, default=50_000)
+    parser.add_argument("--num-queries", type=int, default=200)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--nlist", type=int, default=256)
+    parser.add_argument("--nprobe", type=int, default=16)
+    parser.add_argument(
+        "--backends", nargs="+", choices=list(BACKENDS), default=list(BACKENDS)
+    )
+    args = parser.parse_args()
+
+    data, queries = make_dataset(args.num_vectors, args.num_queries, args.dim)
+    exact = np.argsort(-(queries @ data.T), axis=1)[:, : args.top_k]
+
+    context = multiprocessing.get_context("spawn")
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for backend in args.backends:
+            path = Path(tmp_dir) / backend
+            build_seconds = build(backend, path, data, args.nlist, args.nprobe)
+            results = context.Queue()
+            process = context.Process(
+                target=run_queries,
+                args=(
+                    backend,
+                    path,
+                    queries,
+                    args.top_k,
+                    args.nlist,
+                    args.nprobe,
+                    results,
+                ),
+            )
+            process.start()
+            result = results.get()
+            process.join()
+
+            recall = np.mean(
+                [
+                    len(set(found) & set(expected)) / args.top_k
+                    for found, expected in zip(result["ids"], exact, strict=True)
+                ]
+            )
+            latencies = sorted(result["latencies"])
+            memory = result["memory"]
+            rows.append(
+                (
+                    backend,
+                    f"{recall:.3f}",
+                    f"{statistics.median(latencies):.2f}",
+                    f"{latencies[int(len(latencies) * 0.95) - 1]:.2f}",
+                    f"{memory['RssAnon'] / 1024:.1f}",
+                    f"{memory['RssFile'] / 1024:.1f}",
+                    f"{memory['VmHWM'] / 1024:.1f}",
+                    f"{build_seconds:.1f}",
+                )
+            )
+
+    header = (
+        "backend",
+        f"recall@{args.top_k}",
+        "p50 ms",
+        "p95 ms",
+        "private MB",
+        "shared MB",
+        "process peak RSS MB",
+        "build s",
+    )
+    print(f"{args.num_vectors} vectors x {args.dim} dims, {args.num_queries} queries")
+    print("| " + " | ".join(header) + " |")
+    print("|" + "---|" * len(header))
+    for row in rows:
+        print("| " + " | ".join(row) + " |")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,8 @@ set -e
 HOST=${HOST:-0.0.0.0}
 PORT=${PORT:-8000}
 WORKERS=${WORKERS:-2}
+# Each worker takes its share of the cores, see rag_service.resources.
+export WORKERS
 LOG_LEVEL=${LOG_LEVEL:-info}
 RELOAD_FLAG=""
 
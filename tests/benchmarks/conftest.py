@@ -0,0 +1,200 @@
+"""Benchmark fixtures, timing functions against their stored baselines."""
+
+import json
+import statistics
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pytest
+
+BASELINES_PATH = Path(__file__).parent / "baselines.json"
+
+
+def seconds_per_call(
+    func: Callable[..., object],
+    calls: int,
+    setup: Callable[[], tuple[Any, ...]] | None = None,
+) -> float:
+    """Returns the mean seconds of a block of consecutive calls of a function.
+
+    The optional setup runs untimed before every call, and returns the
+    arguments of the call.
+    """
+    seconds = 0.0
+    for _ in range(calls):
+        args = setup() if setup else ()
+        start = time.perf_counter()
+        func(*args)
+        seconds += time.perf_counter() - start
+    return seconds / calls
+
+
+def reference_workload() -> None:
+    """Runs a fixed mix of interpreter and NumPy work, the unit of the costs."""
+    records = [{"id": i, "text": f"chunk {i}", "score": i / 7} for i in range(2000)]
+    json.loads(json.dumps(records))
+    matrix = np.linspace(0, 1, 256 * 256, dtype=np.float32).reshape(256, 256)
+    matrix @ matrix
+
+
+@dataclass
+class BenchmarkResult:
+    """Median time of a benchmarked call and the items it processed.
+
+    The cost is the time relative to the reference workload timed next to it,
+    which mostly cancels out the speed of the host.
+    """
+
+    seconds: float
+    cost: float
+    items: int = 1
+
+    @property
+    def items_per_s(self) -> float:
+        """Returns the throughput of the call."""
+        return self.items / self.seconds
+
+
+class Benchmark:
+    """Times functions and fails those costlier than their baseline.
+
+    Every function is timed over some rounds, after a warm-up call. A round
+    times the reference workload, then a block of calls of the function, so
+    the cost of the round holds even if the host speed drifts during the run.
+    The median of the rounds is kept, which a few rounds slowed down by
+    scheduling noise do not move. Costs are compared with the baselines of the
+    same name, if any.
+    """
+
+    def __init__(
+        self,
+        baselines: dict[str, float],
+        results: dict[str, BenchmarkResult],
+        threshold_pct: float,
+        check: bool,
+    ):
+        """Initializes the benchmark with the baselines to compare with."""
+        self._baselines = baselines
+        self._results = results
+        self._threshold_pct = threshold_pct
+        self._check = check
+
+    def __call__(
+        self,
+        name: str,
+        func: Callable[..., object],
+        rounds: int = 10,
+        calls: int = 1,
+        items: int = 1,
+        warmup: bool = True,
+        setup: Callable[[], tuple[Any, ...]] | None = None,
+    ) -> BenchmarkResult:
+        """Times a function, failing if it regressed past the threshold.
+
+        Fast functions should be called several times per round, so that a
+        round lasts about as long as the reference workload. The optional setup
+        runs untimed before every call, and returns the arguments of the call.
+        """
+        if warmup:
+            func(*(setup() if setup else ()))
+        timings, costs = [], []
+        for _ in range(rounds):
+            reference_seconds = seconds_per_call(reference_workload, calls=1)
+            seconds = seconds_per_call(func, calls, setup=setup)
+            timings.append(seconds)
+            costs.append(seconds / reference_seconds)
+        result = BenchmarkResult(
+            seconds=statistics.median(timings),
+            cost=statistics.median(costs),
+            items=items,
+        )
+        self._results[name] = result
+
+        baseline = self._baselines.get(name)
+        if self._check and baseline is not None:
+            slowdown_pct = (result.cost / baseline - 1) * 100
+            if slowdown_pct > self._threshold_pct:
+                pytest.fail(
+                    f"{name} regressed: it cost {result.cost:.4g} reference runs "
+                    f"against {baseline:.4g}, {slowdown_pct:+.0f}% over the "
+                    f"{self._threshold_pct:g}% threshold."
+                )
+        return result
+
+
+RESULTS_KEY = pytest.StashKey[dict[str, BenchmarkResult]]()
+
+
+def pytest_terminal_summary(
+    terminalreporter: pytest.TerminalReporter, config: pytest.Config
+) -> None:
+    """Reports the benchmark results next to their baselines."""
+    results = config.stash.get(RESULTS_KEY, {})
+    if not results:
+        return
+    baselines = load_baselines(BASELINES_PATH)
+    terminalreporter.section("benchmarks")
+    for name, result in sorted(results.items()):
+        line = f"{name:<40} {result.seconds * 1000:>10.3f} ms {result.cost:>10.4g} x"
+        if result.items > 1:
+            line += f" {result.items_per_s:>12,.0f} items/s"
+        if name in baselines:
+            change_pct = (result.cost / baselines[name] - 1) * 100
+            line += f"  ({change_pct:+.0f}% vs baseline)"
+        terminalreporter.write_line(line)
+
+
+def load_baselines(path: Path) -> dict[str, float]:
+    """Loads the baseline costs of a JSON file, if it exists."""
+    if not path.is_file():
+        return {}
+    return {name: entry["cost"] for name, entry in json.loads(path.read_text()).items()}
+
+
+@pytest.fixture(scope="session")
+def benchmark_results(
+    pytestconfig: pytest.Config,
+) -> Iterator[dict[str, BenchmarkResult]]:
+    """Collect the benchmark results, saved as baselines if requested.
+
+    Baselines of the benchmarks that did not run are kept.
+    """
+    results: dict[str, BenchmarkResult] = {}
+    pytestconfig.stash[RESULTS_KEY] = results
+    yield results
+    if pytestconfig.getoption("--benchmark-save") and results:
+        costs = load_baselines(BASELINES_PATH) | {
+            name: result.cost for name, result in results.items()
+        }
+        BASELINES_PATH.write_text(
+            json.dumps(
+                {
+                    name: {"cost": float(f"{cost:.3g}")}
+                    for name, cost in sorted(costs.items())
+                },
+                indent=2,
+            )
+            + "\n"
+        )
+
+
+@pytest.fixture
+def benchmark(
+    pytestconfig: pytest.Config,
+    benchmark_results: dict[str, BenchmarkResult],
+) -> Benchmark:
+    """Create a benchmark timer comparing costs with the stored baselines.
+
+    Returns:
+        Benchmark: A timer failing the calls costlier than their baseline.
+    """
+    return Benchmark(
+        baselines=load_baselines(BASELINES_PATH),
+        results=benchmark_results,
+        threshold_pct=pytestconfig.getoption("--benchmark-threshold"),
+        check=not pytestconfig.getoption("--benchmark-save"),
+    )
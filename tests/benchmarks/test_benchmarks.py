@@ -0,0 +1,198 @@
+"""Micro-benchmarks of the RAG service and its components.
+
+Models are replaced by deterministic fakes answering at once, so the timings
+only cover the code of the service, LlamaIndex and the vector store.
+"""
+
+import asyncio
+import itertools
+from collections.abc import Iterator
+from pathlib import Path
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+from llama_index.core import Settings
+from llama_index.core.ingestion import run_transformations
+from llama_index.core.llms import MockLLM
+from llama_index.core.prompts import RichPromptTemplate
+from llama_index.core.schema import Document, NodeWithScore, TextNode
+from llama_index.core.vector_stores.types import VectorStoreQuery
+
+from app.api.v1.schemas import RAGQueryResponse
+from app.core.config.rag import RagServiceConfig
+from app.services.components import ChromaVectorStoreComponent
+from app.services.rag_service import RAGService, _sources_data
+
+pytestmark = pytest.mark.benchmark
+
+TEMPLATE_PATH = Path("templates") / "qa_template.jinja2"
+COLLECTION_SIZES = (100, 1000, 5000)
+EMBEDDING_DIM = 384
+PARAGRAPH = (
+    "LLaMA is a collection of foundation language models ranging from 7B to 65B "
+    "parameters. The models are trained on trillions of tokens of publicly "
+    "available data, such as CommonCrawl, C4, GitHub, Wikipedia and ArXiv. "
+)
+
+
+def chroma_component(path: Path, collection_name: str) -> ChromaVectorStoreComponent:
+    """Create a Chroma vector store component persisted in a directory."""
+    component = ChromaVectorStoreComponent(
+        RagServiceConfig(
+            vector_store_path=path,
+            collection_name=collection_name,
+            template_dir=Path("templates"),
+        )
+    )
+    component.load()
+    return component
+
+
+def embedded_nodes(count: int, seed: int = 0) -> list[TextNode]:
+    """Create nodes with random unit embeddings."""
+    vectors = np.random.default_rng(seed).standard_normal((count, EMBEDDING_DIM))
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return [
+        TextNode(
+            text=f"Chunk {i}. {PARAGRAPH}",
+            embedding=vector.tolist(),
+            metadata={"file_name": f"doc-{i % 10}.pdf", "page": i % 50},
+        )
+        for i, vector in enumerate(vectors)
+    ]
+
+
+@pytest.fixture(scope="module")
+def chroma_path(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Create a directory holding the Chroma collections of the benchmarks."""
+    return tmp_path_factory.mktemp("chroma")
+
+
+class TestPromptBenchmarks:
+    """Benchmarks of the prompt and response handling of queries."""
+
+    def test_template_rendering(self, benchmark) -> None:
+        """Benchmark rendering the question answering template of a query."""
+        template = RichPromptTemplate(TEMPLATE_PATH.read_text())
+        context = "\n\n".join([PARAGRAPH] * 4)
+
+        benchmark(
+            "template_rendering",
+            lambda: template.format(
+                query_str="What data is LLaMA trained on?", context_str=context
+            ),
+            rounds=50,
+            calls=20,
+        )
+
+    def test_source_node_serialization(self, benchmark) -> None:
+        """Benchmark serializing the sources of an answer into a response."""
+        nodes = [NodeWithScore(node=node, score=0.5) for node in embedded_nodes(10)]
+
+        def serialize() -> None:
+            RAGQueryResponse(
+                answer=PARAGRAPH, sources=_sources_data(nodes)
+            ).model_dump_json()
+
+        benchmark(
+            "source_node_serialization", serialize, rounds=50, calls=100, items=10
+        )
+
+
+class TestQueryBenchmarks:
+    """Benchmarks of the query path of the RAG service."""
+
+    @pytest.fixture
+    def service(
+        self, tmp_path: Path, chroma_path: Path, keyword_embed_model
+    ) -> Iterator[RAGService]:
+        """Create a RAG service over a Chroma index, with instant fake models."""
+        docs = tmp_path / "docs"
+        docs.mkdir()
+        for i in range(20):
+            (docs / f"doc-{i}.txt").write_text(f"llama data training {i}. " * 50)
+        config = RagServiceConfig(
+            pdf_directory=str(docs),
+            vector_store_path=chroma_path,
+            collection_name="bench-query",
+            template_dir=Path("templates"),
+        )
+        embedding_component = Mock()
+        embedding_component.get_model.return_value = keyword_embed_model
+        llm_component = Mock()
+        llm_component.get_model.return_value = MockLLM(max_tokens=8)
+        vector_store_component = ChromaVectorStoreComponent(config)
+        vector_store_component.load()
+        service = RAGService(
+            llm_component, embedding_component, vector_store_component, config
+        )
+        service.get_or_create_index(force_reindex=True)
+        yield service
+        asyncio.run(service.shutdown())
+
+    def test_query_overhead(self, benchmark, service: RAGService) -> None:
+        """Benchmark a query end to end, the models answering at once."""
+        loop = asyncio.new_event_loop()
+        try:
+            assert loop.run_until_complete(service.query("llama training?"))["sources"]
+            benchmark(
+                "query_overhead",
+                lambda: loop.run_until_complete(service.query("llama training?")),
+                rounds=25,
+                calls=2,
+            )
+        finally:
+            loop.close()
+
+
+class TestVectorStoreBenchmarks:
+    """Benchmarks of the Chroma vector store at several collection sizes."""
+
+    @pytest.mark.parametrize("size", COLLECTION_SIZES)
+    def test_insert(self, benchmark, chroma_path: Path, size: int) -> None:
+        """Benchmark inserting embedded nodes into an empty collection."""
+        nodes = embedded_nodes(size)
+        names = (f"bench-insert-{size}-{i}" for i in itertools.count())
+
+        benchmark(
+            f"vector_insert_{size}",
+            lambda store: store.add(nodes),
+            rounds=max(10_000 // size, 2),
+            items=size,
+            warmup=False,
+            setup=lambda: (chroma_component(chroma_path, next(names)).get_store(),),
+        )
+
+    @pytest.mark.parametrize("size", COLLECTION_SIZES)
+    def test_search(self, benchmark, chroma_path: Path, size: int) -> None:
+        """Benchmark a top-k similarity search in a collection."""
+        store = chroma_component(chroma_path, f"bench-search-{size}").get_store()
+        store.add(embedded_nodes(size))
+        query = VectorStoreQuery(
+            query_embedding=embedded_nodes(1, seed=1)[0].embedding,
+            similarity_top_k=4,
+        )
+
+        benchmark(
+            f"vector_search_{size}", lambda: store.query(query), rounds=50, calls=10
+        )
+
+
+class TestIngestionBenchmarks:
+    """Benchmarks of the ingestion of documents."""
+
+    def test_chunking_throughput(self, benchmark) -> None:
+        """Benchmark splitting documents into chunks, in characters per second."""
+        documents = [
+            Document(text=PARAGRAPH * 200, metadata={"file_name": f"doc-{i}.pdf"})
+            for i in range(10)
+        ]
+        characters = sum(len(document.text) for document in documents)
+
+        benchmark(
+            "ingestion_chunking",
+            lambda: run_transformations(documents, [Settings.node_parser]),
+            rounds=5,
+            items=characters,
+        )
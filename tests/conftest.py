@@ -1,10 +1,45 @@
-"""Shared fixtures for embedding component tests."""
+"""Shared fixtures for service and component tests."""
 
+from collections.abc import Callable
 from unittest.mock import Mock
 
 import pytest
-
-from app.core.config.rag import RagServiceConfig
+from llama_index.core.embeddings import BaseEmbedding
+
+from app.core.config.rag import RagServiceConfig, SpeculativeDecodingConfig
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Adds the options of the benchmark suite."""
+    group = parser.getgroup("benchmark")
+    group.addoption(
+        "--benchmark",
+        action="store_true",
+        help="Run the benchmarks, skipped otherwise.",
+    )
+    group.addoption(
+        "--benchmark-save",
+        action="store_true",
+        help="Save the benchmark results as the new baselines.",
+    )
+    group.addoption(
+        "--benchmark-threshold",
+        type=float,
+        default=50.0,
+        help="Slowdown over the baseline, in percent, failing a benchmark.",
+    )
+
+
+def pytest_collection_modifyitems(
+    config: pytest.Config, items: list[pytest.Item]
+) -> None:
+    """Skips the benchmarks unless they are requested."""
+    if config.getoption("--benchmark"):
+        return
+    skip = pytest.mark.skip(reason="Benchmarks only run with --benchmark.")
+    for item in items:
+        if item.get_closest_marker("benchmark") is not None:
+            item.add_marker(skip)
 
 
 @pytest.fixture
@@ -16,6 +51,7 @@ def mock_rag_config() -> Mock:
     """
     config = Mock(spec=RagServiceConfig)
     config.embed_model_name = "sentence-transformers/all-MiniLM-L6-v2"
+    config.model_artifacts_dir = None
     return config
 
 
@@ -44,6 +80,30 @@ def mock_rag_config_llm() -> Mock:
     config.max_new_tokens = 512
     config.temperature = 0.7
     config.device_map = "auto"
+    config.llm_precision = "default"
+    config.speculative_decoding = SpeculativeDecodingConfig()
+    config.model_artifacts_dir = None
+    return config
+
+
+@pytest.fixture
+def mock_rag_config_llama_cpp() -> Mock:
+    """Create a mock RagServiceConfig for llama.cpp LLM testing.
+
+    Returns:
+        Mock: A mock configuration object with llama.cpp-specific attributes.
+    """
+    from pathlib import Path
+
+    from app.core.config.rag import LlamaCppConfig
+
+    config = Mock(spec=RagServiceConfig)
+    config.context_window = 2048
+    config.max_new_tokens = 256
+    config.temperature = 0.1
+    config.llama_cpp = LlamaCppConfig(
+        model_path=Path("./models/model-Q4_K_M.gguf"), n_threads=4
+    )
     return config
 
 
@@ -72,3 +132,78 @@ def mock_rag_config_vector_store() -> Mock:
     config.vector_store_path = Path("./test_vector_store")
     config.collection_name = "test_collection"
     return config
+
+
+class KeywordEmbedding(BaseEmbedding):
+    """Deterministic embedding counting the occurrences of a fixed vocabulary."""
+
+    vocabulary: tuple[str, ...] = ("llama", "data", "training", "weather", "football")
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "KeywordEmbedding"
+
+    def _embed(self, text: str) -> list[float]:
+        lowered = text.lower()
+        return [float(lowered.count(word)) + 0.01 for word in self.vocabulary]
+
+    def _get_query_embedding(self, query: str) -> list[float]:
+        return self._embed(query)
+
+    async def _aget_query_embedding(self, query: str) -> list[float]:
+        return self._embed(query)
+
+    def _get_text_embedding(self, text: str) -> list[float]:
+        return self._embed(text)
+
+
+@pytest.fixture
+def keyword_embed_model() -> KeywordEmbedding:
+    """Create a deterministic embedding model without external weights.
+
+    Returns:
+        KeywordEmbedding: An embedding model based on keyword counts.
+    """
+    return KeywordEmbedding(model_name="keyword-embedding")
+
+
+def build_pdf(*pages: str) -> bytes:
+    """Builds a PDF document showing one line of text per page."""
+    font = 3 + 2 * len(pages)
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [%s] /Count %d >>"
+        % (b" ".join(b"%d 0 R" % (3 + 2 * i) for i in range(len(pages))), len(pages)),
+    ]
+    for number, text in enumerate(pages):
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+        objects += [
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Contents %d 0 R /Resources << /Font << /F1 %d 0 R >> >> >>"
+            % (4 + 2 * number, font),
+            b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream),
+        ]
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    pdf, offsets = b"%PDF-1.4\n", []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+    return pdf
+
+
+@pytest.fixture
+def make_pdf() -> Callable[..., bytes]:
+    """Create a builder of PDF documents with one line of text per page.
+
+    Returns:
+        Callable[..., bytes]: A function taking the page texts.
+    """
+    return build_pdf
@@ -21,7 +21,7 @@ class TestHuggingFaceEmbeddingComponent:
         assert component._config == mock_rag_config
         assert component._model is None
 
-    @patch("app.services.components.embedding.HuggingFaceEmbedding")
+    @patch("llama_index.embeddings.huggingface.HuggingFaceEmbedding")
     @patch("app.services.components.embedding.logger")
     def test_load_model_success(
         self,
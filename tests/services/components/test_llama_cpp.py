@@ -0,0 +1,147 @@
+"""Unit tests for LlamaCppLLMComponent class."""
+
+import sys
+from unittest.mock import Mock, patch
+
+import pytest
+
+from app.services.components.base import PrefixCache
+from app.services.components.llama_cpp import LlamaCppLLMComponent
+from app.services.deadlines import Deadline, deadline_scope
+
+
+class TestLlamaCppLLMComponent:
+    """Test cases for LlamaCppLLMComponent class."""
+
+    def test_initialization(self, mock_rag_config_llama_cpp: Mock) -> None:
+        """Test that the component initializes correctly with configuration."""
+        component = LlamaCppLLMComponent(mock_rag_config_llama_cpp)
+
+        assert component._config == mock_rag_config_llama_cpp
+        assert component._model is None
+
+    def test_load_model_success(self, mock_rag_config_llama_cpp: Mock) -> None:
+        """Test successful loading of the GGUF model with correct parameters."""
+        mock_llama_cpp_class = Mock()
+        module = Mock(LlamaCPP=mock_llama_cpp_class)
+        llama_cpp_module = Mock()
+        component = LlamaCppLLMComponent(mock_rag_config_llama_cpp)
+
+        with patch.dict(
+            sys.modules,
+            {"llama_index.llms.llama_cpp": module, "llama_cpp": llama_cpp_module},
+        ):
+            component.load()
+
+        mock_llama_cpp_class.assert_called_once_with(
+            model_path="models/model-Q4_K_M.gguf",
+            temperature=0.1,
+            max_new_tokens=256,
+            context_window=2048,
+            model_kwargs={
+                "n_batch": 512,
+                "n_gpu_layers": 0,
+                "use_mmap": True,
+                "n_threads": 4,
+            },
+            generate_kwargs={
+                "stopping_criteria": llama_cpp_module.StoppingCriteriaList.return_value
+            },
+            verbose=False,
+        )
+        assert component.get_model() == mock_llama_cpp_class.return_value
+
+    def test_generation_stops_at_deadline(
+        self, mock_rag_config_llama_cpp: Mock
+    ) -> None:
+        """Test that decoding stops once the running request reaches its deadline."""
+        llama_cpp_module = Mock()
+        component = LlamaCppLLMComponent(mock_rag_config_llama_cpp)
+
+        with patch.dict(
+            sys.modules,
+            {"llama_index.llms.llama_cpp": Mock(), "llama_cpp": llama_cpp_module},
+        ):
+            component.load()
+
+        (criteria,), _ = llama_cpp_module.StoppingCriteriaList.call_args
+        assert criteria[0]([1, 2], None) is False
+        with deadline_scope(Deadline(timeout_s=0)):
+            assert criteria[0]([1, 2], None) is True
+
+    def test_load_without_model_path_raises_error(
+        self, mock_rag_config_llama_cpp: Mock
+    ) -> None:
+        """Test that load raises ValueError when no GGUF model is configured."""
+        mock_rag_config_llama_cpp.llama_cpp.model_path = None
+        component = LlamaCppLLMComponent(mock_rag_config_llama_cpp)
+
+        with (
+            patch.dict(
+                sys.modules,
+                {"llama_index.llms.llama_cpp": Mock(), "llama_cpp": Mock()},
+            ),
+            pytest.raises(ValueError, match="requires a model_path"),
+        ):
+            component.load()
+
+    def test_load_without_dependency_raises_error(
+        self, mock_rag_config_llama_cpp: Mock
+    ) -> None:
+        """Test that load explains how to install the optional dependency."""
+        component = LlamaCppLLMComponent(mock_rag_config_llama_cpp)
+
+        with (
+            patch.dict(sys.modules, {"llama_index.llms.llama_cpp": None}),
+            pytest.raises(ImportError, match="uv sync --extra llama-cpp"),
+        ):
+            component.load()
+
+    def test_get_model_not_loaded_raises_error(
+        self, mock_rag_config_llama_cpp: Mock
+    ) -> None:
+        """Test that get_model raises ValueError when model is not loaded."""
+        component = LlamaCppLLMComponent(mock_rag_config_llama_cpp)
+
+        with pytest.raises(
+            ValueError, match=r"LLM model has not been loaded. Call load\(\) first."
+        ):
+            component.get_model()
+
+    def test_shutdown(self, mock_rag_config_llama_cpp: Mock) -> None:
+        """Test shutdown functionality releases model from memory."""
+        component = LlamaCppLLMComponent(mock_rag_config_llama_cpp)
+        component._model = Mock()
+
+        component.shutdown()
+
+        assert component._model is None
+
+    def test_complete_with_cache_restores_state(
+        self, mock_rag_config_llama_cpp: Mock
+    ) -> None:
+        """Test that a cached turn restores the saved state before generating."""
+        llama = Mock()
+        llama.tokenize.return_value = [1, 2, 4, 7, 8]
+        llama.token_eos.return_value = 0
+        llama.generate.return_value = iter([5, 6, 0])
+        llama.detokenize.return_value = b" answer"
+        component = LlamaCppLLMComponent(mock_rag_config_llama_cpp)
+        component._model = Mock(
+            _model=llama,
+            generate_kwargs={},
+            completion_to_prompt=lambda prompt: f"[INST] {prompt} [/INST]",
+        )
+        cache = PrefixCache(token_ids=[1, 2, 3], state=Mock(n_tokens=3), memory_bytes=0)
+
+        answer, cache = component.complete_with_cache("text", cache)
+
+        llama.load_state.assert_called_once()
+        llama.tokenize.assert_called_once_with(
+            b"[INST] text [/INST]", add_bos=True, special=True
+        )
+        assert llama.generate.call_args.args[0] == [1, 2, 4, 7, 8]
+        assert answer == " answer"
+        assert cache.token_ids == [1, 2, 4, 7, 8, 5, 6]
+        assert (cache.reused_tokens, cache.prefilled_tokens) == (2, 3)
+        assert cache.state == llama.save_state.return_value
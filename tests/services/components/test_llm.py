@@ -3,8 +3,15 @@
 from unittest.mock import Mock, patch
 
 import pytest
+import torch
 
-from app.services.components.llm import HuggingFaceLLMComponent
+from app.services.components import PrefixCache
+from app.services.components.llm import (
+    HuggingFaceLLMComponent,
+    _kv_cache_bytes,
+    _stop_at_deadline,
+)
+from app.services.deadlines import Deadline, deadline_scope
 
 
 class TestHuggingFaceLLMComponent:
@@ -21,7 +28,7 @@ class TestHuggingFaceLLMComponent:
         assert component._config == mock_rag_config_llm
         assert component._model is None
 
-    @patch("app.services.components.llm.HuggingFaceLLM")
+    @patch("llama_index.llms.huggingface.HuggingFaceLLM")
     @patch("app.services.components.llm.logger")
     def test_load_model_success(
         self,
@@ -94,3 +101,130 @@ class TestHuggingFaceLLMComponent:
 
         # Verify logging message
         mock_logger.info.assert_called_once_with("Shutting down LLM model component.")
+
+    @pytest.mark.parametrize(
+        ("precision", "dtype", "device_map"),
+        [
+            ("bfloat16", torch.bfloat16, "auto"),
+            ("int8", torch.float32, "cpu"),
+        ],
+    )
+    @patch.object(HuggingFaceLLMComponent, "_quantize_int8")
+    @patch("llama_index.llms.huggingface.HuggingFaceLLM")
+    def test_load_model_precision(
+        self,
+        mock_huggingface_llm_class: Mock,
+        mock_quantize_int8: Mock,
+        precision: str,
+        dtype: torch.dtype,
+        device_map: str,
+        mock_rag_config_llm: Mock,
+    ) -> None:
+        """Test that the configured precision is applied when loading the model."""
+        mock_rag_config_llm.llm_precision = precision
+        component = HuggingFaceLLMComponent(mock_rag_config_llm)
+
+        component.load()
+
+        kwargs = mock_huggingface_llm_class.call_args.kwargs
+        assert kwargs["model_kwargs"] == {"torch_dtype": dtype}
+        assert kwargs["device_map"] == device_map
+        assert mock_quantize_int8.called == (precision == "int8")
+
+    def test_quantize_int8(self) -> None:
+        """Test that linear layers are replaced by dynamically quantized ones."""
+        model = Mock()
+        model._model = torch.nn.Sequential(
+            torch.nn.Embedding(8, 16), torch.nn.Linear(16, 8)
+        )
+        inputs = torch.tensor([[1, 2, 3]])
+        expected = model._model(inputs)
+
+        HuggingFaceLLMComponent._quantize_int8(model._model)
+
+        assert isinstance(model._model[1], torch.ao.nn.quantized.dynamic.Linear)
+        assert isinstance(model._model[0], torch.nn.Embedding)
+        torch.testing.assert_close(model._model(inputs), expected, atol=0.05, rtol=0.1)
+
+    def test_generation_stops_at_deadline(self) -> None:
+        """Test that generation stops after one token once the deadline passed."""
+        from transformers import GPT2Config, GPT2LMHeadModel
+
+        torch.manual_seed(0)
+        model = GPT2LMHeadModel(
+            GPT2Config(vocab_size=8, n_embd=16, n_layer=1, n_head=2, eos_token_id=None)
+        )
+        generate = _stop_at_deadline(model.generate)
+        inputs = torch.tensor([[1, 2, 3]])
+        generate_kwargs = {"max_new_tokens": 10, "do_sample": False, "pad_token_id": 0}
+
+        assert generate(inputs, **generate_kwargs).shape[1] == 13
+        with deadline_scope(Deadline(timeout_s=0)):
+            assert generate(inputs, **generate_kwargs).shape[1] == 4
+
+    def test_complete_with_cache_matches_full_generation(self) -> None:
+        """Test that a cached turn generates as the whole conversation would."""
+        from tokenizers import Tokenizer, models, pre_tokenizers
+        from transformers import GPT2Config, GPT2LMHeadModel, PreTrainedTokenizerFast
+
+        words = ["<unk>", "user", "assistant", ":", "what", "is", "llama", "data"]
+        tokenizer_model = Tokenizer(
+            models.WordLevel({w: i for i, w in enumerate(words)}, unk_token="<unk>")
+        )
+        tokenizer_model.pre_tokenizer = pre_tokenizers.WhitespaceSplit()
+        tokenizer = PreTrainedTokenizerFast(
+            tokenizer_object=tokenizer_model, unk_token="<unk>"
+        )
+        torch.manual_seed(0)
+        model = GPT2LMHeadModel(
+            GPT2Config(
+                vocab_size=len(words), n_embd=16, n_layer=2, n_head=2, eos_token_id=None
+            )
+        ).eval()
+        component = HuggingFaceLLMComponent(Mock())
+        component._model = Mock(
+            _tokenizer=tokenizer,
+            _model=model,
+            max_new_tokens=3,
+            generate_kwargs={"do_sample": False, "pad_token_id": 0},
+            query_wrapper_prompt=None,
+            completion_to_prompt=lambda prompt: f"assistant : {prompt}",
+            system_prompt=None,
+        )
+
+        def assert_full_generation(cache: PrefixCache) -> None:
+            expected = model.generate(
+                torch.tensor([cache.token_ids[:-3]]),
+                max_new_tokens=3,
+                do_sample=False,
+                pad_token_id=0,
+            )
+            assert cache.token_ids == expected[0].tolist()
+
+        first = "user : what is llama"
+        answer, cache = component.complete_with_cache(first, None)
+        assert tokenizer.decode(cache.token_ids[:2]) == "assistant :"
+        assert cache.memory_bytes > 0
+
+        conversation = f"{first} {answer} user : what data"
+        answer, cache = component.complete_with_cache(conversation, cache)
+
+        # The last token of the first answer was not in the cache yet.
+        assert (cache.reused_tokens, cache.prefilled_tokens) == (9, 5)
+        assert len(cache.token_ids) == 17
+        assert_full_generation(cache)
+        assert answer == tokenizer.decode(cache.token_ids[-3:])
+
+        answer, cache = component.complete_with_cache("user : what data", cache)
+
+        # Only the shared tokens are reused, the rest of the cache is dropped.
+        assert (cache.reused_tokens, cache.prefilled_tokens) == (5, 1)
+        assert_full_generation(cache)
+
+    def test_kv_cache_bytes_of_legacy_cache(self) -> None:
+        """Test that caches without layers, before transformers 4.56, are sized."""
+        tensor = torch.zeros(1, 2, 3, 4)
+        state = Mock(spec=["key_cache", "value_cache"])
+        state.key_cache, state.value_cache = [tensor, tensor], [tensor, tensor]
+
+        assert _kv_cache_bytes(state) == 4 * tensor.nbytes
@@ -0,0 +1,225 @@
+"""Unit tests for MmapVectorStore and MmapVectorStoreComponent classes."""
+
+from pathlib import Path
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+from llama_index.core.schema import NodeRelationship, RelatedNodeInfo, TextNode
+from llama_index.core.vector_stores.types import (
+    FilterOperator,
+    MetadataFilter,
+    MetadataFilters,
+    VectorStoreQuery,
+)
+
+from app.core.config.rag import MmapVectorStoreConfig, RagServiceConfig
+from app.services.components.mmap_vector_store import (
+    MmapVectorStore,
+    MmapVectorStoreComponent,
+)
+
+
+def _nodes(vectors: np.ndarray, doc_id: str = "doc") -> list[TextNode]:
+    nodes = []
+    for i, vector in enumerate(vectors):
+        node = TextNode(
+            text=f"chunk {i}",
+            id_=f"{doc_id}-{i}",
+            embedding=vector.tolist(),
+            metadata={"page": i, "file_name": f"{doc_id}.pdf"},
+        )
+        node.relationships[NodeRelationship.SOURCE] = RelatedNodeInfo(node_id=doc_id)
+        nodes.append(node)
+    return nodes
+
+
+@pytest.fixture
+def vectors() -> np.ndarray:
+    """Random unit vectors."""
+    rng = np.random.default_rng(0)
+    data = rng.normal(size=(200, 16)).astype(np.float32)
+    return data / np.linalg.norm(data, axis=1, keepdims=True)
+
+
+class TestMmapVectorStore:
+    """Test cases for MmapVectorStore class."""
+
+    @pytest.mark.parametrize("dtype", ["float32", "float16", "int8"])
+    def test_query_returns_nearest_nodes(
+        self, tmp_path: Path, vectors: np.ndarray, dtype: str
+    ) -> None:
+        """Test that the nearest vectors are returned for every storage dtype."""
+        store = MmapVectorStore(path=tmp_path, dtype=dtype)
+        store.add(_nodes(vectors))
+
+        result = store.query(
+            VectorStoreQuery(query_embedding=vectors[7].tolist(), similarity_top_k=3)
+        )
+
+        assert result.ids is not None and result.ids[0] == "doc-7"
+        assert result.similarities is not None
+        assert result.similarities[0] == pytest.approx(1.0, abs=1e-2)
+        assert result.similarities == sorted(result.similarities, reverse=True)
+        assert result.nodes is not None
+        assert result.nodes[0].get_content() == "chunk 7"
+        assert store.count() == 200
+
+    def test_query_with_filters(self, tmp_path: Path, vectors: np.ndarray) -> None:
+        """Test that metadata filters restrict the returned nodes."""
+        store = MmapVectorStore(path=tmp_path)
+        store.add(_nodes(vectors))
+        filters = MetadataFilters(
+            filters=[MetadataFilter(key="page", value=10, operator=FilterOperator.LT)]
+        )
+
+        result = store.query(
+            VectorStoreQuery(
+                query_embedding=vectors[150].tolist(),
+                similarity_top_k=4,
+                filters=filters,
+            )
+        )
+
+        assert result.nodes is not None and len(result.nodes) == 4
+        assert all(node.metadata["page"] < 10 for node in result.nodes)
+
+    def test_changes_are_visible_to_other_instances(
+        self, tmp_path: Path, vectors: np.ndarray
+    ) -> None:
+        """Test that a reader picks up vectors appended by another writer."""
+        reader = MmapVectorStore(path=tmp_path)
+        writer = MmapVectorStore(path=tmp_path)
+
+        writer.add(_nodes(vectors[:50], doc_id="first"))
+        writer.add(_nodes(vectors[50:], doc_id="second"))
+
+        assert reader.count() == 200
+        result = reader.query(
+            VectorStoreQuery(query_embedding=vectors[120].tolist(), similarity_top_k=1)
+        )
+        assert result.ids == ["second-70"]
+
+    @pytest.mark.parametrize("dtype", ["float32", "int8"])
+    def test_add_overwrites_uncommitted_bytes(
+        self, tmp_path: Path, vectors: np.ndarray, dtype: str
+    ) -> None:
+        """Test that bytes left by a writer that crashed are overwritten."""
+        store = MmapVectorStore(path=tmp_path, dtype=dtype)
+        store.add(_nodes(vectors[:100], doc_id="first"))
+        # Appends of a writer that crashed before replacing the manifest.
+        for name in ("vectors.bin", "scales.bin", "records.jsonl", "offsets.bin"):
+            with (tmp_path / name).open("ab") as f:
+                f.write(b"\x07" * 13)
+        with (tmp_path / "tombstones.bin").open("ab") as f:
+            f.write(b"\x01" * 13)
+
+        store.add(_nodes(vectors[100:], doc_id="second"))
+
+        reader = MmapVectorStore(path=tmp_path, dtype=dtype)
+        assert reader.count() == 200
+        result = reader.query(
+            VectorStoreQuery(query_embedding=vectors[150].tolist(), similarity_top_k=1)
+        )
+        assert result.ids == ["second-50"]
+        assert result.nodes is not None
+        assert result.nodes[0].get_content() == "chunk 50"
+
+    def test_delete_and_clear(self, tmp_path: Path, vectors: np.ndarray) -> None:
+        """Test that deleted documents are no longer returned."""
+        store = MmapVectorStore(path=tmp_path)
+        store.add(_nodes(vectors[:100], doc_id="keep"))
+        store.add(_nodes(vectors[100:], doc_id="drop"))
+
+        store.delete("drop")
+
+        assert store.count() == 100
+        result = store.query(
+            VectorStoreQuery(query_embedding=vectors[150].tolist(), similarity_top_k=5)
+        )
+        assert result.ids is not None
+        assert all(node_id.startswith("keep") for node_id in result.ids)
+
+        store.clear()
+
+        assert store.count() == 0
+        result = store.query(
+            VectorStoreQuery(query_embedding=vectors[0].tolist(), similarity_top_k=5)
+        )
+        assert result.ids == []
+
+    def test_dimension_mismatch_raises_error(
+        self, tmp_path: Path, vectors: np.ndarray
+    ) -> None:
+        """Test that vectors of a different dimension are rejected."""
+        store = MmapVectorStore(path=tmp_path)
+        store.add(_nodes(vectors))
+
+        with pytest.raises(ValueError, match="does not match the store dimension"):
+            store.add(_nodes(vectors[:, :8], doc_id="other"))
+
+    def test_ivf_search(self, tmp_path: Path, vectors: np.ndarray) -> None:
+        """Test that the IVF index is trained and finds exact matches."""
+        store = MmapVectorStore(path=tmp_path, search_mode="ivf", nlist=4, nprobe=2)
+
+        store.add(_nodes(vectors))
+
+        assert store._ivf is not None
+        assert store._manifest["ivf_rows"] == 200
+        for row in (3, 99, 180):
+            result = store.query(
+                VectorStoreQuery(
+                    query_embedding=vectors[row].tolist(), similarity_top_k=1
+                )
+            )
+            assert result.ids == [f"doc-{row}"]
+
+
+class TestMmapVectorStoreComponent:
+    """Test cases for MmapVectorStoreComponent class."""
+
+    @pytest.fixture
+    def config(self, tmp_path: Path) -> Mock:
+        """Mock configuration pointing to a temporary directory."""
+        config = Mock(spec=RagServiceConfig)
+        config.vector_store_path = tmp_path
+        config.collection_name = "test_collection"
+        config.mmap_store = MmapVectorStoreConfig(dtype="int8")
+        return config
+
+    def test_load(self, config: Mock, tmp_path: Path) -> None:
+        """Test that the store is opened in the collection directory."""
+        component = MmapVectorStoreComponent(config)
+
+        component.load()
+
+        store = component.get_store()
+        assert store.path == str(tmp_path / "test_collection")
+        assert store.dtype == "int8"
+        assert component.count() == 0
+
+    def test_get_store_not_loaded_raises_error(self, config: Mock) -> None:
+        """Test that get_store raises ValueError when store is not loaded."""
+        component = MmapVectorStoreComponent(config)
+
+        with pytest.raises(ValueError, match=r"Vector Store has not been loaded"):
+            component.get_store()
+
+    def test_clear_collections(self, config: Mock, vectors: np.ndarray) -> None:
+        """Test that clearing the collection removes every vector."""
+        component = MmapVectorStoreComponent(config)
+        component.load()
+        component.get_store().add(_nodes(vectors))
+
+        component.clear_collections()
+
+        assert component.count() == 0
+
+    def test_shutdown(self, config: Mock) -> None:
+        """Test shutdown functionality releases the store."""
+        component = MmapVectorStoreComponent(config)
+        component.load()
+
+        component.shutdown()
+
+        assert component._store is None
@@ -0,0 +1,203 @@
+"""Unit tests for ShardedVectorStore and ShardedVectorStoreComponent classes."""
+
+from collections import Counter, OrderedDict
+from pathlib import Path
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+from llama_index.core.schema import NodeRelationship, RelatedNodeInfo, TextNode
+from llama_index.core.vector_stores.types import (
+    VectorStoreQuery,
+    VectorStoreQueryResult,
+)
+
+from app.core.config.rag import RagServiceConfig, ShardingConfig
+from app.services.components import (
+    ChromaVectorStoreComponent,
+    MmapVectorStoreComponent,
+    ShardedVectorStoreComponent,
+    sharded_vector_store,
+)
+from app.services.components.mmap_vector_store import MmapVectorStore
+from app.services.components.sharded_vector_store import (
+    _query_shard,
+    _worker_pool,
+    merge_results,
+    shard_of,
+)
+from app.services.rag_service import create_vector_store_component
+
+
+def _nodes(vectors: np.ndarray) -> list[TextNode]:
+    nodes = []
+    for i, vector in enumerate(vectors):
+        node = TextNode(
+            text=f"chunk {i}",
+            id_=f"node-{i}",
+            embedding=vector.tolist(),
+            metadata={"file_name": f"doc-{i % 4}.pdf"},
+        )
+        node.relationships[NodeRelationship.SOURCE] = RelatedNodeInfo(
+            node_id=f"doc-{i % 4}"
+        )
+        nodes.append(node)
+    return nodes
+
+
+def _query(vector: np.ndarray, top_k: int = 5) -> VectorStoreQuery:
+    return VectorStoreQuery(query_embedding=vector.tolist(), similarity_top_k=top_k)
+
+
+@pytest.fixture
+def vectors() -> np.ndarray:
+    """Random unit vectors."""
+    rng = np.random.default_rng(0)
+    data = rng.normal(size=(120, 16)).astype(np.float32)
+    return data / np.linalg.norm(data, axis=1, keepdims=True)
+
+
+def sharded_config(tmp_path: Path, backend: str, num_shards: int = 3):
+    """Builds the configuration of a sharded collection."""
+    return RagServiceConfig(
+        vector_store_path=tmp_path,
+        vector_store_backend=backend,
+        sharding=ShardingConfig(num_shards=num_shards, workers=2),
+    )
+
+
+class TestSharding:
+    """Test cases for the sharding functions."""
+
+    def test_shard_of_is_stable_and_balanced(self) -> None:
+        """Test that node ids always map to the same, evenly used, shards."""
+        shards = [shard_of(f"node-{i}", 4) for i in range(4000)]
+
+        assert shards == [shard_of(f"node-{i}", 4) for i in range(4000)]
+        assert min(Counter(shards).values()) > 900
+
+    def test_merge_results_keeps_global_top_k(self) -> None:
+        """Test that the best nodes of all shards are merged by similarity."""
+        results = [
+            VectorStoreQueryResult(
+                nodes=[TextNode(id_=i) for i in ids],
+                similarities=similarities,
+                ids=ids,
+            )
+            for ids, similarities in [
+                (["a", "b"], [0.9, 0.2]),
+                (["c", "d"], [0.8, 0.7]),
+                ([], []),
+            ]
+        ]
+
+        merged = merge_results(results, top_k=3)
+
+        assert merged.ids == ["a", "c", "d"]
+        assert merged.similarities == [0.9, 0.8, 0.7]
+        assert [node.node_id for node in merged.nodes or []] == merged.ids
+
+    def test_factory_shards_only_when_configured(self, tmp_path: Path) -> None:
+        """Test that a single shard keeps the plain backend component."""
+        assert isinstance(
+            create_vector_store_component(sharded_config(tmp_path, "mmap", 1)),
+            MmapVectorStoreComponent,
+        )
+        assert isinstance(
+            create_vector_store_component(sharded_config(tmp_path, "mmap", 2)),
+            ShardedVectorStoreComponent,
+        )
+
+
+class TestShardedVectorStoreComponent:
+    """Test cases for ShardedVectorStoreComponent class."""
+
+    def test_mmap_shards_are_queried_by_worker_processes(
+        self, tmp_path: Path, vectors: np.ndarray
+    ) -> None:
+        """Test that process workers return the results of an unsharded store."""
+        component = ShardedVectorStoreComponent(
+            sharded_config(tmp_path, "mmap"), MmapVectorStoreComponent
+        )
+        component.load()
+        try:
+            store = component.get_store()
+            store.add(_nodes(vectors))
+            reference = MmapVectorStore(path=tmp_path / "reference")
+            reference.add(_nodes(vectors))
+
+            assert component.count() == len(vectors)
+            assert all(shard.count() > 0 for shard in component._shards)
+            for vector in vectors[:10]:
+                result = store.query(_query(vector))
+                expected = reference.query(_query(vector))
+                assert result.ids == expected.ids
+                np.testing.assert_allclose(
+                    result.similarities, expected.similarities, rtol=1e-5
+                )
+
+            store.delete("doc-0")
+            assert component.count() == 90
+            component.clear_collections()
+            component.get_store().add(_nodes(vectors[:5]))
+            result = component.get_store().query(_query(vectors[0]))
+            assert sorted(result.ids or []) == [f"node-{i}" for i in range(5)]
+        finally:
+            component.shutdown()
+        assert _worker_pool._executor is None
+
+    def test_worker_stores_are_keyed_by_location_and_bounded(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that workers keep distinct stores per location and close old ones."""
+        monkeypatch.setattr(sharded_vector_store, "_worker_stores", OrderedDict())
+        monkeypatch.setattr(sharded_vector_store, "_MAX_WORKER_STORES", 2)
+        components: list[Mock] = []
+
+        def component_cls(config: RagServiceConfig) -> Mock:
+            component = Mock(config=config)
+            components.append(component)
+            return component
+
+        query = VectorStoreQuery(similarity_top_k=1)
+        first, second = (
+            RagServiceConfig(vector_store_path=tmp_path / name, collection_name="docs")
+            for name in ("first", "second")
+        )
+
+        _query_shard(component_cls, first, "token", query)
+        _query_shard(component_cls, second, "token", query)
+        _query_shard(component_cls, first, "token", query)
+        assert len(components) == 2
+        assert components[0].get_store().query.call_count == 2
+
+        _query_shard(component_cls, first, "recreated", query)
+        assert len(components) == 3
+        components[0].shutdown.assert_called_once()
+
+        third = second.model_copy(update={"collection_name": "other"})
+        _query_shard(component_cls, third, "token", query)
+        components[1].shutdown.assert_called_once()
+        components[2].shutdown.assert_not_called()
+        assert len(sharded_vector_store._worker_stores) == 2
+
+    def test_embedded_chroma_shards_are_queried_by_threads(
+        self, tmp_path: Path, vectors: np.ndarray
+    ) -> None:
+        """Test that embedded Chroma shards are searched within the process."""
+        component = ShardedVectorStoreComponent(
+            sharded_config(tmp_path, "chroma"), ChromaVectorStoreComponent
+        )
+        component.load()
+        try:
+            component.get_store().add(_nodes(vectors))
+
+            result = component.get_store().query(_query(vectors[7], top_k=3))
+
+            assert _worker_pool._executor is None
+            assert component.count() == len(vectors)
+            assert result.ids is not None and result.ids[0] == "node-7"
+            assert len({node.node_id for node in result.nodes or []}) == 3
+            assert sum(len(batch) for batch in component.iter_nodes(50)) == 120
+        finally:
+            component.shutdown()
@@ -1,8 +1,54 @@
+import shutil
+import socket
+import ssl
+import subprocess
+import time
+from collections.abc import Iterator
+from pathlib import Path
 from unittest.mock import Mock, patch
 
+import chromadb
+import httpx
 import pytest
 
-from app.services.components.vector_store import ChromaVectorStoreComponent
+from app.core.config import ChromaServerConfig
+from app.services.components.vector_store import (
+    ChromaVectorStoreComponent,
+    RetryingTransport,
+)
+
+
+@pytest.fixture
+def chroma_server(tmp_path: Path) -> Iterator[ChromaServerConfig]:
+    """Launch a standalone Chroma server on a free local port."""
+    executable = shutil.which("chroma")
+    if executable is None:
+        pytest.skip("The chroma CLI is not available.")
+    with socket.socket() as sock:
+        sock.bind(("localhost", 0))
+        port = sock.getsockname()[1]
+
+    process = subprocess.Popen(
+        [executable, "run", "--path", str(tmp_path), "--port", str(port)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            try:
+                httpx.get(
+                    f"http://localhost:{port}/api/v2/heartbeat"
+                ).raise_for_status()
+                break
+            except httpx.HTTPError:
+                time.sleep(0.2)
+        else:
+            pytest.skip("The Chroma server did not start.")
+        yield ChromaServerConfig(port=port, retries=1, retry_backoff_secs=0.01)
+    finally:
+        process.terminate()
+        process.wait()
 
 
 class TestChromaVectorStoreComponent:
@@ -65,3 +111,158 @@ class TestChromaVectorStoreComponent:
         mock_logger.info.assert_called_once_with(
             "Shutting down vector store component."
         )
+
+    def test_count(self, mock_rag_config_vector_store: Mock) -> None:
+        """Test that count returns the number of vectors in the collection."""
+        component = ChromaVectorStoreComponent(mock_rag_config_vector_store)
+        component._store = Mock()
+        component._store.client.count.return_value = 3
+
+        assert component.count() == 3
+
+    def test_load_http_mode(
+        self, mock_rag_config_vector_store: Mock, chroma_server: ChromaServerConfig
+    ) -> None:
+        """Test that http mode connects to a Chroma server through a pooled client."""
+        mock_rag_config_vector_store.chroma_mode = "http"
+        mock_rag_config_vector_store.chroma_server = chroma_server
+        component = ChromaVectorStoreComponent(mock_rag_config_vector_store)
+
+        component.load()
+
+        session = component._client._server._session  # type: ignore[union-attr]
+        assert isinstance(session._transport, RetryingTransport)
+        assert session.timeout.read == chroma_server.timeout_secs
+        assert component.count() == 0
+        component.clear_collections()
+        assert component.count() == 0
+        component.shutdown()
+
+    def test_connect_http_keeps_session_settings(
+        self, mock_rag_config_vector_store: Mock
+    ) -> None:
+        """Test that the replaced HTTP session keeps its TLS, auth and headers."""
+        mock_rag_config_vector_store.chroma_server = ChromaServerConfig()
+        http_api = Mock()
+        http_api._settings.chroma_server_ssl_verify = False
+        http_api._session = httpx.Client(
+            auth=("user", "secret"), headers={"X-Chroma-Token": "token"}
+        )
+        http_api.http_limits = httpx.Limits(max_connections=4)
+        component = ChromaVectorStoreComponent(mock_rag_config_vector_store)
+
+        with patch("chromadb.HttpClient", return_value=Mock(_server=http_api)):
+            component._connect_http()
+
+        session = http_api._session
+        assert session.headers["X-Chroma-Token"] == "token"
+        assert isinstance(session.auth, httpx.BasicAuth)
+        assert isinstance(session._transport, RetryingTransport)
+        ssl_context = session._transport._pool._ssl_context
+        assert ssl_context.verify_mode == ssl.CERT_NONE
+
+    def test_chroma_http_client_exposes_session(self) -> None:
+        """Test that the Chroma HTTP API still has the attributes replaced."""
+        from chromadb.api.fastapi import FastAPI
+        from chromadb.config import Settings, System
+
+        http_api = FastAPI(
+            System(
+                Settings(
+                    anonymized_telemetry=False,
+                    chroma_server_host="localhost",
+                    chroma_server_http_port=8000,
+                    chroma_server_ssl_verify=False,
+                )
+            )
+        )
+
+        assert isinstance(http_api._session, httpx.Client)
+        assert http_api._settings.chroma_server_ssl_verify is False
+        assert isinstance(http_api.http_limits, httpx.Limits)
+        http_api._session.close()
+
+    def test_load_http_mode_unreachable_raises_error(
+        self, mock_rag_config_vector_store: Mock
+    ) -> None:
+        """Test that http mode gives up after retrying an unreachable server."""
+        with socket.socket() as sock:
+            sock.bind(("localhost", 0))
+            port = sock.getsockname()[1]
+        mock_rag_config_vector_store.chroma_mode = "http"
+        mock_rag_config_vector_store.chroma_server = ChromaServerConfig(
+            port=port, retries=2, retry_backoff_secs=0.0
+        )
+        component = ChromaVectorStoreComponent(mock_rag_config_vector_store)
+
+        with (
+            patch("chromadb.HttpClient", wraps=chromadb.HttpClient) as client,
+            pytest.raises(ValueError, match="Could not connect to a Chroma server"),
+        ):
+            component.load()
+
+        assert client.call_count == 3
+
+
+class TestRetryingTransport:
+    """Test cases for RetryingTransport class."""
+
+    def test_retries_transient_errors(self) -> None:
+        """Test that connection errors are retried until the request succeeds."""
+        transport = RetryingTransport(retries=2, backoff_secs=0.0)
+        request = httpx.Request("GET", "http://localhost/api/v2/heartbeat")
+        response = httpx.Response(200)
+
+        with patch.object(
+            httpx.HTTPTransport,
+            "handle_request",
+            side_effect=[httpx.ConnectError("refused"), response],
+        ) as handle_request:
+            assert transport.handle_request(request) is response
+
+        assert handle_request.call_count == 2
+
+    def test_retries_protocol_errors_of_idempotent_requests(self) -> None:
+        """Test that dropped connections are only retried for idempotent methods."""
+        transport = RetryingTransport(retries=2, backoff_secs=0.0)
+        response = httpx.Response(200)
+
+        with patch.object(
+            httpx.HTTPTransport,
+            "handle_request",
+            side_effect=[httpx.RemoteProtocolError("closed"), response],
+        ) as handle_request:
+            request = httpx.Request("GET", "http://localhost/api/v2/heartbeat")
+            assert transport.handle_request(request) is response
+
+        assert handle_request.call_count == 2
+
+        with (
+            patch.object(
+                httpx.HTTPTransport,
+                "handle_request",
+                side_effect=httpx.RemoteProtocolError("closed"),
+            ) as handle_request,
+            pytest.raises(httpx.RemoteProtocolError),
+        ):
+            request = httpx.Request("POST", "http://localhost/api/v2/collections")
+            transport.handle_request(request)
+
+        assert handle_request.call_count == 1
+
+    def test_gives_up_after_retries(self) -> None:
+        """Test that the last connection error is raised once retries run out."""
+        transport = RetryingTransport(retries=2, backoff_secs=0.0)
+        request = httpx.Request("GET", "http://localhost/api/v2/heartbeat")
+
+        with (
+            patch.object(
+                httpx.HTTPTransport,
+                "handle_request",
+                side_effect=httpx.ConnectError("refused"),
+            ) as handle_request,
+            pytest.raises(httpx.ConnectError),
+        ):
+            transport.handle_request(request)
+
+        assert handle_request.call_count == 3
@@ -0,0 +1,214 @@
+"""Unit tests for the pre-baked model artifact functions."""
+
+import json
+from pathlib import Path
+
+import pytest
+from safetensors import safe_open
+
+from app.core.config.rag import (
+    RagServiceConfig,
+    RoutingConfig,
+    SpeculativeDecodingConfig,
+)
+from app.services.artifacts import (
+    DRAFT_ARTIFACT,
+    EMBEDDING_ARTIFACT,
+    LLM_ARTIFACT,
+    MANIFEST_FILE,
+    SMALL_LLM_ARTIFACT,
+    artifact_path,
+    bake_model_artifacts,
+)
+from app.services.components import (
+    HuggingFaceEmbeddingComponent,
+    HuggingFaceLLMComponent,
+)
+from app.services.routing import small_llm_config
+
+VOCABULARY = ["[UNK]", "[PAD]", "[CLS]", "[SEP]", "llama", "data", "training"]
+
+
+@pytest.fixture(scope="module")
+def tiny_models_config(tmp_path_factory: pytest.TempPathFactory) -> RagServiceConfig:
+    """Create randomly initialized tiny LLM and embedding models on disk.
+
+    Returns:
+        RagServiceConfig: A configuration pointing to the local models.
+    """
+    from tokenizers import Tokenizer, models, pre_tokenizers
+    from transformers import (
+        BertConfig,
+        BertModel,
+        GPT2Config,
+        GPT2LMHeadModel,
+        PreTrainedTokenizerFast,
+    )
+
+    models_dir = tmp_path_factory.mktemp("models")
+    tokenizer = Tokenizer(
+        models.WordLevel(
+            {token: i for i, token in enumerate(VOCABULARY)}, unk_token="[UNK]"
+        )
+    )
+    tokenizer.pre_tokenizer = pre_tokenizers.Whitespace()
+    fast_tokenizer = PreTrainedTokenizerFast(
+        tokenizer_object=tokenizer,
+        unk_token="[UNK]",
+        pad_token="[PAD]",
+        cls_token="[CLS]",
+        sep_token="[SEP]",
+    )
+
+    llm_dir = models_dir / "tiny-llm"
+    GPT2LMHeadModel(
+        GPT2Config(
+            vocab_size=len(VOCABULARY), n_embd=16, n_layer=1, n_head=2, n_positions=64
+        )
+    ).save_pretrained(llm_dir)
+    fast_tokenizer.save_pretrained(llm_dir)
+
+    embed_dir = models_dir / "tiny-embedding"
+    BertModel(
+        BertConfig(
+            vocab_size=len(VOCABULARY),
+            hidden_size=16,
+            num_hidden_layers=1,
+            num_attention_heads=2,
+            intermediate_size=32,
+            max_position_embeddings=64,
+        )
+    ).save_pretrained(embed_dir)
+    fast_tokenizer.save_pretrained(embed_dir)
+
+    return RagServiceConfig(
+        llm_model_name=str(llm_dir),
+        embed_model_name=str(embed_dir),
+        model_artifacts_dir=models_dir / "artifacts",
+        context_window=64,
+        max_new_tokens=2,
+        device_map="cpu",
+    )
+
+
+class TestModelArtifacts:
+    """Test cases for the pre-baked model artifact functions."""
+
+    def test_bake_model_artifacts(self, tiny_models_config: RagServiceConfig) -> None:
+        """Test that both models are written in safetensors with a manifest."""
+        output_dir = tiny_models_config.model_artifacts_dir
+        assert output_dir is not None
+
+        manifest = bake_model_artifacts(
+            tiny_models_config, output_dir=output_dir, dtype="float16"
+        )
+
+        assert json.loads((output_dir / MANIFEST_FILE).read_text()) == manifest
+        assert manifest["dtype"] == "float16"
+        weights = [name for name in manifest["files"] if name.endswith(".safetensors")]
+        assert {Path(name).parts[0] for name in weights} == {
+            LLM_ARTIFACT,
+            EMBEDDING_ARTIFACT,
+        }
+        assert not any(name.endswith(".bin") for name in manifest["files"])
+        with safe_open(output_dir / weights[0], framework="pt") as f:
+            assert f.get_tensor(next(iter(f.keys()))).dtype.itemsize == 2
+
+    def test_components_load_artifacts_offline(
+        self, tiny_models_config: RagServiceConfig
+    ) -> None:
+        """Test that the components load the baked models from local files only."""
+        assert tiny_models_config.model_artifacts_dir is not None
+        bake_model_artifacts(
+            tiny_models_config, output_dir=tiny_models_config.model_artifacts_dir
+        )
+        llm_component = HuggingFaceLLMComponent(tiny_models_config)
+        embedding_component = HuggingFaceEmbeddingComponent(tiny_models_config)
+
+        llm_component.load()
+        embedding_component.load()
+
+        llm = llm_component.get_model()
+        assert llm.model_name == str(
+            tiny_models_config.model_artifacts_dir / LLM_ARTIFACT
+        )
+        assert isinstance(llm.complete("llama data").text, str)
+        embedding = embedding_component.get_model().get_text_embedding("llama data")
+        assert len(embedding) == 16
+
+    def test_artifact_path_missing_raises_error(self, tmp_path: Path) -> None:
+        """Test that loading artifacts that were never baked fails clearly."""
+        config = RagServiceConfig(model_artifacts_dir=tmp_path)
+
+        with pytest.raises(FileNotFoundError, match="app bake-models"):
+            artifact_path(config, LLM_ARTIFACT)
+
+    def test_artifact_path_other_models_raises_error(self, tmp_path: Path) -> None:
+        """Test that artifacts baked for other models are rejected."""
+        (tmp_path / MANIFEST_FILE).write_text(
+            json.dumps({"llm_model_name": "other", "embed_model_name": "other"})
+        )
+        config = RagServiceConfig(model_artifacts_dir=tmp_path)
+
+        with pytest.raises(ValueError, match="not for the configured models"):
+            artifact_path(config, EMBEDDING_ARTIFACT)
+
+    def test_draft_model_artifact(
+        self, tiny_models_config: RagServiceConfig, tmp_path: Path
+    ) -> None:
+        """Test that the draft model is baked and loaded offline from artifacts."""
+        config = tiny_models_config.model_copy(
+            update={
+                "model_artifacts_dir": tmp_path,
+                "speculative_decoding": SpeculativeDecodingConfig(
+                    draft_model_name=tiny_models_config.llm_model_name
+                ),
+            }
+        )
+        bake_model_artifacts(config, output_dir=tmp_path)
+        component = HuggingFaceLLMComponent(config)
+
+        component.load()
+
+        draft_model = component.get_model().generate_kwargs["assistant_model"]
+        assert draft_model.name_or_path == str(tmp_path / DRAFT_ARTIFACT)
+
+    def test_small_llm_artifact(
+        self, tiny_models_config: RagServiceConfig, tmp_path: Path
+    ) -> None:
+        """Test that the small routing LLM is baked and loaded from artifacts."""
+        config = tiny_models_config.model_copy(
+            update={
+                "model_artifacts_dir": tmp_path,
+                "routing": RoutingConfig(
+                    enabled=True,
+                    small_llm_model_name=tiny_models_config.llm_model_name,
+                ),
+            }
+        )
+        manifest = bake_model_artifacts(config, output_dir=tmp_path)
+        component = HuggingFaceLLMComponent(small_llm_config(config))
+
+        component.load()
+
+        assert f"{SMALL_LLM_ARTIFACT}/model.safetensors" in manifest["files"]
+        llm = component.get_model()
+        assert llm.model_name == str(tmp_path / SMALL_LLM_ARTIFACT)
+        assert isinstance(llm.complete("llama data").text, str)
+
+    def test_artifact_path_missing_draft_raises_error(
+        self, tiny_models_config: RagServiceConfig, tmp_path: Path
+    ) -> None:
+        """Test that artifacts baked without the configured draft model are rejected."""
+        bake_model_artifacts(tiny_models_config, output_dir=tmp_path)
+        config = tiny_models_config.model_copy(
+            update={
+                "model_artifacts_dir": tmp_path,
+                "speculative_decoding": SpeculativeDecodingConfig(
+                    draft_model_name="other"
+                ),
+            }
+        )
+
+        with pytest.raises(ValueError, match="do not contain the draft model"):
+            artifact_path(config, DRAFT_ARTIFACT)
@@ -0,0 +1,125 @@
+"""Unit tests for SentenceCompressor class."""
+
+from llama_index.core.embeddings import BaseEmbedding
+from llama_index.core.schema import NodeWithScore, QueryBundle, TextNode
+
+from app.services.compression import SentenceCompressor, split_sentences
+
+
+def _whitespace_tokenizer(text: str) -> list[str]:
+    return text.split()
+
+
+def _nodes() -> list[NodeWithScore]:
+    return [
+        NodeWithScore(
+            node=TextNode(
+                text=(
+                    "The llama models were trained on public data. "
+                    "The weather in Paris was sunny that week. "
+                    "Football scores were not reported."
+                ),
+                id_="node-1",
+            ),
+            score=0.9,
+        ),
+        NodeWithScore(
+            node=TextNode(
+                text="Nothing about football here. Or the weather either.",
+                id_="node-2",
+            ),
+            score=0.5,
+        ),
+    ]
+
+
+class TestSentenceCompressor:
+    """Test cases for SentenceCompressor class."""
+
+    def test_split_sentences(self) -> None:
+        """Test that texts are split on sentence boundaries and short ones dropped."""
+        text = "First sentence here. Ok. Third one?\n\nFourth paragraph!"
+
+        assert split_sentences(text) == [
+            "First sentence here.",
+            "Ok.",
+            "Third one?",
+            "Fourth paragraph!",
+        ]
+        assert split_sentences(text, min_length=5) == [
+            "First sentence here.",
+            "Third one?",
+            "Fourth paragraph!",
+        ]
+
+    def test_keeps_most_relevant_sentences(
+        self, keyword_embed_model: BaseEmbedding
+    ) -> None:
+        """Test that only the sentences closest to the query are kept."""
+        compressor = SentenceCompressor(
+            embed_model=keyword_embed_model,
+            token_budget=8,
+            tokenizer=_whitespace_tokenizer,
+        )
+
+        result = compressor.postprocess_nodes(
+            _nodes(), query_bundle=QueryBundle("llama training data")
+        )
+
+        assert len(result) == 1
+        assert result[0].node.get_content() == (
+            "The llama models were trained on public data."
+        )
+        assert result[0].score == 0.9
+        assert result[0].node.node_id == "node-1"
+
+    def test_report(self, keyword_embed_model: BaseEmbedding) -> None:
+        """Test that the report accounts for the tokens removed."""
+        compressor = SentenceCompressor(
+            embed_model=keyword_embed_model,
+            token_budget=8,
+            tokenizer=_whitespace_tokenizer,
+        )
+
+        compressor.postprocess_nodes(_nodes(), query_bundle=QueryBundle("llama"))
+
+        report = compressor.report
+        assert report is not None
+        assert report.original_tokens == 29
+        assert report.compressed_tokens == 8
+        assert report.tokens_saved == 21
+        assert report.sentences_total == 5
+        assert report.sentences_kept == 1
+        assert report.as_dict()["tokens_saved"] == 21
+
+    def test_budget_larger_than_context_keeps_everything(
+        self, keyword_embed_model: BaseEmbedding
+    ) -> None:
+        """Test that nodes are preserved when the whole context fits the budget."""
+        compressor = SentenceCompressor(
+            embed_model=keyword_embed_model,
+            token_budget=1000,
+            tokenizer=_whitespace_tokenizer,
+        )
+
+        result = compressor.postprocess_nodes(_nodes(), query_bundle=QueryBundle("x"))
+
+        assert [node.node.get_content() for node in result] == [
+            node.node.get_content() for node in _nodes()
+        ]
+        assert compressor.report is not None
+        assert compressor.report.tokens_saved == 0
+
+    def test_without_query_returns_nodes_untouched(
+        self, keyword_embed_model: BaseEmbedding
+    ) -> None:
+        """Test that no compression happens without a query bundle."""
+        compressor = SentenceCompressor(
+            embed_model=keyword_embed_model,
+            token_budget=1,
+            tokenizer=_whitespace_tokenizer,
+        )
+        nodes = _nodes()
+
+        assert compressor.postprocess_nodes(nodes) == nodes
+        assert compressor.report is None
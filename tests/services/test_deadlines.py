@@ -0,0 +1,251 @@
+"""Unit tests for query deadlines and cancellation."""
+
+import time
+from pathlib import Path
+from typing import Any
+from unittest.mock import Mock
+
+import pytest
+from llama_index.core.llms import (
+    CompletionResponse,
+    CompletionResponseGen,
+    CustomLLM,
+    LLMMetadata,
+)
+from llama_index.core.llms.callbacks import llm_completion_callback
+
+from app.core.config.rag import DeadlinesConfig, RagServiceConfig
+from app.core.exceptions import QueryTimeoutError
+from app.services.components import MmapVectorStoreComponent
+from app.services.deadlines import (
+    Deadline,
+    cancel_on_disconnect,
+    deadline_reached,
+    deadline_scope,
+)
+from app.services.rag_service import RAGService
+
+
+class SlowLLM(CustomLLM):
+    """LLM generating one word every few milliseconds until it is stopped."""
+
+    max_tokens: int = 100
+    finish_s: float = 0.0
+
+    @property
+    def metadata(self) -> LLMMetadata:
+        return LLMMetadata(num_output=self.max_tokens)
+
+    @llm_completion_callback()
+    def complete(
+        self,
+        prompt: str,  # noqa: ARG002
+        formatted: bool = False,  # noqa: ARG002
+        **kwargs: Any,  # noqa: ARG002
+    ) -> CompletionResponse:
+        words = []
+        for _ in range(self.max_tokens):
+            time.sleep(0.005)
+            words.append("llama")
+            if deadline_reached():
+                break
+        time.sleep(self.finish_s)
+        return CompletionResponse(text=" ".join(words))
+
+    @llm_completion_callback()
+    def stream_complete(
+        self, prompt: str, formatted: bool = False, **kwargs: Any
+    ) -> CompletionResponseGen:
+        raise NotImplementedError
+
+
+@pytest.fixture
+def rag_service(tmp_path: Path, keyword_embed_model) -> RAGService:
+    """Create a RAG service over one indexed document and a slow LLM.
+
+    Returns:
+        RAGService: A service with its default index loaded.
+    """
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "llama.txt").write_text("llama data training.")
+    config = RagServiceConfig(
+        pdf_directory=str(docs),
+        vector_store_path=tmp_path / "vector_store",
+        vector_store_backend="mmap",
+        template_dir=Path("templates"),
+        deadlines=DeadlinesConfig(disconnect_poll_interval_s=0.01),
+    )
+    embedding_component = Mock()
+    embedding_component.get_model.return_value = keyword_embed_model
+    llm_component = Mock()
+    llm_component.get_model.return_value = SlowLLM()
+    vector_store_component = MmapVectorStoreComponent(config)
+    vector_store_component.load()
+    service = RAGService(
+        llm_component, embedding_component, vector_store_component, config
+    )
+    service.get_or_create_index()
+    return service
+
+
+class TestDeadline:
+    """Test cases for the Deadline class."""
+
+    def test_without_timeout_never_expires(self) -> None:
+        """Test that a deadline without timeout only stops when cancelled."""
+        deadline = Deadline(timeout_s=None)
+
+        assert deadline.remaining() is None
+        assert not deadline.reached
+        deadline.cancel()
+        assert deadline.reached
+        with pytest.raises(QueryTimeoutError, match="cancelled during retrieval"):
+            deadline.check("retrieval")
+
+    def test_expires_after_timeout(self) -> None:
+        """Test that a deadline expires once its timeout elapsed."""
+        deadline = Deadline(timeout_s=0)
+
+        assert deadline.expired
+        assert deadline.remaining() == 0.0
+        with pytest.raises(QueryTimeoutError, match="0 s deadline during generation"):
+            deadline.check("generation")
+
+    def test_deadline_scope(self) -> None:
+        """Test that only the requests within a deadline scope are stopped."""
+        assert not deadline_reached()
+        with deadline_scope(Deadline(timeout_s=0)):
+            assert deadline_reached()
+        assert not deadline_reached()
+
+    @pytest.mark.asyncio
+    async def test_cancel_on_disconnect(self) -> None:
+        """Test that the deadline is cancelled once the client disconnects."""
+        checks = iter([False, False, True])
+        deadline = Deadline(timeout_s=None)
+
+        async def is_disconnected() -> bool:
+            return next(checks)
+
+        await cancel_on_disconnect(is_disconnected, deadline, interval_s=0)
+
+        assert deadline.cancelled
+
+
+class TestQueryDeadlines:
+    """Test cases for deadlines of RAG service queries."""
+
+    @pytest.mark.asyncio
+    async def test_query_within_deadline_is_complete(
+        self, rag_service: RAGService
+    ) -> None:
+        """Test that a query finishing before its deadline is not partial."""
+        result = await rag_service.query("llama", timeout_s=30)
+
+        assert not result["partial"]
+        assert len(result["answer"].split()) == 100
+
+    @pytest.mark.asyncio
+    async def test_answer_completed_before_deadline_is_not_partial(
+        self, rag_service: RAGService
+    ) -> None:
+        """Test that an answer is complete when the deadline passes after its end."""
+        rag_service._llm_component.get_model.return_value = SlowLLM(
+            max_tokens=3, finish_s=0.3
+        )
+
+        result = await rag_service.query("llama", timeout_s=0.2)
+
+        assert not result["partial"]
+        assert result["answer"] == "llama llama llama"
+
+    @pytest.mark.asyncio
+    async def test_generation_is_stopped_at_deadline(
+        self, rag_service: RAGService
+    ) -> None:
+        """Test that generation stops at the deadline with a partial answer."""
+        result = await rag_service.query("llama", timeout_s=0.2)
+
+        assert result["partial"]
+        assert 0 < len(result["answer"].split()) < 100
+        assert result["sources"]
+
+    @pytest.mark.asyncio
+    async def test_generation_is_stopped_on_disconnect(
+        self, rag_service: RAGService
+    ) -> None:
+        """Test that generation stops when the client goes away."""
+        start = time.monotonic()
+
+        async def is_disconnected() -> bool:
+            return time.monotonic() - start > 0.1
+
+        result = await rag_service.query("llama", is_disconnected=is_disconnected)
+
+        assert result["partial"]
+        assert 0 < len(result["answer"].split()) < 100
+
+    @pytest.mark.asyncio
+    async def test_deadline_passed_during_retrieval_raises_error(
+        self, rag_service: RAGService
+    ) -> None:
+        """Test that no answer is generated once the deadline passed."""
+        with pytest.raises(QueryTimeoutError, match="during retrieval"):
+            await rag_service.query("llama", timeout_s=1e-9)
+
+    @pytest.mark.asyncio
+    async def test_queued_query_times_out(self, rag_service: RAGService) -> None:
+        """Test that a query waiting for a busy LLM stops at its deadline."""
+        rag_service._generation_locks["large"].acquire()
+        try:
+            with pytest.raises(QueryTimeoutError, match="wait for the LLM"):
+                await rag_service.query("llama", timeout_s=0.2)
+        finally:
+            rag_service._generation_locks["large"].release()
+
+    @pytest.mark.asyncio
+    async def test_timeout_is_bounded_by_maximum(self, rag_service: RAGService) -> None:
+        """Test that queries cannot set a deadline over the configured maximum."""
+        rag_service._config.deadlines.max_timeout_s = 0.2
+
+        result = await rag_service.query("llama", timeout_s=3600)
+
+        assert result["partial"]
+
+
+class TestChatDeadlines:
+    """Test cases for deadlines of RAG service chat turns."""
+
+    @pytest.fixture
+    def rag_service(self, rag_service: RAGService) -> RAGService:
+        """Use an LLM component without KV cache support."""
+        llm_component = Mock(spec=["load", "get_model", "shutdown"])
+        llm_component.get_model.return_value = SlowLLM()
+        rag_service._llm_component = llm_component
+        return rag_service
+
+    @pytest.mark.asyncio
+    async def test_generation_is_stopped_at_deadline(
+        self, rag_service: RAGService
+    ) -> None:
+        """Test that a chat turn stopped at its deadline keeps a partial answer."""
+        result = await rag_service.chat("llama", timeout_s=0.2)
+
+        assert result["partial"]
+        assert 0 < len(result["answer"].split()) < 100
+        assert rag_service.get_session(result["session_id"]).turns[0].partial
+
+    @pytest.mark.asyncio
+    async def test_answer_completed_before_deadline_is_not_partial(
+        self, rag_service: RAGService
+    ) -> None:
+        """Test that a turn is complete when the deadline passes after its end."""
+        rag_service._llm_component.get_model.return_value = SlowLLM(
+            max_tokens=3, finish_s=0.3
+        )
+
+        result = await rag_service.chat("llama", timeout_s=0.2)
+
+        assert not result["partial"]
+        assert result["answer"] == "llama llama llama"
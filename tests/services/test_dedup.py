@@ -0,0 +1,91 @@
+"""Unit tests for NearDuplicateFilter class."""
+
+import numpy as np
+from llama_index.core.schema import TextNode
+
+from app.services.dedup import NearDuplicateFilter, lsh_bands
+
+PARAGRAPH = (
+    "We train large transformers on a large quantity of textual data using a "
+    "standard optimizer. Our training dataset is a mixture of several sources "
+    "that cover a diverse set of domains, and we only use publicly available data."
+)
+OTHER_PARAGRAPH = (
+    "The tokenizer splits all numbers into individual digits and falls back to "
+    "bytes to decompose unknown UTF-8 characters, following the SentencePiece setup."
+)
+
+
+class TestNearDuplicateFilter:
+    """Test cases for NearDuplicateFilter class."""
+
+    def test_lsh_bands(self) -> None:
+        """Test that the band split multiplies to num_perm and tracks the threshold."""
+        bands, rows = lsh_bands(128, 0.85)
+
+        assert bands * rows == 128
+        assert abs((1 / bands) ** (1 / rows) - 0.85) < 0.1
+
+    def test_signature_is_deterministic(self) -> None:
+        """Test that equal texts produce equal signatures across instances."""
+        first = NearDuplicateFilter().signature(PARAGRAPH)
+        second = NearDuplicateFilter().signature(PARAGRAPH)
+
+        assert first.shape == (128,)
+        np.testing.assert_array_equal(first, second)
+
+    def test_drops_near_duplicates(self) -> None:
+        """Test that exact and near duplicates are dropped keeping the first one."""
+        nodes = [
+            TextNode(text=PARAGRAPH, id_="original"),
+            TextNode(text=OTHER_PARAGRAPH, id_="other"),
+            TextNode(text=PARAGRAPH, id_="exact-copy"),
+            TextNode(text=PARAGRAPH.replace("standard", "Standard") + " ", id_="near"),
+        ]
+        dedup_filter = NearDuplicateFilter(threshold=0.8)
+
+        result = dedup_filter(nodes)
+
+        assert [node.node_id for node in result] == ["original", "other"]
+        assert dedup_filter.stats.input_nodes == 4
+        assert dedup_filter.stats.dropped_nodes == 2
+        assert dedup_filter.stats.kept_nodes == 2
+        assert dedup_filter.stats.dropped_ratio == 0.5
+
+    def test_keeps_distinct_nodes(self) -> None:
+        """Test that unrelated nodes are all kept."""
+        nodes = [
+            TextNode(text=PARAGRAPH, id_="first"),
+            TextNode(text=OTHER_PARAGRAPH, id_="second"),
+        ]
+        dedup_filter = NearDuplicateFilter()
+
+        result = dedup_filter(nodes)
+
+        assert len(result) == 2
+        assert dedup_filter.stats.dropped_nodes == 0
+
+    def test_signatures_are_bounded(self) -> None:
+        """Test that duplicates of nodes whose signature was evicted are dropped."""
+        dedup_filter = NearDuplicateFilter(incremental=True, max_signatures=1)
+        dedup_filter([TextNode(text=PARAGRAPH, id_="original")])
+        dedup_filter([TextNode(text=OTHER_PARAGRAPH, id_="other")])
+
+        result = dedup_filter(
+            [
+                TextNode(text=PARAGRAPH, id_="copy"),
+                TextNode(text=OTHER_PARAGRAPH, id_="other-copy"),
+            ]
+        )
+
+        assert result == []
+        assert len(dedup_filter._signatures) == 1
+        assert dedup_filter.stats.dropped_nodes == 2
+
+    def test_estimated_bytes_saved(self) -> None:
+        """Test that the saved bytes account for node text and float32 vectors."""
+        dedup_filter = NearDuplicateFilter()
+        dedup_filter([TextNode(text="abc"), TextNode(text="abc")])
+
+        assert dedup_filter.stats.dropped_text_bytes == 3
+        assert dedup_filter.stats.estimated_bytes_saved(embedding_dim=10) == 43
@@ -0,0 +1,169 @@
+"""Unit tests for streaming document ingestion."""
+
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+from llama_index.core import StorageContext, VectorStoreIndex
+from llama_index.core.node_parser import SentenceSplitter
+from llama_index.core.schema import TextNode
+
+from app.core.config.rag import RagServiceConfig
+from app.services.components import MmapVectorStoreComponent
+from app.services.dedup import NearDuplicateFilter
+from app.services.ingestion import insert_documents, iter_documents, list_documents
+from app.services.metadata import PAGE_NUMBER_KEY
+
+PARAGRAPH = (
+    "We train large transformers on a large quantity of textual data using a "
+    "standard optimizer, and we only use publicly available data."
+)
+
+
+def write_corpus(directory: Path, files: int, sentences: int = 400) -> int:
+    """Writes distinct text documents and returns their total size in bytes."""
+    directory.mkdir()
+    for number in range(files):
+        text = " ".join(
+            f"Llama {number} sees data {i} on training day {i}."
+            for i in range(sentences)
+        )
+        (directory / f"notes-{number}.txt").write_text(text)
+    return sum(path.stat().st_size for path in directory.iterdir())
+
+
+@pytest.fixture
+def make_index(tmp_path: Path, keyword_embed_model) -> Callable[[str], tuple]:
+    """Create empty indexes over memory-mapped vector stores.
+
+    Returns:
+        Callable[[str], tuple]: A function creating an index and its store.
+    """
+
+    def make(name: str) -> tuple[VectorStoreIndex, MmapVectorStoreComponent]:
+        config = RagServiceConfig(
+            vector_store_path=tmp_path / name,
+            vector_store_backend="mmap",
+            template_dir=Path("templates"),
+        )
+        component = MmapVectorStoreComponent(config)
+        component.load()
+        index = VectorStoreIndex(
+            nodes=[],
+            storage_context=StorageContext.from_defaults(
+                vector_store=component.get_store()
+            ),
+            embed_model=keyword_embed_model,
+        )
+        return index, component
+
+    return make
+
+
+class TestIterDocuments:
+    """Test cases for reading documents as a stream."""
+
+    def test_pdf_pages_are_yielded_one_by_one(
+        self, tmp_path: Path, make_pdf: Callable[..., bytes]
+    ) -> None:
+        """Test that each PDF page becomes a document with its page label."""
+        path = tmp_path / "llama.pdf"
+        path.write_bytes(make_pdf("llama", "data", "training"))
+
+        documents = iter_documents([path])
+        first = next(documents)
+
+        assert first.text.strip() == "llama"
+        assert first.metadata["page_label"] == "1"
+        assert first.metadata["file_name"] == "llama.pdf"
+        assert "file_name" in first.excluded_embed_metadata_keys
+        assert [document.text.strip() for document in documents] == [
+            "data",
+            "training",
+        ]
+
+    def test_list_documents_skips_hidden_files(self, tmp_path: Path) -> None:
+        """Test that staged uploads are not listed as documents."""
+        (tmp_path / "weather.txt").write_text("weather")
+        (tmp_path / ".0123-llama.pdf").write_bytes(b"%PDF-")
+
+        assert [path.name for path in list_documents(str(tmp_path))] == ["weather.txt"]
+
+
+class TestInsertDocuments:
+    """Test cases for batched insertion of document streams."""
+
+    def test_nodes_are_written_in_batches(
+        self, tmp_path: Path, make_pdf: Callable[..., bytes], make_index
+    ) -> None:
+        """Test that every node is stored and pages are numbered across batches."""
+        path = tmp_path / "llama.pdf"
+        path.write_bytes(make_pdf("llama", "data", "training"))
+        index, component = make_index("store")
+
+        stats = insert_documents(
+            index, iter_documents([path]), [SentenceSplitter()], batch_size=2
+        )
+
+        assert (stats.documents, stats.nodes, stats.batches) == (3, 3, 2)
+        assert component.count() == 3
+        nodes = index.as_retriever(similarity_top_k=3).retrieve("training")
+        assert nodes[0].metadata[PAGE_NUMBER_KEY] == 3
+
+    def test_duplicates_are_dropped_across_batches(
+        self, tmp_path: Path, make_index
+    ) -> None:
+        """Test that an incremental filter compares chunks of different batches."""
+        (tmp_path / "docs").mkdir()
+        for name in ("a.txt", "b.txt", "c.txt"):
+            (tmp_path / "docs" / name).write_text(PARAGRAPH)
+        index, component = make_index("store")
+        dedup_filter = NearDuplicateFilter(incremental=True)
+
+        stats = insert_documents(
+            index,
+            iter_documents(list_documents(str(tmp_path / "docs"))),
+            [SentenceSplitter(), dedup_filter],
+            batch_size=1,
+        )
+
+        assert stats.nodes == component.count() == 1
+        assert dedup_filter.stats.input_nodes == 3
+        assert dedup_filter.stats.dropped_nodes == 2
+
+    def test_incremental_filter_is_reset_otherwise(self) -> None:
+        """Test that a non-incremental filter forgets the nodes of past calls."""
+        dedup_filter = NearDuplicateFilter()
+
+        dedup_filter([TextNode(text=PARAGRAPH)])
+
+        assert len(dedup_filter([TextNode(text=PARAGRAPH)])) == 1
+        assert dedup_filter.stats.input_nodes == 1
+
+    def test_peak_memory_is_bounded_by_batch_size(
+        self, tmp_path: Path, make_index
+    ) -> None:
+        """Test that peak memory does not grow with the size of the corpus."""
+        splitter = SentenceSplitter(
+            chunk_size=256, chunk_overlap=0, tokenizer=str.split
+        )
+
+        def peak_bytes(name: str, files: int) -> tuple[int, int]:
+            corpus_bytes = write_corpus(tmp_path / name, files)
+            index, _ = make_index(f"{name}-store")
+            documents = iter_documents(list_documents(str(tmp_path / name)))
+            tracemalloc.start()
+            try:
+                insert_documents(index, documents, [splitter], batch_size=8)
+                return tracemalloc.get_traced_memory()[1], corpus_bytes
+            finally:
+                tracemalloc.stop()
+
+        # Load the lazily imported tokenizers before measuring.
+        peak_bytes("warmup", files=1)
+        small_peak, small_bytes = peak_bytes("small", files=2)
+        large_peak, large_bytes = peak_bytes("large", files=8)
+
+        # Materializing the corpus would retain at least all of its text.
+        assert large_peak - small_peak < (large_bytes - small_bytes) / 2
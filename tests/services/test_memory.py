@@ -0,0 +1,103 @@
+"""Unit tests for the memory accounting."""
+
+from pathlib import Path
+from unittest.mock import Mock
+
+import torch
+from llama_index.core.llms import MockLLM
+
+from app.core.config.rag import RagServiceConfig
+from app.services.components import (
+    HuggingFaceLLMComponent,
+    MmapVectorStoreComponent,
+)
+from app.services.memory import (
+    estimate_hnsw_bytes,
+    model_weight_bytes,
+    module_bytes,
+    process_memory,
+)
+from app.services.rag_service import RAGService
+
+
+class TestMemoryAccounting:
+    """Test cases for the memory accounting functions."""
+
+    def test_process_memory(self) -> None:
+        """Test that the resident memory of the process is reported."""
+        memory = process_memory()
+
+        assert memory.peak_rss_bytes is not None
+        assert memory.peak_rss_bytes >= (memory.rss_bytes or 0) > 0
+
+    def test_model_weight_bytes(self, tmp_path: Path) -> None:
+        """Test that torch models count their weights and GGUF models their file."""
+        gguf = tmp_path / "model.gguf"
+        gguf.write_bytes(b"\0" * 100)
+        module = torch.nn.Sequential(torch.nn.Linear(4, 2), torch.nn.BatchNorm1d(2))
+
+        # 8 + 2 and 2 + 2 float parameters, 2 + 2 float buffers and an int64 one.
+        assert model_weight_bytes(Mock(_model=module)) == 18 * 4 + 8
+        assert model_weight_bytes(Mock(_model=None, model_path=str(gguf))) == 100
+        assert model_weight_bytes(MockLLM()) is None
+
+    def test_module_bytes_counts_packed_and_tied_weights(self) -> None:
+        """Test that int8 packed weights are counted, and tied weights once."""
+        module = torch.nn.Sequential(torch.nn.Embedding(8, 16), torch.nn.Linear(16, 8))
+        module[1].weight = module[0].weight
+
+        # Tied 8 x 16 float weights and 8 float biases.
+        assert module_bytes(module) == (128 + 8) * 4
+
+        quantized = torch.nn.Sequential(
+            torch.nn.Embedding(8, 16), torch.nn.Linear(16, 8)
+        )
+        HuggingFaceLLMComponent._quantize_int8(quantized)
+
+        # 8 x 16 float embeddings, 8 x 16 int8 weights with 8 float biases, and
+        # the float scale and int64 zero point of the quantized outputs.
+        assert module_bytes(quantized) == 128 * 4 + 128 + 8 * 4 + 4 + 8
+
+    def test_estimate_hnsw_bytes(self) -> None:
+        """Test that HNSW indexes count their vectors and base layer links."""
+        assert estimate_hnsw_bytes(10, 384) == 10 * (384 * 4 + 32 * 4)
+
+
+class TestServiceMemory:
+    """Test cases for the memory report of the RAG service."""
+
+    def test_memory_usage(self, tmp_path: Path, keyword_embed_model) -> None:
+        """Test that the report covers the models, the index and the caches."""
+        docs = tmp_path / "docs"
+        docs.mkdir()
+        (docs / "llama.txt").write_text("llama data training.")
+        config = RagServiceConfig(
+            pdf_directory=str(docs),
+            vector_store_path=tmp_path / "vector_store",
+            vector_store_backend="mmap",
+            template_dir=Path("templates"),
+        )
+        embedding_component = Mock()
+        embedding_component.get_model.return_value = keyword_embed_model
+        llm_component = Mock()
+        llm_component.get_model.side_effect = ValueError("not loaded")
+        vector_store_component = MmapVectorStoreComponent(config)
+        vector_store_component.load()
+        service = RAGService(
+            llm_component, embedding_component, vector_store_component, config
+        )
+        service.get_or_create_index()
+
+        report = service.memory_usage()
+        rendered = service.metrics.render()
+
+        assert [model.component for model in report.models] == ["embedding"]
+        assert report.vector_store is not None
+        assert report.vector_store.vectors == 1
+        assert report.vector_store.index_bytes > 0
+        assert [cache.cache for cache in report.caches] == [
+            "tenant_indexes",
+            "chat_sessions",
+        ]
+        assert "rag_vector_store_vectors 1.0" in rendered
+        assert 'rag_process_memory_bytes{kind="rss"}' in rendered
@@ -0,0 +1,85 @@
+"""Unit tests for document metadata capture and query filters."""
+
+from llama_index.core.schema import Document, MetadataMode
+from llama_index.core.vector_stores.types import FilterCondition, FilterOperator
+from llama_index.vector_stores.chroma.base import _to_chroma_filter
+
+from app.services.metadata import annotate_documents, build_metadata_filters
+
+
+def _pages(file_name: str, count: int) -> list[Document]:
+    return [
+        Document(
+            text=f"{file_name} page {i}",
+            metadata={
+                "file_path": f"/docs/{file_name}",
+                "file_name": file_name,
+                "page_label": str(i + 1),
+            },
+        )
+        for i in range(count)
+    ]
+
+
+class TestAnnotateDocuments:
+    """Test cases for annotate_documents function."""
+
+    def test_adds_page_numbers_per_file(self) -> None:
+        """Test that page numbers restart for every source file."""
+        documents = _pages("a.pdf", 3) + _pages("b.pdf", 2)
+
+        annotate_documents(documents)
+
+        assert [doc.metadata["page_number"] for doc in documents] == [1, 2, 3, 1, 2]
+
+    def test_adds_tags_without_changing_embedded_content(self) -> None:
+        """Test that file tags are stored but not embedded nor sent to the LLM."""
+        documents = _pages("a.pdf", 1) + _pages("b.pdf", 1)
+        embedded_before = documents[0].get_content(metadata_mode=MetadataMode.EMBED)
+
+        annotate_documents(documents, {"a.pdf": {"topic": "llm", "year": 2023}})
+
+        assert documents[0].metadata["topic"] == "llm"
+        assert documents[0].metadata["year"] == 2023
+        assert "topic" not in documents[1].metadata
+        assert (
+            documents[0].get_content(metadata_mode=MetadataMode.EMBED)
+            == embedded_before
+        )
+        assert "topic" not in documents[0].get_content(metadata_mode=MetadataMode.LLM)
+
+
+class TestBuildMetadataFilters:
+    """Test cases for build_metadata_filters function."""
+
+    def test_no_conditions_returns_none(self) -> None:
+        """Test that an unscoped query has no filters."""
+        assert build_metadata_filters() is None
+        assert build_metadata_filters(file_names=[], tags={}) is None
+
+    def test_builds_conjunction_of_conditions(self) -> None:
+        """Test that every condition is combined with AND."""
+        filters = build_metadata_filters(
+            file_names=["a.pdf"], page_from=2, page_to=5, tags={"topic": "llm"}
+        )
+
+        assert filters is not None
+        assert filters.condition == FilterCondition.AND
+        assert [(f.key, f.operator, f.value) for f in filters.filters] == [  # type: ignore[union-attr]
+            ("file_name", FilterOperator.IN, ["a.pdf"]),
+            ("page_number", FilterOperator.GTE, 2),
+            ("page_number", FilterOperator.LTE, 5),
+            ("topic", FilterOperator.EQ, "llm"),
+        ]
+
+    def test_translates_to_chroma_where_clause(self) -> None:
+        """Test that the filters become a native Chroma where clause."""
+        filters = build_metadata_filters(file_names=["a.pdf", "b.pdf"], page_to=3)
+
+        assert filters is not None
+        assert _to_chroma_filter(filters) == {
+            "$and": [
+                {"file_name": {"$in": ["a.pdf", "b.pdf"]}},
+                {"page_number": {"$lte": 3}},
+            ]
+        }
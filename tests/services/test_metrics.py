@@ -0,0 +1,73 @@
+"""Unit tests for the service metrics."""
+
+import pytest
+
+from app.services.metrics import MetricsRegistry
+
+
+class TestMetricsRegistry:
+    """Test cases for the MetricsRegistry class."""
+
+    def test_render_counter(self) -> None:
+        """Test that counters are rendered with their help, type and labels."""
+        registry = MetricsRegistry()
+        counter = registry.counter("rag_queries_total", "Queries.", ("route",))
+
+        counter.inc(route="small")
+        counter.inc(2, route='say "large"')
+
+        assert counter.value(route="small") == 1.0
+        assert registry.render().splitlines() == [
+            "# HELP rag_queries_total Queries.",
+            "# TYPE rag_queries_total counter",
+            'rag_queries_total{route="say \\"large\\""} 2.0',
+            'rag_queries_total{route="small"} 1.0',
+        ]
+
+    def test_render_histogram(self) -> None:
+        """Test that histogram buckets are cumulative and end with +Inf."""
+        registry = MetricsRegistry()
+        histogram = registry.histogram("rag_score", "Scores.", buckets=[0.5, 1.0])
+
+        for value in (0.2, 0.5, 0.7, 3.0):
+            histogram.observe(value)
+
+        assert histogram.count() == 4
+        assert registry.render().splitlines()[2:] == [
+            'rag_score_bucket{le="0.5"} 2.0',
+            'rag_score_bucket{le="1.0"} 3.0',
+            'rag_score_bucket{le="+Inf"} 4.0',
+            "rag_score_sum 4.4",
+            "rag_score_count 4.0",
+        ]
+
+    def test_wrong_labels_raise_error(self) -> None:
+        """Test that samples must set exactly the label names of their metric."""
+        counter = MetricsRegistry().counter("rag_total", "Total.", ("outcome",))
+
+        with pytest.raises(ValueError, match="expects the labels"):
+            counter.inc(route="small")
+        with pytest.raises(ValueError, match="only be incremented"):
+            counter.inc(-1, outcome="passed")
+
+    def test_duplicate_metric_raises_error(self) -> None:
+        """Test that a metric name can only be registered once."""
+        registry = MetricsRegistry()
+        registry.counter("rag_total", "Total.")
+
+        with pytest.raises(ValueError, match="already registered"):
+            registry.histogram("rag_total", "Total.", buckets=[1.0])
+
+    def test_gauges_are_collected_on_render(self) -> None:
+        """Test that collectors update the gauges before they are rendered."""
+        registry = MetricsRegistry()
+        gauge = registry.gauge("rag_memory_bytes", "Memory.", ("kind",))
+        values = iter([10, 4])
+        registry.add_collector(lambda: gauge.set(next(values), kind="rss"))
+
+        assert registry.render().splitlines()[1:] == [
+            "# TYPE rag_memory_bytes gauge",
+            'rag_memory_bytes{kind="rss"} 10.0',
+        ]
+        assert registry.render().splitlines()[2] == 'rag_memory_bytes{kind="rss"} 4.0'
+        assert gauge.value(kind="rss") == 4.0
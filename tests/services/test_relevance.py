@@ -0,0 +1,134 @@
+"""Unit tests for the relevance gate."""
+
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+from llama_index.core.llms import MockLLM
+from llama_index.core.schema import NodeWithScore, TextNode
+
+from app.core.config.rag import (
+    ContextCompressionConfig,
+    RagServiceConfig,
+    RelevanceGateConfig,
+)
+from app.services.components import MmapVectorStoreComponent
+from app.services.compression import SentenceCompressor
+from app.services.metrics import MetricsRegistry
+from app.services.rag_service import RAGService
+from app.services.relevance import RelevanceGate, top_score
+
+
+def scored(*scores: float | None) -> list[NodeWithScore]:
+    """Builds retrieved nodes with the given scores."""
+    return [NodeWithScore(node=TextNode(text="llama"), score=s) for s in scores]
+
+
+@pytest.fixture
+def rag_service(tmp_path: Path, keyword_embed_model) -> RAGService:
+    """Create a RAG service over one indexed document with the gate enabled.
+
+    Returns:
+        RAGService: A service with its default index loaded.
+    """
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "llama.txt").write_text("llama data training.")
+    config = RagServiceConfig(
+        pdf_directory=str(docs),
+        vector_store_path=tmp_path / "vector_store",
+        vector_store_backend="mmap",
+        template_dir=Path("templates"),
+        relevance_gate=RelevanceGateConfig(enabled=True, min_score=0.3),
+    )
+    embedding_component = Mock()
+    embedding_component.get_model.return_value = keyword_embed_model
+    llm_component = Mock()
+    llm_component.get_model.return_value = MockLLM(max_tokens=8)
+    vector_store_component = MmapVectorStoreComponent(config)
+    vector_store_component.load()
+    service = RAGService(
+        llm_component, embedding_component, vector_store_component, config
+    )
+    service.get_or_create_index()
+    return service
+
+
+class TestRelevanceGate:
+    """Test cases for the RelevanceGate class."""
+
+    def test_top_score(self) -> None:
+        """Test that the top score ignores missing scores and empty retrievals."""
+        assert top_score(scored(0.2, None, 0.7)) == 0.7
+        assert top_score([]) == 0.0
+
+    def test_rejects_nodes_below_threshold(self) -> None:
+        """Test that generation is skipped unless a node reaches the threshold."""
+        metrics = MetricsRegistry()
+        gate = RelevanceGate(RelevanceGateConfig(enabled=True, min_score=0.5), metrics)
+
+        assert gate.passes(scored(0.2, 0.5))
+        assert not gate.passes(scored(0.2, 0.49))
+        assert not gate.passes([])
+
+        rendered = metrics.render()
+        assert 'rag_relevance_gate_total{outcome="passed"} 1.0' in rendered
+        assert 'rag_relevance_gate_total{outcome="rejected"} 2.0' in rendered
+        assert "rag_retrieval_top_score_count 3.0" in rendered
+
+    def test_disabled_gate_records_scores(self) -> None:
+        """Test that a disabled gate passes every query but records its score."""
+        metrics = MetricsRegistry()
+        gate = RelevanceGate(RelevanceGateConfig(enabled=False), metrics)
+
+        assert gate.passes([])
+
+        rendered = metrics.render()
+        assert "rag_retrieval_top_score_count 1.0" in rendered
+        assert "rag_relevance_gate_total{" not in rendered
+
+
+class TestQueryRelevanceGate:
+    """Test cases for the relevance gate of RAG service queries."""
+
+    @pytest.mark.asyncio
+    async def test_irrelevant_query_skips_generation(
+        self, rag_service: RAGService
+    ) -> None:
+        """Test that the canned answer is returned when nothing is relevant."""
+        result = await rag_service.query("football")
+
+        assert result["answer"] == RelevanceGateConfig().answer
+        assert result["sources"] == []
+        assert not result["partial"]
+
+    @pytest.mark.asyncio
+    async def test_relevant_query_is_answered(self, rag_service: RAGService) -> None:
+        """Test that queries with relevant context are answered by the LLM."""
+        result = await rag_service.query("llama")
+
+        assert result["answer"] != RelevanceGateConfig().answer
+        assert result["sources"]
+        assert (
+            'rag_relevance_gate_total{outcome="passed"} 1.0'
+            in rag_service.metrics.render()
+        )
+
+    @pytest.mark.asyncio
+    async def test_gate_runs_before_compression(self, rag_service: RAGService) -> None:
+        """Test that the gate uses the retrieval scores, before compression runs."""
+        rag_service._config.compression = ContextCompressionConfig(enabled=True)
+
+        with patch.object(
+            SentenceCompressor, "postprocess_nodes", autospec=True
+        ) as postprocess:
+            result = await rag_service.query("football")
+
+        assert result["answer"] == RelevanceGateConfig().answer
+        postprocess.assert_not_called()
+        assert "compression" not in result
+
+        result = await rag_service.query("llama")
+
+        assert result["answer"] != RelevanceGateConfig().answer
+        assert result["compression"]["original_tokens"] > 0
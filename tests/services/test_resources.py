@@ -0,0 +1,176 @@
+"""Unit tests for the CPU thread budget and its autotuning."""
+
+import os
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+import torch
+import yaml
+from llama_index.core.llms import MockLLM
+
+from app.core.config.configuration import Configuration
+from app.core.config.rag import RagServiceConfig, ResourcesConfig
+from app.core.exceptions import QueryTimeoutError
+from app.services.components import MmapVectorStoreComponent
+from app.services.rag_service import RAGService
+from app.services.resources import (
+    TrialResult,
+    apply_thread_budget,
+    autotune,
+    best_trial,
+    default_thread_counts,
+    thread_budget,
+    write_resources,
+)
+
+
+class TestThreadBudget:
+    """Test cases for the thread budget functions."""
+
+    def test_cpu_budget_is_shared_by_workers(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that every worker gets its share of the cores."""
+        monkeypatch.setenv("WORKERS", "3")
+
+        assert thread_budget(ResourcesConfig(cpu_budget=8)).intra_op_threads == 2
+        assert (
+            thread_budget(ResourcesConfig(cpu_budget=8, workers=2)).intra_op_threads
+            == 4
+        )
+        assert (
+            thread_budget(ResourcesConfig(cpu_budget=8, workers=16)).intra_op_threads
+            == 1
+        )
+        assert (
+            thread_budget(
+                ResourcesConfig(cpu_budget=8, intra_op_threads=6)
+            ).intra_op_threads
+            == 6
+        )
+
+    def test_apply_thread_budget(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that the budget sizes the torch and tokenizers thread pools."""
+        for name in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "TOKENIZERS_PARALLELISM"):
+            monkeypatch.delenv(name, raising=False)
+        threads = torch.get_num_threads()
+        try:
+            apply_thread_budget(
+                thread_budget(ResourcesConfig(intra_op_threads=2, workers=1))
+            )
+
+            assert torch.get_num_threads() == 2
+        finally:
+            torch.set_num_threads(threads)
+        assert os.environ["OMP_NUM_THREADS"] == "2"
+        assert os.environ["TOKENIZERS_PARALLELISM"] == "false"
+
+
+class TestAutotune:
+    """Test cases for the autotuning functions."""
+
+    def test_sweeps_threads_and_in_flight_limits(self) -> None:
+        """Test that every combination of the sweep is measured."""
+        results = autotune(
+            ResourcesConfig(workers=1), [1], [1, 2], requests=4, dim=16, layers=2
+        )
+
+        assert [(r.intra_op_threads, r.max_in_flight) for r in results] == [
+            (1, 1),
+            (1, 2),
+        ]
+        assert all(r.throughput > 0 and r.p50_ms > 0 for r in results)
+
+    def test_best_trial_prefers_fewer_threads(self) -> None:
+        """Test that equivalent throughputs are won by the fewest threads."""
+        results = [
+            TrialResult(intra_op_threads=1, max_in_flight=1, throughput=50, p50_ms=1),
+            TrialResult(intra_op_threads=2, max_in_flight=1, throughput=98, p50_ms=1),
+            TrialResult(intra_op_threads=4, max_in_flight=2, throughput=100, p50_ms=1),
+        ]
+
+        assert best_trial(results).intra_op_threads == 2
+
+    def test_default_thread_counts(self) -> None:
+        """Test that the sweep covers the share of a worker and all the cores."""
+        assert default_thread_counts(12, 2) == [1, 2, 4, 6, 8]
+        assert default_thread_counts(1, 2) == [1]
+
+    def test_write_resources_keeps_the_config(self, tmp_path: Path) -> None:
+        """Test that tuned settings are written without rewriting the file."""
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text(
+            "app_name: test\n"
+            "rag_service:\n"
+            "  # Tuned below.\n"
+            "  resources:\n"
+            "    # cpu_budget: 8\n"
+            "    intra_op_threads: 8\n"
+            "\n"
+            "  # Next section.\n"
+            "  routing:\n"
+            "    enabled: false\n"
+        )
+
+        write_resources(config_file, {"intra_op_threads": 2, "max_in_flight": 4})
+
+        text = config_file.read_text()
+        assert (
+            "    # cpu_budget: 8\n    intra_op_threads: 2\n    max_in_flight: 4\n"
+            in text
+        )
+        assert "\n\n  # Next section.\n  routing:\n" in text
+        resources = Configuration.from_yaml(str(config_file)).rag_service.resources
+        assert resources.intra_op_threads == 2
+        assert resources.max_in_flight == 4
+
+    def test_write_resources_adds_the_section(self, tmp_path: Path) -> None:
+        """Test that the resources section is added to configs without one."""
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text(
+            "app_name: test\nrag_service:\n  collection_name: docs\n\n# Logs.\nlogging: {}\n"
+        )
+
+        write_resources(config_file, {"max_in_flight": 2})
+
+        config = yaml.safe_load(config_file.read_text())
+        assert config["rag_service"] == {
+            "collection_name": "docs",
+            "resources": {"max_in_flight": 2},
+        }
+        assert "\n# Logs.\nlogging: {}\n" in config_file.read_text()
+
+
+class TestInFlightLimit:
+    """Test cases for the in-flight query limit of the RAG service."""
+
+    @pytest.mark.asyncio
+    async def test_queued_query_times_out(
+        self, tmp_path: Path, keyword_embed_model
+    ) -> None:
+        """Test that a query waiting for a slot stops at its deadline."""
+        docs = tmp_path / "docs"
+        docs.mkdir()
+        (docs / "llama.txt").write_text("llama data training.")
+        config = RagServiceConfig(
+            pdf_directory=str(docs),
+            vector_store_path=tmp_path / "vector_store",
+            vector_store_backend="mmap",
+            template_dir=Path("templates"),
+            resources=ResourcesConfig(max_in_flight=1),
+        )
+        embedding_component = Mock()
+        embedding_component.get_model.return_value = keyword_embed_model
+        llm_component = Mock()
+        llm_component.get_model.return_value = MockLLM()
+        vector_store_component = MmapVectorStoreComponent(config)
+        vector_store_component.load()
+        service = RAGService(
+            llm_component, embedding_component, vector_store_component, config
+        )
+        service.get_or_create_index()
+
+        service._in_flight.acquire()
+        with pytest.raises(QueryTimeoutError, match="wait for a query slot"):
+            await service.query("llama", timeout_s=0.2)
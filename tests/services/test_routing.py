@@ -0,0 +1,205 @@
+"""Unit tests for the query router."""
+
+import json
+from pathlib import Path
+from typing import Any
+from unittest.mock import Mock
+
+import pytest
+from llama_index.core.llms import (
+    CompletionResponse,
+    CompletionResponseGen,
+    CustomLLM,
+    LLMMetadata,
+)
+from llama_index.core.llms.callbacks import llm_completion_callback
+from llama_index.core.schema import NodeWithScore, TextNode
+
+from app.core.config.rag import RagServiceConfig, RoutingConfig
+from app.services.artifacts import MANIFEST_FILE, SMALL_LLM_ARTIFACT
+from app.services.components import MmapVectorStoreComponent
+from app.services.metrics import MetricsRegistry
+from app.services.rag_service import RAGService
+from app.services.routing import QueryRouter, small_llm_config
+
+
+class NamedLLM(CustomLLM):
+    """LLM answering every prompt with its own name."""
+
+    name: str
+
+    @property
+    def metadata(self) -> LLMMetadata:
+        return LLMMetadata(num_output=8)
+
+    @llm_completion_callback()
+    def complete(
+        self,
+        prompt: str,  # noqa: ARG002
+        formatted: bool = False,  # noqa: ARG002
+        **kwargs: Any,  # noqa: ARG002
+    ) -> CompletionResponse:
+        return CompletionResponse(text=self.name)
+
+    @llm_completion_callback()
+    def stream_complete(
+        self, prompt: str, formatted: bool = False, **kwargs: Any
+    ) -> CompletionResponseGen:
+        raise NotImplementedError
+
+
+def nodes(*texts: str) -> list[NodeWithScore]:
+    """Builds retrieved nodes with the given texts."""
+    return [NodeWithScore(node=TextNode(text=text), score=1.0) for text in texts]
+
+
+def llm_component(name: str) -> Mock:
+    """Builds an LLM component serving a named LLM."""
+    component = Mock()
+    component.get_model.return_value = NamedLLM(name=name)
+    return component
+
+
+@pytest.fixture
+def rag_service(tmp_path: Path, keyword_embed_model) -> RAGService:
+    """Create a RAG service over one indexed document with routing enabled.
+
+    Returns:
+        RAGService: A service with its default index loaded.
+    """
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "llama.txt").write_text("llama data training.")
+    config = RagServiceConfig(
+        pdf_directory=str(docs),
+        vector_store_path=tmp_path / "vector_store",
+        vector_store_backend="mmap",
+        template_dir=Path("templates"),
+        routing=RoutingConfig(enabled=True),
+    )
+    embedding_component = Mock()
+    embedding_component.get_model.return_value = keyword_embed_model
+    vector_store_component = MmapVectorStoreComponent(config)
+    vector_store_component.load()
+    service = RAGService(
+        llm_component("large"),
+        embedding_component,
+        vector_store_component,
+        config,
+        small_llm_component=llm_component("small"),
+    )
+    service.get_or_create_index()
+    return service
+
+
+class TestQueryRouter:
+    """Test cases for the QueryRouter class."""
+
+    @pytest.mark.parametrize(
+        ("prompt", "context", "route", "reason"),
+        [
+            ("Which tokenizer does llama use?", "llama tokenizer", "small", "easy"),
+            ("word " * 25, "llama", "large", "query_length"),
+            ("Who trained llama? On which data?", "llama", "large", "questions"),
+            ("Compare llama and GPT-3.", "llama", "large", "keyword"),
+            ("Which data was used?", "data " * 1201, "large", "context_length"),
+        ],
+    )
+    def test_routes_by_difficulty(
+        self, prompt: str, context: str, route: str, reason: str
+    ) -> None:
+        """Test that only easy queries are routed to the small LLM."""
+        metrics = MetricsRegistry()
+        router = QueryRouter(RoutingConfig(enabled=True), metrics)
+
+        assert router.route(prompt, nodes(context)) == route
+        assert (
+            f'rag_llm_route_total{{route="{route}",reason="{reason}"}} 1.0'
+            in metrics.render()
+        )
+
+    def test_keywords_match_whole_words(self) -> None:
+        """Test that keywords are not matched inside other words."""
+        router = QueryRouter(
+            RoutingConfig(enabled=True, hard_keywords=["why"]), MetricsRegistry()
+        )
+
+        assert router.route("Is whyte a llama?", nodes("llama")) == "small"
+        assert router.route("Why is it a llama?", nodes("llama")) == "large"
+
+    def test_disabled_router_uses_large_llm(self) -> None:
+        """Test that every query goes to the large LLM while routing is disabled."""
+        metrics = MetricsRegistry()
+        router = QueryRouter(RoutingConfig(enabled=False), metrics)
+
+        assert router.route("llama?", nodes("llama")) == "large"
+        router.observe("large", 0.3)
+
+        rendered = metrics.render()
+        assert 'rag_llm_route_total{route="large",reason="disabled"} 1.0' in rendered
+        assert 'rag_llm_generation_seconds_count{route="large"} 1.0' in rendered
+
+    def test_small_llm_config(self) -> None:
+        """Test that the small LLM replaces the LLM without draft model."""
+        config = RagServiceConfig(
+            routing=RoutingConfig(small_llm_model_name="test/small"),
+        )
+
+        small_config = small_llm_config(config)
+
+        assert small_config.llm_model_name == "test/small"
+        assert small_config.speculative_decoding.draft_model_name is None
+        with pytest.raises(ValueError, match="small_llama_cpp_model_path"):
+            small_llm_config(config.model_copy(update={"llm_backend": "llama_cpp"}))
+
+    def test_small_llm_config_loads_artifact(self, tmp_path: Path) -> None:
+        """Test that the small LLM is loaded from its baked artifact."""
+        config = RagServiceConfig(
+            model_artifacts_dir=tmp_path,
+            routing=RoutingConfig(enabled=True, small_llm_model_name="test/small"),
+        )
+        manifest = {
+            "llm_model_name": config.llm_model_name,
+            "embed_model_name": config.embed_model_name,
+            "small_llm_model_name": "other/small",
+        }
+        (tmp_path / MANIFEST_FILE).write_text(json.dumps(manifest))
+
+        with pytest.raises(ValueError, match="do not contain the small LLM model"):
+            small_llm_config(config)
+
+        manifest["small_llm_model_name"] = "test/small"
+        (tmp_path / MANIFEST_FILE).write_text(json.dumps(manifest))
+        small_config = small_llm_config(config)
+
+        assert small_config.llm_model_name == str(tmp_path / SMALL_LLM_ARTIFACT)
+        assert small_config.model_artifacts_dir is None
+
+
+class TestQueryRouting:
+    """Test cases for the query routing of the RAG service."""
+
+    @pytest.mark.asyncio
+    async def test_queries_are_answered_by_their_route(
+        self, rag_service: RAGService
+    ) -> None:
+        """Test that easy and hard queries are answered by different LLMs."""
+        easy = await rag_service.query("llama")
+        hard = await rag_service.query("Explain llama training.")
+
+        assert easy["answer"] == "small"
+        assert hard["answer"] == "large"
+        rendered = rag_service.metrics.render()
+        assert 'rag_llm_generation_seconds_count{route="small"} 1.0' in rendered
+        assert 'rag_llm_generation_seconds_count{route="large"} 1.0' in rendered
+
+    def test_routing_requires_small_llm(self, tmp_path: Path) -> None:
+        """Test that enabling routing without a small LLM fails early."""
+        config = RagServiceConfig(
+            vector_store_path=tmp_path,
+            template_dir=Path("templates"),
+            routing=RoutingConfig(enabled=True),
+        )
+
+        with pytest.raises(ValueError, match="requires a small LLM"):
+            RAGService(llm_component("large"), Mock(), Mock(), config)
@@ -0,0 +1,242 @@
+"""Unit tests for the chat sessions."""
+
+from pathlib import Path
+from typing import Any
+from unittest.mock import Mock
+
+import pytest
+from llama_index.core.llms import (
+    CompletionResponse,
+    CompletionResponseGen,
+    CustomLLM,
+    LLMMetadata,
+)
+from llama_index.core.llms.callbacks import llm_completion_callback
+from pydantic import Field
+
+from app.core.config.rag import RagServiceConfig, SessionsConfig
+from app.core.exceptions import SessionNotFoundError
+from app.services.components import MmapVectorStoreComponent, PrefixCache
+from app.services.components.base import shared_prefix_length
+from app.services.metrics import MetricsRegistry
+from app.services.rag_service import RAGService
+from app.services.sessions import CHAT_PREAMBLE, ChatTurn, SessionStore
+
+
+class RecordingLLM(CustomLLM):
+    """LLM recording its prompts and answering with their number."""
+
+    prompts: list[str] = Field(default_factory=list)
+
+    @property
+    def metadata(self) -> LLMMetadata:
+        return LLMMetadata(num_output=8)
+
+    @llm_completion_callback()
+    def complete(
+        self,
+        prompt: str,
+        formatted: bool = False,  # noqa: ARG002
+        **kwargs: Any,  # noqa: ARG002
+    ) -> CompletionResponse:
+        self.prompts.append(prompt)
+        return CompletionResponse(text=f"answer {len(self.prompts)}")
+
+    @llm_completion_callback()
+    def stream_complete(
+        self, prompt: str, formatted: bool = False, **kwargs: Any
+    ) -> CompletionResponseGen:
+        raise NotImplementedError
+
+
+class CachingLLMComponent:
+    """LLM component caching the text it completed, one token per word."""
+
+    def __init__(self):
+        self.texts: list[str] = []
+
+    def load(self) -> None:
+        pass
+
+    def get_model(self) -> RecordingLLM:
+        return RecordingLLM()
+
+    def shutdown(self) -> None:
+        pass
+
+    def complete_with_cache(
+        self, prompt: str, cache: PrefixCache | None
+    ) -> tuple[str, PrefixCache]:
+        self.texts.append(prompt)
+        answer = f"answer {len(self.texts)}"
+        token_ids = prompt.split()
+        reused = shared_prefix_length(cache.token_ids, token_ids) if cache else 0
+        return answer, PrefixCache(
+            token_ids=[*token_ids, *answer.split()],
+            state=None,
+            memory_bytes=100,
+            reused_tokens=reused,
+            prefilled_tokens=len(token_ids) - reused,
+        )
+
+
+def make_service(
+    tmp_path: Path, keyword_embed_model, llm_component: Any, **sessions: Any
+) -> RAGService:
+    """Create a RAG service over two indexed documents."""
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "llama.txt").write_text("llama data training.")
+    (docs / "weather.txt").write_text("weather forecast data.")
+    config = RagServiceConfig(
+        pdf_directory=str(docs),
+        vector_store_path=tmp_path / "vector_store",
+        vector_store_backend="mmap",
+        template_dir=Path("templates"),
+        similarity_top_k=1,
+        sessions=SessionsConfig(**sessions),
+    )
+    embedding_component = Mock()
+    embedding_component.get_model.return_value = keyword_embed_model
+    vector_store_component = MmapVectorStoreComponent(config)
+    vector_store_component.load()
+    service = RAGService(
+        llm_component, embedding_component, vector_store_component, config
+    )
+    service.get_or_create_index()
+    return service
+
+
+def recording_component(llm: RecordingLLM) -> Mock:
+    """Create an LLM component without KV cache support."""
+    component = Mock(spec=["load", "get_model", "shutdown"])
+    component.get_model.return_value = llm
+    return component
+
+
+class TestSessionStore:
+    """Test cases for the SessionStore class."""
+
+    def test_idle_sessions_expire(self) -> None:
+        """Test that sessions idle for longer than the TTL are gone."""
+        store = SessionStore(SessionsConfig(ttl_s=60), MetricsRegistry())
+        session = store.create(tenant=None)
+        assert store.get(session.session_id, tenant=None) is session
+
+        session.last_used -= 61
+
+        assert store.get(session.session_id, tenant=None) is None
+        assert len(store) == 0
+
+    def test_least_recently_used_sessions_are_evicted(self) -> None:
+        """Test that the least recently used session makes room for a new one."""
+        metrics = MetricsRegistry()
+        store = SessionStore(SessionsConfig(max_sessions=2), metrics)
+        first, second = store.create(tenant=None), store.create(tenant=None)
+        store.get(first.session_id, tenant=None)
+
+        store.create(tenant=None)
+
+        assert store.get(first.session_id, tenant=None) is first
+        assert store.get(second.session_id, tenant=None) is None
+        assert "rag_chat_sessions_evicted_total" in metrics.render()
+
+    def test_sessions_are_evicted_beyond_the_memory_budget(self) -> None:
+        """Test that sessions are evicted once their memory exceeds the budget."""
+        store = SessionStore(SessionsConfig(max_memory_mb=0.001), MetricsRegistry())
+        first, second = store.create(tenant=None), store.create(tenant=None)
+
+        second.turns.append(ChatTurn("question", "answer", "x" * 2048, []))
+        store.update(second)
+
+        # The session in use is kept, even over the budget.
+        assert store.get(first.session_id, tenant=None) is None
+        assert store.get(second.session_id, tenant=None) is second
+
+    def test_sessions_belong_to_their_tenant(self) -> None:
+        """Test that a session is not visible nor deletable by other tenants."""
+        store = SessionStore(SessionsConfig(), MetricsRegistry())
+        session = store.create(tenant="acme")
+
+        assert store.get(session.session_id, tenant=None) is None
+        assert not store.delete(session.session_id, tenant="other")
+        assert store.delete(session.session_id, tenant="acme")
+
+
+class TestChat:
+    """Test cases for the chat sessions of the RAG service."""
+
+    @pytest.mark.asyncio
+    async def test_follow_up_turns_keep_the_history(
+        self, tmp_path: Path, keyword_embed_model
+    ) -> None:
+        """Test that follow-up prompts hold the history and new context only."""
+        llm = RecordingLLM()
+        service = make_service(tmp_path, keyword_embed_model, recording_component(llm))
+
+        first = await service.chat("What about llama training?")
+        second = await service.chat("And llama data?", session_id=first["session_id"])
+        third = await service.chat("And the weather?", session_id=first["session_id"])
+
+        assert (first["turn"], second["turn"], third["turn"]) == (1, 2, 3)
+        assert second["answer"] == "answer 2"
+        assert llm.prompts[0].startswith(CHAT_PREAMBLE)
+        assert llm.prompts[1].startswith(llm.prompts[0] + " answer 1")
+        # The llama document is already in the conversation.
+        assert llm.prompts[1].count("llama data training.") == 1
+        assert "weather forecast data." in llm.prompts[2]
+        session = service.get_session(first["session_id"])
+        assert [turn.question for turn in session.turns][-1] == "And the weather?"
+
+    @pytest.mark.asyncio
+    async def test_old_turns_are_dropped_from_the_prompt(
+        self, tmp_path: Path, keyword_embed_model
+    ) -> None:
+        """Test that the prompt keeps the configured number of turns at most."""
+        llm = RecordingLLM()
+        service = make_service(
+            tmp_path, keyword_embed_model, recording_component(llm), max_turns=2
+        )
+
+        session_id = (await service.chat("first llama question"))["session_id"]
+        await service.chat("second question", session_id=session_id)
+        await service.chat("third question", session_id=session_id)
+
+        assert "first llama question" not in llm.prompts[2]
+        assert "second question" in llm.prompts[2]
+        assert len(service.get_session(session_id).as_dict()["turns"]) == 3
+
+    @pytest.mark.asyncio
+    async def test_kv_cache_is_reused_across_turns(
+        self, tmp_path: Path, keyword_embed_model
+    ) -> None:
+        """Test that the previous turn is reused from the cache of the LLM."""
+        component = CachingLLMComponent()
+        service = make_service(tmp_path, keyword_embed_model, component)
+
+        session_id = (await service.chat("llama?"))["session_id"]
+        await service.chat("And the data?", session_id=session_id)
+
+        assert component.texts[0].startswith(CHAT_PREAMBLE)
+        assert component.texts[1].startswith(component.texts[0] + " answer 1")
+        assert service._chat_tokens.value(kind="reused") == len(
+            (component.texts[0] + " answer 1").split()
+        )
+
+    @pytest.mark.asyncio
+    async def test_unknown_sessions_are_not_found(
+        self, tmp_path: Path, keyword_embed_model
+    ) -> None:
+        """Test that unknown, deleted and other tenants' sessions raise."""
+        service = make_service(
+            tmp_path, keyword_embed_model, recording_component(RecordingLLM())
+        )
+        session_id = (await service.chat("llama?"))["session_id"]
+
+        with pytest.raises(SessionNotFoundError):
+            await service.chat("llama?", session_id="0" * 32)
+        service.delete_session(session_id)
+        with pytest.raises(SessionNotFoundError):
+            service.get_session(session_id)
+        with pytest.raises(SessionNotFoundError):
+            service.delete_session(session_id)
@@ -0,0 +1,160 @@
+"""Unit tests for the index snapshots."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+import yaml
+from llama_index.core.schema import NodeRelationship, RelatedNodeInfo, TextNode
+
+from app.core.config.rag import RagServiceConfig
+from app.main import main
+from app.services.components import MmapVectorStoreComponent
+from app.services.components.vector_store import ChromaVectorStoreComponent
+from app.services.snapshots import export_snapshot, import_snapshot
+
+
+def make_config(tmp_path: Path, name: str, backend: str = "mmap") -> RagServiceConfig:
+    """Builds the configuration of a vector store under a temporary directory."""
+    return RagServiceConfig(
+        vector_store_path=tmp_path / name,
+        vector_store_backend=backend,
+        embed_model_name="test/embedding-model",
+    )
+
+
+def make_nodes(count: int, dim: int = 8) -> list[TextNode]:
+    """Builds nodes with random unit embeddings, metadata and a source."""
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(count, dim)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    nodes = []
+    for i, vector in enumerate(vectors):
+        node = TextNode(
+            text=f"chunk {i}",
+            id_=f"node-{i}",
+            embedding=vector.tolist(),
+            metadata={"file_name": f"doc-{i % 3}.pdf", "page_label": str(i)},
+        )
+        node.relationships[NodeRelationship.SOURCE] = RelatedNodeInfo(
+            node_id=f"doc-{i % 3}"
+        )
+        nodes.append(node)
+    return nodes
+
+
+def load_component(config: RagServiceConfig, nodes: list[TextNode] | None = None):
+    """Opens the vector store of a configuration and adds nodes to it."""
+    component_cls = (
+        MmapVectorStoreComponent
+        if config.vector_store_backend == "mmap"
+        else ChromaVectorStoreComponent
+    )
+    component = component_cls(config)
+    component.load()
+    if nodes:
+        component.get_store().add(nodes)
+    return component
+
+
+def stored_nodes(component) -> dict[str, TextNode]:
+    """Returns the nodes of a vector store by id."""
+    return {node.node_id: node for batch in component.iter_nodes(7) for node in batch}
+
+
+class TestSnapshots:
+    """Test cases for the snapshot export and import functions."""
+
+    @pytest.mark.parametrize(
+        ("source", "target"), [("mmap", "mmap"), ("chroma", "mmap"), ("mmap", "chroma")]
+    )
+    def test_round_trip(self, tmp_path: Path, source: str, target: str) -> None:
+        """Test that nodes, metadata and embeddings survive an export and import."""
+        nodes = make_nodes(20)
+        source_config = make_config(tmp_path, "source", source)
+        source_component = load_component(source_config, nodes)
+        target_config = make_config(tmp_path, "target", target)
+        target_component = load_component(target_config)
+
+        snapshot = tmp_path / "snapshots" / "index.snapshot"
+        manifest = export_snapshot(source_config, source_component, snapshot, 6)
+        import_snapshot(target_config, target_component, snapshot, 6)
+
+        assert manifest["count"] == 20 and manifest["dim"] == 8
+        assert target_component.count() == 20
+        imported = stored_nodes(target_component)
+        for node in nodes:
+            copy = imported[node.node_id]
+            assert copy.get_content() == node.get_content()
+            assert copy.metadata == node.metadata
+            assert copy.ref_doc_id == node.ref_doc_id
+            np.testing.assert_allclose(copy.embedding, node.embedding, atol=1e-6)
+
+    def test_deleted_nodes_are_not_exported(self, tmp_path: Path) -> None:
+        """Test that the nodes deleted from the mmap store are skipped."""
+        config = make_config(tmp_path, "source")
+        component = load_component(config, make_nodes(9))
+        component.get_store().delete("doc-0")
+
+        manifest = export_snapshot(config, component, tmp_path / "index.snapshot")
+
+        assert manifest["count"] == 6
+
+    def test_other_embedding_model_raises_error(self, tmp_path: Path) -> None:
+        """Test that a snapshot of another embedding model is refused."""
+        config = make_config(tmp_path, "source")
+        snapshot = tmp_path / "index.snapshot"
+        export_snapshot(config, load_component(config, make_nodes(3)), snapshot)
+        target_config = make_config(tmp_path, "target").model_copy(
+            update={"embed_model_name": "test/other-model"}
+        )
+        target_component = load_component(target_config)
+
+        with pytest.raises(ValueError, match="was exported with the embedding model"):
+            import_snapshot(target_config, target_component, snapshot)
+        assert target_component.count() == 0
+
+    def test_non_empty_collection_raises_error(self, tmp_path: Path) -> None:
+        """Test that a snapshot is only imported into an empty collection."""
+        config = make_config(tmp_path, "source")
+        component = load_component(config, make_nodes(3))
+        snapshot = tmp_path / "index.snapshot"
+        export_snapshot(config, component, snapshot)
+
+        with pytest.raises(ValueError, match="is not empty"):
+            import_snapshot(config, component, snapshot)
+        assert component.count() == 3
+
+    def test_cli_commands(self, tmp_path: Path) -> None:
+        """Test that the CLI exports a collection and imports it into another one."""
+        config = make_config(tmp_path, "vector_store")
+        load_component(config, make_nodes(5))
+        settings = yaml.safe_load(Path("config-local.yaml").read_text())
+        settings["rag_service"].update(
+            vector_store_path=str(config.vector_store_path),
+            vector_store_backend="mmap",
+            embed_model_name=config.embed_model_name,
+        )
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text(yaml.safe_dump(settings))
+        snapshot = tmp_path / "index.snapshot"
+
+        main(
+            ["--config", str(config_file), "export-snapshot", "--output", str(snapshot)]
+        )
+        main(
+            [
+                "--config",
+                str(config_file),
+                "import-snapshot",
+                "--input",
+                str(snapshot),
+                "--collection",
+                "replica",
+            ]
+        )
+
+        replica = load_component(
+            config.model_copy(update={"collection_name": "replica"})
+        )
+        assert replica.count() == 5
@@ -0,0 +1,188 @@
+"""Unit tests for assisted (speculative) decoding."""
+
+from pathlib import Path
+
+import pytest
+
+from app.core.config.rag import RagServiceConfig, SpeculativeDecodingConfig
+from app.services.components import HuggingFaceLLMComponent
+from app.services.deadlines import Deadline, deadline_scope
+from app.services.speculative import DecodingStats
+
+VOCABULARY = ["[UNK]", "[PAD]", "llama", "data", "training", "model", "tokens"]
+
+
+def _save_tiny_llm(path: Path, seed: int) -> None:
+    """Saves a randomly initialized tiny GPT2 model and its tokenizer."""
+    import torch
+    from tokenizers import Tokenizer, models, pre_tokenizers
+    from transformers import GPT2Config, GPT2LMHeadModel, PreTrainedTokenizerFast
+
+    tokenizer = Tokenizer(
+        models.WordLevel(
+            {token: i for i, token in enumerate(VOCABULARY)}, unk_token="[UNK]"
+        )
+    )
+    tokenizer.pre_tokenizer = pre_tokenizers.Whitespace()
+    PreTrainedTokenizerFast(
+        tokenizer_object=tokenizer, unk_token="[UNK]", pad_token="[PAD]"
+    ).save_pretrained(path)
+    torch.manual_seed(seed)
+    GPT2LMHeadModel(
+        GPT2Config(
+            vocab_size=len(VOCABULARY), n_embd=16, n_layer=1, n_head=2, n_positions=128
+        )
+    ).save_pretrained(path)
+
+
+@pytest.fixture(scope="module")
+def tiny_llm_dirs(tmp_path_factory: pytest.TempPathFactory) -> dict[str, Path]:
+    """Create a tiny LLM, an identical draft model and an unrelated draft model.
+
+    Returns:
+        dict[str, Path]: The model directories by role.
+    """
+    models_dir = tmp_path_factory.mktemp("models")
+    dirs = {
+        "llm": models_dir / "llm",
+        "same_draft": models_dir / "same-draft",
+        "other_draft": models_dir / "other-draft",
+    }
+    _save_tiny_llm(dirs["llm"], seed=0)
+    _save_tiny_llm(dirs["same_draft"], seed=0)
+    _save_tiny_llm(dirs["other_draft"], seed=1)
+    return dirs
+
+
+def _config(dirs: dict[str, Path], draft: str | None) -> RagServiceConfig:
+    """Builds a greedy-decoding configuration of the tiny LLM."""
+    return RagServiceConfig(
+        llm_model_name=str(dirs["llm"]),
+        context_window=128,
+        max_new_tokens=24,
+        device_map="cpu",
+        speculative_decoding=SpeculativeDecodingConfig(
+            draft_model_name=str(dirs[draft]) if draft else None,
+            num_assistant_tokens=4,
+            num_assistant_tokens_schedule="constant",
+        ),
+    )
+
+
+def _greedy_completion(component: HuggingFaceLLMComponent, prompt: str) -> str:
+    """Completes a prompt without sampling."""
+    llm = component.get_model()
+    llm.generate_kwargs |= {"do_sample": False}
+    return llm.complete(prompt).text
+
+
+class TestDecodingStats:
+    """Test cases for the DecodingStats class."""
+
+    def test_rates(self) -> None:
+        """Test the acceptance rate and throughput of accumulated generations."""
+        stats = DecodingStats()
+        stats.add(DecodingStats(1, new_tokens=20, draft_tokens=16, accepted_tokens=12))
+        stats.add(DecodingStats(1, new_tokens=10, draft_tokens=4, seconds=2.0))
+
+        assert stats.generations == 2
+        assert stats.acceptance_rate == pytest.approx(0.6)
+        assert stats.tokens_per_second == pytest.approx(15.0)
+
+    def test_empty_rates(self) -> None:
+        """Test that the rates are zero before any generation."""
+        assert DecodingStats().acceptance_rate == 0.0
+        assert DecodingStats().tokens_per_second == 0.0
+
+
+class TestSpeculativeDecoding:
+    """Test cases for assisted decoding with a draft model."""
+
+    def test_load_without_draft_model(self, tiny_llm_dirs: dict[str, Path]) -> None:
+        """Test that assisted decoding is disabled without a draft model."""
+        component = HuggingFaceLLMComponent(_config(tiny_llm_dirs, draft=None))
+
+        component.load()
+
+        assert "assistant_model" not in component.get_model().generate_kwargs
+        assert component.decoding_stats is None
+
+    @pytest.mark.parametrize("draft", [None, "other_draft"])
+    def test_generation_stops_at_deadline(
+        self, tiny_llm_dirs: dict[str, Path], draft: str | None
+    ) -> None:
+        """Test that completions of a loaded LLM stop once the deadline passed."""
+        component = HuggingFaceLLMComponent(_config(tiny_llm_dirs, draft=draft))
+        component.load()
+
+        with deadline_scope(Deadline(timeout_s=0)):
+            result = _greedy_completion(component, "llama data training")
+
+        # An assisted step adds up to the draft tokens and one token of its own.
+        assert len(result.split()) <= (5 if draft else 1)
+
+    @pytest.mark.parametrize("draft", ["same_draft", "other_draft"])
+    def test_assisted_decoding_matches_greedy_decoding(
+        self, tiny_llm_dirs: dict[str, Path], draft: str
+    ) -> None:
+        """Test that the main model verification keeps greedy outputs unchanged."""
+        baseline = HuggingFaceLLMComponent(_config(tiny_llm_dirs, draft=None))
+        assisted = HuggingFaceLLMComponent(_config(tiny_llm_dirs, draft=draft))
+        baseline.load()
+        assisted.load()
+
+        expected = _greedy_completion(baseline, "llama data training")
+        result = _greedy_completion(assisted, "llama data training")
+
+        assert result == expected
+        stats = assisted.decoding_stats
+        assert stats is not None
+        assert stats.generations == 1
+        assert stats.new_tokens == 24
+        assert 0 <= stats.accepted_tokens <= stats.draft_tokens
+        assert stats.tokens_per_second > 0
+
+    def test_identical_draft_model_is_always_accepted(
+        self, tiny_llm_dirs: dict[str, Path]
+    ) -> None:
+        """Test that a draft model agreeing with the LLM has every token accepted."""
+        component = HuggingFaceLLMComponent(_config(tiny_llm_dirs, "same_draft"))
+        component.load()
+
+        _greedy_completion(component, "model tokens")
+
+        stats = component.decoding_stats
+        assert stats is not None
+        assert stats.draft_tokens > 0
+        assert stats.acceptance_rate == 1.0
+
+    def test_unassisted_generations_are_not_recorded(
+        self, tiny_llm_dirs: dict[str, Path]
+    ) -> None:
+        """Test that generations without the draft model leave the stats unchanged."""
+        component = HuggingFaceLLMComponent(_config(tiny_llm_dirs, "other_draft"))
+        component.load()
+        llm = component.get_model()
+        llm.generate_kwargs = {
+            key: value
+            for key, value in llm.generate_kwargs.items()
+            if not key.startswith(("assistant_", "num_assistant_"))
+        }
+
+        _greedy_completion(component, "llama data training")
+
+        stats = component.decoding_stats
+        assert stats is not None
+        assert stats.generations == 0
+
+    def test_shutdown_removes_monitor(self, tiny_llm_dirs: dict[str, Path]) -> None:
+        """Test that shutdown unhooks the decoding statistics from the model."""
+        component = HuggingFaceLLMComponent(_config(tiny_llm_dirs, "other_draft"))
+        component.load()
+        model = component.get_model()._model  # type: ignore[attr-defined]
+
+        component.shutdown()
+
+        assert model.generate.__wrapped__ == type(model).generate.__get__(model)
+        assert not model._forward_hooks
+        assert component.decoding_stats is None
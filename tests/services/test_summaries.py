@@ -0,0 +1,183 @@
+"""Unit tests for the precomputed document summaries."""
+
+from pathlib import Path
+from typing import Any
+from unittest.mock import Mock
+
+import pytest
+from llama_index.core.llms import (
+    CompletionResponse,
+    CompletionResponseGen,
+    CustomLLM,
+    LLMMetadata,
+)
+from llama_index.core.llms.callbacks import llm_completion_callback
+from llama_index.core.schema import Document
+from pydantic import Field
+
+from app.core.config.rag import RagServiceConfig, SummariesConfig
+from app.services.components import MmapVectorStoreComponent
+from app.services.metadata import build_metadata_filters
+from app.services.rag_service import RAGService
+from app.services.summaries import (
+    SummaryStore,
+    filtered_file_names,
+    summarize_document,
+)
+
+
+class RecordingLLM(CustomLLM):
+    """LLM recording its prompts and answering with their number."""
+
+    prompts: list[str] = Field(default_factory=list)
+
+    @property
+    def metadata(self) -> LLMMetadata:
+        return LLMMetadata(num_output=8)
+
+    @llm_completion_callback()
+    def complete(
+        self,
+        prompt: str,
+        formatted: bool = False,  # noqa: ARG002
+        **kwargs: Any,  # noqa: ARG002
+    ) -> CompletionResponse:
+        self.prompts.append(prompt)
+        return CompletionResponse(text=f"answer {len(self.prompts)}")
+
+    @llm_completion_callback()
+    def stream_complete(
+        self, prompt: str, formatted: bool = False, **kwargs: Any
+    ) -> CompletionResponseGen:
+        raise NotImplementedError
+
+
+def counting_complete() -> Mock:
+    """Builds a completion function numbering its answers."""
+    complete = Mock()
+    complete.side_effect = lambda _: f"summary {complete.call_count}"
+    return complete
+
+
+def read_text(path: Path) -> list[Document]:
+    """Reads a text file as a single document."""
+    return [Document(text=path.read_text())]
+
+
+def make_service(tmp_path: Path, keyword_embed_model, llm: RecordingLLM) -> RAGService:
+    """Create a RAG service over one indexed document with summaries enabled."""
+    docs = tmp_path / "docs"
+    docs.mkdir(exist_ok=True)
+    (docs / "llama.txt").write_text("llama data training.")
+    config = RagServiceConfig(
+        pdf_directory=str(docs),
+        vector_store_path=tmp_path / "vector_store",
+        vector_store_backend="mmap",
+        template_dir=Path("templates"),
+        summaries=SummariesConfig(enabled=True),
+    )
+    embedding_component = Mock()
+    embedding_component.get_model.return_value = keyword_embed_model
+    llm_component = Mock()
+    llm_component.get_model.return_value = llm
+    vector_store_component = MmapVectorStoreComponent(config)
+    vector_store_component.load()
+    service = RAGService(
+        llm_component, embedding_component, vector_store_component, config
+    )
+    service.get_or_create_index()
+    return service
+
+
+class TestSummaries:
+    """Test cases for the document summary functions."""
+
+    def test_sections_are_rolled_up(self) -> None:
+        """Test that section summaries are combined in groups into one summary."""
+        complete = counting_complete()
+        documents = [Document(text="one two three four"), Document(text="five six")]
+
+        sections, summary = summarize_document(
+            "paper.pdf",
+            documents,
+            complete,
+            SummariesConfig(section_words=2, rollup_fan_in=2),
+        )
+
+        # 3 sections, rolled up into 2 then 1 summaries.
+        assert sections == ["summary 1", "summary 2", "summary 3"]
+        assert summary == "summary 6"
+        assert "one two" in complete.call_args_list[0].args[0]
+        assert "summary 1\n\nsummary 2" in complete.call_args_list[3].args[0]
+
+    def test_filtered_file_names(self) -> None:
+        """Test that only queries scoped to files at most can use summaries."""
+        assert filtered_file_names(None) == []
+        assert filtered_file_names(build_metadata_filters(file_names=["a.pdf"])) == [
+            "a.pdf"
+        ]
+        assert (
+            filtered_file_names(build_metadata_filters(file_names=["a.pdf"], page_to=2))
+            is None
+        )
+
+
+class TestSummaryStore:
+    """Test cases for the SummaryStore class."""
+
+    def test_refresh_only_summarizes_changed_files(self, tmp_path: Path) -> None:
+        """Test that summaries are regenerated when their file changes only."""
+        docs = tmp_path / "docs"
+        docs.mkdir()
+        (docs / "a.txt").write_text("llama data")
+        (docs / "b.txt").write_text("weather data")
+        path = tmp_path / "summaries.json"
+        config = SummariesConfig()
+        complete = counting_complete()
+
+        assert (
+            SummaryStore(path).refresh(docs.iterdir(), read_text, complete, config) == 2
+        )
+        store = SummaryStore(path)
+        assert store.refresh(docs.iterdir(), read_text, complete, config) == 0
+
+        (docs / "a.txt").write_text("llama training data")
+        (docs / "b.txt").unlink()
+        assert store.refresh(docs.iterdir(), read_text, complete, config) == 1
+
+        nodes = SummaryStore(path).nodes()
+        assert [node.node.metadata["file_name"] for node in nodes] == ["a.txt"]
+        assert nodes[0].node.get_content() == "summary 3"
+        assert SummaryStore(path).nodes(["b.txt"]) == []
+
+
+class TestOverviewQueries:
+    """Test cases for the overview queries of the RAG service."""
+
+    @pytest.mark.asyncio
+    async def test_overview_is_answered_from_summaries(
+        self, tmp_path: Path, keyword_embed_model
+    ) -> None:
+        """Test that overview queries are answered from the stored summaries."""
+        llm = RecordingLLM()
+        service = make_service(tmp_path, keyword_embed_model, llm)
+        assert len(llm.prompts) == 1
+
+        overview = await service.query("Give me an overview of the documents.")
+        answer = await service.query("llama")
+
+        assert len(llm.prompts) == 3
+        assert "answer 1" in llm.prompts[1]
+        assert overview["sources"][0]["metadata"]["summary"] is True
+        assert "summary" not in answer["sources"][0]["metadata"]
+
+    def test_unchanged_documents_are_not_summarized_again(
+        self, tmp_path: Path, keyword_embed_model
+    ) -> None:
+        """Test that a restarted service reuses the stored summaries."""
+        make_service(tmp_path, keyword_embed_model, RecordingLLM())
+        llm = RecordingLLM()
+
+        make_service(tmp_path, keyword_embed_model, llm)
+
+        assert llm.prompts == []
@@ -0,0 +1,157 @@
+"""Unit tests for TenantIndexCache class."""
+
+import asyncio
+import threading
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+from llama_index.core.llms import MockLLM
+
+from app.core.config.rag import RagServiceConfig
+from app.core.exceptions import TenantNotFoundError
+from app.services.components import MmapVectorStoreComponent
+from app.services.rag_service import RAGService
+from app.services.tenants import TenantIndex, TenantIndexCache, estimate_index_bytes
+
+
+def make_entry(tenant: str, memory_bytes: int = 0) -> TenantIndex:
+    """Create a tenant index backed by mocks."""
+    return TenantIndex(
+        tenant=tenant,
+        index=Mock(),
+        vector_store_component=Mock(),
+        memory_bytes=memory_bytes,
+    )
+
+
+class TestTenantIndexCache:
+    """Test cases for TenantIndexCache class."""
+
+    def test_estimate_index_bytes(self) -> None:
+        """Test that the estimate accounts for float32 vectors."""
+        assert estimate_index_bytes(num_vectors=1000, embedding_dim=384) == 1_536_000
+
+    def test_evicts_least_recently_used(self) -> None:
+        """Test that the least recently used index is evicted and shut down."""
+        cache = TenantIndexCache(max_open=2)
+        acme, globex, initech = (
+            make_entry("acme"),
+            make_entry("globex"),
+            make_entry("initech"),
+        )
+        cache.put(acme)
+        cache.put(globex)
+
+        assert cache.get("acme") is acme
+        cache.put(initech)
+
+        assert "globex" not in cache
+        assert "acme" in cache
+        assert "initech" in cache
+        globex.vector_store_component.shutdown.assert_called_once()
+        acme.vector_store_component.shutdown.assert_not_called()
+
+    def test_evicts_over_memory_budget(self) -> None:
+        """Test that indexes are evicted until the memory budget is met."""
+        cache = TenantIndexCache(max_open=10, max_memory_bytes=100)
+        cache.put(make_entry("acme", memory_bytes=40))
+        cache.put(make_entry("globex", memory_bytes=40))
+        cache.put(make_entry("initech", memory_bytes=50))
+
+        assert len(cache) == 2
+        assert "acme" not in cache
+        assert cache.memory_bytes == 90
+
+    def test_keeps_latest_index_over_memory_budget(self) -> None:
+        """Test that an index larger than the budget still stays open."""
+        cache = TenantIndexCache(max_open=10, max_memory_bytes=100)
+        cache.put(make_entry("acme", memory_bytes=40))
+        cache.put(make_entry("globex", memory_bytes=500))
+
+        assert len(cache) == 1
+        assert "globex" in cache
+
+    def test_put_replaces_existing_index(self) -> None:
+        """Test that reopening a tenant shuts down its previous index."""
+        cache = TenantIndexCache(max_open=2)
+        old, new = make_entry("acme"), make_entry("acme")
+        cache.put(old)
+        cache.put(new)
+
+        assert len(cache) == 1
+        assert cache.get("acme") is new
+        old.vector_store_component.shutdown.assert_called_once()
+
+    def test_clear(self) -> None:
+        """Test that clearing shuts down all the open indexes."""
+        cache = TenantIndexCache(max_open=2)
+        entries = [make_entry("acme"), make_entry("globex")]
+        for entry in entries:
+            cache.put(entry)
+
+        cache.clear()
+
+        assert len(cache) == 0
+        for entry in entries:
+            entry.vector_store_component.shutdown.assert_called_once()
+
+
+class TestTenantIndexes:
+    """Test cases for opening the tenant indexes of the RAG service."""
+
+    @pytest.fixture
+    def rag_service(self, tmp_path: Path, keyword_embed_model) -> RAGService:
+        """Create a RAG service with the documents of one tenant, not indexed yet."""
+        docs = tmp_path / "docs"
+        (docs / "acme").mkdir(parents=True)
+        (docs / "acme" / "llama.txt").write_text("llama data training.")
+        config = RagServiceConfig(
+            pdf_directory=str(docs),
+            vector_store_path=tmp_path / "vector_store",
+            vector_store_backend="mmap",
+            template_dir=Path("templates"),
+        )
+        embedding_component = Mock()
+        embedding_component.get_model.return_value = keyword_embed_model
+        llm_component = Mock()
+        llm_component.get_model.return_value = MockLLM(max_tokens=8)
+        return RAGService(
+            llm_component,
+            embedding_component,
+            MmapVectorStoreComponent(config),
+            config,
+        )
+
+    @pytest.mark.asyncio
+    async def test_concurrent_queries_open_index_once(
+        self, rag_service: RAGService
+    ) -> None:
+        """Test that concurrent first queries of a tenant build its index once."""
+        build_threads = []
+        build_index = rag_service._build_index
+
+        def record_build(*args, **kwargs):
+            build_threads.append(threading.current_thread())
+            return build_index(*args, **kwargs)
+
+        with patch.object(rag_service, "_build_index", side_effect=record_build):
+            results = await asyncio.gather(
+                *(rag_service.query("llama training", tenant="acme") for _ in range(3))
+            )
+
+        assert len(build_threads) == 1
+        assert build_threads[0] is not threading.main_thread()
+        assert all(result["sources"] for result in results)
+
+    @pytest.mark.asyncio
+    async def test_unknown_tenant_creates_no_collection(
+        self, rag_service: RAGService, tmp_path: Path
+    ) -> None:
+        """Test that querying an unknown tenant fails without creating anything."""
+        with pytest.raises(TenantNotFoundError, match="globex"):
+            await rag_service.query("llama training", tenant="globex")
+
+        assert not list((tmp_path / "vector_store").glob("*globex*"))
+        assert not (tmp_path / "docs" / "globex").exists()
+        assert "globex" not in rag_service._tenant_indexes
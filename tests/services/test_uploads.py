@@ -0,0 +1,207 @@
+"""Unit tests for document uploads and their indexing jobs."""
+
+from collections.abc import AsyncIterator, Callable
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+from llama_index.core.llms import MockLLM
+
+from app.core.config.rag import RagServiceConfig
+from app.core.exceptions import FileTooLargeError, FileUploadError, JobNotFoundError
+from app.services.components import MmapVectorStoreComponent
+from app.services.rag_service import RAGService
+from app.services.uploads import UploadJob, UploadJobs, save_upload, staging_path
+
+
+async def stream(data: bytes, chunk_size: int = 16) -> AsyncIterator[bytes]:
+    """Yields a request body in small chunks."""
+    for start in range(0, len(data), chunk_size):
+        yield data[start : start + chunk_size]
+
+
+@pytest.fixture
+def rag_service(tmp_path: Path, keyword_embed_model) -> RAGService:
+    """Create a RAG service over one indexed document and deterministic models.
+
+    Returns:
+        RAGService: A service with its default index loaded.
+    """
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "weather.txt").write_text("weather football weather.")
+    config = RagServiceConfig(
+        pdf_directory=str(docs),
+        vector_store_path=tmp_path / "vector_store",
+        vector_store_backend="mmap",
+        template_dir=Path("templates"),
+    )
+    embedding_component = Mock()
+    embedding_component.get_model.return_value = keyword_embed_model
+    llm_component = Mock()
+    llm_component.get_model.return_value = MockLLM(max_tokens=8)
+    vector_store_component = MmapVectorStoreComponent(config)
+    vector_store_component.load()
+    service = RAGService(
+        llm_component, embedding_component, vector_store_component, config
+    )
+    service.get_or_create_index()
+    return service
+
+
+class TestSaveUpload:
+    """Test cases for streaming uploads to disk."""
+
+    @pytest.mark.asyncio
+    async def test_save_upload(
+        self, tmp_path: Path, make_pdf: Callable[..., bytes]
+    ) -> None:
+        """Test that the chunks are written to the file in order."""
+        data = make_pdf("llama data")
+        path = tmp_path / "docs" / "llama.pdf"
+
+        size = await save_upload(stream(data), path, max_bytes=len(data))
+
+        assert size == len(data)
+        assert path.read_bytes() == data
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("data", [b"%PDF", b"hello world", b""])
+    async def test_save_upload_not_pdf_raises_error(
+        self, tmp_path: Path, data: bytes
+    ) -> None:
+        """Test that non PDF uploads are rejected and their file removed."""
+        path = tmp_path / "notes.pdf"
+
+        with pytest.raises(FileUploadError, match="not a PDF"):
+            await save_upload(stream(data, chunk_size=2), path, max_bytes=1024)
+        assert not path.exists()
+
+    @pytest.mark.asyncio
+    async def test_save_upload_too_large_raises_error(
+        self, tmp_path: Path, make_pdf: Callable[..., bytes]
+    ) -> None:
+        """Test that uploads over the size limit are cut short and removed."""
+        data = make_pdf("llama data")
+        path = tmp_path / "llama.pdf"
+
+        with pytest.raises(FileTooLargeError):
+            await save_upload(stream(data), path, max_bytes=len(data) - 1)
+        assert not path.exists()
+
+    def test_staging_path_is_hidden(self, tmp_path: Path) -> None:
+        """Test that staged uploads are hidden files keeping their extension."""
+        path = staging_path(tmp_path / "llama.pdf", "0123")
+
+        assert path.parent == tmp_path
+        assert path.name.startswith(".")
+        assert path.suffix == ".pdf"
+
+
+class TestUploadJobs:
+    """Test cases for the UploadJobs registry."""
+
+    def test_forgets_oldest_finished_jobs(self, tmp_path: Path) -> None:
+        """Test that finished jobs are forgotten first and active ones kept."""
+        jobs = UploadJobs(max_jobs=2)
+        active = UploadJob(file_name="a.pdf", tenant=None, path=tmp_path / "a.pdf")
+        done = UploadJob(
+            file_name="b.pdf", tenant=None, path=tmp_path / "b.pdf", status="failed"
+        )
+        newest = UploadJob(file_name="c.pdf", tenant=None, path=tmp_path / "c.pdf")
+
+        for job in (active, done, newest):
+            jobs.add(job)
+
+        assert len(jobs) == 2
+        assert jobs.get(done.job_id) is None
+        assert jobs.get(active.job_id) is active
+
+    def test_rejects_concurrent_upload_of_same_document(self, tmp_path: Path) -> None:
+        """Test that a document cannot be uploaded twice at the same time."""
+        jobs = UploadJobs(max_jobs=10)
+        jobs.add(UploadJob(file_name="a.pdf", tenant=None, path=tmp_path / "a.pdf"))
+
+        with pytest.raises(FileUploadError, match="already being uploaded"):
+            jobs.add(UploadJob(file_name="a.pdf", tenant=None, path=tmp_path / "a.pdf"))
+
+
+class TestUploadIndexing:
+    """Test cases for indexing uploaded documents into the live index."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("tenant", [None, "acme"])
+    async def test_upload_is_appended_to_index(
+        self,
+        rag_service: RAGService,
+        tenant: str | None,
+        make_pdf: Callable[..., bytes],
+    ) -> None:
+        """Test that an upload is indexed without rebuilding the collection."""
+        job = await rag_service.upload_document(
+            stream(make_pdf("llama data training")),
+            file_name="llama.pdf",
+            tenant=tenant,
+        )
+        assert job.status == "pending"
+
+        rag_service.index_upload(job.job_id)
+
+        job = rag_service.get_upload_job(job.job_id)
+        assert job.status == "completed", job.error
+        assert job.nodes > 0
+        assert job.path.is_file()
+        assert not staging_path(job.path, job.job_id).exists()
+        result = await rag_service.query("llama training", tenant=tenant)
+        assert result["sources"][0]["metadata"]["file_name"] == "llama.pdf"
+        if tenant is None:
+            # The weather document indexed at startup is still there.
+            file_names = {s["metadata"]["file_name"] for s in result["sources"]}
+            assert "weather.txt" in file_names
+
+    @pytest.mark.asyncio
+    async def test_upload_existing_document_raises_error(
+        self, rag_service: RAGService, make_pdf: Callable[..., bytes]
+    ) -> None:
+        """Test that uploads do not overwrite indexed or pending documents."""
+        job = await rag_service.upload_document(
+            stream(make_pdf("llama")), file_name="llama.pdf"
+        )
+
+        with pytest.raises(FileUploadError, match="already being uploaded"):
+            await rag_service.upload_document(
+                stream(make_pdf("llama")), file_name="llama.pdf"
+            )
+        rag_service.index_upload(job.job_id)
+        with pytest.raises(FileUploadError, match="already exists"):
+            await rag_service.upload_document(
+                stream(make_pdf("llama")), file_name="llama.pdf"
+            )
+
+    @pytest.mark.asyncio
+    async def test_declared_size_over_limit_raises_error(
+        self, rag_service: RAGService
+    ) -> None:
+        """Test that a too large Content-Length is rejected before reading."""
+        with pytest.raises(FileTooLargeError):
+            await rag_service.upload_document(
+                stream(b""), file_name="big.pdf", content_length=1024**4
+            )
+
+    def test_failed_indexing_is_reported(
+        self, rag_service: RAGService, tmp_path: Path
+    ) -> None:
+        """Test that indexing errors are recorded on the job."""
+        job = UploadJob(file_name="gone.pdf", tenant=None, path=tmp_path / "gone.pdf")
+        rag_service._upload_jobs.add(job)
+
+        rag_service.index_upload(job.job_id)
+
+        assert job.status == "failed"
+        assert job.error
+        assert job.finished_at is not None
+
+    def test_unknown_job_raises_error(self, rag_service: RAGService) -> None:
+        """Test that polling an unknown job raises JobNotFoundError."""
+        with pytest.raises(JobNotFoundError):
+            rag_service.get_upload_job("unknown")
@@ -0,0 +1,68 @@
+"""Unit tests for the model warm-up functions."""
+
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import torch
+from llama_index.core.embeddings import BaseEmbedding
+from llama_index.core.llms import MockLLM
+
+from app.services.warmup import compile_model, filler_text, time_step, warm_up
+
+
+class TestWarmup:
+    """Test cases for the model warm-up functions."""
+
+    def test_filler_text(self) -> None:
+        """Test that the filler text has the requested number of words."""
+        assert len(filler_text(100).split()) == 100
+
+    def test_time_step_splits_first_and_steady_runs(self) -> None:
+        """Test that the first run is reported apart from the median of the rest."""
+        fn = Mock()
+        clock = [0.0, 1.0, 1.0, 1.1, 1.1, 1.3, 1.3, 1.4]
+
+        with patch("app.services.warmup.time.perf_counter", side_effect=clock):
+            timing = time_step("step", fn, repeats=4)
+
+        assert fn.call_count == 4
+        assert timing.first_ms == 1000.0
+        assert round(timing.steady_ms) == 100
+        assert round(timing.speedup) == 10
+
+    def test_warm_up_runs_all_steps(self, keyword_embed_model: BaseEmbedding) -> None:
+        """Test that embedding batches, searches and every LLM are warmed up."""
+        retriever = Mock()
+
+        timings = warm_up(
+            llms={"large": MockLLM(), "small": MockLLM()},
+            embed_model=keyword_embed_model,
+            retriever=retriever,
+            embedding_batch_sizes=[1, 4],
+            prompt_lengths=[8, 64],
+            max_new_tokens=2,
+            repeats=2,
+        )
+
+        assert [timing.step for timing in timings] == [
+            "embedding batch=1",
+            "embedding batch=4",
+            "vector search",
+            "generation llm=large prompt=8 words",
+            "generation llm=large prompt=64 words",
+            "generation llm=small prompt=8 words",
+            "generation llm=small prompt=64 words",
+        ]
+        assert retriever.retrieve.call_count == 2
+
+    def test_compile_model(self) -> None:
+        """Test that the forward pass of the wrapped torch module is compiled."""
+        module = torch.nn.Linear(4, 2)
+        forward = module.forward
+
+        assert compile_model(SimpleNamespace(_model=module))
+        assert module.forward is not forward
+
+    def test_compile_model_without_torch_module(self) -> None:
+        """Test that models not wrapping a torch module are left untouched."""
+        assert not compile_model(MockLLM())
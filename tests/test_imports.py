@@ -0,0 +1,103 @@
+"""Import regression tests of the app package."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parent.parent
+
+# Loaded when the models and the vector store are, never on import.
+HEAVY_MODULES = (
+    "chromadb",
+    "llama_index.embeddings.huggingface",
+    "llama_index.llms.huggingface",
+    "llama_index.vector_stores.chroma",
+    "sentence_transformers",
+    "torch",
+    "transformers",
+)
+
+
+def imported_modules(statement: str) -> set[str]:
+    """Runs an import statement in a new interpreter.
+
+    Returns:
+        set[str]: The names of the modules imported by the statement.
+    """
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"{statement}; import json, sys; print(json.dumps(sorted(sys.modules)))",
+        ],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(json.loads(result.stdout.splitlines()[-1]))
+
+
+def import_seconds(statement: str) -> float:
+    """Runs an import statement in a new interpreter under ``-X importtime``.
+
+    Returns:
+        float: The cumulative time of the top-level imports, interpreter startup
+        ones included.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    microseconds = 0
+    for line in result.stderr.splitlines():
+        fields = line.split("|")
+        # Nested imports are indented below the module importing them.
+        is_top_level = len(fields) == 3 and not fields[2].startswith("  ")
+        if is_top_level and fields[1].strip().isdigit():
+            microseconds += int(fields[1])
+    return microseconds / 1e6
+
+
+class TestImports:
+    """Test cases for the imports of the app package."""
+
+    @pytest.mark.parametrize(
+        ("statement", "unexpected"),
+        [
+            ("import app", (*HEAVY_MODULES, "fastapi", "llama_index.core")),
+            ("import app.core.config", (*HEAVY_MODULES, "fastapi", "llama_index.core")),
+            ("from app import build_service_app", HEAVY_MODULES),
+        ],
+    )
+    def test_heavy_modules_are_not_imported(
+        self, statement: str, unexpected: tuple[str, ...]
+    ) -> None:
+        """Test that imports leave the heavy modules to their first use."""
+        modules = imported_modules(statement)
+
+        assert not modules.intersection(unexpected)
+
+    @pytest.mark.parametrize(
+        ("statement", "budget_s"),
+        [
+            ("import app", 1.0),
+            ("import app.core.config", 3.0),
+            ("from app import build_service_app", 15.0),
+        ],
+    )
+    def test_import_time_is_within_budget(
+        self, statement: str, budget_s: float
+    ) -> None:
+        """Test that imports stay well within a generous time budget.
+
+        The budgets are about ten times the import times on a developer laptop,
+        so only regressions such as an eager import of a heavy module fail.
+        """
+        assert import_seconds(statement) < budget_s